@@ -0,0 +1,194 @@
+#!/usr/bin/env python
+
+# ----------------------------------------------------------------------------
+# Copyright (C) 2017 Verizon.  All Rights Reserved.
+#
+#   Licensed under the Apache License, Version 2.0 (the "License");
+#   you may not use this file except in compliance with the License.
+#   You may obtain a copy of the License at
+#
+#       http://www.apache.org/licenses/LICENSE-2.0
+#
+#   Unless required by applicable law or agreed to in writing, software
+#   distributed under the License is distributed on an "AS IS" BASIS,
+#   WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#   See the License for the specific language governing permissions and
+#   limitations under the License.
+#
+# ----------------------------------------------------------------------------
+
+'''Compare fetching EC2 instances through boto3 resources and clients.
+
+No AWS access is needed; ``describe_instances`` responses are
+supplied with ``botocore.stub.Stubber``, so both methods pay the same
+response parsing and validation cost.
+
+Each method runs in a child process, and the CPU time and the growth
+in peak resident memory of that process are reported, scaled to 10000
+instances.
+
+    resource:
+        ``[i.meta.data for i in session.resource('ec2').instances.all()]``,
+        as boogio used to fetch EC2 instances.
+
+    client:
+        ``AWSMediator._fetch('ec2')``, which flattens the
+        ``describe_instances`` paginator's reservations.
+
+'''
+
+import argparse
+import datetime
+import os
+import resource
+import subprocess
+import sys
+import time
+
+import boto3
+from botocore.stub import Stubber
+
+from informer_memory import offline_mediator
+
+
+PAGE_SIZE = 1000
+INSTANCES_PER_RESERVATION = 4
+
+
+# - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - -
+def instance_record(index):
+    '''Construct a synthetic describe_instances instance.'''
+    return {
+        'InstanceId': 'i-%017x' % index,
+        'InstanceType': 'm4.large',
+        'ImageId': 'ami-0abc1234',
+        'KeyName': 'deploy-key',
+        'LaunchTime': datetime.datetime(2017, 1, 1),
+        'VpcId': 'vpc-%08x' % (index % 4),
+        'SubnetId': 'subnet-%08x' % (index % 32),
+        'PrivateIpAddress': '10.0.%d.%d' % (index // 250 % 250, index % 250),
+        'Placement': {'AvailabilityZone': 'us-east-1a', 'Tenancy': 'default'},
+        'State': {'Code': 16, 'Name': 'running'},
+        'SecurityGroups': [
+            {'GroupId': 'sg-%08x' % (index % 8), 'GroupName': 'web'},
+            ],
+        'BlockDeviceMappings': [
+            {
+                'DeviceName': '/dev/xvda',
+                'Ebs': {
+                    'AttachTime': datetime.datetime(2017, 1, 1),
+                    'DeleteOnTermination': True,
+                    'Status': 'attached',
+                    'VolumeId': 'vol-%017x' % index,
+                    },
+                },
+            ],
+        'Tags': [{'Key': 'AppName', 'Value': 'app-%d' % (index % 20)}],
+        }
+
+
+# - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - -
+def stub_pages(client, count):
+    '''Queue describe_instances responses for count instances.'''
+
+    stubber = Stubber(client)
+    for start in range(0, count, PAGE_SIZE):
+        stop = min(start + PAGE_SIZE, count)
+        response = {
+            'Reservations': [
+                {
+                    'ReservationId': 'r-%017x' % first,
+                    'OwnerId': '123456789012',
+                    'Instances': [
+                        instance_record(index)
+                        for index in range(
+                            first,
+                            min(first + INSTANCES_PER_RESERVATION, stop)
+                            )
+                        ],
+                    }
+                for first in range(start, stop, INSTANCES_PER_RESERVATION)
+                ],
+            }
+        if stop < count:
+            response['NextToken'] = str(stop)
+        stubber.add_response('describe_instances', response)
+    stubber.activate()
+    return stubber
+
+
+# - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - -
+def fetch(method, count):
+    '''Fetch count stubbed instances with method; return the records.'''
+
+    session = boto3.session.Session(
+        aws_access_key_id='benchmark', aws_secret_access_key='benchmark',
+        region_name='us-east-1'
+        )
+
+    if method == 'resource':
+        ec2 = session.resource('ec2')
+        stub_pages(ec2.meta.client, count)
+        return [instance.meta.data for instance in ec2.instances.all()]
+
+    # pylint: disable=protected-access
+    mediator = offline_mediator()
+    mediator.session = session
+    mediator.filters = {}
+    mediator._clients = {'ec2': session.client('ec2')}
+    stub_pages(mediator._clients['ec2'], count)
+    return mediator._fetch('ec2')
+
+
+# - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - -
+def child(method, count):
+    '''Run one method and print CPU seconds and peak RSS growth in KB.'''
+
+    # Build the stubbed session machinery once so only the fetch is
+    # measured.
+    fetch(method, 1)
+    baseline_rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+
+    start = os.times()
+    records = fetch(method, count)
+    stop = os.times()
+
+    assert len(records) == count
+    print '%f %d' % (
+        (stop[0] - start[0]) + (stop[1] - start[1]),
+        resource.getrusage(resource.RUSAGE_SELF).ru_maxrss - baseline_rss
+        )
+
+
+# - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - -
+def main():
+    '''Run the benchmark.'''
+
+    parser = argparse.ArgumentParser(description=__doc__.split('\n')[0])
+    parser.add_argument(
+        '-n', '--count', type=int, default=10000,
+        help='The number of instances to fetch.'
+        )
+    parser.add_argument('--child', help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.child:
+        child(args.child, args.count)
+        return
+
+    scale = 10000.0 / args.count
+    print '%-10s %16s %18s' % ('method', 'CPU s/10k', 'peak RSS MB/10k')
+    for method in ['resource', 'client']:
+        start = time.time()
+        output = subprocess.check_output([
+            sys.executable, os.path.abspath(__file__),
+            '--child', method, '--count', str(args.count)
+            ])
+        (cpu, rss) = output.split()
+        print '%-10s %16.2f %18.1f' % (
+            method, float(cpu) * scale, int(rss) * scale / 1024.0
+            )
+
+
+if __name__ == '__main__':
+    main()
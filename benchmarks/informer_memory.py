@@ -0,0 +1,231 @@
+#!/usr/bin/env python
+
+# ----------------------------------------------------------------------------
+# Copyright (C) 2017 Verizon.  All Rights Reserved.
+#
+#   Licensed under the Apache License, Version 2.0 (the "License");
+#   you may not use this file except in compliance with the License.
+#   You may obtain a copy of the License at
+#
+#       http://www.apache.org/licenses/LICENSE-2.0
+#
+#   Unless required by applicable law or agreed to in writing, software
+#   distributed under the License is distributed on an "AS IS" BASIS,
+#   WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#   See the License for the specific language governing permissions and
+#   limitations under the License.
+#
+# ----------------------------------------------------------------------------
+
+'''Report the memory used per informer for synthetic EC2 and subnet records.
+
+No AWS access is needed; informers are built against a mediator whose
+account details are filled in by hand.
+
+Two figures are reported for each entity type:
+
+    shared:
+        Deep size of all the informers together, divided by the
+        number of informers. Objects shared between informers, such
+        as interned strings and the mediator's meta supplementals,
+        are counted once.
+
+    unshared:
+        The sum of each informer's deep size taken alone, divided by
+        the number of informers. This is what each informer would
+        cost if nothing were shared.
+
+With ``--compress`` the informers hold their resources compressed, as
+with ``AWSSurveyor.set_resource_compression()``.
+
+'''
+
+import argparse
+import gc
+import sys
+import time
+
+from boogio import aws_informer
+
+
+REGION_NAME = 'us-east-1'
+ZONES = ['us-east-1a', 'us-east-1b', 'us-east-1c']
+VPCS = ['vpc-%08x' % n for n in range(4)]
+
+
+# - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - -
+def offline_mediator(profile_name='benchmark', compress_resources=False):
+    '''Return an AWSMediator that makes no AWS calls.'''
+
+    # pylint: disable=protected-access
+    mediator = aws_informer.AWSMediator.__new__(aws_informer.AWSMediator)
+    mediator._profile_name = profile_name
+    mediator.region_name = REGION_NAME
+    mediator.account_id = '123456789012'
+    mediator.account_name = 'benchmark'
+    mediator.account_desc = 'Offline benchmark account'
+    mediator._informer_meta = None
+    mediator.elisions = {}
+    mediator._elided_fields = {}
+    mediator.compress_resources = compress_resources
+    return mediator
+
+
+# - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - -
+def ec2_record(index):
+    '''Construct a synthetic EC2 instance record.
+
+    Every string is built fresh, as it would be when decoded from an
+    API response.
+
+    '''
+    zone = ZONES[index % len(ZONES)]
+    vpc = VPCS[index % len(VPCS)]
+    return {
+        u'InstanceId': u'i-%017x' % index,
+        u'InstanceType': u''.join(['m4.', 'large']),
+        u'ImageId': u''.join(['ami-', '0abc1234']),
+        u'KeyName': u''.join(['deploy', '-key']),
+        u'Architecture': u''.join(['x86', '_64']),
+        u'Hypervisor': u''.join(['x', 'en']),
+        u'RootDeviceType': u''.join(['e', 'bs']),
+        u'VirtualizationType': u''.join(['h', 'vm']),
+        u'VpcId': u''.join([vpc]),
+        u'SubnetId': u'subnet-%08x' % (index % 32),
+        u'PrivateIpAddress': u'10.0.%d.%d' % (index // 250 % 250, index % 250),
+        u'Placement': {
+            u'AvailabilityZone': u''.join([zone]),
+            u'Tenancy': u''.join(['def', 'ault']),
+            u'GroupName': u'',
+            },
+        u'State': {u'Code': 16, u'Name': u''.join(['run', 'ning'])},
+        u'SecurityGroups': [
+            {
+                u'GroupId': u'sg-%08x' % (index % 8),
+                u'GroupName': u'group-%d' % (index % 8),
+                },
+            ],
+        u'Tags': [
+            {u'Key': u'AppName', u'Value': u'app-%d' % (index % 20)},
+            ],
+        }
+
+
+# - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - -
+def subnet_record(index):
+    '''Construct a synthetic subnet record.'''
+    return {
+        u'SubnetId': u'subnet-%08x' % index,
+        u'VpcId': u''.join([VPCS[index % len(VPCS)]]),
+        u'AvailabilityZone': u''.join([ZONES[index % len(ZONES)]]),
+        u'State': u''.join(['avail', 'able']),
+        u'CidrBlock': u'10.%d.%d.0/24' % (index // 250 % 250, index % 250),
+        u'AvailableIpAddressCount': 251,
+        u'DefaultForAz': False,
+        u'MapPublicIpOnLaunch': False,
+        }
+
+
+# - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - -
+def deep_size(roots, seen):
+    '''Return the size in bytes of everything reachable from roots.
+
+    Objects whose ids are already in seen aren't counted again, and
+    the ids of counted objects are added to seen. Classes, modules
+    and the mediator aren't followed.
+
+    '''
+    size = 0
+    stack = list(roots)
+    while stack:
+        obj = stack.pop()
+        if id(obj) in seen:
+            continue
+        if isinstance(obj, (type, aws_informer.AWSMediator)):
+            continue
+        seen.add(id(obj))
+        size += sys.getsizeof(obj)
+
+        if isinstance(obj, dict):
+            stack.extend(obj.keys())
+            stack.extend(obj.values())
+        elif isinstance(obj, (list, tuple, set, frozenset)):
+            stack.extend(obj)
+
+        # Informers and compressed resources have __slots__.
+        if isinstance(obj, (dict, aws_informer.AWSInformer)):
+            if hasattr(obj, '__dict__'):
+                stack.append(obj.__dict__)
+            for cls in type(obj).__mro__:
+                for slot in cls.__dict__.get('__slots__', ()):
+                    if slot != '__weakref__' and hasattr(obj, slot):
+                        stack.append(getattr(obj, slot))
+
+    return size
+
+
+# - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - -
+def measure(informer_class, make_record, count, compress_resources=False):
+    '''Build count informers and report their size and build time.'''
+
+    # pylint: disable=protected-access
+
+    mediator = offline_mediator(compress_resources=compress_resources)
+    mediator.informer_cache.clear()
+    records = [make_record(index) for index in range(count)]
+
+    gc.collect()
+    start = time.time()
+    informers = informer_class.from_records(records, mediator)
+    elapsed = time.time() - start
+
+    # Only count what's held for the long term.
+    aws_informer._DECODED_RESOURCES.clear()
+
+    shared = deep_size(informers, set())
+    unshared = sum(deep_size([informer], set()) for informer in informers)
+
+    mediator.informer_cache.clear()
+
+    return {
+        'type': aws_informer.informer_entity_type(informer_class),
+        'count': count,
+        'shared': float(shared) / count,
+        'unshared': float(unshared) / count,
+        'seconds': elapsed,
+        }
+
+
+# - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - -
+def main():
+    '''Run the benchmark.'''
+
+    parser = argparse.ArgumentParser(description=__doc__.split('\n')[0])
+    parser.add_argument(
+        '-n', '--count', type=int, default=10000,
+        help='The number of informers of each type to build.'
+        )
+    parser.add_argument(
+        '--compress', action='store_true',
+        help='Hold informer resources compressed.'
+        )
+    args = parser.parse_args()
+
+    print '%-8s %8s %14s %14s %10s' % (
+        'type', 'count', 'shared B/inf', 'unshared B/inf', 'build s'
+        )
+    for informer_class, make_record in [
+            (aws_informer.EC2InstanceInformer, ec2_record),
+            (aws_informer.SubnetInformer, subnet_record),
+            ]:  # pylint: disable=bad-continuation
+        result = measure(
+            informer_class, make_record, args.count, args.compress
+            )
+        print '%-8s %8d %14.0f %14.0f %10.3f' % (
+            result['type'], result['count'], result['shared'],
+            result['unshared'], result['seconds']
+            )
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,151 @@
+#!/usr/bin/env python
+
+# ----------------------------------------------------------------------------
+# Copyright (C) 2017 Verizon.  All Rights Reserved.
+#
+#   Licensed under the Apache License, Version 2.0 (the "License");
+#   you may not use this file except in compliance with the License.
+#   You may obtain a copy of the License at
+#
+#       http://www.apache.org/licenses/LICENSE-2.0
+#
+#   Unless required by applicable law or agreed to in writing, software
+#   distributed under the License is distributed on an "AS IS" BASIS,
+#   WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#   See the License for the specific language governing permissions and
+#   limitations under the License.
+#
+# ----------------------------------------------------------------------------
+
+'''Compare creating clients from separate and shared boto3 sessions.
+
+No AWS access is needed; clients are created but never called. A
+temporary AWS config file with static credentials for each profile
+is used.
+
+Each method creates the clients an ``AWSMediator`` uses for each
+profile and region, in a child process, and the CPU time and the
+growth in peak resident memory of that process are reported.
+
+    separate:
+        A new ``boto3.session.Session`` for each profile and region,
+        as every ``AWSMediator`` used to create.
+
+    shared:
+        ``aws_informer.shared_session()`` for each profile and region.
+
+'''
+
+import argparse
+import os
+import resource
+import subprocess
+import sys
+import tempfile
+
+import boto3
+
+
+CLIENT_TYPES = ['sts', 'ec2', 'elb', 'autoscaling', 'emr', 'sqs', 's3']
+
+REGIONS = [
+    'ap-northeast-1', 'ap-southeast-1', 'ap-southeast-2', 'eu-central-1',
+    'eu-west-1', 'sa-east-1', 'us-east-1', 'us-east-2', 'us-west-1',
+    'us-west-2',
+    ]
+
+
+# - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - -
+def write_config(profile_count):
+    '''Write a config file for profile_count profiles; return its path.'''
+
+    (handle, path) = tempfile.mkstemp(prefix='boogio-benchmark-')
+    with os.fdopen(handle, 'w') as fptr:
+        for index in range(profile_count):
+            fptr.write(
+                '[profile benchmark-%d]\n'
+                'aws_access_key_id = benchmark\n'
+                'aws_secret_access_key = benchmark\n' % index
+                )
+    return path
+
+
+# - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - -
+def child(method, profile_count):
+    '''Run one method and print CPU seconds and peak RSS growth in KB.'''
+
+    from boogio import aws_informer
+
+    baseline_rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    start = os.times()
+
+    clients = []
+    for index in range(profile_count):
+        for region_name in REGIONS:
+            kwargs = {
+                'profile_name': 'benchmark-%d' % index,
+                'region_name': region_name,
+                }
+            if method == 'shared':
+                session = aws_informer.shared_session(**kwargs)
+            else:
+                session = boto3.session.Session(**kwargs)
+            clients.extend(
+                session.client(client_type) for client_type in CLIENT_TYPES
+                )
+
+    stop = os.times()
+    print '%f %d' % (
+        (stop[0] - start[0]) + (stop[1] - start[1]),
+        resource.getrusage(resource.RUSAGE_SELF).ru_maxrss - baseline_rss
+        )
+
+
+# - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - -
+def main():
+    '''Run the benchmark.'''
+
+    parser = argparse.ArgumentParser(description=__doc__.split('\n')[0])
+    parser.add_argument(
+        '-p', '--profiles', type=int, default=5,
+        help='The number of profiles; each is used in %d regions.' % (
+            len(REGIONS)
+            )
+        )
+    parser.add_argument('--child', help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.child:
+        child(args.child, args.profiles)
+        return
+
+    config_path = write_config(args.profiles)
+    env = dict(os.environ)
+    env['AWS_CONFIG_FILE'] = config_path
+    env['AWS_SHARED_CREDENTIALS_FILE'] = os.devnull
+    env['PYTHONPATH'] = os.pathsep.join(
+        [os.path.dirname(os.path.dirname(os.path.abspath(__file__)))] +
+        [p for p in [env.get('PYTHONPATH')] if p]
+        )
+
+    try:
+        print '%d mediators' % (args.profiles * len(REGIONS))
+        print '%-10s %10s %14s' % ('method', 'CPU s', 'peak RSS MB')
+        for method in ['separate', 'shared']:
+            output = subprocess.check_output(
+                [
+                    sys.executable, os.path.abspath(__file__),
+                    '--child', method, '--profiles', str(args.profiles)
+                    ],
+                env=env
+                )
+            (cpu, rss) = output.split()
+            print '%-10s %10.2f %14.1f' % (
+                method, float(cpu), int(rss) / 1024.0
+                )
+    finally:
+        os.remove(config_path)
+
+
+if __name__ == '__main__':
+    main()
@@ -18,7 +18,13 @@
 
 # pylint: disable=relative-import
 
+import aws_async
+import aws_checkpoint
 import aws_informer
+import aws_limiter
+import aws_differ
+import aws_graph
+import aws_pipeline
 import sqs_sifter
 import aws_reporter
 import aws_surveyor
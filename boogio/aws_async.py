@@ -0,0 +1,418 @@
+# ----------------------------------------------------------------------------
+# Copyright (C) 2017 Verizon.  All Rights Reserved.
+#
+#   Licensed under the Apache License, Version 2.0 (the "License");
+#   you may not use this file except in compliance with the License.
+#   You may obtain a copy of the License at
+#
+#       http://www.apache.org/licenses/LICENSE-2.0
+#
+#   Unless required by applicable law or agreed to in writing, software
+#   distributed under the License is distributed on an "AS IS" BASIS,
+#   WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#   See the License for the specific language governing permissions and
+#   limitations under the License.
+#
+# ----------------------------------------------------------------------------
+
+'''Run AWS work in the background, with cancellation and deadlines.
+
+Services that drive surveys from an event loop can't block it for the
+minutes a survey takes. The classes here start work on a background
+thread and return at once:
+
+``AWSFuture``
+    The eventual result of a function. The caller can wait for it
+    with a timeout, poll it, attach callbacks, or cancel it.
+
+``BackgroundIterator``
+    An iterator whose items are produced ahead of the consumer, up to
+    a bounded number, by a background thread.
+
+Cancellation is cooperative. Cancelling sets the future's
+``cancel_event``. Work running under the future checks the event
+between AWS calls, by calling ``raise_if_cancelled()`` or through an
+``AWSMediator`` whose ``cancel_event`` is set to the same event, and
+stops by raising ``AWSCancelledError``. Worker threads sharing
+mediators with other work can instead set an event for their own
+requests only, with ``set_thread_cancel_event()``. A call already in progress
+finishes first. A ``timeout`` given when the work is started cancels
+it when the time is up, and its result then raises
+``AWSTimeoutError``.
+
+Example
+-------
+
+::
+
+    >>> future = surveyor.asurvey('ec2', 'vpc', timeout=300)
+    >>> future.add_done_callback(lambda f: loop.call_soon_threadsafe(
+    ...     handle_survey, f
+    ...     ))
+    >>> for record in mediator.aiter_entities('ec2', timeout=60):
+    ...     print record['InstanceId']
+
+'''
+
+import Queue
+import sys
+import threading
+
+import logging
+# Set default logging handler to avoid "No handler found" warnings.
+try:  # Python 2.7+
+    from logging import NullHandler
+except ImportError:
+    class NullHandler(logging.Handler):
+        '''Placeholder handler.'''
+        def emit(self, record):
+            '''Dummy docstring.'''
+            pass
+
+logging.getLogger(__name__).addHandler(NullHandler())
+
+
+# The default maximum number of items a BackgroundIterator produces
+# ahead of its consumer.
+DEFAULT_QUEUE_SIZE = 256
+
+# How often, in seconds, blocked threads check for cancellation.
+POLL_INTERVAL = 0.1
+
+# Each thread's own cancel event; see set_thread_cancel_event().
+_THREAD_STATE = threading.local()
+
+
+# - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - -
+class AWSCancelledError(Exception):
+    '''Raised when background work has been cancelled.'''
+    pass
+
+
+# - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - -
+class AWSTimeoutError(Exception):
+    '''Raised when background work or a wait for it has run out of time.'''
+    pass
+
+
+# - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - -
+def set_thread_cancel_event(cancel_event):
+    '''Set the cancel event for requests made by the current thread.
+
+    Arguments:
+
+        cancel_event (threading.Event): The event, or ``None`` to
+            remove it.
+
+    While the event is set, ``AWSMediator`` requests for further
+    pages of records made by this thread raise ``AWSCancelledError``,
+    as they do when the mediator's own ``cancel_event`` is set.
+    Requests made by other threads through the same mediators aren't
+    affected.
+
+    '''
+    _THREAD_STATE.cancel_event = cancel_event
+
+
+# - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - -
+def thread_cancel_event():
+    '''Return the current thread's cancel event, or ``None``.'''
+    return getattr(_THREAD_STATE, 'cancel_event', None)
+
+
+# - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - -
+class AWSFuture(object):
+    '''The eventual result of a function running on a background thread.
+
+    Arguments:
+
+        function (callable):
+            The function to run. It's called with this future as its
+            only argument, so it can check for cancellation.
+
+        timeout (number, optional):
+            If given, the future is cancelled after this many
+            seconds, and its result raises ``AWSTimeoutError``.
+
+        cancel_event (threading.Event, optional):
+            The event that cancelling sets. By default, a new event
+            is created. Passing one lets the caller hand it to
+            mediators before the function starts.
+
+        name (str, optional):
+            A name for the background thread.
+
+    '''
+
+    def __init__(self, function, timeout=None, cancel_event=None, name=None):
+        '''Initialize an AWSFuture instance and start its function.'''
+
+        self.cancel_event = (
+            threading.Event() if cancel_event is None else cancel_event
+            )
+
+        self._function = function
+        self._done = threading.Event()
+        self._lock = threading.Lock()
+        self._callbacks = []
+        self._result = None
+        self._exc_info = None
+        self._timed_out = False
+
+        self._timer = None
+        if timeout is not None:
+            self._timer = threading.Timer(timeout, self._expire)
+            self._timer.daemon = True
+            self._timer.start()
+
+        thread = threading.Thread(
+            target=self._run, name=name or 'aws-future'
+            )
+        thread.daemon = True
+        thread.start()
+
+    # - - - - - - - - - - - - - - - - - - - - - - - - - - - - - -
+    def _expire(self):
+        '''Cancel the future when its time is up.'''
+        if not self._done.is_set():
+            self._timed_out = True
+            self.cancel_event.set()
+
+    # - - - - - - - - - - - - - - - - - - - - - - - - - - - - - -
+    def _run(self):
+        '''Run the function and record its outcome.'''
+        logger = logging.getLogger(__name__)
+
+        try:
+            self._result = self._function(self)
+        except Exception:  # pylint: disable=broad-except
+            self._exc_info = sys.exc_info()
+            if self.cancel_event.is_set():
+                logger.debug('background work cancelled', exc_info=True)
+                error_class = (
+                    AWSTimeoutError if self._timed_out else AWSCancelledError
+                    )
+                try:
+                    raise error_class(
+                        'timed out' if self._timed_out else 'cancelled'
+                        )
+                except error_class:
+                    self._exc_info = sys.exc_info()
+        finally:
+            if self._timer is not None:
+                self._timer.cancel()
+            with self._lock:
+                self._done.set()
+                callbacks = list(self._callbacks)
+
+        for callback in callbacks:
+            self._call(callback)
+
+    # - - - - - - - - - - - - - - - - - - - - - - - - - - - - - -
+    def _call(self, callback):
+        '''Call a done callback, logging rather than raising errors.'''
+        try:
+            callback(self)
+        except Exception:  # pylint: disable=broad-except
+            logging.getLogger(__name__).exception(
+                'exception in future callback %s', callback
+                )
+
+    # - - - - - - - - - - - - - - - - - - - - - - - - - - - - - -
+    def cancel(self):
+        '''Ask the function to stop.
+
+        Returns:
+
+            (bool) ``False`` if the function had already finished,
+            otherwise ``True``.
+
+        '''
+        if self._done.is_set():
+            return False
+        self.cancel_event.set()
+        return True
+
+    # - - - - - - - - - - - - - - - - - - - - - - - - - - - - - -
+    def cancelled(self):
+        '''Return whether the function stopped because it was cancelled.'''
+        return (
+            self._done.is_set() and self._exc_info is not None and
+            issubclass(
+                self._exc_info[0], (AWSCancelledError, AWSTimeoutError)
+                )
+            )
+
+    # - - - - - - - - - - - - - - - - - - - - - - - - - - - - - -
+    def done(self):
+        '''Return whether the function has finished.'''
+        return self._done.is_set()
+
+    # - - - - - - - - - - - - - - - - - - - - - - - - - - - - - -
+    def raise_if_cancelled(self):
+        '''Raise ``AWSCancelledError`` if the future has been cancelled.
+
+        Functions running under the future call this between steps.
+
+        '''
+        if self.cancel_event.is_set():
+            raise AWSCancelledError('cancelled')
+
+    # - - - - - - - - - - - - - - - - - - - - - - - - - - - - - -
+    def wait(self, timeout=None):
+        '''Wait for the function to finish.
+
+        Returns:
+
+            (bool) Whether the function finished within ``timeout``
+            seconds.
+
+        '''
+        if timeout is None:
+            # An untimed wait can't be interrupted in Python 2.
+            while not self._done.wait(POLL_INTERVAL):
+                pass
+            return True
+        return self._done.wait(timeout)
+
+    # - - - - - - - - - - - - - - - - - - - - - - - - - - - - - -
+    def result(self, timeout=None):
+        '''Return the function's result, waiting for it if needed.
+
+        Arguments:
+
+            timeout (number, optional):
+                How long to wait, in seconds. The function keeps
+                running if the wait times out.
+
+        Raises:
+
+            AWSTimeoutError: If the wait or the future timed out.
+
+            AWSCancelledError: If the future was cancelled.
+
+            Exception: Whatever the function raised.
+
+        '''
+        if not self.wait(timeout):
+            raise AWSTimeoutError(
+                'no result after %s seconds' % timeout
+                )
+        if self._exc_info is not None:
+            (error_type, error, error_traceback) = self._exc_info
+            raise error_type, error, error_traceback
+        return self._result
+
+    # - - - - - - - - - - - - - - - - - - - - - - - - - - - - - -
+    def exception(self, timeout=None):
+        '''Return the exception the function raised, or None.
+
+        See ``result()`` for ``timeout``.
+
+        '''
+        if not self.wait(timeout):
+            raise AWSTimeoutError(
+                'no result after %s seconds' % timeout
+                )
+        return None if self._exc_info is None else self._exc_info[1]
+
+    # - - - - - - - - - - - - - - - - - - - - - - - - - - - - - -
+    def add_done_callback(self, callback):
+        '''Call a function of this future when it's done.
+
+        The callback is called in the background thread, or at once
+        if the future is already done.
+
+        '''
+        with self._lock:
+            if not self._done.is_set():
+                self._callbacks.append(callback)
+                return
+        self._call(callback)
+
+
+# - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - -
+class BackgroundIterator(object):
+    '''Iterate over items produced ahead of time on a background thread.
+
+    Arguments:
+
+        iterable (iterable):
+            The source of the items. Taking each item may make AWS
+            calls; e.g., a generator of records fetched a page at a
+            time.
+
+        queue_size (int, optional):
+            The most items produced ahead of the consumer. The
+            producer waits for room before taking the next item.
+
+        timeout (number, optional):
+            If given, the iteration is cancelled after this many
+            seconds, and ``next()`` raises ``AWSTimeoutError``.
+
+    Items are produced in order. If producing an item raises an
+    exception, ``next()`` raises it once the items before it have
+    been consumed. After ``cancel()``, ``next()`` raises
+    ``AWSCancelledError``.
+
+    '''
+
+    def __init__(
+            self, iterable, queue_size=DEFAULT_QUEUE_SIZE, timeout=None
+            ):  # pylint: disable=bad-continuation
+        '''Initialize a BackgroundIterator and start producing items.'''
+
+        self._queue = Queue.Queue(maxsize=queue_size)
+        self._iterable = iterable
+        self.future = AWSFuture(
+            self._produce, timeout=timeout, name='aws-iterator'
+            )
+
+    # - - - - - - - - - - - - - - - - - - - - - - - - - - - - - -
+    def _produce(self, future):
+        '''Queue the items from the iterable as there's room.'''
+        iterator = iter(self._iterable)
+        while True:
+            future.raise_if_cancelled()
+            try:
+                item = iterator.next()
+            except StopIteration:
+                return
+            while True:
+                future.raise_if_cancelled()
+                try:
+                    self._queue.put(item, timeout=POLL_INTERVAL)
+                    break
+                except Queue.Full:
+                    pass
+
+    # - - - - - - - - - - - - - - - - - - - - - - - - - - - - - -
+    def __iter__(self):
+        return self
+
+    # - - - - - - - - - - - - - - - - - - - - - - - - - - - - - -
+    def next(self):
+        '''Return the next item, waiting for it if needed.'''
+        while True:
+            if self.future.cancel_event.is_set():
+                # Report the cancellation rather than leftover items.
+                self.future.wait()
+                self.future.result()
+                raise AWSCancelledError('cancelled')
+
+            try:
+                return self._queue.get(timeout=POLL_INTERVAL)
+            except Queue.Empty:
+                pass
+
+            if self.future.done():
+                try:
+                    return self._queue.get_nowait()
+                except Queue.Empty:
+                    self.future.result()
+                    raise StopIteration
+
+    # - - - - - - - - - - - - - - - - - - - - - - - - - - - - - -
+    def cancel(self):
+        '''Stop producing items.'''
+        self.future.cancel()
@@ -0,0 +1,217 @@
+# ----------------------------------------------------------------------------
+# Copyright (C) 2017 Verizon.  All Rights Reserved.
+#
+#   Licensed under the Apache License, Version 2.0 (the "License");
+#   you may not use this file except in compliance with the License.
+#   You may obtain a copy of the License at
+#
+#       http://www.apache.org/licenses/LICENSE-2.0
+#
+#   Unless required by applicable law or agreed to in writing, software
+#   distributed under the License is distributed on an "AS IS" BASIS,
+#   WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#   See the License for the specific language governing permissions and
+#   limitations under the License.
+#
+# ----------------------------------------------------------------------------
+
+'''Keep the completed parts of a survey on disk, so it can be resumed.
+
+A survey of many accounts and regions can take long enough that a
+crash or expired credentials near the end lose a lot of work. A
+``SurveyCheckpoint`` keeps each completed part in a working
+directory as it's completed:
+
+records
+    The records of one entity type, fetched by one mediator; i.e.,
+    for one profile and region.
+
+expansions
+    The expanded content of one mediator's informers of one entity
+    type, for entity types whose expansions make their own AWS
+    calls rather than looking up other entity types' records; e.g.
+    ``iam``.
+
+Each part is saved with the time it was saved and a description of
+how it was retrieved, such as the filters used. A run using the same
+working directory reuses the parts retrieved the same way that are
+less than ``max_age`` seconds old, and retrieves the rest.
+
+Example
+-------
+
+::
+
+    >>> surveyor.set_checkpoint('/var/tmp/org-survey')
+    >>> surveyor.survey('iam', 'vpc', 'subnet')
+    >>> surveyor.expand_informers()
+
+If this is interrupted, running it again fetches only the records
+and expansions it hadn't got to.
+
+'''
+
+import cPickle
+import os
+import re
+import tempfile
+import time
+import zlib
+
+import logging
+# Set default logging handler to avoid "No handler found" warnings.
+try:  # Python 2.7+
+    from logging import NullHandler
+except ImportError:
+    class NullHandler(logging.Handler):
+        '''Placeholder handler.'''
+        def emit(self, record):
+            '''Dummy docstring.'''
+            pass
+
+logging.getLogger(__name__).addHandler(NullHandler())
+
+
+# How long, in seconds, checkpointed parts are reused by default.
+DEFAULT_MAX_AGE = 24 * 60 * 60
+
+RECORDS = 'records'
+EXPANSIONS = 'expansions'
+
+_UNSAFE_FILENAME_CHARACTERS = re.compile(r'[^\w.-]')
+
+
+# - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - -
+class SurveyCheckpoint(object):
+    '''Completed survey parts, kept in a working directory.
+
+    Arguments:
+
+        path (str):
+            The working directory. It's created if it doesn't exist.
+
+        max_age (number, optional):
+            How long, in seconds, saved parts are reused.
+
+    Parts are identified by kind, ``RECORDS`` or ``EXPANSIONS``, and
+    the profile, region and entity type they're for. Each is written
+    to a file of its own, replacing any earlier one, so an
+    interrupted write leaves the previous file in place. Unreadable
+    parts are treated as missing, and failures to save are logged
+    rather than raised, so a checkpoint never stops a survey.
+
+    '''
+
+    def __init__(self, path, max_age=DEFAULT_MAX_AGE):
+        '''Initialize a SurveyCheckpoint instance.'''
+
+        self.path = os.path.expanduser(path)
+        self.max_age = max_age
+
+        for kind in [RECORDS, EXPANSIONS]:
+            directory = os.path.join(self.path, kind)
+            if not os.path.isdir(directory):
+                os.makedirs(directory)
+
+    # - - - - - - - - - - - - - - - - - - - - - - - - - - - - - -
+    def part_path(self, kind, mediator, entity_type):
+        '''Return the path of the file a part is saved in.'''
+        name = '.'.join([
+            _UNSAFE_FILENAME_CHARACTERS.sub('_', str(value))
+            for value in [
+                mediator.profile_name or '-',
+                mediator.region_name or '-',
+                entity_type
+                ]
+            ])
+        return os.path.join(self.path, kind, name)
+
+    # - - - - - - - - - - - - - - - - - - - - - - - - - - - - - -
+    def load(self, kind, mediator, entity_type, plan=None):
+        '''Return a saved part's content, or None.
+
+        Arguments:
+
+            kind (str): ``RECORDS`` or ``EXPANSIONS``.
+
+            mediator (AWSMediator): The mediator the part is for.
+
+            entity_type (str): The entity type the part is for.
+
+            plan (optional): A description of how the content is
+                retrieved, as passed to ``save()``. Parts saved with a
+                different plan aren't returned.
+
+        Returns:
+
+            The content, if a part was saved with the same plan less
+            than ``max_age`` seconds ago, otherwise None.
+
+        '''
+        logger = logging.getLogger(__name__)
+
+        part_path = self.part_path(kind, mediator, entity_type)
+        if not os.path.exists(part_path):
+            return None
+
+        try:
+            with open(part_path, 'rb') as fptr:
+                part = cPickle.loads(zlib.decompress(fptr.read()))
+        except Exception as err:  # pylint: disable=broad-except
+            logger.warning(
+                'ignoring unreadable checkpoint %s: %s', part_path, err
+                )
+            return None
+
+        if part['plan'] != plan:
+            logger.debug('checkpoint %s is for another plan', part_path)
+            return None
+        if time.time() - part['saved'] >= self.max_age:
+            logger.debug('checkpoint %s has expired', part_path)
+            return None
+
+        logger.debug('resuming from checkpoint %s', part_path)
+        return part['content']
+
+    # - - - - - - - - - - - - - - - - - - - - - - - - - - - - - -
+    def save(self, kind, mediator, entity_type, content, plan=None):
+        '''Save a completed part.
+
+        Arguments:
+
+            kind, mediator, entity_type, plan: As for ``load()``.
+
+            content: The part's content. It must be picklable.
+
+        '''
+        logger = logging.getLogger(__name__)
+
+        part_path = self.part_path(kind, mediator, entity_type)
+
+        temp_path = None
+        try:
+            data = zlib.compress(
+                cPickle.dumps(
+                    {'saved': time.time(), 'plan': plan, 'content': content},
+                    cPickle.HIGHEST_PROTOCOL
+                    ),
+                1
+                )
+            (fd, temp_path) = tempfile.mkstemp(
+                dir=os.path.dirname(part_path), suffix='.tmp'
+                )
+            with os.fdopen(fd, 'wb') as fptr:
+                fptr.write(data)
+            os.rename(temp_path, part_path)
+        except (IOError, OSError, cPickle.PicklingError) as err:
+            logger.warning('not saving checkpoint %s: %s', part_path, err)
+            if temp_path is not None and os.path.exists(temp_path):
+                os.remove(temp_path)
+
+    # - - - - - - - - - - - - - - - - - - - - - - - - - - - - - -
+    def clear(self):
+        '''Delete all saved parts.'''
+        for kind in [RECORDS, EXPANSIONS]:
+            directory = os.path.join(self.path, kind)
+            for name in os.listdir(directory):
+                os.remove(os.path.join(directory, name))
@@ -0,0 +1,676 @@
+# ----------------------------------------------------------------------------
+# Copyright (C) 2017 Verizon.  All Rights Reserved.
+#
+#   Licensed under the Apache License, Version 2.0 (the "License");
+#   you may not use this file except in compliance with the License.
+#   You may obtain a copy of the License at
+#
+#       http://www.apache.org/licenses/LICENSE-2.0
+#
+#   Unless required by applicable law or agreed to in writing, software
+#   distributed under the License is distributed on an "AS IS" BASIS,
+#   WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#   See the License for the specific language governing permissions and
+#   limitations under the License.
+#
+# ----------------------------------------------------------------------------
+
+'''Find added, removed and changed entities between two surveys.
+
+An ``AWSSnapshot`` records the ``to_dict()`` representation of a set
+of ``AWSInformer`` instances together with a content hash of each
+record, as computed by ``content_hash()``.
+Snapshots can be built from an ``AWSSurveyor`` or a list of informers,
+and written to and read from JSON files, so the state of a survey can
+be kept and compared with a later one.
+
+An ``AWSSurveyDiff`` aligns the entries of two snapshots by entity
+type, account, region and identifier. Entries whose content hashes
+match are skipped without further inspection; the remaining entries
+are reported as *added*, *removed* or *changed*, and changed entries
+carry the list of prune paths whose values differ. Entries that
+differ only in their entity type's volatile fields are unchanged.
+
+Example
+-------
+
+::
+
+    >>> from boogio import aws_differ
+    >>> before = aws_differ.AWSSnapshot.read('before.json')
+    >>> surveyor.survey('ec2', 'subnet')
+    >>> diff = aws_differ.AWSSurveyDiff(before, surveyor)
+    >>> [r.key for r in diff.added]
+    [('ec2', '123456789012', 'us-east-1', 'i-0123456789abcdef0')]
+    >>> diff.changed[0].changed_paths
+    ['State.Name']
+
+An ``AWSSurveyDiff`` provides an ``informers()`` method returning its
+``DiffRecord`` instances, so it can be passed to the ``AWSReporter``
+reporting methods in the ``surveyors`` list to run any
+``ReportDefinition`` over just the differences. See also
+``AWSReporter.diff_report()``.
+
+'''
+
+import copy
+import datetime
+import hashlib
+import json
+
+import logging
+# Set default logging handler to avoid "No handler found" warnings.
+try:  # Python 2.7+
+    from logging import NullHandler
+except ImportError:
+    class NullHandler(logging.Handler):
+        '''Placeholder handler.'''
+        def emit(self, record):
+            pass
+
+from boogio import aws_informer
+from boogio.utensils import prune
+
+logging.getLogger(__name__).addHandler(NullHandler())
+
+
+ADDED = 'added'
+REMOVED = 'removed'
+CHANGED = 'changed'
+UNCHANGED = 'unchanged'
+
+SNAPSHOT_FORMAT_VERSION = 1
+
+
+# - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - -
+def content_hash(record):
+    '''Return a stable hash of a JSON-serializable record.
+
+    Arguments:
+
+        record (dict):
+            The record to hash, typically the ``to_dict()``
+            representation of an ``AWSInformer`` instance.
+
+    Returns:
+
+        str: The hex digest of a SHA-1 hash of the canonical JSON
+        serialization of ``record``.
+
+    '''
+    return hashlib.sha1(
+        json.dumps(record, sort_keys=True, default=str)
+        ).hexdigest()
+
+
+# - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - -
+def leaf_paths(tree):
+    '''Map the prune paths in a tree to the leaf values they reach.
+
+    Arguments:
+
+        tree (dict):
+            The tree to analyze.
+
+    Returns:
+
+        dict: A dict whose keys are prune paths to leaves of ``tree``
+        and whose values are sorted lists of the JSON serializations
+        of the values found at that path. Lists are represented by
+        the ``prune.Pruner.LIST_INDICATOR`` symbol, so the order of
+        list elements is not significant. Empty dicts and lists are
+        treated as leaves.
+
+    '''
+    result = {}
+
+    def _walk(path, value):
+        '''Accumulate the leaves below value into result.'''
+        if isinstance(value, dict) and value:
+            for key, child in value.iteritems():
+                _walk(path + [unicode(key)], child)
+
+        elif isinstance(value, list) and value:
+            for child in value:
+                _walk(path + [prune.Pruner.LIST_INDICATOR], child)
+
+        else:
+            result.setdefault('.'.join(path), []).append(
+                json.dumps(value, sort_keys=True, default=str)
+                )
+
+    _walk([], tree)
+
+    for values in result.values():
+        values.sort()
+
+    return result
+
+
+# - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - -
+def changed_paths(old_record, new_record):
+    '''Return the prune paths whose values differ between two records.
+
+    Arguments:
+
+        old_record (dict):
+            The earlier record.
+
+        new_record (dict):
+            The later record.
+
+    Returns:
+
+        list of str: The sorted list of paths to leaves whose values
+        were added, removed or changed between ``old_record`` and
+        ``new_record``.
+
+    '''
+    old_leaves = leaf_paths(old_record)
+    new_leaves = leaf_paths(new_record)
+
+    return sorted(
+        path for path in set(old_leaves) | set(new_leaves)
+        if old_leaves.get(path) != new_leaves.get(path)
+        )
+
+
+# - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - -
+def path_overlaps(path, other_path):
+    '''Check whether one prune path is a prefix of the other.
+
+    Arguments:
+
+        path (str):
+            A prune path.
+
+        other_path (str):
+            Another prune path.
+
+    Returns:
+
+        bool: ``True`` if the dot-separated components of either path
+        begin with all the components of the other. List indicators
+        are ignored in the comparison.
+
+    '''
+    path = [
+        x for x in path.split('.') if x != prune.Pruner.LIST_INDICATOR
+        ]
+    other_path = [
+        x for x in other_path.split('.')
+        if x != prune.Pruner.LIST_INDICATOR
+        ]
+    length = min(len(path), len(other_path))
+
+    return path[:length] == other_path[:length]
+
+
+# - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - -
+class AWSSnapshot(object):
+    '''Record the content of a set of AWS entities at a point in time.
+
+    Arguments:
+
+        entries (list of dict, optional):
+            Snapshot entries, as returned by ``entries()`` or read
+            from a snapshot file.
+
+        created (str, optional):
+            A timestamp string for the snapshot. Defaults to the
+            current UTC time.
+
+    Each snapshot entry is a dict with the keys ``entity_type``,
+    ``account_id``, ``region_name``, ``identifier``,
+    ``content_hash`` and ``record``. The ``record`` value is the JSON
+    normalized ``to_dict()`` representation of the informer.
+
+    '''
+
+    timestamp_format = '%Y-%m-%dT%H:%M:%SZ'
+
+    # - - - - - - - - - - - - - - - - - - - - - - - - - - - -
+    def __init__(self, entries=None, created=None):
+        '''Initialize an AWSSnapshot instance.'''
+
+        self.created = (
+            created if created is not None
+            else datetime.datetime.utcnow().strftime(self.timestamp_format)
+            )
+        self._entries = {}
+
+        for entry in entries or []:
+            self._entries[self.entry_key(entry)] = entry
+
+    # - - - - - - - - - - - - - - - - - - - - - - - - - - - -
+    @staticmethod
+    def entry_key(entry):
+        '''Return the key used to align a snapshot entry.
+
+        Returns:
+
+            tuple: The ``(entity_type, account_id, region_name,
+            identifier)`` tuple for the entry.
+
+        '''
+        return (
+            entry['entity_type'], entry['account_id'],
+            entry['region_name'], entry['identifier']
+            )
+
+    # - - - - - - - - - - - - - - - - - - - - - - - - - - - -
+    @classmethod
+    def from_informers(cls, informers):
+        '''Create a snapshot from a list of AWSInformer instances.'''
+
+        snapshot = cls()
+        for informer in informers:
+            snapshot.add_informer(informer)
+
+        return snapshot
+
+    # - - - - - - - - - - - - - - - - - - - - - - - - - - - -
+    @classmethod
+    def from_surveyor(cls, surveyor, *entity_types):
+        '''Create a snapshot from the informers of an AWSSurveyor.
+
+        Arguments:
+
+            surveyor (AWSSurveyor):
+                The surveyor whose ``informers()`` will be recorded.
+
+            entity_types (tuple of str):
+                If provided, only record informers of these types.
+
+        '''
+        return cls.from_informers(surveyor.informers(*entity_types))
+
+    # - - - - - - - - - - - - - - - - - - - - - - - - - - - -
+    @classmethod
+    def read(cls, path):
+        '''Read a snapshot from a JSON file written by ``write()``.'''
+
+        with open(path, 'r') as fptr:
+            data = json.load(fptr)
+
+        if data.get('format_version') != SNAPSHOT_FORMAT_VERSION:
+            raise ValueError(
+                'unsupported snapshot format version %s in %s'
+                '' % (data.get('format_version'), path)
+                )
+
+        return cls(entries=data['entries'], created=data.get('created'))
+
+    # - - - - - - - - - - - - - - - - - - - - - - - - - - - -
+    def write(self, path):
+        '''Write the snapshot to a JSON file.'''
+
+        with open(path, 'w') as fptr:
+            json.dump(
+                {
+                    'format_version': SNAPSHOT_FORMAT_VERSION,
+                    'created': self.created,
+                    'entries': self.entries(),
+                    },
+                fptr
+                )
+
+    # - - - - - - - - - - - - - - - - - - - - - - - - - - - -
+    def add_record(
+            self,
+            entity_type,
+            account_id,
+            region_name,
+            identifier,
+            record
+            ):  # pylint: disable=bad-continuation
+        '''Add an entry for a plain record to the snapshot.
+
+        Arguments:
+
+            entity_type (str):
+                The entity type of the record.
+
+            account_id (str):
+                The AWS account id of the entity.
+
+            region_name (str):
+                The region of the entity.
+
+            identifier (str):
+                The entity's identifier.
+
+            record (dict):
+                The entity's data. The record is normalized to plain
+                JSON types before it's stored, and the entry's content
+                hash is the ``content_hash()`` of the stored record.
+
+        Returns:
+
+            dict: The snapshot entry added.
+
+        '''
+        record = json.loads(json.dumps(record, default=str))
+        entry = {
+            'entity_type': entity_type,
+            'account_id': account_id,
+            'region_name': region_name,
+            'identifier': identifier,
+            'content_hash': content_hash(record),
+            'record': record,
+            }
+        self._entries[self.entry_key(entry)] = entry
+
+        return entry
+
+    # - - - - - - - - - - - - - - - - - - - - - - - - - - - -
+    def add_informer(self, informer):
+        '''Add an entry for an AWSInformer instance to the snapshot.
+
+        The entry's record is the informer's ``to_dict()``
+        representation, which includes the content of the entities
+        it expands to, and it's hashed the same way as any other
+        record. See ``add_record()``.
+
+        '''
+        meta = informer.supplementals['meta']
+
+        return self.add_record(
+            entity_type=informer.entity_type,
+            account_id=meta['account_id'],
+            region_name=meta['region_name'],
+            identifier=informer.identifier,
+            record=informer.to_dict()
+            )
+
+    # - - - - - - - - - - - - - - - - - - - - - - - - - - - -
+    def entries(self, *entity_types):
+        '''Get the snapshot's entries.
+
+        Arguments:
+
+            entity_types (tuple of str):
+                If provided, only return entries of these types.
+
+        Returns:
+
+            list of dict: The matching entries, sorted by key.
+
+        '''
+        return [
+            self._entries[key] for key in sorted(self._entries)
+            if len(entity_types) == 0 or key[0] in entity_types
+            ]
+
+    # - - - - - - - - - - - - - - - - - - - - - - - - - - - -
+    def entry(self, key):
+        '''Get the entry with the given key, or None.'''
+        return self._entries.get(key)
+
+    # - - - - - - - - - - - - - - - - - - - - - - - - - - - -
+    def keys(self):
+        '''Get the set of entry keys in the snapshot.'''
+        return set(self._entries)
+
+    # - - - - - - - - - - - - - - - - - - - - - - - - - - - -
+    def __len__(self):
+        return len(self._entries)
+
+
+# - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - -
+class DiffRecord(object):
+    '''An added, removed or changed entity in an AWSSurveyDiff.
+
+    Attributes:
+
+        status (str):
+            One of ``aws_differ.ADDED``, ``aws_differ.REMOVED`` or
+            ``aws_differ.CHANGED``.
+
+        key (tuple):
+            The ``(entity_type, account_id, region_name, identifier)``
+            alignment key.
+
+        old (dict):
+            The earlier snapshot entry, or None if added.
+
+        new (dict):
+            The later snapshot entry, or None if removed.
+
+        changed_paths (list of str):
+            For changed records, the prune paths whose values differ.
+            Empty for added and removed records.
+
+    ``DiffRecord`` instances provide the ``entity_type`` attribute
+    and ``to_dict()`` method used by ``ReportDefinition``, so they
+    can be reported on in place of informers. The record reported is
+    the later record, or the earlier record for removed entities,
+    with an added ``diff`` key holding the status and changed paths.
+
+    '''
+
+    # - - - - - - - - - - - - - - - - - - - - - - - - - - - -
+    def __init__(self, status, key, old=None, new=None, changed_paths=None):
+        '''Initialize a DiffRecord instance.'''
+
+        self.status = status
+        self.key = key
+        self.old = old
+        self.new = new
+        self.changed_paths = changed_paths or []
+
+    # - - - - - - - - - - - - - - - - - - - - - - - - - - - -
+    @property
+    def entity_type(self):
+        '''The entity type of the differing entity.'''
+        return self.key[0]
+
+    # - - - - - - - - - - - - - - - - - - - - - - - - - - - -
+    @property
+    def identifier(self):
+        '''The identifier of the differing entity.'''
+        return self.key[3]
+
+    # - - - - - - - - - - - - - - - - - - - - - - - - - - - -
+    def touches(self, paths):
+        '''Check whether this record is relevant to a set of paths.
+
+        Arguments:
+
+            paths (list of str):
+                Prune paths, e.g. those of a report definition.
+
+        Returns:
+
+            bool: ``True`` for added and removed records, and for
+            changed records with a changed path overlapping any of
+            ``paths``.
+
+        '''
+        if self.status != CHANGED:
+            return True
+
+        return any(
+            path_overlaps(changed, path)
+            for changed in self.changed_paths
+            for path in paths
+            )
+
+    # - - - - - - - - - - - - - - - - - - - - - - - - - - - -
+    def to_dict(self):
+        '''Return the reportable record for this difference.'''
+
+        entry = self.new if self.new is not None else self.old
+        record = copy.deepcopy(entry['record'])
+        record['diff'] = {
+            'status': self.status,
+            'changed_paths': list(self.changed_paths),
+            }
+
+        return record
+
+    # - - - - - - - - - - - - - - - - - - - - - - - - - - - -
+    def __repr__(self):
+        return 'DiffRecord(%r, %r)' % (self.status, self.key)
+
+
+# - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - -
+class AWSSurveyDiff(object):
+    '''Compute the differences between two surveys or snapshots.
+
+    Arguments:
+
+        old (AWSSnapshot, AWSSurveyor or list of AWSInformer):
+            The earlier state.
+
+        new (AWSSnapshot, AWSSurveyor or list of AWSInformer):
+            The later state.
+
+        entity_types (list of str, optional):
+            If provided, only compare entities of these types.
+
+    Attributes:
+
+        added (list of DiffRecord):
+            Records for entities only in the later state.
+
+        removed (list of DiffRecord):
+            Records for entities only in the earlier state.
+
+        changed (list of DiffRecord):
+            Records for entities in both states whose content hashes
+            differ.
+
+        unchanged_count (int):
+            The number of entities whose content hashes match.
+
+    '''
+
+    # - - - - - - - - - - - - - - - - - - - - - - - - - - - -
+    def __init__(self, old, new, entity_types=None):
+        '''Initialize an AWSSurveyDiff instance.'''
+
+        entity_types = entity_types or []
+
+        self.old = self._as_snapshot(old, entity_types)
+        self.new = self._as_snapshot(new, entity_types)
+
+        self.added = []
+        self.removed = []
+        self.changed = []
+        self.unchanged_count = 0
+
+        self._compare(entity_types)
+
+    # - - - - - - - - - - - - - - - - - - - - - - - - - - - -
+    @staticmethod
+    def _as_snapshot(state, entity_types):
+        '''Convert a survey state argument to an AWSSnapshot.'''
+
+        if isinstance(state, AWSSnapshot):
+            return state
+
+        if hasattr(state, 'informers'):
+            return AWSSnapshot.from_surveyor(state, *entity_types)
+
+        return AWSSnapshot.from_informers(
+            i for i in state
+            if len(entity_types) == 0 or i.entity_type in entity_types
+            )
+
+    # - - - - - - - - - - - - - - - - - - - - - - - - - - - -
+    def _compare(self, entity_types):
+        '''Populate the added, removed and changed record lists.'''
+
+        old_keys = self.old.keys()
+        new_keys = self.new.keys()
+
+        if entity_types:
+            old_keys = set(k for k in old_keys if k[0] in entity_types)
+            new_keys = set(k for k in new_keys if k[0] in entity_types)
+
+        for key in sorted(new_keys - old_keys):
+            self.added.append(
+                DiffRecord(ADDED, key, new=self.new.entry(key))
+                )
+
+        for key in sorted(old_keys - new_keys):
+            self.removed.append(
+                DiffRecord(REMOVED, key, old=self.old.entry(key))
+                )
+
+        for key in sorted(old_keys & new_keys):
+            old_entry = self.old.entry(key)
+            new_entry = self.new.entry(key)
+
+            # The cheap check: most entities don't change between
+            # surveys, and matching hashes let us skip the detailed
+            # comparison entirely.
+            if old_entry['content_hash'] == new_entry['content_hash']:
+                self.unchanged_count += 1
+                continue
+
+            volatile = (
+                aws_informer.informer_volatile_fields(key[0])
+                if key[0] in aws_informer.entity_types() else []
+                )
+            paths = [
+                path for path in changed_paths(
+                    old_entry['record'], new_entry['record']
+                    )
+                if not any(path_overlaps(path, v) for v in volatile)
+                ]
+
+            # Only volatile fields changed.
+            if not paths:
+                self.unchanged_count += 1
+                continue
+
+            self.changed.append(DiffRecord(
+                CHANGED, key, old=old_entry, new=new_entry,
+                changed_paths=paths
+                ))
+
+    # - - - - - - - - - - - - - - - - - - - - - - - - - - - -
+    def records(self, *statuses):
+        '''Get diff records.
+
+        Arguments:
+
+            statuses (tuple of str):
+                If provided, only return records with these statuses.
+
+        Returns:
+
+            list of DiffRecord: The added, removed and changed
+            records, in that order.
+
+        '''
+        return [
+            r for r in self.added + self.removed + self.changed
+            if len(statuses) == 0 or r.status in statuses
+            ]
+
+    # - - - - - - - - - - - - - - - - - - - - - - - - - - - -
+    def informers(self, *entity_types):
+        '''Get diff records, filtered by entity type.
+
+        This mirrors ``AWSSurveyor.informers()`` so that an
+        ``AWSSurveyDiff`` can be passed to ``AWSReporter`` methods
+        in the ``surveyors`` argument.
+
+        '''
+        return [
+            r for r in self.records()
+            if len(entity_types) == 0 or r.entity_type in entity_types
+            ]
+
+    # - - - - - - - - - - - - - - - - - - - - - - - - - - - -
+    def summary(self):
+        '''Get counts of records by status.'''
+        return {
+            ADDED: len(self.added),
+            REMOVED: len(self.removed),
+            CHANGED: len(self.changed),
+            UNCHANGED: self.unchanged_count,
+            }
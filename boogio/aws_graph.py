@@ -0,0 +1,458 @@
+# ----------------------------------------------------------------------------
+# Copyright (C) 2017 Verizon.  All Rights Reserved.
+#
+#   Licensed under the Apache License, Version 2.0 (the "License");
+#   you may not use this file except in compliance with the License.
+#   You may obtain a copy of the License at
+#
+#       http://www.apache.org/licenses/LICENSE-2.0
+#
+#   Unless required by applicable law or agreed to in writing, software
+#   distributed under the License is distributed on an "AS IS" BASIS,
+#   WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#   See the License for the specific language governing permissions and
+#   limitations under the License.
+#
+# ----------------------------------------------------------------------------
+
+'''Index the relationships between surveyed AWS entities.
+
+AWS entity records refer to each other by identifier: an EC2 instance
+record lists its security groups, subnet and network interfaces, a load
+balancer lists its instances, and so on. An ``AWSRelationshipGraph``
+collects these references from a set of ``AWSInformer`` instances into
+typed edges, indexed in both directions, so that questions like "which
+instances are in subnet X" or "which network interfaces use security
+group Y" can be answered in time proportional to the number of
+answers rather than by scanning every informer.
+
+Nodes are identified by ``(entity_type, identifier, scope)`` tuples,
+where the scope is the account (or profile, if the account isn't
+known) and region of the informer's mediator. Identifiers such as
+load balancer names repeat across accounts and regions, and the
+scope keeps their entities apart. Edges are directed from the entity
+holding the reference to the entity referred to, in the same scope,
+and are typed by the pair of entity types they connect. References
+to entities that weren't surveyed are kept as edges to unresolved
+nodes, so they'll connect if the entity is added later.
+
+Example
+-------
+
+::
+
+    >>> surveyor.survey('ec2', 'subnet', 'network_interface',
+    ...     'security_group')
+    >>> graph = surveyor.relationship_graph()
+    >>> subnet = surveyor.informers('subnet')[0]
+    >>> graph.neighbors(subnet, 'ec2')
+    [<aws_informer.EC2InstanceInformer ...>, ...]
+    >>> sg = surveyor.informers('security_group')[0]
+    >>> graph.neighbors(sg, 'network_interface', direction=INCOMING)
+    [<aws_informer.NetworkInterfaceInformer ...>, ...]
+
+'''
+
+import collections
+
+import logging
+# Set default logging handler to avoid "No handler found" warnings.
+try:  # Python 2.7+
+    from logging import NullHandler
+except ImportError:
+    class NullHandler(logging.Handler):
+        '''Placeholder handler.'''
+        def emit(self, record):
+            pass
+
+logging.getLogger(__name__).addHandler(NullHandler())
+
+
+OUTGOING = 'outgoing'
+INCOMING = 'incoming'
+BOTH = 'both'
+
+LIST_INDICATOR = '[]'
+
+# The references each entity type's resource makes to other entities,
+# as (target entity type, path to identifiers) pairs. Paths are
+# dot-separated sequences of dict keys, with ``[]`` standing for every
+# element of a list.
+# Update for new AWSInformer subclass.
+RELATIONSHIPS = {
+    'ec2': [
+        ('security_group', 'SecurityGroups.[].GroupId'),
+        ('subnet', 'SubnetId'),
+        ('vpc', 'VpcId'),
+        ('network_interface', 'NetworkInterfaces.[].NetworkInterfaceId'),
+        ],
+    'elb': [
+        ('ec2', 'Instances.[].InstanceId'),
+        ('security_group', 'SecurityGroups.[]'),
+        ('subnet', 'Subnets.[]'),
+        ('vpc', 'VPCId'),
+        ],
+    'security_group': [
+        ('vpc', 'VpcId'),
+        ],
+    'vpc_peering_connection': [
+        ('vpc', 'AccepterVpcInfo.VpcId'),
+        ('vpc', 'RequesterVpcInfo.VpcId'),
+        ],
+    'internet_gateway': [
+        ('vpc', 'Attachments.[].VpcId'),
+        ],
+    'nat_gateway': [
+        ('subnet', 'SubnetId'),
+        ('vpc', 'VpcId'),
+        ('network_interface', 'NatGatewayAddresses.[].NetworkInterfaceId'),
+        ],
+    'autoscaling': [
+        ('ec2', 'Instances.[].InstanceId'),
+        ('elb', 'LoadBalancerNames.[]'),
+        ],
+    'subnet': [
+        ('vpc', 'VpcId'),
+        ],
+    'network_interface': [
+        ('security_group', 'Groups.[].GroupId'),
+        ('subnet', 'SubnetId'),
+        ('vpc', 'VpcId'),
+        ('ec2', 'Attachment.InstanceId'),
+        ],
+    'network_acl': [
+        ('vpc', 'VpcId'),
+        ('subnet', 'Associations.[].SubnetId'),
+        ],
+    'route_table': [
+        ('vpc', 'VpcId'),
+        ('subnet', 'Associations.[].SubnetId'),
+        ],
+    'eip': [
+        ('ec2', 'InstanceId'),
+        ('network_interface', 'NetworkInterfaceId'),
+        ],
+    }
+
+
+# - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - -
+def path_values(tree, path):
+    '''Return the non-empty values found at a path in a tree.
+
+    Arguments:
+
+        tree (dict):
+            The structure to search.
+
+        path (str):
+            A dot-separated sequence of dict keys, with ``[]``
+            standing for every element of a list.
+
+    Returns:
+
+        list: The values found. Missing keys, ``None`` values and
+        empty strings are skipped.
+
+    '''
+    values = [tree]
+
+    for key in path.split('.'):
+        found = []
+        for value in values:
+            if key == LIST_INDICATOR:
+                if isinstance(value, list):
+                    found.extend(value)
+            elif isinstance(value, dict) and key in value:
+                found.append(value[key])
+        values = found
+
+    return [v for v in values if v is not None and v != '']
+
+
+# - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - -
+def informer_scope(informer):
+    '''Return the ``(account, region)`` scope of an informer's entity.
+
+    Returns:
+
+        tuple: The account ID, or the profile name if the account ID
+        isn't known, and the region of the informer's mediator; or
+        None if the informer has no mediator.
+
+    '''
+    mediator = getattr(informer, 'mediator', None)
+    if mediator is None:
+        return None
+
+    return (
+        mediator.account_id or mediator.profile_name, mediator.region_name
+        )
+
+
+# - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - -
+class AWSRelationshipGraph(object):
+    '''A bidirectional index of references between AWS entities.
+
+    Arguments:
+
+        informers (list of AWSInformer, optional):
+            Informers to add to the graph.
+
+        relationships (dict, optional):
+            The reference specifications to use in place of the
+            module ``RELATIONSHIPS``.
+
+    '''
+
+    # - - - - - - - - - - - - - - - - - - - - - - - - - - - -
+    def __init__(self, informers=None, relationships=None):
+        '''Initialize an AWSRelationshipGraph instance.'''
+
+        self.relationships = (
+            RELATIONSHIPS if relationships is None else relationships
+            )
+
+        # node -> informer, for resolved nodes.
+        self._informers = {}
+
+        # node -> entity type -> set of nodes.
+        self._outgoing = collections.defaultdict(
+            lambda: collections.defaultdict(set)
+            )
+        self._incoming = collections.defaultdict(
+            lambda: collections.defaultdict(set)
+            )
+
+        self.add_informers(informers or [])
+
+    # - - - - - - - - - - - - - - - - - - - - - - - - - - - -
+    @staticmethod
+    def node(informer_or_node):
+        '''Return the ``(entity_type, identifier, scope)`` informer node.
+
+        Nodes passed in are returned unchanged, except that an
+        ``(entity_type, identifier)`` pair is taken to have no scope.
+
+        '''
+        if isinstance(informer_or_node, tuple):
+            if len(informer_or_node) == 2:
+                return informer_or_node + (None,)
+            return informer_or_node
+
+        return (
+            informer_or_node.entity_type,
+            informer_or_node.identifier,
+            informer_scope(informer_or_node)
+            )
+
+    # - - - - - - - - - - - - - - - - - - - - - - - - - - - -
+    def add_informers(self, informers):
+        '''Add informers and their references to the graph.'''
+
+        for informer in informers:
+            self.add_informer(informer)
+
+    # - - - - - - - - - - - - - - - - - - - - - - - - - - - -
+    def add_informer(self, informer):
+        '''Add an informer and its references to the graph.'''
+
+        source = self.node(informer)
+        if source in self._informers:
+            return
+
+        self._informers[source] = informer
+
+        if not isinstance(informer.resource, dict):
+            return
+
+        # References are to entities in the same account and region.
+        for target_type, path in self.relationships.get(source[0], []):
+            for identifier in path_values(informer.resource, path):
+                self.add_edge(source, (target_type, identifier, source[2]))
+
+    # - - - - - - - - - - - - - - - - - - - - - - - - - - - -
+    def add_edge(self, source, target):
+        '''Add a directed edge between two nodes.'''
+
+        source = self.node(source)
+        target = self.node(target)
+
+        self._outgoing[source][target[0]].add(target)
+        self._incoming[target][source[0]].add(source)
+
+    # - - - - - - - - - - - - - - - - - - - - - - - - - - - -
+    def informer(self, informer_or_node):
+        '''Return the informer for a node, or None if unresolved.'''
+        return self._informers.get(self.node(informer_or_node))
+
+    # - - - - - - - - - - - - - - - - - - - - - - - - - - - -
+    def informers(self, *entity_types):
+        '''Return the informers in the graph, filtered by entity type.'''
+        return [
+            self._informers[n] for n in sorted(self._informers)
+            if len(entity_types) == 0 or n[0] in entity_types
+            ]
+
+    # - - - - - - - - - - - - - - - - - - - - - - - - - - - -
+    def _adjacent_nodes(self, node, entity_type, direction):
+        '''Return the set of nodes adjacent to node.'''
+
+        indexes = {
+            OUTGOING: [self._outgoing],
+            INCOMING: [self._incoming],
+            BOTH: [self._outgoing, self._incoming],
+            }[direction]
+
+        adjacent = set()
+        for index in indexes:
+            # Don't let lookups add empty entries to the defaultdicts.
+            by_type = index.get(node)
+            if not by_type:
+                continue
+            if entity_type is None:
+                for nodes in by_type.itervalues():
+                    adjacent.update(nodes)
+            elif entity_type in by_type:
+                adjacent.update(by_type[entity_type])
+
+        return adjacent
+
+    # - - - - - - - - - - - - - - - - - - - - - - - - - - - -
+    def neighbor_nodes(
+            self,
+            informer_or_node,
+            entity_type=None,
+            direction=BOTH
+            ):  # pylint: disable=bad-continuation
+        '''Return the nodes adjacent to a node.
+
+        Arguments:
+
+            informer_or_node (AWSInformer or tuple):
+                The informer or node whose neighbors are wanted.
+
+            entity_type (str, optional):
+                If provided, only return neighbors of this type.
+
+            direction (str, default=BOTH):
+                ``OUTGOING`` for the entities this one refers to,
+                ``INCOMING`` for the entities referring to this one,
+                or ``BOTH``.
+
+        Returns:
+
+            list of tuple: The sorted adjacent nodes, including
+            unresolved nodes.
+
+        '''
+        return sorted(self._adjacent_nodes(
+            self.node(informer_or_node), entity_type, direction
+            ))
+
+    # - - - - - - - - - - - - - - - - - - - - - - - - - - - -
+    def neighbors(
+            self,
+            informer_or_node,
+            entity_type=None,
+            direction=BOTH
+            ):  # pylint: disable=bad-continuation
+        '''Return the informers adjacent to a node.
+
+        See ``neighbor_nodes()`` for arguments. Unresolved nodes are
+        omitted.
+
+        '''
+        return [
+            self._informers[n]
+            for n in self.neighbor_nodes(
+                informer_or_node, entity_type, direction
+                )
+            if n in self._informers
+            ]
+
+    # - - - - - - - - - - - - - - - - - - - - - - - - - - - -
+    def closure(
+            self,
+            informer_or_node,
+            entity_types=None,
+            direction=OUTGOING,
+            max_depth=None
+            ):  # pylint: disable=bad-continuation
+        '''Return the informers reachable from a node.
+
+        Arguments:
+
+            informer_or_node (AWSInformer or tuple):
+                The informer or node to start from.
+
+            entity_types (list of str, optional):
+                If provided, only traverse nodes of these types.
+
+            direction (str, default=OUTGOING):
+                The direction of edges to follow, as for
+                ``neighbor_nodes()``.
+
+            max_depth (int, optional):
+                If provided, the maximum number of edges to follow.
+
+        Returns:
+
+            list of AWSInformer: The resolved informers reachable from
+            the starting node, not including the starting node, in
+            breadth first order.
+
+        '''
+        start = self.node(informer_or_node)
+        visited = set([start])
+        reached = []
+        frontier = [start]
+        depth = 0
+
+        while frontier and (max_depth is None or depth < max_depth):
+            next_frontier = []
+            for node in frontier:
+                for adjacent in sorted(
+                        self._adjacent_nodes(node, None, direction)
+                        ):  # pylint: disable=bad-continuation
+                    if adjacent in visited:
+                        continue
+                    if entity_types and adjacent[0] not in entity_types:
+                        continue
+                    visited.add(adjacent)
+                    next_frontier.append(adjacent)
+                    if adjacent in self._informers:
+                        reached.append(self._informers[adjacent])
+            frontier = next_frontier
+            depth += 1
+
+        return reached
+
+    # - - - - - - - - - - - - - - - - - - - - - - - - - - - -
+    def edges(self, source_type=None, target_type=None):
+        '''Return the graph's edges as sorted (source, target) pairs.
+
+        Arguments:
+
+            source_type (str, optional):
+                If provided, only return edges from this type.
+
+            target_type (str, optional):
+                If provided, only return edges to this type.
+
+        '''
+        return sorted(
+            (source, target)
+            for source, by_type in self._outgoing.iteritems()
+            if source_type is None or source[0] == source_type
+            for etype, targets in by_type.iteritems()
+            if target_type is None or etype == target_type
+            for target in targets
+            )
+
+    # - - - - - - - - - - - - - - - - - - - - - - - - - - - -
+    def __len__(self):
+        return len(self._informers)
+
+    # - - - - - - - - - - - - - - - - - - - - - - - - - - - -
+    def __contains__(self, informer_or_node):
+        return self.node(informer_or_node) in self._informers
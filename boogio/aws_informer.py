@@ -53,13 +53,19 @@ etc.
 
 '''
 
+import calendar
+import collections
 import copy
+import cPickle
+import hashlib
 # import itertools
 import json
-from multiprocessing import Pool
+from multiprocessing.pool import ThreadPool
 import os
 import socket
+import threading
 import time
+import zlib
 
 
 import logging
@@ -75,7 +81,12 @@ except ImportError:
 
 import boto3
 import botocore
+import botocore.loaders
+import botocore.session
 
+from boogio import aws_async
+from boogio import aws_checkpoint
+from boogio import aws_limiter
 from boogio import site_boogio
 from boogio.utensils import flatten
 # from utensils import prune
@@ -119,161 +130,1590 @@ def _load_boogio_config():
 _BOOGIO_CONFIG = _load_boogio_config()
 
 
+# - - - - - - - - - - - - - - - - - - - - - - - - - - - -
+# Entity type regionality. Regional entities are surveyed in each
+# region, regionless entities once per profile from any region, and
+# unitary entities have a single informer per profile.
+REGIONAL = 'regional'
+REGIONLESS = 'regionless'
+UNITARY = 'unitary'
+
+
+# - - - - - - - - - - - - - - - - - - - - - - - - - - - -
+class EntityTypeSpec(collections.namedtuple(
+        'EntityTypeSpec', [
+            'entity_type', 'informer_class', 'identifier_key',
+            'client', 'operation', 'result_key', 'operation_kwargs',
+            'records', 'regionality', 'filters', 'expansion_entity_types',
+            ]
+        )):  # pylint: disable=bad-continuation
+    '''Everything boogio needs to know about an entity type.
+
+    entity_type (str):
+        The entity type name; e.g., ``ec2``.
+
+    informer_class (class or None):
+        The ``AWSInformer`` subclass for the type's entities.
+
+    identifier_key (str or None):
+        The record key whose value identifies an entity.
+
+    client, operation, result_key (str or None):
+        The AWS client type, the client method that lists the
+        type's entities, and the key of the list in each response.
+        Operations with paginators are paginated.
+
+    operation_kwargs (dict):
+        Additional arguments for the operation.
+
+    records (callable or None):
+        A function turning the listed items into entity records,
+        where they differ.
+
+    regionality (str or None):
+        ``REGIONAL``, ``REGIONLESS`` or ``UNITARY``, for informer
+        entity types.
+
+    filters (str or None):
+        How the mediator's filters for the type are passed to the
+        operation: ``Filters`` for a ``Filters`` parameter built by
+        ``AWSMediator._filters_kwarg()``, ``ClusterStates`` for
+        ``AWSMediator._cluster_states_kwarg()``, or ``None`` if
+        filters aren't used.
+
+    expansion_entity_types (tuple of str):
+        The entity types whose records the informers' ``expand()``
+        methods look up. See ``expansion_dependencies()``.
+
+    '''
+
+    __slots__ = ()
+
+
+# - - - - - - - - - - - - - - - - - - - - - - - - - - - -
+def _spec(entity_type, **kwargs):
+    '''Return an EntityTypeSpec, with defaults for unspecified fields.'''
+    fields = dict.fromkeys(EntityTypeSpec._fields)
+    fields.update(operation_kwargs={}, expansion_entity_types=())
+    fields.update(kwargs, entity_type=entity_type)
+    return EntityTypeSpec(**fields)
+
+
+# - - - - - - - - - - - - - - - - - - - - - - - - - - - -
+def _reservation_instances(reservations):
+    '''Return the instances in a list of EC2 reservations.'''
+    # Instances come grouped in reservations, which we don't keep.
+    return [
+        instance
+        for reservation in reservations
+        for instance in reservation['Instances']
+        ]
+
+
+# - - - - - - - - - - - - - - - - - - - - - - - - - - - -
+def _queue_records(queue_urls):
+    '''Return records for a list of SQS queue URLs.'''
+    return [{'QueueURL': url} for url in queue_urls]
+
+
+# - - - - - - - - - - - - - - - - - - - - - - - - - - - -
+def _entity_type_specs():
+    '''Return the EntityTypeSpec for each entity type boogio handles.'''
+    # Update for new AWSInformer subclass.
+    return [
+        _spec(
+            'ec2', informer_class=EC2InstanceInformer,
+            identifier_key='InstanceId',
+            client='ec2', operation='describe_instances',
+            result_key='Reservations', records=_reservation_instances,
+            regionality=REGIONAL,
+            expansion_entity_types=(
+                'security_group', 'network_interface', 'vpc', 'subnet'
+                ),
+            ),
+        _spec(
+            'elb', informer_class=ELBInformer,
+            identifier_key='LoadBalancerName',
+            client='elb', operation='describe_load_balancers',
+            result_key='LoadBalancerDescriptions',
+            regionality=REGIONAL,
+            expansion_entity_types=(
+                'security_group', 'vpc', 'subnet', 'ec2'
+                ),
+            ),
+        _spec(
+            'security_group', informer_class=SecurityGroupInformer,
+            identifier_key='GroupId',
+            client='ec2', operation='describe_security_groups',
+            result_key='SecurityGroups',
+            regionality=REGIONAL,
+            expansion_entity_types=('vpc',),
+            ),
+        _spec(
+            'vpc', informer_class=VPCInformer,
+            identifier_key='VpcId',
+            client='ec2', operation='describe_vpcs', result_key='Vpcs',
+            regionality=REGIONAL,
+            ),
+        _spec(
+            'vpc_peering_connection',
+            informer_class=VpcPeeringConnectionInformer,
+            identifier_key='VpcPeeringConnectionId',
+            client='ec2', operation='describe_vpc_peering_connections',
+            result_key='VpcPeeringConnections',
+            regionality=REGIONAL,
+            ),
+        _spec(
+            'internet_gateway', informer_class=InternetGatewayInformer,
+            identifier_key='InternetGatewayId',
+            client='ec2', operation='describe_internet_gateways',
+            result_key='InternetGateways',
+            regionality=REGIONAL,
+            ),
+        _spec(
+            'nat_gateway', informer_class=NatGatewayInformer,
+            identifier_key='NatGatewayId',
+            client='ec2', operation='describe_nat_gateways',
+            result_key='NatGateways',
+            regionality=REGIONAL,
+            ),
+        _spec(
+            'autoscaling', informer_class=AutoScalingGroupInformer,
+            identifier_key='AutoScalingGroupARN',
+            client='autoscaling', operation='describe_auto_scaling_groups',
+            result_key='AutoScalingGroups',
+            regionality=REGIONAL,
+            ),
+        _spec(
+            'subnet', informer_class=SubnetInformer,
+            identifier_key='SubnetId',
+            client='ec2', operation='describe_subnets', result_key='Subnets',
+            regionality=REGIONAL,
+            expansion_entity_types=('vpc',),
+            ),
+        _spec(
+            'network_interface', informer_class=NetworkInterfaceInformer,
+            identifier_key='NetworkInterfaceId',
+            client='ec2', operation='describe_network_interfaces',
+            result_key='NetworkInterfaces',
+            regionality=REGIONAL,
+            expansion_entity_types=('security_group',),
+            ),
+        _spec(
+            'network_acl', informer_class=NetworkAclInformer,
+            identifier_key='NetworkAclId',
+            client='ec2', operation='describe_network_acls',
+            result_key='NetworkAcls',
+            regionality=REGIONAL,
+            expansion_entity_types=('subnet',),
+            ),
+        _spec(
+            'route_table', informer_class=RouteTableInformer,
+            identifier_key='RouteTableId',
+            client='ec2', operation='describe_route_tables',
+            result_key='RouteTables',
+            regionality=REGIONAL,
+            ),
+        _spec(
+            'eip', informer_class=EIPInformer,
+            identifier_key='PublicIp',
+            client='ec2', operation='describe_addresses',
+            result_key='Addresses',
+            regionality=REGIONAL, filters='Filters',
+            expansion_entity_types=('ec2', 'network_interface'),
+            ),
+        _spec(
+            'emr', informer_class=EMRInformer,
+            identifier_key='Id',
+            client='emr', operation='list_clusters', result_key='Clusters',
+            regionality=REGIONAL, filters='ClusterStates',
+            ),
+        _spec(
+            'sqs', informer_class=SQSInformer,
+            identifier_key='QueueURL',
+            client='sqs', operation='list_queues', result_key='QueueUrls',
+            # Without MaxResults, only the first 1000 queues are listed.
+            operation_kwargs={'MaxResults': 1000},
+            records=_queue_records,
+            regionality=REGIONLESS,
+            ),
+        _spec(
+            'iam', informer_class=IAMInformer,
+            regionality=UNITARY,
+            ),
+        _spec(
+            's3',
+            client='s3', operation='list_buckets', result_key='Buckets',
+            ),
+        # _spec('ip_permissions', informer_class=IpPermissionsInformer),
+        ]
+
+
+# Built from _entity_type_specs() on first use by _informer_registry().
+_REGISTRY_LOCK = threading.Lock()
+_ENTITY_TYPE_SPECS = {}
+_INFORMER_METADATA_BY_CLASS = {}
+_INFORMER_CLASS_BY_ENTITY_TYPE = {}
+_ENTITY_TYPES_BY_REGIONALITY = {}
+
+
+# - - - - - - - - - - - - - - - - - - - - - - - - - - - -
+def _informer_registry():
+    '''Return the EntityTypeSpec for each AWSInformer class.
+
+    Returns:
+
+        dict: A mapping of ``AWSInformer`` subclasses to their
+        ``EntityTypeSpec``. The informer classes aren't defined
+        when this module starts loading, so the registry is built
+        from ``_entity_type_specs()`` the first time it's needed,
+        along with lookups of the specs by entity type, and reused
+        after that.
+
+    '''
+    if not _ENTITY_TYPE_SPECS:
+        with _REGISTRY_LOCK:
+            if not _ENTITY_TYPE_SPECS:
+                _build_informer_registry()
+
+    return _INFORMER_METADATA_BY_CLASS
+
+
+# - - - - - - - - - - - - - - - - - - - - - - - - - - - -
+def _build_informer_registry():
+    '''Fill in the registry lookups from _entity_type_specs().'''
+    for regionality in (REGIONAL, REGIONLESS, UNITARY):
+        _ENTITY_TYPES_BY_REGIONALITY[regionality] = []
+
+    specs = _entity_type_specs()
+
+    for spec in specs:
+        if spec.informer_class is None:
+            continue
+        _INFORMER_CLASS_BY_ENTITY_TYPE[spec.entity_type] = spec.informer_class
+        _INFORMER_METADATA_BY_CLASS[spec.informer_class] = spec
+        _ENTITY_TYPES_BY_REGIONALITY[spec.regionality].append(
+            spec.entity_type
+            )
+
+    # Set last; its being filled in marks the registry as built.
+    _ENTITY_TYPE_SPECS.update((spec.entity_type, spec) for spec in specs)
+
+
+# - - - - - - - - - - - - - - - - - - - - - - - - - - - -
+def entity_type_spec(etype):
+    '''Return the EntityTypeSpec for an entity type, or None.'''
+    _informer_registry()
+    return _ENTITY_TYPE_SPECS.get(etype)
+
+
 # - - - - - - - - - - - - - - - - - - - - - - - - - - - -
 def _entity_type_informer_class_map():
     '''Return a mapping of entity types to AWSInformer classes.'''
-    # Update for new AWSInformer subclass.
-    return {
-        'ec2': EC2InstanceInformer,
-        'elb': ELBInformer,
-        'security_group': SecurityGroupInformer,
-        'vpc': VPCInformer,
-        'vpc_peering_connection': VpcPeeringConnectionInformer,
-        'internet_gateway': InternetGatewayInformer,
-        'nat_gateway': NatGatewayInformer,
-        'autoscaling': AutoScalingGroupInformer,
-        'subnet': SubnetInformer,
-        'network_interface': NetworkInterfaceInformer,
-        'network_acl': NetworkAclInformer,
-        'route_table': RouteTableInformer,
-        'eip': EIPInformer,
-        'emr': EMRInformer,
-        'sqs': SQSInformer,
-        'iam': IAMInformer,
-        # 'ip_permissions': IpPermissionsInformer,
-        }
+    _informer_registry()
+    return dict(_INFORMER_CLASS_BY_ENTITY_TYPE)
+
+
+# - - - - - - - - - - - - - - - - - - - - - - - - - - - -
+def _informer_identifier_key(iclass):
+    '''Return the identifier key for an AWSInformer class, or None.'''
+    metadata = _informer_registry().get(iclass)
+    return None if metadata is None else metadata.identifier_key
+
+
+# - - - - - - - - - - - - - - - - - - - - - - - - - - - -
+def _prevent_duplicate_informer_init_if_cached(original_init):
+    '''Only proceed with __init__() if an informer isn't already cached.
+
+    AWSInformer subclass __init__ methods can be called multiple
+    times on a single instance, due to the redefinition of
+    __new__() to check for an existing informer in the mediator's
+    informer_cache. If we find the resource's identifier in the
+    mediator's informer_cache, we don't do any initialization
+    here. If we don't find it, we both initialize and update the
+    mediator's cache.
+
+    '''
+    def decorated(self, resource, *args, **kwargs):
+        # pylint: disable=missing-docstring
+
+        mediator = kwargs['mediator'] if 'mediator' in kwargs else None
+
+        # We have to figure out if we're already in the mediator's
+        # informer cache. Our key would be our resource identifier.
+        # pylint: disable=protected-access
+        entity_identifier = self._get_init_entity_identifier(resource)
+
+        # If our attempt to look it up failed, entity_identifier could
+        # be None, which shouldn't be a key in the mediator's
+        # informer_cache anyway.
+        if mediator is not None:
+            assert None not in mediator.informer_cache
+
+        # If we found ourself in the cache, we're already initialized.
+        # Another informer found there was cached by another thread
+        # after __new__() checked, and we still need initializing.
+        if mediator.informer_cache.get(entity_identifier) is self:
+            return
+
+        # We didn't find ourself in the cache, so we'll initialize
+        # ourself anew. This is done without holding the cache lock,
+        # so informers can be constructed in several threads at once.
+        original_init(self, resource, *args, **kwargs)
+
+        # Put ourself in the cache for next time, unless another
+        # thread has cached an informer for the same entity in the
+        # meantime; then we're left out of the cache, and it's used
+        # from now on.
+        with mediator._informer_cache_lock:
+            cached = mediator.informer_cache.setdefault(
+                entity_identifier, self
+                )
+
+        if cached is self and mediator.compress_resources:
+            self._compress_resource(resource)
+
+    # Bulk construction in AWSInformer.from_records() does its own
+    # cache handling and calls the original directly.
+    decorated.undecorated_init = original_init
+
+    return decorated
+
+
+# - - - - - - - - - - - - - - - - - - - - - - - - - - - -
+# The ids of informers whose expansions are being populated by some
+# thread, and the condition other threads wait on for them.
+_EXPANSION_CONDITION = threading.Condition()
+_EXPANDING = set()
+
+
+# - - - - - - - - - - - - - - - - - - - - - - - - - - - -
+def _expand_once(original_expand):
+    '''Only proceed with expand() if an informer isn't already expanded.
+
+    AWSInformer subclass expand methods fetch the records their
+    expansions refer to, which can be expensive, and the same
+    informer is often reached through many others; e.g. a security
+    group shared by thousands of instances. The fetching is done only
+    the first time an informer is expanded. Later calls only expand
+    its expansions further, if a greater ``max_depth`` is asked for.
+
+    Informers can be expanded from several threads at once. The
+    first thread to reach an informer claims it, and others wait
+    until its expansions are populated, but not for them to be
+    expanded in turn, so reference cycles can't deadlock.
+
+    '''
+    def decorated(self, max_depth=None, **kwargs):
+        # pylint: disable=missing-docstring,protected-access
+
+        if max_depth is not None and max_depth < 1:
+            return
+
+        with _EXPANSION_CONDITION:
+            while id(self) in _EXPANDING:
+                _EXPANSION_CONDITION.wait()
+
+            claimed = not self.is_expanded
+            if claimed:
+                _EXPANDING.add(id(self))
+            elif (
+                    self._expanded_depth is None or (
+                        max_depth is not None and
+                        self._expanded_depth >= max_depth
+                        )
+                    ):  # pylint: disable=bad-continuation
+                return
+
+        if not claimed:
+            AWSInformer.expand(self, max_depth)
+            return
+
+        try:
+            original_expand(self, max_depth, **kwargs)
+        finally:
+            _expansion_populated(self)
+
+    decorated.__doc__ = original_expand.__doc__
+
+    return decorated
+
+
+# - - - - - - - - - - - - - - - - - - - - - - - - - - - -
+def _expansion_populated(informer):
+    '''Release threads waiting for an informer's expansions.'''
+    with _EXPANSION_CONDITION:
+        if id(informer) in _EXPANDING:
+            _EXPANDING.discard(id(informer))
+            _EXPANSION_CONDITION.notify_all()
+
+
+# - - - - - - - - - - - - - - - - - - - - - - - - - - - -
+def entity_types():
+    '''Return a list of entity types that have AWSInformer classes.'''
+    _informer_registry()
+    return _INFORMER_CLASS_BY_ENTITY_TYPE.keys()
+
+
+# - - - - - - - - - - - - - - - - - - - - - - - - - - - -
+def informer_class(etype):
+    '''Map entity type to the AWSInformer class name.'''
+
+    # All entity_types() values must be supported here.
+    _informer_registry()
+    return _INFORMER_CLASS_BY_ENTITY_TYPE[etype]
+
+
+# - - - - - - - - - - - - - - - - - - - - - - - - - - - -
+def informer_entity_type(iclass):
+    '''Map AWSInformer class to entity type.'''
+
+    metadata = _informer_registry().get(iclass)
+    return None if metadata is None else metadata.entity_type
+
+
+# - - - - - - - - - - - - - - - - - - - - - - - - - - - -
+def expansion_dependencies(etype, max_depth=None):
+    '''Return the entity types an entity type's expansions depend on.
+
+    Arguments:
+
+        etype (str):
+            An informer entity type.
+
+        max_depth (int, optional):
+            The depth informers will be expanded to, as for
+            ``AWSInformer.expand()``. By default, expansions are
+            expanded all the way down.
+
+    Returns:
+
+        (set) The entity types whose records are looked up in
+        expanding informers of type ``etype``, the types their
+        expansions look up in turn, and so on down to ``max_depth``.
+        These are declared in the ``expansion_entity_types`` of each
+        type's ``EntityTypeSpec``.
+
+    '''
+    _informer_registry()
+
+    dependencies = set()
+    level = set([etype])
+
+    while level and (max_depth is None or max_depth > 0):
+        level = set(
+            dependency
+            for level_type in level
+            for dependency in (
+                _ENTITY_TYPE_SPECS[level_type].expansion_entity_types
+                )
+            ) - dependencies
+        dependencies.update(level)
+        if max_depth is not None:
+            max_depth -= 1
+
+    return dependencies
+
+
+# - - - - - - - - - - - - - - - - - - - - - - - - - - - -
+def regional_types():
+    '''Return the Informer entity types with instances in each region.'''
+    _informer_registry()
+    return list(_ENTITY_TYPES_BY_REGIONALITY[REGIONAL])
+
+
+# - - - - - - - - - - - - - - - - - - - - - - - - - - - -
+def regionless_types():
+    '''Return the Informer entity types with instances not tied to a region.'''
+    _informer_registry()
+    return list(_ENTITY_TYPES_BY_REGIONALITY[REGIONLESS])
+
+
+# - - - - - - - - - - - - - - - - - - - - - - - - - - - -
+def unitary_types():
+    '''Return the Informer entity types with a unique instance.'''
+    _informer_registry()
+    return list(_ENTITY_TYPES_BY_REGIONALITY[UNITARY])
+
+
+# - - - - - - - - - - - - - - - - - - - - - - - - - - - -
+def informer_volatile_fields(etype):
+    '''Return the fields excluded from an entity type's fingerprint.
+
+    The default for each type is its informer class's
+    ``volatile_fields`` attribute. This can be overridden per type in
+    the boogio config file::
+
+        {
+            "aws_informer": {
+                "volatile_fields": {
+                    "subnet": ["AvailableIpAddressCount"],
+                    "ec2": ["LaunchTime", "State.Code"]
+                    }
+                }
+            }
+
+    '''
+    configured = _BOOGIO_CONFIG.get('aws_informer', {}).get(
+        'volatile_fields', {}
+        )
+
+    if etype in configured:
+        return list(configured[etype])
+
+    return list(informer_class(etype).volatile_fields)
+
+
+# - - - - - - - - - - - - - - - - - - - - - - - - - - - -
+def informer_elisions(etype):
+    '''Return the top level resource keys elided for an entity type.
+
+    The default for each type is its informer class's ``elisions``
+    attribute. This can be overridden per type in the boogio config
+    file::
+
+        {
+            "aws_informer": {
+                "elisions": {
+                    "ec2": ["BlockDeviceMappings", "ProductCodes"],
+                    "security_group": ["IpPermissionsEgress"]
+                    }
+                }
+            }
+
+    '''
+    configured = _BOOGIO_CONFIG.get('aws_informer', {}).get(
+        'elisions', {}
+        )
+
+    if etype in configured:
+        return list(configured[etype])
+
+    return list(informer_class(etype).elisions)
+
+
+# - - - - - - - - - - - - - - - - - - - - - - - - - - - -
+def informer_expansion_types(etype):
+    '''Return the entity types an entity type's expansions hold.
+
+    Returns:
+
+        (dict) The entity type of the informers in each of the
+        entity type's expansions, keyed by expansion key; i.e., by
+        the top level resource key the expansion replaces in
+        ``AWSInformer.to_dict()``.
+
+    '''
+    return dict(informer_class(etype).expansion_types)
+
+
+# - - - - - - - - - - - - - - - - - - - - - - - - - - - -
+def emr_cluster_states():
+    '''Return the EMR cluster states surveyed by default.
+
+    The default is ``EMRInformer.default_cluster_states``, the states
+    of clusters that haven't terminated. This can be overridden in the
+    boogio config file, with an empty list meaning all states::
+
+        {
+            "aws_informer": {
+                "emr_cluster_states": ["RUNNING", "WAITING"]
+                }
+            }
+
+    '''
+    configured = _BOOGIO_CONFIG.get('aws_informer', {}).get(
+        'emr_cluster_states'
+        )
+
+    if configured is not None:
+        return list(configured)
+
+    return list(EMRInformer.default_cluster_states)
+
+
+# - - - - - - - - - - - - - - - - - - - - - - - - - - - -
+def sqs_attribute_names():
+    '''Return the SQS queue attribute names requested for informers.
+
+    The default is ``SQSInformer.attribute_names``, which asks for all
+    attributes. Reports that only use some attributes can ask for
+    those alone in the boogio config file::
+
+        {
+            "aws_informer": {
+                "sqs_attribute_names": ["QueueArn", "Policy"]
+                }
+            }
+
+    '''
+    configured = _BOOGIO_CONFIG.get('aws_informer', {}).get(
+        'sqs_attribute_names'
+        )
+
+    if configured:
+        return list(configured)
+
+    return list(SQSInformer.attribute_names)
+
+
+# - - - - - - - - - - - - - - - - - - - - - - - - - - - -
+def _without_paths(tree, paths):
+    '''Return a copy of tree with the values at the given paths removed.
+
+    Paths are lists of dict keys, with ``[]`` standing for every
+    element of a list. Only the containers along the removed paths
+    are copied; the rest of the tree is shared with the original.
+
+    '''
+    if not paths:
+        return tree
+
+    if isinstance(tree, list):
+        child_paths = [p[1:] for p in paths if p[0] == '[]']
+        if not child_paths:
+            return tree
+        return [_without_paths(x, child_paths) for x in tree]
+
+    if not isinstance(tree, dict):
+        return tree
+
+    result = dict(tree)
+    for path in paths:
+        if len(path) == 1:
+            result.pop(path[0], None)
+
+    for key in set(p[0] for p in paths if len(p) > 1):
+        if key in result:
+            result[key] = _without_paths(
+                result[key], [p[1:] for p in paths if p[0] == key]
+                )
+
+    return result
+
+
+# - - - - - - - - - - - - - - - - - - - - - - - - - - - -
+def _canonical_digest(data):
+    '''Return a hex digest of the canonical JSON serialization of data.'''
+    return hashlib.sha1(json.dumps(
+        data, sort_keys=True, separators=(',', ':'), default=str
+        )).hexdigest()
+
+
+# - - - - - - - - - - - - - - - - - - - - - - - - - - - -
+# Strings that recur across many informers, shared via _intern().
+_INTERNED_STRINGS = {}
+
+
+# - - - - - - - - - - - - - - - - - - - - - - - - - - - -
+def _intern(value):
+    '''Return a shared copy of a string value.
+
+    Builtin ``intern()`` only accepts ``str``, and boto returns many
+    values as ``unicode``, so we keep our own table. Entries are
+    keyed by type as well as value so a ``unicode`` value is never
+    replaced by an equal ``str``. Other values are returned as is.
+
+    '''
+    if isinstance(value, basestring):
+        return _INTERNED_STRINGS.setdefault((type(value), value), value)
+    return value
+
+
+# - - - - - - - - - - - - - - - - - - - - - - - - - - - -
+def _intern_paths(tree, paths):
+    '''Intern the string values at the given paths in tree, in place.
+
+    Paths are lists of dict keys, with ``[]`` standing for every
+    element of a list, as for ``_without_paths()``.
+
+    '''
+    # This runs for every informer created, so _intern() is inlined.
+    table = _INTERNED_STRINGS
+
+    for path in paths:
+        containers = [tree]
+        for key in path[:-1]:
+            found = []
+            for container in containers:
+                if key == '[]':
+                    if isinstance(container, list):
+                        found.extend(container)
+                elif isinstance(container, dict) and key in container:
+                    found.append(container[key])
+            containers = found
+
+        leaf_key = path[-1]
+        for container in containers:
+            if leaf_key == '[]' and isinstance(container, list):
+                container[:] = [_intern(x) for x in container]
+            elif isinstance(container, dict):
+                value = container.get(leaf_key)
+                if isinstance(value, basestring):
+                    container[leaf_key] = table.setdefault(
+                        (type(value), value), value
+                        )
+
+
+# - - - - - - - - - - - - - - - - - - - - - - - - - - - -
+# The split interned_fields paths of each informer class.
+_INTERNED_PATHS_BY_CLASS = {}
+
+
+# - - - - - - - - - - - - - - - - - - - - - - - - - - - -
+def _interned_paths(iclass):
+    '''Return the interned_fields of iclass as lists of keys.'''
+    paths = _INTERNED_PATHS_BY_CLASS.get(iclass)
+    if paths is None:
+        paths = _INTERNED_PATHS_BY_CLASS.setdefault(
+            iclass, [x.split('.') for x in iclass.interned_fields]
+            )
+    return paths
+
+
+# - - - - - - - - - - - - - - - - - - - - - - - - - - - -
+class _FrozenDict(dict):
+    '''A dict that can't be modified after creation.
+
+    Used for the ``meta`` supplementals shared by all the informers of
+    a mediator. Copies are ordinary, modifiable dicts.
+
+    '''
+
+    # pylint: disable=unused-argument
+
+    def _immutable(self, *args, **kwargs):
+        '''Refuse modification.'''
+        raise TypeError('%s is immutable' % type(self).__name__)
+
+    __setitem__ = __delitem__ = _immutable
+    clear = pop = popitem = setdefault = update = _immutable
+
+    def __copy__(self):
+        return dict(self)
+
+    def __deepcopy__(self, memo):
+        return copy.deepcopy(dict(self), memo)
+
+    def __reduce__(self):
+        return (_FrozenDict, (dict(self),))
+
+
+# - - - - - - - - - - - - - - - - - - - - - - - - - - - -
+class _ResourceStub(dict):
+    '''A compressed resource record.
+
+    The full record is held as a zlib compressed pickle in ``blob``.
+    As a dict the stub holds only the record's identifier key and
+    value, which is all that's needed to find the record in a list of
+    records. Use ``_decoded_resource()`` to get the full record.
+
+    '''
+
+    __slots__ = ('blob',)
+
+    def __init__(self, record, identifier_key):
+        super(_ResourceStub, self).__init__()
+        self.encode(record, identifier_key)
+
+    def encode(self, record, identifier_key):
+        '''Replace the stub's content with a compressed record.'''
+        self.blob = zlib.compress(
+            cPickle.dumps(record, cPickle.HIGHEST_PROTOCOL), 1
+            )
+        dict.clear(self)
+        if identifier_key is not None and identifier_key in record:
+            dict.__setitem__(self, identifier_key, record[identifier_key])
+
+    def decode(self):
+        '''Return a new copy of the full record.'''
+        return cPickle.loads(zlib.decompress(self.blob))
+
+    def __reduce__(self):
+        return (dict, (self.decode(),))
+
+
+# - - - - - - - - - - - - - - - - - - - - - - - - - - - -
+class _DecodedResourceCache(object):
+    '''A small least recently used cache of decoded resource records.
+
+    Keys are ``_ResourceStub`` blobs, so a decoded record is shared by
+    every holder of the stub until it's evicted. Changes made to a
+    decoded record are lost when it's evicted, unless it's assigned
+    back to an informer's ``resource``.
+
+    '''
+
+    # - - - - - - - - - - - - - - - - - - - - - - - - - - - - - -
+    def __init__(self, size):
+        self.size = size
+        self._decoded = collections.OrderedDict()
+        self._lock = threading.Lock()
+
+    # - - - - - - - - - - - - - - - - - - - - - - - - - - - - - -
+    def get(self, stub):
+        '''Return the decoded record for stub.'''
+        blob = stub.blob
+        with self._lock:
+            record = self._decoded.pop(blob, None)
+            if record is None:
+                record = stub.decode()
+            self._decoded[blob] = record
+            while len(self._decoded) > self.size:
+                self._decoded.popitem(last=False)
+        return record
+
+    # - - - - - - - - - - - - - - - - - - - - - - - - - - - - - -
+    def put(self, stub, record):
+        '''Cache record as the decoded record for stub.'''
+        with self._lock:
+            self._decoded[stub.blob] = record
+            while len(self._decoded) > self.size:
+                self._decoded.popitem(last=False)
+
+    # - - - - - - - - - - - - - - - - - - - - - - - - - - - - - -
+    def discard(self, stub):
+        '''Remove any decoded record for stub.'''
+        with self._lock:
+            self._decoded.pop(stub.blob, None)
+
+    # - - - - - - - - - - - - - - - - - - - - - - - - - - - - - -
+    def clear(self):
+        '''Remove all decoded records.'''
+        with self._lock:
+            self._decoded.clear()
+
+
+# The default can be changed with the boogio config file setting
+# aws_informer.decoded_resource_cache_size.
+_DECODED_RESOURCES = _DecodedResourceCache(
+    _BOOGIO_CONFIG.get('aws_informer', {}).get(
+        'decoded_resource_cache_size', 256
+        )
+    )
+
+
+# - - - - - - - - - - - - - - - - - - - - - - - - - - - -
+def _decoded_resource(resource):
+    '''Return resource, decoded if it's a compressed record.'''
+    if resource.__class__ is _ResourceStub:
+        return _DECODED_RESOURCES.get(resource)
+    return resource
+
+
+# - - - - - - - - - - - - - - - - - - - - - - - - - - - -
+def _compressed_records(entity_type, records):
+    '''Return a list of compressed copies of an entity type's records.'''
+
+    if entity_type not in entity_types():
+        return records
+
+    identifier_key = _informer_identifier_key(informer_class(entity_type))
+    return [
+        _ResourceStub(record, identifier_key)
+        if isinstance(record, dict) and not isinstance(record, _ResourceStub)
+        else record
+        for record in records
+        ]
+
+
+# - - - - - - - - - - - - - - - - - - - - - - - - - - - -
+class _DNSAddressResolver(object):
+    '''Resolve DNS names concurrently, caching the results.
+
+    Arguments:
+
+        ttl (number):
+            How long, in seconds, resolved addresses are reused.
+
+        timeout (number):
+            How long, in seconds, to wait for each lookup attempt.
+
+        attempts (int):
+            How many times to try a lookup that times out or fails
+            temporarily before giving up.
+
+        thread_count (int):
+            The number of lookups run at once.
+
+        cache_path (string, optional):
+            A file to keep resolved addresses in between runs.
+
+    Names passed to ``prefetch()`` are resolved in the background,
+    and ``resolve()`` waits only for the name it's asked for. Names
+    that don't exist are cached as having no addresses; names that
+    can't be resolved within the allowed attempts resolve to no
+    addresses, but aren't cached.
+
+    '''
+
+    # pylint: disable=too-many-arguments,too-many-instance-attributes
+
+    def __init__(self, ttl, timeout, attempts, thread_count, cache_path=None):
+        '''Initialize a _DNSAddressResolver instance.'''
+
+        self.ttl = ttl
+        self.timeout = timeout
+        self.attempts = attempts
+        self.thread_count = thread_count
+        self.cache_path = cache_path
+
+        # DNS names mapped to (addresses, expiration time) pairs.
+        self._cache = None
+        # DNS names being resolved, mapped to threading.Events set
+        # when they're done.
+        self._pending = {}
+        self._dirty = False
+        self._pool = None
+        self._lock = threading.Lock()
+
+    # - - - - - - - - - - - - - - - - - - - - - - - - - - - - - -
+    def _load(self):
+        '''Load cached addresses, once. Call with the lock held.'''
+        logger = logging.getLogger(__name__)
+
+        if self._cache is not None:
+            return
+
+        self._cache = {}
+        if self.cache_path and os.path.exists(self.cache_path):
+            try:
+                with open(self.cache_path, 'r') as fptr:
+                    self._cache = {
+                        name: tuple(entry)
+                        for (name, entry) in json.load(fptr).iteritems()
+                        }
+            except (IOError, ValueError) as err:
+                logger.warning(
+                    'ignoring unreadable DNS cache %s: %s',
+                    self.cache_path, err
+                    )
+
+    # - - - - - - - - - - - - - - - - - - - - - - - - - - - - - -
+    def _save(self):
+        '''Write unexpired cached addresses. Call with the lock held.'''
+        logger = logging.getLogger(__name__)
+
+        self._dirty = False
+        if not self.cache_path:
+            return
+
+        now = time.time()
+        try:
+            with open(self.cache_path, 'w') as fptr:
+                json.dump(
+                    {
+                        name: entry
+                        for (name, entry) in self._cache.iteritems()
+                        if entry[1] > now
+                        },
+                    fptr
+                    )
+        except IOError as err:
+            logger.warning(
+                'not updating DNS cache %s: %s', self.cache_path, err
+                )
+
+    # - - - - - - - - - - - - - - - - - - - - - - - - - - - - - -
+    def _cached(self, dns_name):
+        '''Return unexpired cached addresses, or None.'''
+        entry = self._cache.get(dns_name)
+        if entry is None or entry[1] <= time.time():
+            return None
+        return list(entry[0])
+
+    # - - - - - - - - - - - - - - - - - - - - - - - - - - - - - -
+    def _getaddrinfo(self, dns_name):
+        '''Make one lookup attempt, limited to self.timeout seconds.
+
+        Returns:
+
+            The list of addresses, or None if the name doesn't exist.
+
+        Raises:
+
+            socket.timeout: If the lookup doesn't finish in time.
+
+            socket.gaierror: If the lookup fails.
+
+            Any other exception raised by ``socket.getaddrinfo()``.
+
+        '''
+        outcome = {}
+
+        def lookup():
+            '''Run the blocking lookup.'''
+            # Errors are recorded for the waiting thread to raise.
+            try:
+                outcome['addr_info'] = socket.getaddrinfo(
+                    dns_name, 0, socket.AF_INET
+                    )
+            except Exception as err:  # pylint: disable=broad-except
+                outcome['error'] = err
+
+        # getaddrinfo() can't be interrupted, so a lookup that times
+        # out is abandoned to finish on its own.
+        thread = threading.Thread(target=lookup)
+        thread.daemon = True
+        thread.start()
+        thread.join(self.timeout)
+
+        if thread.is_alive():
+            raise socket.timeout('lookup of %s timed out' % dns_name)
+
+        if 'error' in outcome:
+            err = outcome['error']
+            if isinstance(err, socket.gaierror) and err.args[0] in (
+                    socket.EAI_NONAME, getattr(socket, 'EAI_NODATA', None)
+                    ):  # pylint: disable=bad-continuation
+                return None
+            raise err
+
+        # Different parameters to getaddrinfo may return the same
+        # IP Address, so we remove duplicates here.
+        return sorted(set(
+            saddr[0] for (_, _, _, _, saddr) in outcome['addr_info']
+            ))
+
+    # - - - - - - - - - - - - - - - - - - - - - - - - - - - - - -
+    def _lookup(self, dns_name):
+        '''Resolve dns_name and record the result.'''
+        logger = logging.getLogger(__name__)
+
+        addresses = None
+        resolved = False
+
+        # Threads waiting in resolve() are released however the lookup
+        # ends.
+        try:
+            for attempt in range(self.attempts):
+                try:
+                    addresses = self._getaddrinfo(dns_name) or []
+                    resolved = True
+                    break
+                except (socket.timeout, socket.gaierror) as err:
+                    logger.debug(
+                        'lookup %s of %s failed: %s',
+                        attempt + 1, dns_name, err
+                        )
+                    if attempt + 1 < self.attempts:
+                        time.sleep(aws_limiter.retry_delay(attempt + 1))
+
+            if not resolved:
+                logger.warning(
+                    'giving up on lookup of %s after %s attempts',
+                    dns_name, self.attempts
+                    )
+
+        except Exception as err:  # pylint: disable=broad-except
+            logger.warning('lookup of %s failed: %s', dns_name, err)
+
+        finally:
+            with self._lock:
+                if resolved:
+                    self._cache[dns_name] = (
+                        addresses, time.time() + self.ttl
+                        )
+                    self._dirty = True
+                self._pending.pop(dns_name).set()
+                if not self._pending and self._dirty:
+                    self._save()
+
+    # - - - - - - - - - - - - - - - - - - - - - - - - - - - - - -
+    def prefetch(self, dns_names):
+        '''Start resolving any of dns_names not already cached.'''
+
+        with self._lock:
+            self._load()
+
+            for dns_name in dns_names:
+                if (
+                        not dns_name or dns_name in self._pending or
+                        self._cached(dns_name) is not None
+                        ):  # pylint: disable=bad-continuation
+                    continue
+
+                if self._pool is None:
+                    self._pool = ThreadPool(self.thread_count)
+
+                self._pending[dns_name] = threading.Event()
+                self._pool.apply_async(self._lookup, (dns_name,))
+
+    # - - - - - - - - - - - - - - - - - - - - - - - - - - - - - -
+    def resolve(self, dns_name):
+        '''Return the list of IPv4 addresses for dns_name.'''
+
+        self.prefetch([dns_name])
+
+        with self._lock:
+            done = self._pending.get(dns_name)
+
+        if done is not None:
+            # Allow for each attempt and the pauses between them.
+            done.wait(
+                self.attempts * self.timeout +
+                (self.attempts - 1) * aws_limiter.RETRY_MAX_DELAY
+                )
+
+        with self._lock:
+            return self._cached(dns_name) or []
+
+    # - - - - - - - - - - - - - - - - - - - - - - - - - - - - - -
+    def clear(self):
+        '''Discard all cached addresses.'''
+        with self._lock:
+            self._cache = {}
+            self._save()
+
+
+# Load balancer DNS names are resolved through this. Its settings can
+# be changed with the boogio config file settings aws_informer.dns_ttl,
+# aws_informer.dns_timeout, aws_informer.dns_attempts,
+# aws_informer.dns_thread_count and aws_informer.dns_cache_file (which
+# is unset, and addresses aren't kept between runs, by default).
+DNS_RESOLVER = _DNSAddressResolver(
+    ttl=_BOOGIO_CONFIG.get('aws_informer', {}).get('dns_ttl', 300),
+    timeout=_BOOGIO_CONFIG.get('aws_informer', {}).get('dns_timeout', 5),
+    attempts=_BOOGIO_CONFIG.get('aws_informer', {}).get('dns_attempts', 3),
+    thread_count=_BOOGIO_CONFIG.get('aws_informer', {}).get(
+        'dns_thread_count', 32
+        ),
+    cache_path=(
+        os.path.expanduser(
+            _BOOGIO_CONFIG['aws_informer']['dns_cache_file']
+            )
+        if _BOOGIO_CONFIG.get('aws_informer', {}).get('dns_cache_file')
+        else None
+        )
+    )
+
+
+# - - - - - - - - - - - - - - - - - - - - - - - - - - - -
+# All AWS calls made through boogio sessions share this limiter; see
+# aws_limiter. Its limits can be set with the boogio config file
+# setting aws_informer.rate_limits.
+RATE_LIMITER = aws_limiter.AWSRateLimiter(
+    limits=_BOOGIO_CONFIG.get('aws_informer', {}).get('rate_limits')
+    )
+
+
+# - - - - - - - - - - - - - - - - - - - - - - - - - - - -
+# Sessions are shared between AWSSession instances, and between the
+# requests handled by each parallel fetch worker. A single botocore
+# data loader caches the parsed service models for all of them, and
+# credentials are resolved once per profile, so an AssumeRole profile
+# assumes its role once and reuses the temporary (self-refreshing)
+# credentials in every region.
+#
+# _SHARED_SESSION_LOCK guards these module dicts and the shared
+# loader, and is only held briefly. Work that can be slow, such as
+# resolving a profile's credentials (an STS AssumeRole call) or
+# creating a client, is done under the profile's own lock; see
+# _profile_lock().
+_SHARED_SESSION_LOCK = threading.RLock()
+_SHARED_SESSIONS = {}
+_SHARED_CREDENTIALS = {}
+_SHARED_LOADER = []
+_PROFILE_LOCKS = {}
+
+# Shared credentials are resolved again when they're within this many
+# seconds of their expiry time.
+CREDENTIAL_EXPIRY_MARGIN = 60
+
+
+# - - - - - - - - - - - - - - - - - - - - - - - - - - - -
+def _profile_lock(profile_name):
+    '''Return the lock for a profile's shared sessions and credentials.'''
+    with _SHARED_SESSION_LOCK:
+        return _PROFILE_LOCKS.setdefault(profile_name, threading.RLock())
+
+
+# - - - - - - - - - - - - - - - - - - - - - - - - - - - -
+class _SharedCredentialResolver(object):
+    '''Resolve a profile's credentials once for all its sessions.'''
+
+    # pylint: disable=too-few-public-methods
+
+    def __init__(self, profile_name, resolver):
+        '''Wrap the default botocore credential resolver for a profile.'''
+        self.profile_name = profile_name
+        self.resolver = resolver
+
+    def load_credentials(self):
+        '''Return the profile's credentials, resolving them if needed.
+
+        Credentials are resolved again if there are none yet, or if
+        they expire within ``CREDENTIAL_EXPIRY_MARGIN`` seconds;
+        e.g., temporary credentials that can't refresh themselves.
+
+        '''
+        with _profile_lock(self.profile_name):
+            credentials = _SHARED_CREDENTIALS.get(self.profile_name)
+            if credentials is None or _credentials_expiring(credentials):
+                # Resolving credentials can mean an STS call, which
+                # is rate limited before the account ID is known.
+                resolving = getattr(_ACCOUNT_ID_STATE, 'resolving', False)
+                _ACCOUNT_ID_STATE.resolving = True
+                try:
+                    credentials = self.resolver.load_credentials()
+                finally:
+                    _ACCOUNT_ID_STATE.resolving = resolving
+                with _SHARED_SESSION_LOCK:
+                    _SHARED_CREDENTIALS[self.profile_name] = credentials
+            return credentials
+
+
+# - - - - - - - - - - - - - - - - - - - - - - - - - - - -
+def _credentials_expiring(credentials):
+    '''Return True if credentials expire within the expiry margin.'''
+    # Only temporary botocore credentials have an expiry time.
+    # pylint: disable=protected-access
+    expiry_time = getattr(credentials, '_expiry_time', None)
+    if expiry_time is None:
+        return False
+    return (
+        calendar.timegm(expiry_time.utctimetuple()) <=
+        time.time() + CREDENTIAL_EXPIRY_MARGIN
+        )
+
+
+# - - - - - - - - - - - - - - - - - - - - - - - - - - - -
+def shared_session(profile_name=None, region_name=None):
+    '''Return the shared boto3 session for a profile and region.
+
+    Arguments:
+
+        profile_name (string, optional):
+            The name of the profile record in
+            :file:`$HOME/.aws/credentials` to use. If omitted, boto's
+            default credential search order is used.
+
+        region_name (string, optional):
+            The name of the AWS region to use. If omitted, boto's
+            default region search order is used.
+
+    Returns:
+
+        A ``boto3.session.Session`` instance. Every call with the same
+        arguments returns the same instance, and all instances share
+        one botocore data loader and one set of credentials per
+        profile.
+
+    '''
+    key = (profile_name, region_name)
+
+    with _SHARED_SESSION_LOCK:
+        if key in _SHARED_SESSIONS:
+            return _SHARED_SESSIONS[key]
+
+    with _profile_lock(profile_name):
+
+        with _SHARED_SESSION_LOCK:
+            if key in _SHARED_SESSIONS:
+                return _SHARED_SESSIONS[key]
+
+        core_session = botocore.session.Session(profile=profile_name)
+
+        with _SHARED_SESSION_LOCK:
+            if not _SHARED_LOADER:
+                _SHARED_LOADER.append(
+                    botocore.loaders.create_loader(
+                        core_session.get_config_variable('data_path')
+                        )
+                    )
+            loader = _SHARED_LOADER[0]
+        core_session.register_component('data_loader', loader)
+
+        RATE_LIMITER.register(
+            core_session, lambda: _rate_limit_account(profile_name)
+            )
+
+        core_session.register_component(
+            'credential_provider',
+            _SharedCredentialResolver(
+                profile_name,
+                core_session.get_component('credential_provider')
+                )
+            )
+
+        with _SHARED_SESSION_LOCK:
+
+            session = boto3.session.Session(
+                botocore_session=core_session, region_name=region_name
+                )
+
+            # Each boto3 session appends its resource model path to
+            # the loader's search paths.
+            search_paths = []
+            for path in loader.search_paths:
+                if path not in search_paths:
+                    search_paths.append(path)
+            loader.search_paths[:] = search_paths
+
+            _SHARED_SESSIONS[key] = session
+
+        return session
+
+
+# - - - - - - - - - - - - - - - - - - - - - - - - - - - -
+def clear_shared_sessions(profile_name=None):
+    '''Discard shared sessions and credentials.
+
+    Arguments:
+
+        profile_name (string, optional):
+            If provided, only this profile's sessions and credentials
+            are discarded; otherwise all of them are, along with the
+            shared service model cache.
+
+    '''
+    with _SHARED_SESSION_LOCK:
+
+        if profile_name is None:
+            _SHARED_SESSIONS.clear()
+            _SHARED_CREDENTIALS.clear()
+            del _SHARED_LOADER[:]
+            del _AVAILABLE_SERVICES[:]
+            return
+
+        for key in list(_SHARED_SESSIONS):
+            if key[0] == profile_name:
+                del _SHARED_SESSIONS[key]
+        _SHARED_CREDENTIALS.pop(profile_name, None)
+
+
+# - - - - - - - - - - - - - - - - - - - - - - - - - - - -
+# AWS account IDs are resolved once per profile and shared between
+# mediators. Named profiles' account IDs are also kept in the file
+# given by the boogio config file setting
+# aws_informer.account_id_cache_file, if present.
+#
+# _ACCOUNT_ID_LOCK guards _ACCOUNT_IDS and is only held briefly. Each
+# profile's account ID is resolved under that profile's lock in
+# _ACCOUNT_ID_PROFILE_LOCKS, so profiles are resolved concurrently,
+# and the cache file is read and rewritten under _ACCOUNT_ID_FILE_LOCK.
+_ACCOUNT_ID_LOCK = threading.RLock()
+_ACCOUNT_ID_PROFILE_LOCKS = {}
+_ACCOUNT_ID_FILE_LOCK = threading.RLock()
+_ACCOUNT_IDS = {}
+
+# Marks the threads resolving credentials or an account ID. The calls
+# they make can't wait for an account ID to key their rate limit
+# buckets by; see _rate_limit_account().
+_ACCOUNT_ID_STATE = threading.local()
+
+# Profiles whose account IDs couldn't be resolved for rate limiting.
+_UNRESOLVED_ACCOUNT_PROFILES = set()
+
+
+# - - - - - - - - - - - - - - - - - - - - - - - - - - - -
+def _account_id_cache_filepath():
+    '''Return the path of the persistent account ID cache, or None.'''
+    filepath = _BOOGIO_CONFIG.get('aws_informer', {}).get(
+        'account_id_cache_file'
+        )
+    if filepath:
+        return os.path.expanduser(filepath)
+    return None
+
+
+# - - - - - - - - - - - - - - - - - - - - - - - - - - - -
+def _load_account_ids(filepath):
+    '''Return the profile to account ID mapping stored in filepath.'''
+    logger = logging.getLogger(__name__)
+
+    if not os.path.exists(filepath):
+        return {}
+
+    try:
+        with open(filepath, 'r') as fptr:
+            return json.load(fptr)
+    except (IOError, ValueError) as err:
+        logger.warning(
+            'ignoring unreadable account ID cache %s: %s', filepath, err
+            )
+        return {}
+
+
+# - - - - - - - - - - - - - - - - - - - - - - - - - - - -
+def _save_account_ids(filepath, account_ids):
+    '''Write the profile to account ID mapping to filepath.'''
+    logger = logging.getLogger(__name__)
+
+    temp_filepath = '%s.%d' % (filepath, os.getpid())
+    try:
+        with open(temp_filepath, 'w') as fptr:
+            json.dump(account_ids, fptr, indent=4, sort_keys=True)
+        os.rename(temp_filepath, filepath)
+    except (IOError, OSError) as err:
+        logger.warning(
+            'not updating account ID cache %s: %s', filepath, err
+            )
 
 
 # - - - - - - - - - - - - - - - - - - - - - - - - - - - -
-def _informer_identifier_key_map():
-    '''Return a mapping of AWSInformer classes and their identifier keys.'''
-    # Update for new AWSInformer subclass.
-    return {
-        ELBInformer: 'LoadBalancerName',
-        EMRInformer: 'Id',
-        EC2InstanceInformer: 'InstanceId',
-        SecurityGroupInformer: 'GroupId',
-        VPCInformer: 'VpcId',
-        VpcPeeringConnectionInformer: 'VpcPeeringConnectionId',
-        InternetGatewayInformer: 'InternetGatewayId',
-        NatGatewayInformer: 'NatGatewayId',
-        AutoScalingGroupInformer: 'AutoScalingGroupARN',
-        SubnetInformer: 'SubnetId',
-        NetworkInterfaceInformer: 'NetworkInterfaceId',
-        NetworkAclInformer: 'NetworkAclId',
-        RouteTableInformer: 'RouteTableId',
-        EIPInformer: 'PublicIp',
-        SQSInformer: 'QueueURL',
-        }
+def profile_account_id(profile_name=None, region_name=None):
+    '''Return the AWS account ID for a profile.
 
+    Arguments:
 
-# - - - - - - - - - - - - - - - - - - - - - - - - - - - -
-def _prevent_duplicate_informer_init_if_cached(original_init):
-    '''Only proceed with __init__() if an informer isn't already cached.
+        profile_name (string, optional):
+            The name of the profile record in
+            :file:`$HOME/.aws/credentials`. If omitted, boto's
+            default credential search order is used.
 
-    AWSInformer subclass __init__ methods can be called multiple
-    times on a single instance, due to the redefinition of
-    __new__() to check for an existing informer in the mediator's
-    informer_cache. If we find the resource's identifier in the
-    mediator's informer_cache, we don't do any initialization
-    here. If we don't find it, we both initialize and update the
-    mediator's cache.
+        region_name (string, optional):
+            The name of the AWS region to use for the STS call, if
+            one is needed.
+
+    Returns:
+
+        The account ID, as a string.
+
+    The account ID is retrieved with STS ``get_caller_identity()``
+    the first time it's needed for a profile, and reused thereafter.
+    If the boogio config file sets
+    ``aws_informer.account_id_cache_file``, the account IDs of named
+    profiles are also stored in that file and reused by later runs;
+    delete the file or call ``clear_account_ids()`` if a profile is
+    changed to refer to another account.
 
     '''
-    def decorated(self, resource, *args, **kwargs):
-        # pylint: disable=missing-docstring
+    with _ACCOUNT_ID_LOCK:
+        if profile_name in _ACCOUNT_IDS:
+            return _ACCOUNT_IDS[profile_name]
+        profile_lock = _ACCOUNT_ID_PROFILE_LOCKS.setdefault(
+            profile_name, threading.RLock()
+            )
 
-        mediator = kwargs['mediator'] if 'mediator' in kwargs else None
+    with profile_lock:
 
-        # We have to figure out if we're already in the mediator's
-        # informer cache. Our key would be our resource identifier.
-        # pylint: disable=protected-access
-        entity_identifier = self._get_init_entity_identifier(resource)
+        with _ACCOUNT_ID_LOCK:
+            if profile_name in _ACCOUNT_IDS:
+                return _ACCOUNT_IDS[profile_name]
 
-        # If our attempt to look it up failed, entity_identifier could
-        # be None, which shouldn't be a key in the mediator's
-        # informer_cache anyway.
-        if mediator is not None:
-            assert None not in mediator.informer_cache
+        filepath = _account_id_cache_filepath()
 
-        if (
-                mediator is None or
-                entity_identifier not in mediator.informer_cache
-                ):  # pylint: disable=bad-continuation
+        if filepath and profile_name is not None:
+            with _ACCOUNT_ID_FILE_LOCK:
+                persisted = _load_account_ids(filepath)
+            if profile_name in persisted:
+                with _ACCOUNT_ID_LOCK:
+                    _ACCOUNT_IDS[profile_name] = persisted[profile_name]
+                return persisted[profile_name]
 
-            # We didn't find ourself in the cache, so we'll initialize
-            # ourself anew.
-            original_init(self, resource, *args, **kwargs)
+        session = shared_session(
+            profile_name=profile_name, region_name=region_name
+            )
+        with _profile_lock(profile_name):
+            client = session.client('sts')
 
-            # Put ourself in the cache for next time.
-            mediator.informer_cache[entity_identifier] = self
+        resolving = getattr(_ACCOUNT_ID_STATE, 'resolving', False)
+        _ACCOUNT_ID_STATE.resolving = True
+        try:
+            account_id = client.get_caller_identity()['Account']
+        finally:
+            _ACCOUNT_ID_STATE.resolving = resolving
 
-        else:
-            # We found ourself in the cache. Let's make sure it's
-            # really us.
-            assert mediator.informer_cache[entity_identifier] is self
+        with _ACCOUNT_ID_LOCK:
+            _ACCOUNT_IDS[profile_name] = account_id
 
-    return decorated
+        if filepath and profile_name is not None:
+            with _ACCOUNT_ID_FILE_LOCK:
+                persisted = _load_account_ids(filepath)
+                persisted[profile_name] = account_id
+                _save_account_ids(filepath, persisted)
+
+        return account_id
 
 
 # - - - - - - - - - - - - - - - - - - - - - - - - - - - -
-def entity_types():
-    '''Return a list of entity types that have AWSInformer classes.'''
-    return _entity_type_informer_class_map().keys()
+def _rate_limit_account(profile_name):
+    '''Return the account to key a profile's rate limit buckets by.
 
+    This is the profile's resolved account ID, so every profile for
+    an account shares its buckets, whether or not the ID was known
+    when the call's client was created. The calls that resolve the
+    profile's credentials and account ID, and calls for profiles
+    whose ID can't be resolved, are keyed by the profile name.
 
-# - - - - - - - - - - - - - - - - - - - - - - - - - - - -
-def informer_class(etype):
-    '''Map entity type to the AWSInformer class name.'''
+    '''
+    logger = logging.getLogger(__name__)
 
-    # All entity_types() values must be supported here.
-    return _entity_type_informer_class_map()[etype]
+    account_id = _ACCOUNT_IDS.get(profile_name)
+    if account_id is not None:
+        return account_id
+
+    if (
+            getattr(_ACCOUNT_ID_STATE, 'resolving', False) or
+            profile_name in _UNRESOLVED_ACCOUNT_PROFILES
+            ):  # pylint: disable=bad-continuation
+        return profile_name
+
+    try:
+        return profile_account_id(profile_name)
+    except Exception as err:  # pylint: disable=broad-except
+        logger.warning(
+            'rate limiting profile %s by name; no account ID: %s',
+            profile_name, err
+            )
+        with _ACCOUNT_ID_LOCK:
+            _UNRESOLVED_ACCOUNT_PROFILES.add(profile_name)
+        return profile_name
 
 
 # - - - - - - - - - - - - - - - - - - - - - - - - - - - -
-def informer_entity_type(iclass):
-    '''Map AWSInformer class to entity type.'''
+def clear_account_ids(profile_name=None):
+    '''Discard resolved account IDs.
 
-    type_class_map = _entity_type_informer_class_map()
+    Arguments:
 
-    if iclass not in type_class_map.values():
-        return None
+        profile_name (string, optional):
+            If provided, only this profile's account ID is discarded;
+            otherwise all of them are. Account IDs are removed from
+            the persistent account ID cache file as well, if one is
+            configured.
 
-    possible_types = [
-        t for t in type_class_map
-        if type_class_map[t] == iclass
-        ]
-    assert len(possible_types) == 1
+    '''
+    with _ACCOUNT_ID_LOCK:
+        if profile_name is None:
+            _ACCOUNT_IDS.clear()
+            _UNRESOLVED_ACCOUNT_PROFILES.clear()
+        else:
+            _ACCOUNT_IDS.pop(profile_name, None)
+            _UNRESOLVED_ACCOUNT_PROFILES.discard(profile_name)
 
-    return possible_types[0]
+    filepath = _account_id_cache_filepath()
+    if not filepath:
+        return
 
+    with _ACCOUNT_ID_FILE_LOCK:
+        persisted = _load_account_ids(filepath)
+        if profile_name is None:
+            persisted = {}
+        else:
+            persisted.pop(profile_name, None)
 
-# - - - - - - - - - - - - - - - - - - - - - - - - - - - -
-def regional_types():
-    '''Return the Informer entity types with instances in each region.'''
-    # Update for new AWSInformer subclass.
-    return [
-        'ec2', 'elb', 'security_group',
-        'vpc', 'vpc_peering_connection', 'internet_gateway', 'nat_gateway',
-        'autoscaling',
-        'subnet', 'network_interface', 'network_acl', 'route_table',
-        'eip', 'emr',
-        # 'ip_permissions'
-        ]
+        if os.path.exists(filepath):
+            _save_account_ids(filepath, persisted)
 
 
 # - - - - - - - - - - - - - - - - - - - - - - - - - - - -
-def regionless_types():
-    '''Return the Informer entity types with instances not tied to a region.'''
-    # Update for new AWSInformer subclass.
-    return ['sqs']
+_AVAILABLE_SERVICES = []
 
 
 # - - - - - - - - - - - - - - - - - - - - - - - - - - - -
-def unitary_types():
-    '''Return the Informer entity types with a unique instance.'''
-    # Update for new AWSInformer subclass.
-    return ['iam']
+def _available_services(session):
+    '''Return the names of the AWS services boto knows about.
+
+    All shared sessions use the same data loader, so the list is
+    retrieved once.
+
+    '''
+    with _SHARED_SESSION_LOCK:
+        if not _AVAILABLE_SERVICES:
+            _AVAILABLE_SERVICES.extend(session.get_available_services())
+        return _AVAILABLE_SERVICES
 
 
 # - - - - - - - - - - - - - - - - - - - - - - - - - - - -
@@ -344,11 +1784,15 @@ def get_paged_data(
         **kwargs:
             Arbitrary keyword arguments.
 
-    This method is used in subprocesses by ``get_one_request`` to
+    This method is used in worker threads by ``get_one_request`` to
     retrieve potentially paged data from an AWS access function. The
     ``*args`` and ``**kwargs`` arguments are passed to the ``func``
     argument when it's called.
 
+    If ``func`` is a method of a client created from a shared
+    session, a throttled page request is retried by ``RATE_LIMITER``
+    with the same marker, rather than failing the whole request.
+
     '''
     # Error reporting reference string.
     err_ref_string = '%s, %s, %s, %s' % (
@@ -409,24 +1853,21 @@ def get_paged_data(
 def get_one_request(request):
     '''Handle one parallelized request.
 
-    This gets called in a subprocess, and has to reconstruct the
-    session and client. All of the execution is wrapped in a broad
-    "try...except Exception" block because exceptions in subprocesses
-    breaks multiprocessing and leaves things hung.
+    This gets called in a worker thread, and creates a client from
+    the shared session for the request's profile and region, so
+    requests share that profile's credentials and ``RATE_LIMITER``
+    with the rest of the process. Errors are returned rather than
+    raised, so one failed request doesn't lose the others' results.
 
     '''
 
     err = None
 
-    # Wrap the whole thing in a try/except because any uncaught
-    # exception hangs the multiprocessing and leaves zombies when the
-    # parent is killed.
     try:
-        session = boto3.session.Session(
-            **request['session_kwargs']
-            )
+        session = shared_session(**request['session_kwargs'])
 
-        client = session.client(request['client_type'])
+        with _profile_lock(request['session_kwargs'].get('profile_name')):
+            client = session.client(request['client_type'])
 
         method = getattr(client, request['client_method'])
 
@@ -511,6 +1952,18 @@ class AWSInformerResourceTypeError(AWSSessionError):
             ).__init__(msg=msg, *args, **kwargs)
 
 
+# - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - -
+class AWSInformerElidedFieldError(AWSInformerResourceError):
+    '''A field elided from an AWS Informer resource has been requested.'''
+
+    def __init__(self, msg=None, *args, **kwargs):
+        '''Initialize an AWSInformerElidedFieldError instance.'''
+
+        super(
+            AWSInformerElidedFieldError, self
+            ).__init__(msg=msg, *args, **kwargs)
+
+
 # - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - -
 class AWSInformerRegionError(AWSInformerError):
     '''An AWSInformer error associated with an AWS region has occurred.'''
@@ -548,7 +2001,9 @@ class AWSSession(object):
         profile_name or region_name are provided.
 
     An ``AWSSession`` is a simple wrapper for the underlying boto3
-    session.
+    session. Unless an existing session is provided, the underlying
+    session is shared with other ``AWSSession`` instances for the
+    same profile and region; see ``shared_session()``.
 
     '''
 
@@ -573,6 +2028,13 @@ class AWSSession(object):
             self._profile_name = session.profile_name
             self.region_name = session.region_name
             self.session = session
+            self._session_is_shared = False
+
+            # pylint: disable=protected-access
+            RATE_LIMITER.register(
+                session._session,
+                lambda: _rate_limit_account(session.profile_name)
+                )
 
         else:
 
@@ -582,7 +2044,7 @@ class AWSSession(object):
 
             self.region_name = region_name
 
-            self.refresh_session()
+            self._assign_session()
             # self.session = boto3.session.Session(
             #     region_name=region_name,
             #     profile_name=profile_name
@@ -613,13 +2075,35 @@ class AWSSession(object):
 
         return session_kwargs
 
+    # - - - - - - - - - - - - - - - - - - - - - - - - - - - - - -
+    def _assign_session(self):
+        '''Assign the shared session for the current parameters.
+
+        Sessions are shared between ``AWSSession`` instances with the
+        same profile and region; see ``shared_session()``.
+
+        '''
+        self.session = shared_session(**self._session_kwargs())
+        self._session_is_shared = True
+
     # - - - - - - - - - - - - - - - - - - - - - - - - - - - - - -
     def refresh_session(self):
-        '''Recreate ``self.session`` with the current parameters.'''
+        '''Reassign ``self.session`` with freshly resolved credentials.
+
+        The profile's shared sessions and credentials are discarded
+        with ``clear_shared_sessions()`` before a new shared session
+        is created, so the new session doesn't reuse stale
+        credentials. Other ``AWSSession`` instances for the profile
+        keep their current sessions until they're refreshed too. If
+        the profile name isn't set, all shared sessions are
+        discarded.
+
+        '''
 
         logger = logging.getLogger(__name__)
 
-        self.session = boto3.session.Session(**self._session_kwargs())
+        clear_shared_sessions(self.profile_name)
+        self._assign_session()
 
         logger.debug(
             'refreshed AWSSession: profile_name "%s", region_name "%s"',
@@ -636,7 +2120,7 @@ class AWSSession(object):
     def _set_profile_name(self, value):
         '''Property setter.'''
         self._profile_name = value
-        self.refresh_session()
+        self._assign_session()
 
     profile_name = property(_get_profile_name, _set_profile_name)
 
@@ -672,14 +2156,26 @@ class AWSMediator(AWSSession):
     '''
     # TODO: Set a cache timeout and autoflush.
 
+    # The number of threads get_aws_info_in_parallel() uses.
     PARALLEL_FETCH_PROCESS_COUNT = 48
 
+    # Error codes returned by calls to regions the account hasn't
+    # enabled. Authentication failures aren't among them, since they
+    # can be transient, and a region mistaken for disabled would be
+    # skipped until the probe result expires.
+    disabled_region_error_codes = ['OptInRequired']
+
     # We cache at the AWSMediator class level all informers managed by
     # this mediator, indexed by their unique identifiers, so that we
     # can avoid duplicate records for the same AWS entity and re-use
     # existing records when, e.g., expanding other entities.
     informer_cache = {}
 
+    # Mediators in different threads can add informers to the cache at
+    # once, so informers are added holding this lock. It's only held
+    # for the insertion, not while an informer is constructed.
+    _informer_cache_lock = threading.RLock()
+
     # - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - -
     @staticmethod
     def _get_account_descriptors(account_id):
@@ -760,44 +2256,91 @@ class AWSMediator(AWSSession):
 
         super(AWSMediator, self).__init__(**kwargs)
 
-        # TODO: Move this into _get_account_descriptors, and check for
-        # the profile name in config files maybe?
-        self.account_id = (
-            self.session.client("sts").get_caller_identity()["Account"]
-            )
+        self._clients = {}
 
-        descriptors = self._get_account_descriptors(self.account_id)
-        self.account_name = descriptors['name']
-        self.account_desc = descriptors['description']
+        # Guards the mediator's caches, so its informers can be
+        # expanded from several threads. Each entity type is fetched
+        # under its own lock in _fetch_locks.
+        self._lock = threading.RLock()
+        self._fetch_locks = {}
 
-        self._clients = {}
+        # The account ID, name and description, resolved on first use
+        # by _account().
+        self._account_descriptors = None
 
         # self._resources = {
         #     resource: None
         #     for resource in self.session.get_available_resources()
         #     }
 
-        self._services = {
-            service: None
-            for service in self.session.get_available_services()
-            }
-
-        # Update for new AWSInformer subclass.
-        self._other_entities = {
-            'security_group': None,
-            'vpc': None,
-            'vpc_peering_connection': None,
-            'internet_gateway': None,
-            'nat_gateway': None,
-            'subnet': None,
-            'network_interface': None,
-            'network_acl': None,
-            'route_table': None,
-            'eip': None
-            }
+        # The record caches for AWS services and for other entity
+        # types, built on first use by the _services and
+        # _other_entities properties.
+        self._service_records = None
+        self._other_entity_records = None
 
         self.filters = {}
 
+        # If True, resource records are held compressed, and decoded
+        # on demand.
+        self.compress_resources = bool(
+            _BOOGIO_CONFIG.get('aws_informer', {}).get(
+                'compress_resources', False
+                )
+            )
+
+        # If True, informer expansions are held as references to the
+        # related entities, and informers for them are only created
+        # when they're used.
+        self.lazy_expansions = bool(
+            _BOOGIO_CONFIG.get('aws_informer', {}).get(
+                'lazy_expansions', False
+                )
+            )
+
+        # Positions of entity records in their entity lists, by entity
+        # type, key and key value, built on demand by entity_index().
+        self._entity_indexes = {}
+
+        self.elisions = {}
+        # The combined configured and assigned elisions for each
+        # entity type, built on demand by elided_fields().
+        self._elided_fields = {}
+
+        # Built on demand by the informer_meta property.
+        self._informer_meta = None
+
+        # When this event is set, e.g. by cancelling an
+        # aws_async.AWSFuture, requests for further pages of records
+        # raise aws_async.AWSCancelledError.
+        self.cancel_event = None
+
+        # When this is set to an aws_checkpoint.SurveyCheckpoint,
+        # fetched records are saved to it, and records saved by an
+        # earlier run are used instead of fetching them again.
+        self.checkpoint = None
+
+    # - - - - - - - - - - - - - - - - - - - - - - - - - - - - - -
+    @property
+    def informer_meta(self):
+        '''The ``meta`` supplementals shared by this mediator's informers.
+
+        This is a single immutable dict per mediator holding the
+        profile, region and account strings, so informers don't each
+        carry their own copy.
+
+        '''
+        if self._informer_meta is None:
+            self._informer_meta = _FrozenDict({
+                'profile_name': _intern(self.profile_name),
+                'region_name': _intern(self.region_name),
+                'account_id': _intern(self.account_id),
+                'account_name': _intern(self.account_name),
+                'account_desc': _intern(self.account_desc),
+                })
+
+        return self._informer_meta
+
     # - - - - - - - - - - - - - - - - - - - - - - - - - - - - - -
     @property
     def profile_name(self):
@@ -816,7 +2359,96 @@ class AWSMediator(AWSSession):
         # We need to flush() if the profile_name gets changed.
         if value != self._profile_name:
             self.flush()
+            self._informer_meta = None
         super(AWSMediator, self)._set_profile_name(value)
+        self._clients = {}
+        self._account_descriptors = None
+
+    # - - - - - - - - - - - - - - - - - - - - - - - - - - - - - -
+    def refresh_session(self):
+        '''Reassign the session, discarding clients made with the old one.
+
+        See ``AWSSession.refresh_session()``.
+
+        '''
+        super(AWSMediator, self).refresh_session()
+        self._clients = {}
+
+    # - - - - - - - - - - - - - - - - - - - - - - - - - - - - - -
+    def _account(self):
+        '''Return the account ID, name and description for the session.
+
+        These are resolved the first time they're needed, rather than
+        when the mediator is created. The account ID of a shared
+        session is resolved once per profile; see
+        ``profile_account_id()``.
+
+        '''
+        descriptors = self._account_descriptors
+        if descriptors is not None:
+            return descriptors
+
+        with self._lock:
+            if self._account_descriptors is None:
+                if self._session_is_shared:
+                    account_id = profile_account_id(
+                        **self._session_kwargs()
+                        )
+                else:
+                    account_id = (
+                        self.client("sts").get_caller_identity()["Account"]
+                        )
+                descriptors = self._get_account_descriptors(account_id)
+                descriptors['id'] = account_id
+                self._account_descriptors = descriptors
+            return self._account_descriptors
+
+    @property
+    def account_id(self):
+        '''The AWS account ID for the session, resolved on first use.'''
+        return self._account()['id']
+
+    @property
+    def account_name(self):
+        '''The account name for the session, resolved on first use.'''
+        return self._account()['name']
+
+    @property
+    def account_desc(self):
+        '''The account description, resolved on first use.'''
+        return self._account()['description']
+
+    # - - - - - - - - - - - - - - - - - - - - - - - - - - - - - -
+    def _build_entity_caches(self):
+        '''Create the empty record caches for all entity types.'''
+        with self._lock:
+            if self._service_records is not None:
+                return
+
+            services = dict.fromkeys(_available_services(self.session))
+
+            # Entity types that aren't AWS services, e.g.
+            # security_group.
+            _informer_registry()
+            self._other_entity_records = dict.fromkeys(
+                entity_type for entity_type in _ENTITY_TYPE_SPECS
+                if entity_type not in services
+                )
+            self._service_records = services
+
+    @property
+    def _services(self):
+        '''The cached records of AWS service entity types.'''
+        if self._service_records is None:
+            self._build_entity_caches()
+        return self._service_records
+
+    @property
+    def _other_entities(self):
+        '''The cached records of other entity types.'''
+        if self._service_records is None:
+            self._build_entity_caches()
+        return self._other_entity_records
 
     # - - - - - - - - - - - - - - - - - - - - - - - - - - - - - -
     def add_filters(self, entity_type, new_filters):
@@ -878,6 +2510,86 @@ class AWSMediator(AWSSession):
             if remove_types == () or existing_type in remove_types:
                 del self.filters[existing_type]
 
+    # - - - - - - - - - - - - - - - - - - - - - - - - - - - - - -
+    def add_elisions(self, entity_type, fields):
+        '''
+        Add top level resource keys to elide from the mediator's informers.
+
+        Arguments:
+
+            entity_type (string):
+                An informer entity type whose informers will have
+                the indicated fields removed from their resource.
+
+            fields (list of string):
+                Top level keys of the entity type's resource.
+
+        Raises:
+
+            ValueError: If ``fields`` includes the entity type's
+            identifier key.
+
+        Elisions are applied as each informer is created, and
+        elided fields are never held in memory. Informers created
+        before the elisions are added aren't changed.
+
+        Note that eliding a field which an informer's ``expand()``
+        method uses will cause ``expand()`` to fail.
+
+        '''
+        identifier_key = _informer_identifier_key(
+            informer_class(entity_type)
+            )
+        if identifier_key in fields:
+            raise ValueError(
+                'can\'t elide %s identifier key %s' % (
+                    entity_type, identifier_key
+                    )
+                )
+
+        self.elisions[entity_type] = list(
+            set(self.elisions.get(entity_type, [])).union(set(fields))
+            )
+        self._elided_fields.pop(entity_type, None)
+
+    # - - - - - - - - - - - - - - - - - - - - - - - - - - - - - -
+    def remove_all_elisions(self, *remove_types):
+        '''Remove assigned elisions from the mediator.
+
+        Elisions from the boogio config file still apply.
+
+        '''
+        existing_types = self.elisions.keys()
+        for existing_type in existing_types:
+            if remove_types == () or existing_type in remove_types:
+                del self.elisions[existing_type]
+        self._elided_fields = {}
+
+    # - - - - - - - - - - - - - - - - - - - - - - - - - - - - - -
+    def elided_fields(self, entity_type):
+        '''Return the top level resource keys elided for entity_type.
+
+        Returns:
+
+            (frozenset) The keys from the boogio config file (see
+            ``informer_elisions()``) and from ``add_elisions()``.
+
+        The same frozenset is returned for every call with the same
+        entity type, so informers can share it.
+
+        '''
+        fields = self._elided_fields.get(entity_type)
+
+        if fields is None:
+            fields = frozenset(
+                _intern(x) for x in
+                informer_elisions(entity_type) +
+                self.elisions.get(entity_type, [])
+                )
+            self._elided_fields[entity_type] = fields
+
+        return fields
+
     # - - - - - - - - - - - - - - - - - - - - - - - - - - - - - -
     def _filters_kwarg(self, entity_type, use_filters=True):
         '''Create a structure representing the 'Filters' parameter.
@@ -910,6 +2622,27 @@ class AWSMediator(AWSSession):
 
         return filters_kwarg
 
+    # - - - - - - - - - - - - - - - - - - - - - - - - - - - - - -
+    def _cluster_states_kwarg(self, use_filters=True):
+        '''Create the 'ClusterStates' parameter for listing EMR clusters.
+
+        EMR's list_clusters operation doesn't take 'Filters'. A
+        ``ClusterStates`` filter added to this mediator for the
+        ``emr`` entity type takes precedence; otherwise the states
+        are those returned by ``emr_cluster_states()``. An empty list
+        of states, or ``use_filters=False``, lists clusters in every
+        state.
+
+        '''
+        states = emr_cluster_states()
+        if use_filters and 'ClusterStates' in self.filters.get('emr', {}):
+            states = self.filters['emr']['ClusterStates']
+
+        if not use_filters or not states:
+            return {}
+
+        return {'ClusterStates': sorted(states)}
+
     # - - - - - - - - - - - - - - - - - - - - - - - - - - - - - -
     def flush(self, *cached_entity_types):
         '''
@@ -930,6 +2663,10 @@ class AWSMediator(AWSSession):
                 )
         logger.debug('clearing cache of entity types: %s', cached_entity_types)
 
+        for index_key in self._entity_indexes.keys():
+            if index_key[0] in cached_entity_types:
+                del self._entity_indexes[index_key]
+
         # Delete cached informers.
         to_delete = []
         for (identifier, informer) in self.informer_cache.iteritems():
@@ -962,6 +2699,29 @@ class AWSMediator(AWSSession):
                 del self._other_entities[entity_type]
                 self._other_entities[entity_type] = None
 
+    # - - - - - - - - - - - - - - - - - - - - - - - - - - - - - -
+    def release(self, *informers):
+        '''
+        Remove particular informers from the informer cache.
+
+        Arguments:
+
+            informers (tuple of AWSInformer):
+                The informers to remove. An informer is only removed
+                if it's the one cached for its identifier.
+
+        Once released, an informer is no longer returned for its
+        record's identifier, and can be garbage collected when
+        nothing else refers to it. Records cached by the mediator
+        are kept.
+
+        '''
+        with self._informer_cache_lock:
+            for informer in informers:
+                identifier = informer.identifier
+                if self.informer_cache.get(identifier) is informer:
+                    del self.informer_cache[identifier]
+
     # - - - - - - - - - - - - - - - - - - - - - - - - - - - - - -
     def _fetch(self, entity_type, use_filters=True):
         '''Retrieve all instances of the indicated entity type from AWS.
@@ -984,117 +2744,209 @@ class AWSMediator(AWSSession):
         if use_filters:
             logger.info('filtering with %s', self.filters)
 
-        # TODO: Helpers for pagination.
-        def paginated(
-                method, data_key,
-                page_key='Marker', next_page_key='NextMarker'
+        spec = entity_type_spec(entity_type)
+        if spec is None:
+            errmsg = "Can't fetch entity type: %s" % (entity_type)
+            logger.error(errmsg)
+            raise AWSMediatorError(errmsg)
+
+        raw_entity_collection = []
+        for page in self._entity_type_pages(spec, use_filters):
+            raw_entity_collection.extend(page)
+
+        logger.info('fetched %s entities', len(raw_entity_collection))
+
+        return raw_entity_collection
+
+    # - - - - - - - - - - - - - - - - - - - - - - - - - - - - - -
+    def _entity_type_pages(self, spec, use_filters=True):
+        '''Yield the records of an entity type a page at a time.
+
+        Arguments:
+
+            spec (EntityTypeSpec):
+                The entity type's registry entry.
+
+            use_filters (bool, default=True):
+                As for ``_fetch()``.
+
+        '''
+        # Unitary types, e.g. iam, have no list of entities.
+        if spec.operation is None:
+            return
+
+        for page in self._pages(
+                spec.client, spec.operation, spec.result_key,
+                **self._operation_kwargs(spec, use_filters)
                 ):  # pylint: disable=bad-continuation
-            '''Call ``method`` until all pages of data are returned.'''
-            final_data = []
-            more_pages = True
-            next_page_marker = None
-            while more_pages:
-                kwargs = {}
-                if next_page_marker:
-                    kwargs = {page_key: next_page_marker}
-                response = method(**kwargs)
-                next_page_marker = response.get(next_page_key)
-                if not next_page_marker:
-                    more_pages = False
-                final_data.extend(response[data_key])
-            return final_data
-
-        # Update for new AWSInformer subclass.
-        raw_entity_collection = {
-
-            # 'ec2': self.session.resource('ec2').instances.all,
-            'ec2': lambda: [
-                ec2.meta.data
-                for ec2 in list(
-                    self.session.resource('ec2').instances.all()
-                    )
-                ],
+            if spec.records is not None:
+                page = spec.records(page)
+            yield list(page)
 
-            # 's3': self.session.resource('s3').buckets.all,
-            's3': lambda: [
-                s3.meta.data
-                for s3 in list(
-                    self.session.resource('s3').buckets.all()
-                    )
-                ],
-            'iam': lambda: [],
+    # - - - - - - - - - - - - - - - - - - - - - - - - - - - - - -
+    def _operation_kwargs(self, spec, use_filters=True):
+        '''Return the arguments for an entity type's list operation.'''
 
-            'sqs': lambda: [
-                {'QueueURL': q.url}
-                for q in list(
-                    self.session.resource('sqs').queues.all()
-                    )
-                ],
+        kwargs = dict(spec.operation_kwargs)
+        if spec.filters == 'Filters':
+            kwargs.update(self._filters_kwarg(spec.entity_type, use_filters))
+        elif spec.filters == 'ClusterStates':
+            kwargs.update(self._cluster_states_kwarg(use_filters))
+        return kwargs
+
+    # - - - - - - - - - - - - - - - - - - - - - - - - - - - - - -
+    def entity_pages(self, entity_type, use_filters=True):
+        '''Retrieve entities from AWS a page at a time, without caching.
+
+        Arguments:
+
+            entity_type (string):
+                The entity type requested.
+
+            use_filters (bool, default=True):
+                As for ``entities()``.
+
+        Returns:
+
+            (generator) A list of records for each page of the
+            entity type's listing, as each page arrives. Unitary
+            types yield no pages.
+
+        Raises:
+
+            AWSMediatorError: If ``entity_type`` isn't an entity
+                type the mediator can fetch.
+
+        Unlike ``entities()``, this always sends requests to AWS,
+        and the records aren't kept by the mediator, so they can be
+        processed and discarded while later pages are still being
+        fetched.
+
+        '''
+        logger = logging.getLogger(__name__)
+
+        spec = entity_type_spec(entity_type)
+        if spec is None:
+            errmsg = "Can't fetch entity type: %s" % (entity_type)
+            logger.error(errmsg)
+            raise AWSMediatorError(errmsg)
+
+        return self._entity_type_pages(spec, use_filters)
+
+    # - - - - - - - - - - - - - - - - - - - - - - - - - - - - - -
+    def _pages(self, client_type, operation, result_key, **kwargs):
+        '''Yield the result items of a client operation a page at a time.
+
+        Arguments:
+
+            client_type (string):
+                The type of AWS client to use; e.g., ``ec2``.
+
+            operation (string):
+                The name of the client method to call; e.g.,
+                ``describe_instances``.
 
-            # 'elb': lambda: self.session.client(
-            #     'elb'
-            #     ).describe_load_balancers()['LoadBalancerDescriptions'],
+            result_key (string):
+                The key of the list of items in each response page.
 
-            'elb': lambda: paginated(
-                self.session.client('elb').describe_load_balancers,
-                'LoadBalancerDescriptions'
-                ),
+            kwargs (dict):
+                Additional arguments for the client method.
 
-            'security_group': lambda: self.session.client(
-                'ec2'
-                ).describe_security_groups()['SecurityGroups'],
+        The client's paginator is used if the operation has one;
+        otherwise the operation is called once. Each page is requested
+        only when the previous page's items have been taken, and not
+        at all once the mediator's ``cancel_event``, or the calling
+        thread's ``aws_async.thread_cancel_event()``, is set.
 
-            'vpc': lambda: self.session.client(
-                'ec2'
-                ).describe_vpcs()['Vpcs'],
+        '''
+        client = self.client(client_type)
 
-            'vpc_peering_connection': lambda: self.session.client(
-                'ec2'
-                ).describe_vpc_peering_connections()['VpcPeeringConnections'],
+        if client.can_paginate(operation):
+            pages = client.get_paginator(operation).paginate(**kwargs)
+        else:
+            pages = [getattr(client, operation)(**kwargs)]
+
+        pages = iter(pages)
+        thread_cancel_event = aws_async.thread_cancel_event()
+        while True:
+            if any(
+                    event is not None and event.is_set()
+                    for event in [self.cancel_event, thread_cancel_event]
+                    ):  # pylint: disable=bad-continuation
+                raise aws_async.AWSCancelledError(
+                    'cancelled %s %s' % (client_type, operation)
+                    )
+            try:
+                page = pages.next()
+            except StopIteration:
+                return
+            yield page.get(result_key, [])
 
-            'internet_gateway': lambda: self.session.client(
-                'ec2'
-                ).describe_internet_gateways()['InternetGateways'],
+    # - - - - - - - - - - - - - - - - - - - - - - - - - - - - - -
+    def probe_occupancy(self, *entity_types):
+        '''Return which entity types this mediator's region holds.
 
-            'nat_gateway': lambda: self.session.client(
-                'ec2'
-                ).describe_nat_gateways()['NatGateways'],
+        Arguments:
 
-            'autoscaling': lambda: self.session.client(
-                'autoscaling'
-                ).describe_auto_scaling_groups()['AutoScalingGroups'],
+            entity_types (str): The entity types to look for. By
+                default, all regional entity types.
 
-            'subnet': lambda: self.session.client(
-                'ec2'
-                ).describe_subnets()['Subnets'],
+        Returns:
 
-            'network_interface': lambda: self.session.client(
-                'ec2'
-                ).describe_network_interfaces()['NetworkInterfaces'],
+            (dict) Whether each entity type probed has any entities
+            in the region, with the mediator's filters applied.
+            Entity types are probed in turn, and probing stops at the
+            first one found, so types after it are left out. If the
+            region isn't enabled for the account, every type is
+            reported empty.
 
-            'network_acl': lambda: self.session.client(
-                'ec2'
-                ).describe_network_acls()['NetworkAcls'],
+        Each probe requests only the first page of an entity type's
+        records, so a probe of an empty region costs a request or so
+        per entity type instead of a full survey.
 
-            'route_table': lambda: self.session.client(
-                'ec2'
-                ).describe_route_tables()['RouteTables'],
+        Raises:
 
-            'eip': lambda: self.session.client(
-                'ec2'
-                ).describe_addresses(
-                    **self._filters_kwarg('eip', use_filters)
-                    )['Addresses'],
+            botocore.exceptions.ClientError: For errors other than
+                the region not being enabled; e.g., authentication
+                failures.
 
-            'emr': lambda: self.session.client(
-                'emr'
-                ).list_clusters()['Clusters'],
+        '''
+        logger = logging.getLogger(__name__)
 
-            }[entity_type]()
+        if len(entity_types) == 0:
+            entity_types = regional_types()
 
-        logger.info('fetched %s entities', len(raw_entity_collection))
+        occupancy = {}
+        for entity_type in entity_types:
+            try:
+                occupied = any(
+                    len(page) > 0 for page in self.entity_pages(entity_type)
+                    )
+            except botocore.exceptions.ClientError as err:
+                if (
+                        err.response.get('Error', {}).get('Code') in
+                        self.disabled_region_error_codes
+                        ):  # pylint: disable=bad-continuation
+                    logger.info(
+                        'region %s not enabled for profile %s: %s',
+                        self.region_name, self.profile_name, err
+                        )
+                    return {t: False for t in entity_types}
+                raise
+
+            occupancy[entity_type] = occupied
+            if occupied:
+                logger.debug(
+                    'region %s occupied for profile %s: %s found',
+                    self.region_name, self.profile_name, entity_type
+                    )
+                return occupancy
 
-        return list(raw_entity_collection)
+        logger.debug(
+            'region %s empty for profile %s',
+            self.region_name, self.profile_name
+            )
+        return occupancy
 
     # - - - - - - - - - - - - - - - - - - - - - - - - - - - - - -
     def client(self, client_type):
@@ -1116,16 +2968,22 @@ class AWSMediator(AWSSession):
         ``AWSInformer`` entity types.
 
         '''
-        if client_type not in self._clients:
-
-            try:
-                new_client = self.session.client(client_type)
-            except botocore.exceptions.DataNotFoundError:
-                raise AWSMediatorError(
-                    "can't create client for %s" % client_type
-                    )
+        client = self._clients.get(client_type)
+        if client is not None:
+            return client
 
-            self._clients[client_type] = new_client
+        try:
+            # Client creation from a session isn't thread safe, and
+            # sessions are shared.
+            with _profile_lock(self.profile_name):
+                if client_type not in self._clients:
+                    self._clients[client_type] = self.session.client(
+                        client_type
+                        )
+        except botocore.exceptions.DataNotFoundError:
+            raise AWSMediatorError(
+                "can't create client for %s" % client_type
+                )
 
         return self._clients[client_type]
 
@@ -1163,37 +3021,222 @@ class AWSMediator(AWSSession):
         types like ``ec2`` and ``s3`` that correspond to AWS services
         and other entity types that don't.
 
+        If the mediator's ``compress_resources`` attribute is
+        ``True`` when the entities are retrieved, the records of
+        informer entity types are compressed. Each compressed record
+        appears as a dict holding only the entity's identifier, and
+        the full record is available from the entity's informer.
+
         '''
 
-        logger = logging.getLogger(__name__)
+        cache = self._entity_cache(entity_type)
 
-        if (
-                entity_type not in self._services and
-                entity_type not in self._other_entities
-                ):  # pylint: disable=bad-continuation
-            errmsg = "Unknown entity type: %s" % (entity_type)
-            logger.error(errmsg)
-            raise AWSMediatorError(errmsg)
+        if cache[entity_type] is None:
+
+            # Other threads wanting this entity type wait for this
+            # fetch, rather than fetching it again.
+            with self._fetch_lock(entity_type):
+                if cache[entity_type] is None:
+                    entities = self._checkpointed_fetch(
+                        entity_type, use_filters
+                        )
+                    if self.compress_resources:
+                        entities = _compressed_records(entity_type, entities)
+                    cache[entity_type] = entities
+
+        return cache[entity_type]
+
+    # - - - - - - - - - - - - - - - - - - - - - - - - - - - - - -
+    def _checkpointed_fetch(self, entity_type, use_filters=True):
+        '''Fetch records, or load them from the mediator's checkpoint.'''
+
+        if self.checkpoint is None:
+            return self._fetch(entity_type, use_filters)
+
+        spec = entity_type_spec(entity_type)
+        plan = None if spec is None else self._operation_kwargs(
+            spec, use_filters
+            )
+
+        entities = self.checkpoint.load(
+            aws_checkpoint.RECORDS, self, entity_type, plan
+            )
+        if entities is None:
+            entities = self._fetch(entity_type, use_filters)
+            self.checkpoint.save(
+                aws_checkpoint.RECORDS, self, entity_type, entities, plan
+                )
+        return entities
+
+    # - - - - - - - - - - - - - - - - - - - - - - - - - - - - - -
+    def aiter_entities(
+            self, entity_type, use_filters=True, timeout=None,
+            queue_size=aws_async.DEFAULT_QUEUE_SIZE
+            ):  # pylint: disable=bad-continuation
+        '''Retrieve entities in the background, iterating as they arrive.
+
+        Arguments:
+
+            entity_type (string):
+                The entity type requested.
+
+            use_filters (bool, default=True):
+                As for ``entities()``.
+
+            timeout (number, optional):
+                If given, stop fetching after this many seconds.
+
+            queue_size (int, optional):
+                The most records fetched ahead of the caller.
+
+        Returns:
+
+            (aws_async.BackgroundIterator) An iterator over the same
+            records ``entities()`` returns. Its ``cancel()`` method
+            stops fetching after the page in progress.
+
+        Raises:
+
+            AWSMediatorError: If ``entity_type`` isn't an entity type
+                the mediator handles.
+
+        Records already cached are iterated over directly. Otherwise
+        pages are fetched on a background thread, and each page's
+        records can be used while the next page is requested. Once
+        the last page has been fetched, the records are cached as
+        ``entities()`` would cache them, unless another thread
+        cached the entity type first.
+
+        '''
+        cache = self._entity_cache(entity_type)
+
+        def records():
+            '''Yield cached records, or fetch and cache them.'''
+            cached = cache[entity_type]
+            if cached is not None:
+                for record in cached:
+                    yield record
+                return
+
+            entities = []
+            for page in self.entity_pages(entity_type, use_filters):
+                entities.extend(page)
+                for record in page:
+                    yield record
+
+            with self._fetch_lock(entity_type):
+                if cache[entity_type] is None:
+                    if self.compress_resources:
+                        entities = _compressed_records(entity_type, entities)
+                    cache[entity_type] = entities
+
+        return aws_async.BackgroundIterator(
+            records(), queue_size=queue_size, timeout=timeout
+            )
+
+    # - - - - - - - - - - - - - - - - - - - - - - - - - - - - - -
+    def _entity_cache(self, entity_type):
+        '''Return the dict the records of an entity type are cached in.'''
 
         if entity_type in self._services:
+            return self._services
 
-            if self._services[entity_type] is None:
-                self._services[entity_type] = self._fetch(
-                    entity_type, use_filters
-                    )
+        if entity_type in self._other_entities:
+            return self._other_entities
+
+        logger = logging.getLogger(__name__)
+        errmsg = "Unknown entity type: %s" % (entity_type)
+        logger.error(errmsg)
+        raise AWSMediatorError(errmsg)
 
-            entities = self._services[entity_type]
+    # - - - - - - - - - - - - - - - - - - - - - - - - - - - - - -
+    def is_cached(self, entity_type):
+        '''Return whether the records of an entity type are cached.'''
+        return self._entity_cache(entity_type)[entity_type] is not None
 
-        elif entity_type in self._other_entities:
+    # - - - - - - - - - - - - - - - - - - - - - - - - - - - - - -
+    def _fetch_lock(self, entity_type):
+        '''Return the lock held while an entity type is fetched.'''
+        with self._lock:
+            return self._fetch_locks.setdefault(
+                entity_type, threading.Lock()
+                )
 
-            if self._other_entities[entity_type] is None:
-                self._other_entities[entity_type] = self._fetch(
-                    entity_type, use_filters
-                    )
+    # - - - - - - - - - - - - - - - - - - - - - - - - - - - - - -
+    def entity_index(self, entity_type, key):
+        '''Return an index of the entities of a type by one of their keys.
 
-            entities = self._other_entities[entity_type]
+        Arguments:
 
-        return entities
+            entity_type (string):
+                The entity type to index.
+
+            key (string):
+                The top level record key to index by. As compressed
+                records only hold their identifier key, this should
+                be the entity type's identifier key if the mediator
+                compresses resources.
+
+        Returns:
+
+            (dict) The positions in ``entities(entity_type)`` of the
+            records with each value of ``key``.
+
+        The index is built the first time it's asked for, and kept
+        until the entity type is flushed.
+
+        '''
+        index = self._entity_indexes.get((entity_type, key))
+        if index is not None:
+            return index
+
+        entities = self.entities(entity_type)
+
+        with self._lock:
+            index = self._entity_indexes.get((entity_type, key))
+            if index is None:
+                index = collections.defaultdict(list)
+                for (position, record) in enumerate(entities):
+                    value = record.get(key)
+                    if value is not None:
+                        index[value].append(position)
+                index = dict(index)
+                self._entity_indexes[(entity_type, key)] = index
+
+        return index
+
+    # - - - - - - - - - - - - - - - - - - - - - - - - - - - - - -
+    def indexed_informers(self, entity_type, key, values):
+        '''Return informers for the entities with any of a key's values.
+
+        Arguments:
+
+            entity_type (string):
+                The entity type of the informers.
+
+            key (string):
+                A top level record key; see ``entity_index()``.
+
+            values (list):
+                The values of ``key`` to find.
+
+        Returns:
+
+            (list) Informers for the matching entities, in the order
+            of ``entities(entity_type)``.
+
+        '''
+        index = self.entity_index(entity_type, key)
+        positions = sorted(set(
+            position
+            for value in values
+            for position in index.get(value, [])
+            ))
+
+        entities = self.entities(entity_type)
+        return informer_class(entity_type).from_records(
+            [entities[position] for position in positions], self
+            )
 
     # - - - - - - - - - - - - - - - - - - - - - - - - - - - - - -
     @classmethod
@@ -1202,7 +3245,7 @@ class AWSMediator(AWSSession):
             requests
             ):  # pylint: disable=bad-continuation
         '''
-        Use subprocess pools to retrieve multiple data requests in parallel.
+        Use a thread pool to retrieve multiple data requests in parallel.
 
         Arguments:
 
@@ -1247,15 +3290,171 @@ class AWSMediator(AWSSession):
         if pool_size == 0:
             return []
 
-        pools = Pool(pool_size)
-        results = pools.map(get_one_request, requests)
-        pools.terminate()
+        pool = ThreadPool(pool_size)
+        try:
+            results = pool.map(get_one_request, requests)
+        finally:
+            pool.close()
+            pool.join()
 
         return results
 
 
 # TODO: Might be helpful to move the fancy __new__() stuff into a
 # CachableInformer subclass?
+# - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - -
+class _ExpansionReference(object):
+    '''A reference to an informer's expansion, to be resolved when used.
+
+    Arguments:
+
+        informer (AWSInformer):
+            The informer the expansion belongs to.
+
+        entity_type (string):
+            The entity type of the expansion's informers.
+
+        key (string):
+            The entity type's record key the expansion matches.
+
+        values (list):
+            The values of ``key`` the expansion matches.
+
+        single (bool):
+            If ``True``, the expansion is the first matching
+            informer, or is dropped if there's none; if ``False``, it's
+            the list of all matching informers.
+
+    '''
+
+    # pylint: disable=too-few-public-methods,too-many-arguments
+
+    __slots__ = ('informer', 'entity_type', 'key', 'values', 'single')
+
+    def __init__(self, informer, entity_type, key, values, single):
+        '''Initialize an _ExpansionReference instance.'''
+        self.informer = informer
+        self.entity_type = entity_type
+        self.key = key
+        self.values = values
+        self.single = single
+
+    # - - - - - - - - - - - - - - - - - - - - - - - - - - - - - -
+    def resolve(self):
+        '''Return the expansion's informer or list of informers.
+
+        The informers are expanded as deeply as their parent's
+        expansions would have been, with expansions of their own held
+        as references in turn. ``None`` is returned for a single
+        expansion with no match.
+
+        '''
+        # pylint: disable=protected-access
+        informers = self.informer.mediator.indexed_informers(
+            self.entity_type, self.key, self.values
+            )
+
+        depth = self.informer._expanded_depth
+        child_depth = None if depth is None else depth - 1
+        for informer in informers:
+            informer.expand(child_depth)
+
+        if self.single:
+            return informers[0] if informers else None
+        return informers
+
+
+# - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - -
+class _Expansions(dict):
+    '''An informer's expansions, resolving references when they're used.
+
+    Values that are ``_ExpansionReference`` instances are replaced by
+    what they resolve to the first time they're looked up, tested for
+    or iterated over. A single expansion that resolves to nothing is
+    removed. Listing, counting or comparing the expansions resolves
+    them all first, so keys that are listed can always be looked up.
+
+    '''
+
+    __slots__ = ()
+
+    def _resolve_all(self):
+        '''Resolve every reference, dropping those with no match.'''
+        for key in dict.keys(self):
+            if dict.__getitem__(self, key).__class__ is _ExpansionReference:
+                try:
+                    self._resolve(key)
+                except KeyError:
+                    pass
+
+    def _resolve(self, key):
+        '''Return the value for key, resolving it if needed.'''
+        value = dict.__getitem__(self, key)
+        if value.__class__ is _ExpansionReference:
+            value = value.resolve()
+            if value is None:
+                dict.__delitem__(self, key)
+                raise KeyError(key)
+            dict.__setitem__(self, key, value)
+        return value
+
+    def __getitem__(self, key):
+        return self._resolve(key)
+
+    def __contains__(self, key):
+        try:
+            self._resolve(key)
+        except KeyError:
+            return False
+        return True
+
+    has_key = __contains__
+
+    def get(self, key, default=None):
+        try:
+            return self._resolve(key)
+        except KeyError:
+            return default
+
+    def keys(self):
+        self._resolve_all()
+        return dict.keys(self)
+
+    def iterkeys(self):
+        return iter(self.keys())
+
+    __iter__ = iterkeys
+
+    def __len__(self):
+        self._resolve_all()
+        return dict.__len__(self)
+
+    def __eq__(self, other):
+        self._resolve_all()
+        if isinstance(other, _Expansions):
+            other._resolve_all()
+        return dict.__eq__(self, other)
+
+    def __ne__(self, other):
+        return not self == other
+
+    def items(self):
+        self._resolve_all()
+        return dict.items(self)
+
+    def values(self):
+        return [value for (_, value) in self.items()]
+
+    def iteritems(self):
+        return iter(self.items())
+
+    def itervalues(self):
+        return iter(self.values())
+
+    def copy(self):
+        return _Expansions(self.items())
+
+
 # - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - -
 class AWSInformer(object):
     '''
@@ -1289,7 +3488,9 @@ class AWSInformer(object):
             LoadBalancerName for an ELBInformer.
 
         resource (dict): The original record for the AWS entity this
-            Informer instance manages.
+            Informer instance manages. If the mediator's
+            ``compress_resources`` attribute is ``True``, this is
+            held compressed and decoded on demand.
 
         expansions (dict):
             The child resources found when expanding this informer.
@@ -1299,21 +3500,66 @@ class AWSInformer(object):
 
         is_expanded (bool):
             ``True`` if this informer's ``expand()`` method has been
-            called; ``False`` otherwise.
+            called; ``False`` otherwise. Once an informer is
+            expanded, further calls to ``expand()`` don't fetch its
+            expansions again.
 
-        promote_to_top_level (list):
-            A list of top level ``resource`` keys that will be handled
-            specially in ``AWSInformer.to_dict()``. See the
-            documentation for ``to_dict()`` for details.
+        promote_to_top_level (tuple):
+            Class attribute. A tuple of top level ``resource`` keys
+            that will be handled specially in
+            ``AWSInformer.to_dict()``. See the documentation for
+            ``to_dict()`` for details.
 
         elisions (list):
-            A list of top level ``resource`` keys that will be handled
-            specially in ``AWSInformer.to_dict()``. See the
-            documentation for ``to_dict()`` for details.
+            Class attribute. The default list of top level
+            ``resource`` keys to drop from each informer's resource
+            when it's created. See ``informer_elisions()`` and
+            ``AWSMediator.add_elisions()``.
+
+        expansion_types (dict):
+            Class attribute. The entity type of the informers
+            ``expand()`` puts in each ``expansions`` key. See
+            ``informer_expansion_types()``.
+
+        elided_fields (frozenset):
+            The top level ``resource`` keys that were elided from
+            this informer's resource. Requesting one of these in a
+            report raises ``AWSInformerElidedFieldError``.
+
+        volatile_fields (list):
+            Class attribute. Dot-separated paths into the
+            ``resource`` and ``supplementals`` of fields whose values
+            change without the entity changing in any meaningful way,
+            such as counters. These are excluded from the informer's
+            ``fingerprint``. See ``informer_volatile_fields()``.
 
 
     '''
 
+    volatile_fields = []
+
+    elisions = []
+
+    expansion_types = {}
+
+    promote_to_top_level = ()
+
+    # Dot-separated paths into the resource of string values that
+    # recur across many entities (regions, zones, VPC ids, state
+    # names), which are shared between informers to save memory.
+    interned_fields = [
+        'AvailabilityZone', 'OwnerId', 'State', 'SubnetId', 'VpcId',
+        ]
+
+    # Informers are created by the hundred thousand in large surveys,
+    # so we do without a per-instance __dict__. Subclasses must define
+    # __slots__ too.
+    __slots__ = (
+        '_resource', 'region_name', 'profile_name', 'mediator',
+        'expansions', 'is_expanded', '_expanded_depth', 'supplementals',
+        'elided_fields', '_fingerprint_parts', '__weakref__',
+        )
+
     # - - - - - - - - - - - - - - - - - - - - - - - - - - - - - -
     @classmethod
     def _require_resource_type(cls, resource, resource_type):
@@ -1331,14 +3577,12 @@ class AWSInformer(object):
     def _get_init_entity_identifier(self, resource):
         '''Look up the appropriate key for our class in our resource.'''
 
-        identifier_key_map = _informer_identifier_key_map()
-        entity_identifier = None
+        entity_identifier_key = _informer_identifier_key(self.__class__)
 
-        if self.__class__ in identifier_key_map:
-            entity_identifier_key = identifier_key_map[self.__class__]
-            entity_identifier = resource[entity_identifier_key]
+        if entity_identifier_key is None:
+            return None
 
-        return entity_identifier
+        return resource[entity_identifier_key]
 
     # - - - - - - - - - - - - - - - - - - - - - - - - - - - - - -
     def __new__(
@@ -1371,11 +3615,10 @@ class AWSInformer(object):
 
         logger = logging.getLogger(__name__)
 
-        identifier_key_map = _informer_identifier_key_map()
+        entity_identifier_key = _informer_identifier_key(cls)
         entity_identifier = None
 
-        if cls in identifier_key_map and resource is not None:
-            entity_identifier_key = identifier_key_map[cls]
+        if entity_identifier_key is not None and resource is not None:
             try:
                 entity_identifier = resource[entity_identifier_key]
             except KeyError as err:
@@ -1414,22 +3657,28 @@ class AWSInformer(object):
 
         super(AWSInformer, self).__init__()
 
+        # Initialization works on the full record. The resource is
+        # compressed again once the informer is complete.
+        resource = _decoded_resource(resource)
+
         if 'required_resource_type' in kwargs:
             self._require_resource_type(
                 resource,
                 kwargs['required_resource_type']
                 )
 
-        # self.__class__ will identify the child class AWSInformer
-        # that is being initialized.
-        self._entity_type = informer_entity_type(self.__class__)
+        if isinstance(resource, dict):
+            _intern_paths(resource, _interned_paths(self.__class__))
+
         self.resource = resource
         self.region_name = region_name
         self.profile_name = profile_name
 
         # Child resources stored as Informers.
-        self.expansions = {}
+        self.expansions = _Expansions()
         self.is_expanded = False
+        # How deep the expansions have been expanded; None if fully.
+        self._expanded_depth = 0
 
         # TODO: The following should be a method.
         self.mediator = None
@@ -1470,66 +3719,242 @@ class AWSInformer(object):
             self.region_name = self.mediator.region_name
             self.profile_name = self.mediator.profile_name
 
+        # Drop unwanted fields as early as possible, so they're never
+        # held.
+        self.elided_fields = (
+            frozenset() if self.entity_type is None
+            else self.mediator.elided_fields(self.entity_type)
+            )
+        self._apply_elisions()
+
         # Additional records associated with this informer; e.g. the IP
         # address obtained by DNS lookup on a Load Balancer.
+        # The meta supplementals are shared by all the mediator's
+        # informers, and are immutable.
         self.supplementals = {
-            'meta': {
-                'profile_name': self.profile_name,
-                'region_name': self.region_name,
-                'account_id': self.mediator.account_id,
-                'account_name': self.mediator.account_name,
-                'account_desc': self.mediator.account_desc
-                }
+            'meta': self.mediator.informer_meta
             }
 
-        # - - - - - - - - - - - - - - - - - - - - - - - -
-        # Structure manipulation control to make things
-        # more manageable when exporting data for viewing
-        # in, e.g., kibana.
-        # - - - - - - - - - - - - - - - - - - - - - - - -
-
-        # Fields to map into the top level as dict entries in
-        # to_dict() (and hence JSON) output.
-        self.promote_to_top_level = [
-            ]
-
-        # # Fields on which to call flatten() when converting to
-        # # to_dict() (and hence JSON) output.
-        # self.flatten = [
-        #     ]
+        # Digests of the parts of the informer's content, computed on
+        # demand by the fingerprint property.
+        self._fingerprint_parts = {}
 
         # Call local site defined initialization code.
         site_boogio.informer_site_init(self)
 
+    # - - - - - - - - - - - - - - - - - - - - - - - - - - - - - -
+    @classmethod
+    def from_records(cls, records, mediator):
+        '''Create informers of this class for a list of resource records.
+
+        Arguments:
+
+            records (iterable of dict):
+                The resource records, as returned by
+                ``AWSMediator.entities()``.
+
+            mediator (aws_informer.AWSMediator):
+                The mediator the informers will use.
+
+        Returns:
+
+            list: An informer for each record, in order. Records whose
+            identifiers are already in the mediator's
+            ``informer_cache`` get the cached informer.
+
+        Raises:
+
+            ValueError: If a record lacks the identifier key for this
+                class.
+
+        This is equivalent to calling the class once per record with
+        the ``mediator`` keyword argument, but looks up the class
+        metadata once for the whole list and probes the informer
+        cache once per record instead of once in ``__new__()`` and
+        again in ``__init__()``.
+
+        '''
+        logger = logging.getLogger(__name__)
+
+        entity_identifier_key = _informer_identifier_key(cls)
+        undecorated_init = getattr(cls.__init__, 'undecorated_init', None)
+
+        # Classes without identifiers or cache handling, e.g.
+        # IAMInformer, are constructed the ordinary way.
+        if entity_identifier_key is None or undecorated_init is None:
+            return [cls(record, mediator=mediator) for record in records]
+
+        informer_cache = mediator.informer_cache
+        informers = []
+
+        # Expansions in other threads may be creating informers for
+        # the same records. Each informer is built without holding
+        # the cache lock, and if another thread has cached one for
+        # the same entity by the time it's done, that one is used.
+        # pylint: disable=protected-access
+        for record in records:
+            try:
+                entity_identifier = record[entity_identifier_key]
+            except KeyError as err:
+                err_msg = ('%s entity identifier key "%s" not found in %s')
+                logger.error(err_msg, cls, err.message, record)
+                raise ValueError(err_msg % (cls, err.message, record))
+
+            informer = informer_cache.get(entity_identifier)
+
+            if informer is None:
+                built = super(AWSInformer, cls).__new__(cls)
+                undecorated_init(built, record, mediator=mediator)
+
+                with mediator._informer_cache_lock:
+                    informer = informer_cache.setdefault(
+                        entity_identifier, built
+                        )
+
+                if informer is built and mediator.compress_resources:
+                    informer._compress_resource(record)
+
+            informers.append(informer)
+
+        return informers
+
+    # - - - - - - - - - - - - - - - - - - - - - - - - - - - - - -
+    @property
+    def resource(self):
+        '''The record for the AWS entity this informer manages.
+
+        If the informer's resource is compressed, this is decoded on
+        demand and cached briefly. Changes to a decoded resource are
+        only kept if it's assigned back to ``resource``.
+
+        '''
+        resource = self._resource
+        if resource.__class__ is _ResourceStub:
+            return _DECODED_RESOURCES.get(resource)
+        return resource
+
+    @resource.setter
+    def resource(self, value):
+        '''Set the resource, compressing it if the current one is.'''
+        current = getattr(self, '_resource', None)
+        self._resource = value
+        if (
+                current.__class__ is _ResourceStub and
+                value.__class__ is not _ResourceStub and
+                isinstance(value, dict)
+                ):  # pylint: disable=bad-continuation
+            self._compress_resource(current)
+
+    # - - - - - - - - - - - - - - - - - - - - - - - - - - - - - -
+    def _compress_resource(self, stub=None):
+        '''Replace the informer's resource with a compressed copy.
+
+        Arguments:
+
+            stub (_ResourceStub, optional):
+                A compressed record to update with the resource and
+                use, instead of creating a new one. This lets the
+                informer share the compressed record held in its
+                mediator's entity cache.
+
+        '''
+        resource = self._resource
+        if (
+                resource.__class__ is _ResourceStub or
+                not isinstance(resource, dict)
+                ):  # pylint: disable=bad-continuation
+            return
+
+        identifier_key = _informer_identifier_key(self.__class__)
+
+        if stub.__class__ is _ResourceStub:
+            _DECODED_RESOURCES.discard(stub)
+            stub.encode(resource, identifier_key)
+        else:
+            stub = _ResourceStub(resource, identifier_key)
+
+        # The record we have is the decoded record for the stub.
+        _DECODED_RESOURCES.put(stub, resource)
+        self._resource = stub
+
+    # - - - - - - - - - - - - - - - - - - - - - - - - - - - - - -
+    def _apply_elisions(self):
+        '''Remove the elided fields from the informer's resource.
+
+        Subclasses which add to their resource after
+        ``AWSInformer.__init__()`` should call this again afterwards.
+
+        '''
+        if not self.elided_fields or not isinstance(self.resource, dict):
+            return
+
+        for key in self.elided_fields:
+            self.resource.pop(key, None)
+
+    # - - - - - - - - - - - - - - - - - - - - - - - - - - - - - -
+    def elided_path(self, path):
+        '''Return the elided field a report path would need, if any.
+
+        Arguments:
+
+            path (string):
+                A dot-separated path into the informer's
+                ``to_dict()`` output, as used in report definition
+                prune specs.
+
+        Returns:
+
+            (string) The elided top level resource key the path
+            depends on, or ``None`` if it doesn't depend on one.
+            Paths through expansions are checked against the
+            expansion informers' elided fields.
+
+        '''
+        (head, _, rest) = path.partition('.')
+        # Tags and promoted keys appear as, e.g., Tags:Name.
+        key = head.split(':')[0]
+
+        if key in self.elided_fields:
+            return key
+
+        if not rest or key not in self.expansions:
+            return None
+
+        expansion = self.expansions[key]
+        if isinstance(expansion, AWSInformer):
+            expansion = [expansion]
+
+        if isinstance(expansion, list):
+            for informer in expansion:
+                if isinstance(informer, AWSInformer):
+                    elided = informer.elided_path(rest)
+                    if elided is not None:
+                        return elided
+
+        return None
+
     # - - - - - - - - - - - - - - - - - - - - - - - - - - - - - -
     @property
     def entity_type(self):
         '''Return the ``AWSMediator`` entity type for this informer.'''
-        return self._entity_type
+        # self.__class__ will identify the child class AWSInformer.
+        return informer_entity_type(self.__class__)
 
     # - - - - - - - - - - - - - - - - - - - - - - - - - - - - - -
     @property
     def identifier(self):
         '''Return the unique identifier string for this informer.'''
 
-        identifier = None
-        iclass = None
+        identifier_key = _informer_identifier_key(self.__class__)
 
-        # TODO: Couldn't we just look up self.__class__ directly
-        # in _informer_identifier_key_map?
-        informer_class_map = _entity_type_informer_class_map()
-        identifier_map = _informer_identifier_key_map()
+        if identifier_key is None:
+            return None
 
-        if self._entity_type in informer_class_map:
-            iclass = informer_class_map[self._entity_type]
-        if iclass in identifier_map:
-            identifier_key = identifier_map[iclass]
-            identifier = self.resource[identifier_key]
-
-        return identifier
+        # A compressed resource keeps its identifier uncompressed.
+        return self._resource[identifier_key]
 
     # - - - - - - - - - - - - - - - - - - - - - - - - - - - - - -
-    def to_dict(self, entity_identifier=False, flat=False):
+    def to_dict(self, entity_identifier=False, flat=False, paths=None):
         '''Return a dict structure using expanded subelements when available.
 
         Arguments:
@@ -1546,6 +3971,12 @@ class AWSInformer(object):
                 structures) dicts. For more information on flattening,
                 see the documentation for ``utensils.flatten``.
 
+            paths (list of string, optional):
+                If given, only the expansions these prune paths lead
+                into are used; other expanded keys keep their
+                ``resource`` values. Lazy expansions no path leads
+                into aren't resolved.
+
         The result of ``to_dict()`` is guaranteed to be a serializable
         structure suitable for JSON conversion. If any subentities are
         encountered that raise an error when converting to JSON, they
@@ -1555,12 +3986,13 @@ class AWSInformer(object):
         The result returned by ``to_dict()`` will include the
         informer instance information with the following adjustments.
 
-        *   Any top level keys in the informer's ``elisions`` list
-            will be omitted from the result of ``to_dict()``. As
+        *   Any top level keys in the informer's ``elided_fields``
+            were removed from its resource when it was created, and
+            so won't appear in the result of ``to_dict()``. As
             working with expanded entities can generate significant
             amounts of data, you may sometimes want to use this to
             omit unneeded substructures to speed up subsequent
-            processing.
+            processing. See ``AWSMediator.add_elisions()``.
 
         *   The ``expansions`` value will replace the ``resource``
             value for any top level key present in both.
@@ -1629,20 +4061,36 @@ class AWSInformer(object):
         if entity_identifier:
             as_dict = {'entity_identifier': self.identifier}
 
+        # The paths into each expansion that the caller needs. A path
+        # ending at the expansion itself needs all of it.
+        expansion_paths = None
+        if paths is not None:
+            expansion_paths = {}
+            for path in paths:
+                (head, _, rest) = path.partition('.')
+                while rest.startswith('[]'):
+                    rest = rest[2:].lstrip('.')
+                key = head.split(':')[0]
+                if not rest or expansion_paths.get(key, []) is None:
+                    expansion_paths[key] = None
+                else:
+                    expansion_paths.setdefault(key, []).append(rest)
+
         # - - - - - - - - - - - - - - - - - - - - - - - -
-        # Some Informers store the AWS entity representation in their
-        # meta.data dict attribute; others are just a dict comtaining the
-        # AWS entity representation.
+        # Informer resources are plain dicts containing the AWS entity
+        # representation. Resources built elsewhere may be boto3
+        # resource objects, which store it in their meta.data dict
+        # attribute.
         # - - - - - - - - - - - - - - - - - - - - - - - -
-        try:
-            if self.resource is None:
-                resource_dict = {}
-            else:
-                resource_dict = dict(self.resource.meta.data)
-        except (TypeError, AttributeError):
-            if isinstance(self.resource, dict):
-                resource_dict = self.resource
-            else:
+        resource = self.resource
+        if resource is None:
+            resource_dict = {}
+        elif isinstance(resource, dict):
+            resource_dict = resource
+        else:
+            try:
+                resource_dict = dict(resource.meta.data)
+            except (TypeError, AttributeError):
                 raise TypeError(
                     'unknown resource type in %s' % self.__class__.__name__
                     )
@@ -1724,15 +4172,24 @@ class AWSInformer(object):
             # - - - - - - - - - - - - - - - - - - - - - - - -
             # Use expansions if available.
             # - - - - - - - - - - - - - - - - - - - - - - - -
-            if key in self.expansions:
+            if (
+                    (expansion_paths is None or key in expansion_paths) and
+                    key in self.expansions
+                    ):  # pylint: disable=bad-continuation
                 # as_dict[key] = self._expansion_to_container(key)
                 expansion = self.expansions[key]
+                child_paths = (
+                    None if expansion_paths is None
+                    else expansion_paths[key]
+                    )
                 try:
-                    as_dict[key] = copy.deepcopy(expansion.to_dict())
+                    as_dict[key] = copy.deepcopy(
+                        expansion.to_dict(paths=child_paths)
+                        )
                 except AttributeError:
                     # Must have been a list.
                     as_dict[key] = [
-                        copy.deepcopy(informer.to_dict())
+                        copy.deepcopy(informer.to_dict(paths=child_paths))
                         for informer in expansion
                         ]
 
@@ -1798,9 +4255,118 @@ class AWSInformer(object):
         return json.dumps(data)
 
     # - - - - - - - - - - - - - - - - - - - - - - - - - - - - - -
-    def expand(self):
+    def _fingerprint_part(self, part):
+        '''Return the cached digest of one part of the informer's content.
+
+        Arguments:
+
+            part (str):
+                One of ``'resource'``, ``'supplementals'`` or
+                ``'expansions'``.
+
+        '''
+        if part in self._fingerprint_parts:
+            return self._fingerprint_parts[part]
+
+        volatile = [
+            x.split('.')
+            for x in informer_volatile_fields(self.entity_type)
+            ]
+
+        if part == 'resource':
+            data = self.resource
+            if not isinstance(data, dict) and hasattr(data, 'meta'):
+                data = data.meta.data
+            data = _without_paths(data, volatile)
+
+        elif part == 'supplementals':
+            # Informers in the supplementals are represented by their
+            # identity; changes to their content are reflected in
+            # their own fingerprints.
+            data = {
+                k: (
+                    [v.entity_type, v.identifier]
+                    if isinstance(v, AWSInformer) else v
+                    )
+                for k, v in self.supplementals.iteritems()
+                }
+            data = _without_paths(data, volatile)
+
+        elif part == 'expansions':
+            data = {}
+            for key, informer_or_list in self.expansions.iteritems():
+                try:
+                    data[key] = [
+                        informer_or_list.entity_type,
+                        informer_or_list.identifier
+                        ]
+                except AttributeError:
+                    data[key] = sorted(
+                        [i.entity_type, i.identifier]
+                        for i in informer_or_list
+                        )
+
+        else:
+            raise ValueError('unknown fingerprint part %s' % part)
+
+        self._fingerprint_parts[part] = _canonical_digest(data)
+        return self._fingerprint_parts[part]
+
+    # - - - - - - - - - - - - - - - - - - - - - - - - - - - - - -
+    @property
+    def fingerprint(self):
+        '''A stable hash of the informer's content.
+
+        The fingerprint combines digests of the informer's
+        ``resource``, its ``supplementals`` and the entity types and
+        identifiers of its ``expansions``, each serialized
+        canonically (sorted keys, datetimes as strings). Fields listed
+        in ``informer_volatile_fields()`` for the informer's entity
+        type are excluded.
+
+        Each part's digest is computed when first needed and cached.
+        ``expand()`` discards the cached digests; code that otherwise
+        modifies an informer's content should call
+        ``invalidate_fingerprint()``.
+
+        '''
+        return _canonical_digest([
+            self.entity_type,
+            self._fingerprint_part('resource'),
+            self._fingerprint_part('supplementals'),
+            self._fingerprint_part('expansions'),
+            ])
+
+    # - - - - - - - - - - - - - - - - - - - - - - - - - - - - - -
+    def invalidate_fingerprint(self, *parts):
+        '''Discard cached fingerprint digests.
+
+        Arguments:
+
+            parts (tuple of str):
+                The parts to discard, from ``'resource'``,
+                ``'supplementals'`` and ``'expansions'``. If empty, all
+                parts are discarded.
+
+        '''
+        if len(parts) == 0:
+            self._fingerprint_parts.clear()
+
+        for part in parts:
+            self._fingerprint_parts.pop(part, None)
+
+    # - - - - - - - - - - - - - - - - - - - - - - - - - - - - - -
+    def expand(self, max_depth=None):
         '''Fetch selected entity details and populate the expansions attribute.
 
+        Arguments:
+
+            max_depth (int, optional):
+                How many levels of expansions to expand. With
+                ``max_depth=1``, the informer's expansions are
+                populated, but not themselves expanded. By default,
+                expansions are expanded all the way down.
+
         The expansions attribute is a dictionary whose keys match the
         name of some attribute of the ``resource`` attribute, and
         whose values are either AWSInformer instances or lists of
@@ -1811,52 +4377,151 @@ class AWSInformer(object):
         by id in the original resource record.
 
         Each AWSInformer instance in the expansions will in turn be
-        expanded.
+        expanded. Expansion informers are shared through the
+        mediator's informer cache, and each is only expanded once,
+        however many informers it's reached through.
+
+        Subclasses populate ``expansions`` and then call this.
 
         '''
+        # Mark ourself expanded before expanding our expansions, so
+        # reference cycles end here.
+        self.is_expanded = True
+        self._expanded_depth = max_depth
+        _expansion_populated(self)
+
+        child_depth = None if max_depth is None else max_depth - 1
+
+        # Lazy expansions are expanded when they're resolved.
+        for informer in self.expansion_informers(resolve=False):
+            informer.expand(child_depth)
+
+        self.invalidate_fingerprint()
 
-        # TODO: The mediator, or somewhere, should maintain a master
-        # list of informers so we don't get copies all over the place.
+    # - - - - - - - - - - - - - - - - - - - - - - - - - - - - - -
+    def expansion_informers(self, resolve=True):
+        '''Return a list of the informers in this informer's expansions.
+
+        Arguments:
+
+            resolve (bool, default=True):
+                If ``False``, lazy expansions that haven't been used
+                yet are left out, rather than resolved.
+
+        '''
+        if resolve:
+            values = self.expansions.values()
+        else:
+            values = [
+                value for value in dict.values(self.expansions)
+                if value.__class__ is not _ExpansionReference
+                ]
 
         # Doing things this way will work as long as each value in the
         # expansions dict is either an informer or a list of informers.
-        for key in self.expansions:
-            informer_or_list = self.expansions[key]
-            try:
-                informer_or_list.expand()
-            except AttributeError:
-                for inf in informer_or_list:
-                    inf.expand()
+        informers = []
+        for informer_or_list in values:
+            if isinstance(informer_or_list, list):
+                informers.extend(informer_or_list)
+            else:
+                informers.append(informer_or_list)
 
-        self.is_expanded = True
+        return informers
+
+    # - - - - - - - - - - - - - - - - - - - - - - - - - - - - - -
+    def _add_expansion(self, key, match_key, values, single):
+        '''Add an expansion of the informers matching some values.
+
+        Arguments:
+
+            key (string):
+                The expansions key, a key of this informer's resource.
+                The expansion's informers are of the entity type given
+                for it in the class's ``expansion_types``.
+
+            match_key (string):
+                The record key of the expansion's entity type to match.
+
+            values (list):
+                The values of ``match_key`` to match.
+
+            single (bool):
+                If ``True``, the expansion is the first matching
+                informer, and is left out if there's none. If
+                ``False``, it's a list of all the matching informers.
+
+        Matches are found through the mediator's ``entity_index()``.
+        If the mediator's ``lazy_expansions`` attribute is ``True``,
+        the expansion is only a reference until it's used.
+
+        '''
+        entity_type = self.expansion_types[key]
+
+        if not isinstance(self.expansions, _Expansions):
+            self.expansions = _Expansions(self.expansions)
+
+        if self.mediator.lazy_expansions:
+            dict.__setitem__(
+                self.expansions, key, _ExpansionReference(
+                    self, entity_type, match_key, values, single
+                    )
+                )
+            return
+
+        informers = self.mediator.indexed_informers(
+            entity_type, match_key, values
+            )
+
+        if not single:
+            self.expansions[key] = informers
+        elif informers:
+            self.expansions[key] = informers[0]
 
 
 # - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - -
 class ELBInformer(AWSInformer):
     '''Manage selected information for an ELB resource.'''
 
+    __slots__ = ()
+
+    expansion_types = {
+        'Instances': 'ec2',
+        'SecurityGroups': 'security_group',
+        'Subnets': 'subnet',
+        'VPCId': 'vpc',
+        }
+
+    # Load balancer DNS names resolve to a rotating set of addresses.
+    volatile_fields = ['DNSIpAddress']
+
     # - - - - - - - - - - - - - - - - - - - - - - - - - - - - - -
     @classmethod
     def get_dns_address_info(cls, dns_name):
-        '''Use a socket library DNS call to get the address for dns_name.'''
+        '''Return the IPv4 addresses for dns_name.
 
-        addresses = []
+        Lookups go through ``DNS_RESOLVER``, so they're cached, and
+        time out and retry as configured there.
 
-        try:
-            addr_info = socket.getaddrinfo(dns_name, 0, socket.AF_INET)
-            for (_, _, _, _, saddr) in addr_info:
-                addresses.append(saddr[0])
-        # except socket.gaierror as exc:
-        # TODO: Retry.
-        except socket.gaierror:
-            # raise RuntimeError(
-            #     'Error in socket.getaddrinfo for %s' % dns_name
-            #     )
-            return []
+        '''
+        return DNS_RESOLVER.resolve(dns_name)
 
-        # Different parameters to getaddrinfo may return the same
-        # IP Address, so we remove duplicates here.
-        return list(set(addresses))
+    # - - - - - - - - - - - - - - - - - - - - - - - - - - - - - -
+    @classmethod
+    def prefetch_dns_addresses(cls, informers):
+        '''Start resolving the DNS names of informers in the background.
+
+        Arguments:
+
+            informers (list of ELBInformer):
+                The informers whose load balancer DNS names will be
+                needed. Their ``expand()`` methods will then only
+                wait for their own names, if those aren't resolved
+                already.
+
+        '''
+        DNS_RESOLVER.prefetch(
+            informer.resource.get('DNSName') for informer in informers
+            )
 
     # - - - - - - - - - - - - - - - - - - - - - - - - - - - - - -
     @_prevent_duplicate_informer_init_if_cached
@@ -1878,66 +4543,135 @@ class ELBInformer(AWSInformer):
             )
 
     # - - - - - - - - - - - - - - - - - - - - - - - - - - - - - -
-    def expand(self):
+    @_expand_once
+    def expand(self, max_depth=None):
         '''Fetch selected entity details.'''
 
         # - - - - - - - - - - - - - - - - - - - - - -
         # Resources stored by reference in this resource.
         # - - - - - - - - - - - - - - - - - - - - - -
-        if 'SecurityGroups' in self.resource:
-            self.expansions['SecurityGroups'] = [
-                SecurityGroupInformer(x, mediator=self.mediator)
-                for x in self.mediator.entities('security_group')
-                if x['GroupId'] in self.resource['SecurityGroups']
-                ]
+        resource = self.resource
 
-        if 'VPCId' in self.resource:
-            vpc_list_reduced = [
-                VPCInformer(x, mediator=self.mediator)
-                for x in self.mediator.entities('vpc')
-                if x['VpcId'] == self.resource['VPCId']
-                ]
-            if len(vpc_list_reduced) > 0:
-                self.expansions['VPCId'] = vpc_list_reduced[0]
-
-        if 'Subnets' in self.resource:
-            self.expansions['Subnets'] = [
-                SubnetInformer(x, mediator=self.mediator)
-                for x in self.mediator.entities('subnet')
-                if x['SubnetId'] in self.resource['Subnets']
-                ]
+        if 'SecurityGroups' in resource:
+            self._add_expansion(
+                'SecurityGroups', 'GroupId',
+                resource['SecurityGroups'], single=False
+                )
 
-        if 'Instances' in self.resource:
-            resource_instance_ids = [
-                x['InstanceId'] for x in self.resource['Instances']
-                ]
+        if 'VPCId' in resource:
+            self._add_expansion(
+                'VPCId', 'VpcId', [resource['VPCId']], single=True
+                )
 
-            self.expansions['Instances'] = [
-                EC2InstanceInformer(x, mediator=self.mediator)
-                for x in self.mediator.entities('ec2')
-                if x['InstanceId'] in resource_instance_ids
-                ]
+        if 'Subnets' in resource:
+            self._add_expansion(
+                'Subnets', 'SubnetId', resource['Subnets'],
+                single=False
+                )
+
+        if 'Instances' in resource:
+            self._add_expansion(
+                'Instances', 'InstanceId',
+                [x['InstanceId'] for x in resource['Instances']],
+                single=False
+                )
 
         # - - - - - - - - - - - - - - - - - - - - - -
         # Look up the IP addresses for this ELBs DNS name.
         # - - - - - - - - - - - - - - - - - - - - - -
         self.supplementals['DNSIpAddress'] = {'INET': []}
-        if 'DNSName' in self.to_dict():
-            dns_name = self.to_dict()['DNSName']
-
+        dns_name = self.resource.get('DNSName')
+        if dns_name:
             self.supplementals['DNSIpAddress']['INET'] = (
                 self.get_dns_address_info(dns_name)
                 )
 
         # This must be after the expansions list is populated, as it
         # calls expand() in each element of the list.
-        super(ELBInformer, self).expand()
+        super(ELBInformer, self).expand(max_depth)
 
 
 # - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - -
 class EMRInformer(AWSInformer):
     '''Manage selected information for an EMR resource.'''
 
+    __slots__ = ()
+
+    volatile_fields = ['NormalizedInstanceHours', 'Status.Timeline']
+
+    # Clusters in other states have terminated, and are listed for up
+    # to two months afterwards. See emr_cluster_states().
+    default_cluster_states = [
+        'STARTING', 'BOOTSTRAPPING', 'RUNNING', 'WAITING', 'TERMINATING'
+        ]
+
+    # The number of describe_cluster calls describe_clusters() makes
+    # at once. The calls are still subject to RATE_LIMITER.
+    DESCRIBE_THREAD_COUNT = 8
+
+    # - - - - - - - - - - - - - - - - - - - - - - - - - - - - - -
+    @staticmethod
+    def description_key(informer):
+        '''Return the key of informer's description from describe_clusters().
+
+        Descriptions are keyed by mediator as well as by cluster id, so
+        a description fetched with one account's credentials is never
+        used for an informer fetched with another's.
+
+        '''
+        return (id(informer.mediator), informer.identifier)
+
+    # - - - - - - - - - - - - - - - - - - - - - - - - - - - - - -
+    @classmethod
+    def describe_clusters(cls, informers):
+        '''Fetch the descriptions of informers' clusters concurrently.
+
+        Arguments:
+
+            informers (list of EMRInformer):
+                The informers whose clusters will be described.
+
+        Returns:
+
+            (dict) The cluster descriptions, by ``description_key()``
+            of their informers. Clusters that couldn't be described
+            are left out.
+
+        Passing an informer's description to its ``expand()`` method,
+        as ``expand(max_depth, description=description)``, uses it
+        instead of describing the cluster again.
+
+        '''
+        logger = logging.getLogger(__name__)
+        descriptions = {}
+
+        def describe(informer):
+            '''Fetch the description of one informer's cluster.'''
+            cluster_id = informer.identifier
+            try:
+                descriptions[cls.description_key(informer)] = (
+                    informer.mediator.client('emr').describe_cluster(
+                        ClusterId=cluster_id
+                        )['Cluster']
+                    )
+            except botocore.exceptions.ClientError as err:
+                logger.warning(
+                    "can't describe EMR cluster %s: %s", cluster_id, err
+                    )
+
+        if not informers:
+            return descriptions
+
+        logger.debug('describing %s EMR clusters', len(informers))
+        pool = ThreadPool(min(cls.DESCRIBE_THREAD_COUNT, len(informers)))
+        try:
+            pool.map(describe, informers)
+        finally:
+            pool.close()
+            pool.join()
+
+        return descriptions
+
     # - - - - - - - - - - - - - - - - - - - - - - - - - - - - - -
     @_prevent_duplicate_informer_init_if_cached
     def __init__(
@@ -1955,44 +4689,64 @@ class EMRInformer(AWSInformer):
             )
 
     # - - - - - - - - - - - - - - - - - - - - - - - - - - - - - -
-    def expand(self):
-        '''Fetch selected entity details.'''
+    @_expand_once
+    def expand(self, max_depth=None, description=None):
+        '''Fetch selected entity details.
+
+        Arguments:
 
-        # EMR resources add additional fields upon expansion.
-        cluster_id = self.resource['Id']
+            max_depth (int, optional):
+                As for ``AWSInformer.expand()``.
 
-        # Watch for throttling issues. Start with 20 msec backoff if needed.
-        description = None
-        initial_backoff = .02
-        backoff_growth = 1.5
-        backoff = initial_backoff
-        retries = 0
-        max_retries = 12
+            description (dict, optional):
+                The cluster's description, if it's already been fetched
+                by ``describe_clusters()``. If omitted, the cluster is
+                described here.
 
-        while description is None:
-            try:
-                description = self.mediator.client('emr').describe_cluster(
-                    ClusterId=cluster_id
-                    )['Cluster']
-            except botocore.exceptions.ClientError:
-                if retries == max_retries:
-                    break
-                time.sleep(backoff)
-                retries += 1
-                backoff *= backoff_growth ** retries
+        '''
+
+        # EMR resources add additional fields upon expansion. Throttled
+        # calls are retried by RATE_LIMITER.
+        if description is None:
+            description = self.describe_clusters([self]).get(
+                self.description_key(self)
+                )
 
         if isinstance(description, dict):
-            self.resource.update(description)
+            resource = self.resource
+            resource.update(description)
+            for key in self.elided_fields:
+                resource.pop(key, None)
+            # Reassign, in case the resource is compressed.
+            self.resource = resource
 
         # This must be after the expansions list is populated, as it
         # calls expand() in each element of the list.
-        super(EMRInformer, self).expand()
+        super(EMRInformer, self).expand(max_depth)
 
 
 # - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - -
 class EC2InstanceInformer(AWSInformer):
     '''Manage selected information for an EC2 Instance resource.'''
 
+    __slots__ = ()
+
+    expansion_types = {
+        'NetworkInterfaces': 'network_interface',
+        'SecurityGroups': 'security_group',
+        'SubnetId': 'subnet',
+        'VpcId': 'vpc',
+        }
+
+    promote_to_top_level = ('Placement',)
+
+    interned_fields = AWSInformer.interned_fields + [
+        'Architecture', 'Hypervisor', 'ImageId', 'InstanceType',
+        'KeyName', 'Placement.AvailabilityZone', 'Placement.Tenancy',
+        'RootDeviceType', 'State.Name', 'VirtualizationType',
+        'SecurityGroups.[].GroupId', 'SecurityGroups.[].GroupName',
+        ]
+
     # - - - - - - - - - - - - - - - - - - - - - - - - - - - - - -
     @_prevent_duplicate_informer_init_if_cached
     def __init__(
@@ -2009,10 +4763,6 @@ class EC2InstanceInformer(AWSInformer):
             *args, **kwargs
             )
 
-        self.promote_to_top_level = [
-            'Placement'
-            ]
-
         # The NetworkInterface elements, although they also have their
         # own AWSInformer class, come completely defined as
         # subelements of the EC2InstanceInformer resource. They have
@@ -2050,56 +4800,55 @@ class EC2InstanceInformer(AWSInformer):
             pass
 
     # - - - - - - - - - - - - - - - - - - - - - - - - - - - - - -
-    def expand(self):
+    @_expand_once
+    def expand(self, max_depth=None):
         '''Fetch selected entity details.'''
 
         # - - - - - - - - - - - - - - - - - - - - - -
         # Resources stored by reference in this resource.
         # - - - - - - - - - - - - - - - - - - - - - -
-        if 'SecurityGroups' in self.resource:
-            self.expansions['SecurityGroups'] = [
-                SecurityGroupInformer(x, mediator=self.mediator)
-                for x in self.mediator.entities('security_group')
-                if x['GroupId'] in [
-                    sg['GroupId'] for sg in self.resource['SecurityGroups']
-                    ]
-                ]
+        resource = self.resource
 
-        if 'NetworkInterfaces' in self.resource:
-            self.expansions['NetworkInterfaces'] = [
-                NetworkInterfaceInformer(x, mediator=self.mediator)
-                for x in self.mediator.entities('network_interface')
-                if x['NetworkInterfaceId'] in [
+        if 'SecurityGroups' in resource:
+            self._add_expansion(
+                'SecurityGroups', 'GroupId',
+                [sg['GroupId'] for sg in resource['SecurityGroups']],
+                single=False
+                )
+
+        if 'NetworkInterfaces' in resource:
+            self._add_expansion(
+                'NetworkInterfaces',
+                'NetworkInterfaceId',
+                [
                     ni['NetworkInterfaceId']
-                    for ni in self.resource['NetworkInterfaces']
-                    ]
-                ]
+                    for ni in resource['NetworkInterfaces']
+                    ],
+                single=False
+                )
 
-        if 'VpcId' in self.resource:
-            vpc_list_reduced = [
-                VPCInformer(x, mediator=self.mediator)
-                for x in self.mediator.entities('vpc')
-                if x['VpcId'] == self.resource['VpcId']
-                ]
-            if len(vpc_list_reduced) > 0:
-                self.expansions['VpcId'] = vpc_list_reduced[0]
-
-        if 'SubnetId' in self.resource:
-            subnet_list_reduced = [
-                SubnetInformer(x, mediator=self.mediator)
-                for x in self.mediator.entities('subnet')
-                if x['SubnetId'] == self.resource['SubnetId']
-                ]
-            if len(subnet_list_reduced) > 0:
-                self.expansions['SubnetId'] = subnet_list_reduced[0]
+        if 'VpcId' in resource:
+            self._add_expansion(
+                'VpcId', 'VpcId', [resource['VpcId']], single=True
+                )
+
+        if 'SubnetId' in resource:
+            self._add_expansion(
+                'SubnetId', 'SubnetId', [resource['SubnetId']],
+                single=True
+                )
 
-        super(EC2InstanceInformer, self).expand()
+        super(EC2InstanceInformer, self).expand(max_depth)
 
 
 # - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - -
 class SecurityGroupInformer(AWSInformer):
     '''Manage selected information for a SecurityGroup resource.'''
 
+    __slots__ = ()
+
+    expansion_types = {'VpcId': 'vpc'}
+
     # - - - - - - - - - - - - - - - - - - - - - - - - - - - - - -
     @_prevent_duplicate_informer_init_if_cached
     def __init__(
@@ -2132,7 +4881,8 @@ class SecurityGroupInformer(AWSInformer):
                         perm['PortRange'] = None
 
     # - - - - - - - - - - - - - - - - - - - - - - - - - - - - - -
-    def expand(self):
+    @_expand_once
+    def expand(self, max_depth=None):
         '''Fetch selected entity details.'''
 
         # self.expansions['IpPermissions'] = [
@@ -2146,23 +4896,22 @@ class SecurityGroupInformer(AWSInformer):
         #     ]
 
         if 'VpcId' in self.resource:
-            vpc_list_reduced = [
-                VPCInformer(x, mediator=self.mediator)
-                for x in self.mediator.entities('vpc')
-                if x['VpcId'] == self.resource['VpcId']
-                ]
-            if len(vpc_list_reduced) > 0:
-                self.expansions['VpcId'] = vpc_list_reduced[0]
+            self._add_expansion(
+                'VpcId', 'VpcId', [self.resource['VpcId']],
+                single=True
+                )
 
         # This must be after the expansions list is populated, as it
         # calls expand() in each element of the list.
-        super(SecurityGroupInformer, self).expand()
+        super(SecurityGroupInformer, self).expand(max_depth)
 
 
 # - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - -
 class VPCInformer(AWSInformer):
     '''Manage selected information for a VPC resource.'''
 
+    __slots__ = ()
+
     # - - - - - - - - - - - - - - - - - - - - - - - - - - - - - -
     @_prevent_duplicate_informer_init_if_cached
     def __init__(
@@ -2182,16 +4931,19 @@ class VPCInformer(AWSInformer):
         # Add supplementals for peering connections.
 
     # - - - - - - - - - - - - - - - - - - - - - - - - - - - - - -
-    def expand(self):
+    @_expand_once
+    def expand(self, max_depth=None):
         '''Fetch selected entity details.'''
 
-        super(VPCInformer, self).expand()
+        super(VPCInformer, self).expand(max_depth)
 
 
 # - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - -
 class VpcPeeringConnectionInformer(AWSInformer):
     '''Manage information retrieval for a VPC Peering Connection resource.'''
 
+    __slots__ = ()
+
     # - - - - - - - - - - - - - - - - - - - - - - - - - - - - - -
     @_prevent_duplicate_informer_init_if_cached
     def __init__(
@@ -2211,16 +4963,19 @@ class VpcPeeringConnectionInformer(AWSInformer):
         # Add supplementals for peering connections.
 
     # - - - - - - - - - - - - - - - - - - - - - - - - - - - - - -
-    def expand(self):
+    @_expand_once
+    def expand(self, max_depth=None):
         '''Fetch selected entity details.'''
 
-        super(VpcPeeringConnectionInformer, self).expand()
+        super(VpcPeeringConnectionInformer, self).expand(max_depth)
 
 
 # - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - -
 class InternetGatewayInformer(AWSInformer):
     '''Manage information retrieval for an Internet Gateway resource.'''
 
+    __slots__ = ()
+
     # - - - - - - - - - - - - - - - - - - - - - - - - - - - - - -
     @_prevent_duplicate_informer_init_if_cached
     def __init__(
@@ -2240,16 +4995,19 @@ class InternetGatewayInformer(AWSInformer):
         # Add supplementals for internet gateways.
 
     # - - - - - - - - - - - - - - - - - - - - - - - - - - - - - -
-    def expand(self):
+    @_expand_once
+    def expand(self, max_depth=None):
         '''Fetch selected entity details.'''
 
-        super(InternetGatewayInformer, self).expand()
+        super(InternetGatewayInformer, self).expand(max_depth)
 
 
 # - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - -
 class NatGatewayInformer(AWSInformer):
     '''Manage information retrieval for a NAT Gateway resource.'''
 
+    __slots__ = ()
+
     # - - - - - - - - - - - - - - - - - - - - - - - - - - - - - -
     @_prevent_duplicate_informer_init_if_cached
     def __init__(
@@ -2269,16 +5027,19 @@ class NatGatewayInformer(AWSInformer):
         # Add supplementals for nat gateways.
 
     # - - - - - - - - - - - - - - - - - - - - - - - - - - - - - -
-    def expand(self):
+    @_expand_once
+    def expand(self, max_depth=None):
         '''Fetch selected entity details.'''
 
-        super(NatGatewayInformer, self).expand()
+        super(NatGatewayInformer, self).expand(max_depth)
 
 
 # - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - -
 class AutoScalingGroupInformer(AWSInformer):
     '''Manage selected information for an AutoScalingGroup resource.'''
 
+    __slots__ = ()
+
     # - - - - - - - - - - - - - - - - - - - - - - - - - - - - - -
     @_prevent_duplicate_informer_init_if_cached
     def __init__(
@@ -2296,16 +5057,23 @@ class AutoScalingGroupInformer(AWSInformer):
             )
 
     # - - - - - - - - - - - - - - - - - - - - - - - - - - - - - -
-    def expand(self):
+    @_expand_once
+    def expand(self, max_depth=None):
         '''Fetch selected entity details.'''
 
-        super(AutoScalingGroupInformer, self).expand()
+        super(AutoScalingGroupInformer, self).expand(max_depth)
 
 
 # - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - -
 class SubnetInformer(AWSInformer):
     '''Manage selected information for a Subnet resource.'''
 
+    __slots__ = ()
+
+    expansion_types = {'VpcId': 'vpc'}
+
+    volatile_fields = ['AvailableIpAddressCount']
+
     # - - - - - - - - - - - - - - - - - - - - - - - - - - - - - -
     @_prevent_duplicate_informer_init_if_cached
     def __init__(
@@ -2323,25 +5091,29 @@ class SubnetInformer(AWSInformer):
             )
 
     # - - - - - - - - - - - - - - - - - - - - - - - - - - - - - -
-    def expand(self):
+    @_expand_once
+    def expand(self, max_depth=None):
         '''Fetch selected entity details.'''
 
-        super(SubnetInformer, self).expand()
-
         if 'VpcId' in self.resource:
-            vpc_list_reduced = [
-                VPCInformer(x, mediator=self.mediator)
-                for x in self.mediator.entities('vpc')
-                if x['VpcId'] == self.resource['VpcId']
-                ]
-            if len(vpc_list_reduced) > 0:
-                self.expansions['VpcId'] = vpc_list_reduced[0]
+            self._add_expansion(
+                'VpcId', 'VpcId', [self.resource['VpcId']],
+                single=True
+                )
+
+        # This must be after the expansions list is populated, as it
+        # calls expand() in each element of the list.
+        super(SubnetInformer, self).expand(max_depth)
 
 
 # - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - -
 class NetworkInterfaceInformer(AWSInformer):
     '''Manage selected information for an EC2 Network Interface resource.'''
 
+    __slots__ = ('_attach_datetime',)
+
+    expansion_types = {'Groups': 'security_group'}
+
     timestamp_format = DEFAULT_UTC_TIMESTAMP_FORMAT
 
     # - - - - - - - - - - - - - - - - - - - - - - - - - - - - - -
@@ -2378,25 +5150,28 @@ class NetworkInterfaceInformer(AWSInformer):
         return self._attach_datetime
 
     # - - - - - - - - - - - - - - - - - - - - - - - - - - - - - -
-    def expand(self):
+    @_expand_once
+    def expand(self, max_depth=None):
         '''Fetch selected entity details.'''
 
         if 'Groups' in self.resource:
-            self.expansions['Groups'] = [
-                SecurityGroupInformer(x, mediator=self.mediator)
-                for x in self.mediator.entities('security_group')
-                if x['GroupId'] in [
-                    sg['GroupId'] for sg in self.resource['Groups']
-                    ]
-                ]
+            self._add_expansion(
+                'Groups', 'GroupId',
+                [sg['GroupId'] for sg in self.resource['Groups']],
+                single=False
+                )
 
-        super(NetworkInterfaceInformer, self).expand()
+        super(NetworkInterfaceInformer, self).expand(max_depth)
 
 
 # - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - -
 class NetworkAclInformer(AWSInformer):
     '''Manage selected information for an EC2 Network ACL resource.'''
 
+    __slots__ = ()
+
+    expansion_types = {'AssociatedSubnets': 'subnet'}
+
     # - - - - - - - - - - - - - - - - - - - - - - - - - - - - - -
     @_prevent_duplicate_informer_init_if_cached
     def __init__(
@@ -2441,26 +5216,29 @@ class NetworkAclInformer(AWSInformer):
                     entry['PortRangeDesc'] = '0-65535'
 
     # - - - - - - - - - - - - - - - - - - - - - - - - - - - - - -
-    def expand(self):
+    @_expand_once
+    def expand(self, max_depth=None):
         '''Fetch selected entity details.'''
 
         if 'Associations' in self.resource:
-            self.expansions['AssociatedSubnets'] = [
-                SubnetInformer(x, mediator=self.mediator)
-                for x in self.mediator.entities('subnet')
-                if x['SubnetId'] in [
+            self._add_expansion(
+                'AssociatedSubnets', 'SubnetId',
+                [
                     association['SubnetId']
                     for association in self.resource['Associations']
-                    ]
-                ]
+                    ],
+                single=False
+                )
 
-        super(NetworkAclInformer, self).expand()
+        super(NetworkAclInformer, self).expand(max_depth)
 
 
 # - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - -
 class RouteTableInformer(AWSInformer):
     '''Manage selected information for Route Table resource.'''
 
+    __slots__ = ()
+
     # - - - - - - - - - - - - - - - - - - - - - - - - - - - - - -
     @_prevent_duplicate_informer_init_if_cached
     def __init__(
@@ -2478,7 +5256,8 @@ class RouteTableInformer(AWSInformer):
             )
 
     # - - - - - - - - - - - - - - - - - - - - - - - - - - - - - -
-    def expand(self):
+    @_expand_once
+    def expand(self, max_depth=None):
         '''Fetch selected entity details.'''
 
         # if 'Associations' in self.resource:
@@ -2491,13 +5270,15 @@ class RouteTableInformer(AWSInformer):
         #             ]
         #         ]
 
-        super(RouteTableInformer, self).expand()
+        super(RouteTableInformer, self).expand(max_depth)
 
 
 # - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - -
 class EIPInformer(AWSInformer):
     '''Manage selected information for an Elastic IP resource.'''
 
+    __slots__ = ()
+
     # - - - - - - - - - - - - - - - - - - - - - - - - - - - - - -
     @_prevent_duplicate_informer_init_if_cached
     def __init__(
@@ -2515,11 +5296,10 @@ class EIPInformer(AWSInformer):
             )
 
     # - - - - - - - - - - - - - - - - - - - - - - - - - - - - - -
-    def expand(self):
+    @_expand_once
+    def expand(self, max_depth=None):
         '''Fetch selected entity details.'''
 
-        super(EIPInformer, self).expand()
-
         # - - - - - - - - - - - - - - - -
         if 'InstanceId' in self.resource and self.resource['InstanceId']:
             instance_id = self.resource['InstanceId']
@@ -2559,10 +5339,41 @@ class EIPInformer(AWSInformer):
         else:
             self.supplementals['NetworkInterface'] = None
 
+        # Supplementals don't take part in expansion, but expanding
+        # last keeps the informer's content settled once
+        # is_expanded is set.
+        super(EIPInformer, self).expand(max_depth)
+
 
 # - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - -
 class SQSInformer(AWSInformer):
-    '''Manage selected information for a SQS resource.'''
+    '''Manage selected information for a SQS resource.
+
+    Queue attributes are fetched when the informer is created, or, if
+    the ``aws_informer.lazy_sqs_attributes`` boogio config setting is
+    true, when its resource is first used. Informers created together
+    by ``from_records()`` fetch their attributes concurrently.
+
+    '''
+
+    __slots__ = ('_attributes_loaded',)
+
+    volatile_fields = [
+        'ApproximateNumberOfMessages',
+        'ApproximateNumberOfMessagesDelayed',
+        'ApproximateNumberOfMessagesNotVisible',
+        ]
+
+    # The queue attributes requested; see sqs_attribute_names().
+    attribute_names = ['All']
+
+    # The number of get_queue_attributes calls load_attributes()
+    # makes at once. The calls are still subject to RATE_LIMITER.
+    ATTRIBUTE_THREAD_COUNT = 16
+
+    # Set while from_records() is creating informers, whose attributes
+    # it then fetches all together.
+    _deferring_attributes = threading.local()
 
     # - - - - - - - - - - - - - - - - - - - - - - - - - - - - - -
     @_prevent_duplicate_informer_init_if_cached
@@ -2580,23 +5391,128 @@ class SQSInformer(AWSInformer):
             *args, **kwargs
             )
 
-        self.resource.update(
-            self.mediator.session.resource('sqs').Queue(
-                self.resource['QueueURL']
-                ).attributes
-            )
+        self._attributes_loaded = False
 
-        # Policy comes to us as JSON which we want to convert.
-        if 'Policy' in self.resource:
-            self.resource['Policy'] = json.loads(
-                self.resource['Policy']
+        if not (
+                getattr(self._deferring_attributes, 'active', False) or
+                _BOOGIO_CONFIG.get('aws_informer', {}).get(
+                    'lazy_sqs_attributes', False
+                    )
+                ):  # pylint: disable=bad-continuation
+            self.load_attributes([self])
+
+    # - - - - - - - - - - - - - - - - - - - - - - - - - - - - - -
+    @classmethod
+    def from_records(cls, records, mediator):
+        '''Create informers, fetching their queue attributes concurrently.
+
+        See ``AWSInformer.from_records()``.
+
+        '''
+        cls._deferring_attributes.active = True
+        try:
+            informers = super(SQSInformer, cls).from_records(
+                records, mediator
+                )
+        finally:
+            cls._deferring_attributes.active = False
+
+        if not _BOOGIO_CONFIG.get('aws_informer', {}).get(
+                'lazy_sqs_attributes', False
+                ):  # pylint: disable=bad-continuation
+            cls.load_attributes(informers)
+
+        return informers
+
+    # - - - - - - - - - - - - - - - - - - - - - - - - - - - - - -
+    @classmethod
+    def load_attributes(cls, informers):
+        '''Fetch the attributes of informers' queues concurrently.
+
+        Arguments:
+
+            informers (list of SQSInformer):
+                The informers whose queue attributes will be fetched.
+                Informers which already have their attributes are
+                skipped.
+
+        Each informer's mediator's shared ``sqs`` client is used.
+
+        '''
+        informers = [
+            i for i in informers
+            if not getattr(i, '_attributes_loaded', True)
+            ]
+        if not informers:
+            return
+
+        attribute_names = sqs_attribute_names()
+
+        def load(informer):
+            '''Fetch and add the attributes of one informer's queue.'''
+            # pylint: disable=protected-access
+            informer._add_attributes(
+                informer.mediator.client('sqs').get_queue_attributes(
+                    QueueUrl=informer.identifier,
+                    AttributeNames=attribute_names
+                    ).get('Attributes', {})
                 )
 
+        if len(informers) == 1:
+            load(informers[0])
+            return
+
+        pool = ThreadPool(min(cls.ATTRIBUTE_THREAD_COUNT, len(informers)))
+        try:
+            pool.map(load, informers)
+        finally:
+            pool.close()
+            pool.join()
+
+    # - - - - - - - - - - - - - - - - - - - - - - - - - - - - - -
+    def _add_attributes(self, attributes):
+        '''Add fetched queue attributes to the informer's resource.'''
+
+        self._attributes_loaded = True
+
+        resource = AWSInformer.resource.fget(self)
+        resource.update(attributes)
+
+        # The queue attributes may include elided fields.
+        for key in self.elided_fields:
+            resource.pop(key, None)
+
+        # Policy comes to us as JSON which we want to convert.
+        if 'Policy' in resource:
+            resource['Policy'] = json.loads(resource['Policy'])
+
+        # Reassign, in case the resource is compressed.
+        self.resource = resource
+        self.invalidate_fingerprint()
+
+    # - - - - - - - - - - - - - - - - - - - - - - - - - - - - - -
+    @property
+    def resource(self):
+        '''The record for the queue, fetching its attributes if needed.
+
+        See ``AWSInformer.resource``.
+
+        '''
+        if not getattr(self, '_attributes_loaded', True):
+            self.load_attributes([self])
+        return AWSInformer.resource.fget(self)
+
+    @resource.setter
+    def resource(self, value):
+        '''Set the resource, compressing it if the current one is.'''
+        AWSInformer.resource.fset(self, value)
+
     # - - - - - - - - - - - - - - - - - - - - - - - - - - - - - -
-    def expand(self):
+    @_expand_once
+    def expand(self, max_depth=None):
         '''Fetch selected entity details.'''
 
-        super(SQSInformer, self).expand()
+        super(SQSInformer, self).expand(max_depth)
 
     # - - - - - - - - - - - - - - - - - - - - - - - - - - - - - -
     def _get_region_from_arn(self, arnstr):
@@ -2674,6 +5590,11 @@ class IAMInformer(AWSInformer):
     for a given environment.
     '''
 
+    __slots__ = (
+        'available_record_type_retrievers', 'record_types',
+        'requested_record_type_retrievers',
+        )
+
     # - - - - - - - - - - - - - - - - - - - - - - - - - - - - - -
     def __init__(
             self,
@@ -2729,7 +5650,7 @@ class IAMInformer(AWSInformer):
         # C list_users()
         # C list_virtual_mfa_devices()
         # - - - - - - - - - - - - - - - - - - - -
-        client = self.mediator.session.client('iam')
+        client = self.mediator.client('iam')
 
         # - - - - - - - - - - - - - - - - - - - -
         # Common handling
@@ -2780,6 +5701,7 @@ class IAMInformer(AWSInformer):
                 raise err
             key = request['response_data_keys'][0]
             self.supplementals[key] = response[key]
+        self.invalidate_fingerprint('supplementals')
 
         # for (key, method) in self.requested_record_type_retrievers.items():
         #     self.supplementals[key] = get_paged_data(method, key)[key]
@@ -2789,13 +5711,13 @@ class IAMInformer(AWSInformer):
     # calls.
     #
     # We need to pass quite a few parameters in the request dict so
-    # that the subprocesses can reconstruct the appropriate session
-    # client and call the right method with the necessary
+    # that the worker threads can find the appropriate shared session,
+    # create a client and call the right method with the necessary
     # parameters. We'll pass a list of requests, one for each IAM
     # User/Group/Role/etc for which we need a method call to
-    # retrieve details, to be handled by a pool of subprocesses.
+    # retrieve details, to be handled by a pool of threads.
     #
-    # The return value from the subprocess pool will again be a list
+    # The return value from the thread pool will again be a list
     # of [request, response, err] which should be in 1-1 ordered
     # correspondance with the list of requests we sent. We include
     # each request in its corresponding response for ease of
@@ -2871,7 +5793,8 @@ class IAMInformer(AWSInformer):
                 )
 
     # - - - - - - - - - - - - - - - - - - - - - - - - - - - - - -
-    def expand(self):
+    @_expand_once
+    def expand(self, max_depth=None):
         '''Fetch selected entity details.'''
 
         # client = self.mediator.session.client('iam')
@@ -3059,4 +5982,4 @@ class IAMInformer(AWSInformer):
                     request_response_err
                     )
 
-        super(IAMInformer, self).expand()
+        super(IAMInformer, self).expand(max_depth)
@@ -0,0 +1,371 @@
+# ----------------------------------------------------------------------------
+# Copyright (C) 2017 Verizon.  All Rights Reserved.
+#
+#   Licensed under the Apache License, Version 2.0 (the "License");
+#   you may not use this file except in compliance with the License.
+#   You may obtain a copy of the License at
+#
+#       http://www.apache.org/licenses/LICENSE-2.0
+#
+#   Unless required by applicable law or agreed to in writing, software
+#   distributed under the License is distributed on an "AS IS" BASIS,
+#   WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#   See the License for the specific language governing permissions and
+#   limitations under the License.
+#
+# ----------------------------------------------------------------------------
+
+'''Limit the rate of AWS API calls and retry throttled calls.
+
+AWS throttles API calls per account, region and service, so calls
+made by every mediator and worker thread for the same account, region
+and service need to share one budget. An ``AWSRateLimiter`` keeps a
+``TokenBucket`` for each ``(account, region, service)`` key. Each
+bucket's rate adapts to the limits AWS actually enforces:
+
+*   Each successful call raises the rate by a small fixed amount, up
+    to a maximum (additive increase).
+
+*   Each throttling error cuts the rate by a fixed factor, down to a
+    minimum (multiplicative decrease).
+
+The limiter works through botocore's event hooks, so once it's
+registered with a botocore session it applies to every call made by
+that session's clients, paginators and resources:
+
+``before-call``
+    Waits for a token from the call's bucket.
+
+``needs-retry``
+    On a throttling error, lowers the bucket's rate, then waits for a
+    jittered, exponentially growing delay and another token before
+    the request is sent again. The retry repeats the same request, so
+    a throttled page of a paginated listing is retried in place and
+    pagination continues from the same marker. Other errors are left
+    to botocore's own retry handling.
+
+``after-call``
+    On success, raises the bucket's rate.
+
+Example
+-------
+
+::
+
+    >>> limiter = AWSRateLimiter(limits={'emr': {'rate': 2, 'burst': 4}})
+    >>> limiter.register(session._session, lambda: '123456789012')
+
+'''
+
+import random
+import threading
+import time
+
+import logging
+# Set default logging handler to avoid "No handler found" warnings.
+try:  # Python 2.7+
+    from logging import NullHandler
+except ImportError:
+    class NullHandler(logging.Handler):
+        '''Placeholder handler.'''
+        def emit(self, record):
+            '''Dummy docstring.'''
+            pass
+
+logging.getLogger(__name__).addHandler(NullHandler())
+
+
+# Error codes AWS services use to signal throttling.
+THROTTLE_ERROR_CODES = frozenset([
+    'BandwidthLimitExceeded',
+    'EC2ThrottledException',
+    'PriorRequestNotComplete',
+    'ProvisionedThroughputExceededException',
+    'RequestLimitExceeded',
+    'RequestThrottled',
+    'RequestThrottledException',
+    'SlowDown',
+    'Throttling',
+    'ThrottlingException',
+    'TooManyRequestsException',
+    ])
+
+# Bucket parameters used for services without their own limits.
+DEFAULT_LIMITS = {
+    'rate': 20.0,
+    'burst': 40.0,
+    'min_rate': 0.5,
+    'max_rate': 100.0,
+    'increase': 0.5,
+    'decrease': 0.5,
+    }
+
+# Per-service parameters, overriding DEFAULT_LIMITS.
+DEFAULT_SERVICE_LIMITS = {
+    'emr': {'rate': 2.0, 'burst': 5.0, 'max_rate': 10.0},
+    'iam': {'rate': 10.0, 'burst': 20.0, 'max_rate': 20.0},
+    'support': {'rate': 2.0, 'burst': 5.0, 'max_rate': 10.0},
+    }
+
+# Throttled requests are retried up to this many attempts in all,
+# waiting a random time of up to RETRY_BASE_DELAY * 2 ** attempts
+# (but no more than RETRY_MAX_DELAY) seconds between attempts.
+MAX_ATTEMPTS = 10
+RETRY_BASE_DELAY = 0.1
+RETRY_MAX_DELAY = 20.0
+
+
+# - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - -
+def error_code(response):
+    '''Return the error code of a parsed botocore response, or None.'''
+    if not isinstance(response, dict):
+        return None
+    return response.get('Error', {}).get('Code')
+
+
+# - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - -
+def retry_delay(attempts, base=RETRY_BASE_DELAY, cap=RETRY_MAX_DELAY):
+    '''Return a jittered delay before retry number attempts.
+
+    The delay is chosen uniformly between zero and the exponential
+    backoff ``base * 2 ** attempts``, capped at ``cap`` seconds, so
+    that clients throttled at the same moment don't all retry at the
+    same moment.
+
+    '''
+    return random.uniform(0, min(cap, base * 2 ** attempts))
+
+
+# - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - -
+class TokenBucket(object):
+    '''A thread safe token bucket with an adaptive fill rate.
+
+    Arguments:
+
+        rate (float):
+            The initial rate, in tokens per second.
+
+        burst (float):
+            The bucket's capacity; up to this many tokens can be
+            taken at once after an idle period.
+
+        min_rate, max_rate (float):
+            The bounds of the adapted rate.
+
+        increase (float):
+            The amount the rate rises after each success.
+
+        decrease (float):
+            The factor the rate is multiplied by after each throttle.
+
+    '''
+
+    # pylint: disable=too-many-arguments,too-many-instance-attributes
+
+    def __init__(
+            self, rate, burst, min_rate, max_rate, increase, decrease
+            ):  # pylint: disable=bad-continuation
+        '''Initialize a TokenBucket instance.'''
+
+        self.rate = float(rate)
+        self.burst = float(burst)
+        self.min_rate = float(min_rate)
+        self.max_rate = float(max_rate)
+        self.increase = float(increase)
+        self.decrease = float(decrease)
+
+        self._tokens = self.burst
+        self._updated = time.time()
+        self._lock = threading.Lock()
+
+    # - - - - - - - - - - - - - - - - - - - - - - - - - - - - - -
+    def acquire(self):
+        '''Take a token, waiting for one if needed.
+
+        Returns:
+
+            (float) The number of seconds spent waiting.
+
+        '''
+        waited = 0.0
+
+        while True:
+            with self._lock:
+                now = time.time()
+                self._tokens = min(
+                    self.burst,
+                    self._tokens + (now - self._updated) * self.rate
+                    )
+                self._updated = now
+
+                if self._tokens >= 1:
+                    self._tokens -= 1
+                    return waited
+
+                wait = (1 - self._tokens) / self.rate
+
+            time.sleep(wait)
+            waited += wait
+
+    # - - - - - - - - - - - - - - - - - - - - - - - - - - - - - -
+    def succeeded(self):
+        '''Raise the rate after a successful call.'''
+        with self._lock:
+            self.rate = min(self.max_rate, self.rate + self.increase)
+
+    # - - - - - - - - - - - - - - - - - - - - - - - - - - - - - -
+    def throttled(self):
+        '''Lower the rate after a throttled call.'''
+        with self._lock:
+            self.rate = max(self.min_rate, self.rate * self.decrease)
+            # Don't let a burst of saved tokens defeat the cut.
+            self._tokens = min(self._tokens, 1.0)
+
+
+# - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - -
+class AWSRateLimiter(object):
+    '''Share AWS call rate limits between sessions, clients and threads.
+
+    Arguments:
+
+        limits (dict, optional):
+            Bucket parameters, as for ``TokenBucket``. The
+            ``default`` key's parameters override ``DEFAULT_LIMITS``
+            for all services, and each service name key's parameters
+            override those for that service; e.g.::
+
+                {
+                    "default": {"rate": 10, "burst": 20},
+                    "emr": {"rate": 1}
+                    }
+
+        max_attempts (int, optional):
+            The total number of attempts for a throttled request.
+
+    '''
+
+    def __init__(self, limits=None, max_attempts=MAX_ATTEMPTS):
+        '''Initialize an AWSRateLimiter instance.'''
+
+        self.limits = {}
+        for (service, service_limits) in DEFAULT_SERVICE_LIMITS.iteritems():
+            self.limits[service] = dict(service_limits)
+        for (key, key_limits) in (limits or {}).iteritems():
+            self.limits.setdefault(key, {}).update(key_limits)
+
+        self.max_attempts = max_attempts
+
+        self._buckets = {}
+        self._lock = threading.Lock()
+
+    # - - - - - - - - - - - - - - - - - - - - - - - - - - - - - -
+    def bucket(self, account_id, region_name, service):
+        '''Return the token bucket for an account, region and service.'''
+
+        key = (account_id, region_name, service)
+
+        with self._lock:
+            if key not in self._buckets:
+                parameters = dict(DEFAULT_LIMITS)
+                parameters.update(self.limits.get('default', {}))
+                parameters.update(self.limits.get(service, {}))
+                self._buckets[key] = TokenBucket(**parameters)
+            return self._buckets[key]
+
+    # - - - - - - - - - - - - - - - - - - - - - - - - - - - - - -
+    def clear(self):
+        '''Discard all buckets, and with them their adapted rates.'''
+        with self._lock:
+            self._buckets.clear()
+
+    # - - - - - - - - - - - - - - - - - - - - - - - - - - - - - -
+    def register(self, botocore_session, account_id):
+        '''Limit the calls made through a botocore session.
+
+        Arguments:
+
+            botocore_session (botocore.session.Session):
+                The session to register event handlers with. Only
+                clients created after registration are limited.
+
+            account_id (callable):
+                A function of no arguments returning the account
+                identifier to use in bucket keys.
+
+        Registering the same session again has no effect.
+
+        '''
+
+        def call_bucket(model, context):
+            '''Return the bucket for an API call.'''
+            return self.bucket(
+                account_id(),
+                context.get('client_region'),
+                model.service_model.service_name
+                )
+
+        def before_call(model, context, **kwargs):
+            '''Wait for a token before a call.'''
+            # pylint: disable=unused-argument
+            call_bucket(model, context).acquire()
+
+        def after_call(model, context, http_response, **kwargs):
+            '''Raise the call rate after a success.'''
+            # pylint: disable=unused-argument
+            if http_response.status_code < 300:
+                call_bucket(model, context).succeeded()
+
+        def needs_retry(
+                operation, attempts, response, request_dict, **kwargs
+                ):  # pylint: disable=bad-continuation
+            '''Lower the call rate and retry after a throttle.'''
+            # pylint: disable=unused-argument
+            logger = logging.getLogger(__name__)
+
+            if response is None:
+                return None
+            code = error_code(response[1])
+            if code not in THROTTLE_ERROR_CODES:
+                return None
+
+            bucket = call_bucket(operation, request_dict['context'])
+            bucket.throttled()
+
+            if attempts >= self.max_attempts:
+                if attempts == self.max_attempts:
+                    logger.warning(
+                        'giving up on %s.%s after %s throttled attempts',
+                        operation.service_model.service_name,
+                        operation.name, attempts
+                        )
+                return None
+
+            delay = retry_delay(attempts)
+            logger.debug(
+                '%s.%s throttled (%s), retrying in %.2f s at %.2f/s',
+                operation.service_model.service_name, operation.name,
+                code, delay, bucket.rate
+                )
+            time.sleep(delay)
+            bucket.acquire()
+
+            # The delay has already been spent; retry right away.
+            return 0
+
+        events = botocore_session.get_component('event_emitter')
+        events.register(
+            'before-call.*.*', before_call,
+            unique_id='boogio-limit-before-call'
+            )
+        events.register(
+            'after-call.*.*', after_call,
+            unique_id='boogio-limit-after-call'
+            )
+        # Handlers for more specific event names are called first, so
+        # this comes before botocore's own retry handler, registered
+        # for 'needs-retry.<service>', and its answer takes precedence
+        # for throttling errors.
+        events.register(
+            'needs-retry.*.*', needs_retry,
+            unique_id='boogio-limit-needs-retry'
+            )
@@ -0,0 +1,281 @@
+# ----------------------------------------------------------------------------
+# Copyright (C) 2017 Verizon.  All Rights Reserved.
+#
+#   Licensed under the Apache License, Version 2.0 (the "License");
+#   you may not use this file except in compliance with the License.
+#   You may obtain a copy of the License at
+#
+#       http://www.apache.org/licenses/LICENSE-2.0
+#
+#   Unless required by applicable law or agreed to in writing, software
+#   distributed under the License is distributed on an "AS IS" BASIS,
+#   WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#   See the License for the specific language governing permissions and
+#   limitations under the License.
+#
+# ----------------------------------------------------------------------------
+
+'''Stream items through stages running on worker threads.
+
+A survey normally runs in phases: every page of every entity type is
+fetched, then every informer is constructed, then every informer is
+expanded, and only then is the report extracted and written. Nothing
+is written until the whole estate has been read, and the whole estate
+is held in memory at once.
+
+A ``Pipeline`` instead connects a chain of stages with bounded
+queues. Each stage is a function of one item returning an iterable of
+items for the next stage, and runs on its own worker threads. As soon
+as the first item has made it through every stage, it's available to
+the caller, and when a later stage falls behind, the queue feeding it
+fills and the stages before it block until there's room again. The
+number of items in flight is thus bounded by the queue sizes and
+worker counts, not by the number of items.
+
+Example
+-------
+
+::
+
+    >>> pipeline = Pipeline(queue_size=8)
+    >>> pipeline.add_stage(lambda n: range(n), workers=2)
+    >>> pipeline.add_stage(lambda n: [n * n], workers=4)
+    >>> sorted(pipeline.run([1, 2, 3]))
+    [0, 0, 0, 1, 1, 4]
+
+'''
+
+import Queue
+import sys
+import threading
+
+import logging
+# Set default logging handler to avoid "No handler found" warnings.
+try:  # Python 2.7+
+    from logging import NullHandler
+except ImportError:
+    class NullHandler(logging.Handler):
+        '''Placeholder handler.'''
+        def emit(self, record):
+            '''Dummy docstring.'''
+            pass
+
+logging.getLogger(__name__).addHandler(NullHandler())
+
+
+# The default maximum number of items waiting between two stages.
+DEFAULT_QUEUE_SIZE = 64
+
+# How often, in seconds, threads blocked on a queue check whether the
+# pipeline has been abandoned.
+POLL_INTERVAL = 0.1
+
+# Marks the end of a stage's input.
+_DONE = object()
+
+
+# - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - -
+class PipelineAborted(Exception):
+    '''Raised inside a pipeline's threads when the pipeline is abandoned.'''
+    pass
+
+
+# - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - -
+class Pipeline(object):
+    '''A chain of stages connected by bounded queues.
+
+    Arguments:
+
+        queue_size (int, optional):
+            The maximum number of items waiting between two stages.
+
+    '''
+
+    def __init__(self, queue_size=DEFAULT_QUEUE_SIZE):
+        '''Initialize a Pipeline instance.'''
+
+        self.queue_size = queue_size
+        self._stages = []
+
+    # - - - - - - - - - - - - - - - - - - - - - - - - - - - - - -
+    @property
+    def stages(self):
+        '''The ``(name, function, workers)`` tuple for each stage.'''
+        return list(self._stages)
+
+    # - - - - - - - - - - - - - - - - - - - - - - - - - - - - - -
+    def add_stage(self, function, workers=1, name=None):
+        '''Add a stage at the end of the pipeline.
+
+        Arguments:
+
+            function (callable):
+                A function of one item, returning an iterable of the
+                items to pass on to the next stage. A generator's
+                items are passed on as they're generated.
+
+            workers (int, default=1):
+                The number of threads to run the stage in. With more
+                than one worker, a stage's items may be passed on in
+                a different order than they arrived.
+
+            name (str, optional):
+                A name for the stage, used in thread names and log
+                messages. By default, the function's name is used.
+
+        Returns:
+
+            (Pipeline) This pipeline, so calls can be chained.
+
+        '''
+        if workers < 1:
+            raise ValueError('stage needs at least one worker')
+
+        if name is None:
+            name = getattr(function, '__name__', 'stage')
+
+        self._stages.append((name, function, workers))
+
+        return self
+
+    # - - - - - - - - - - - - - - - - - - - - - - - - - - - - - -
+    def run(self, items):
+        '''Run items through the pipeline, yielding the last stage's items.
+
+        Arguments:
+
+            items (iterable):
+                The items for the first stage. These are read by a
+                separate thread as the first stage has room for them,
+                so this can be a generator, or another pipeline's
+                ``run()``.
+
+        Returns:
+
+            (generator) The items passed on by the last stage, as
+            they're passed on.
+
+        Raises:
+
+            Exception: Any exception raised by a stage function or
+                by iterating over ``items``. The rest of the pipeline
+                is stopped first.
+
+        The pipeline's threads stop when the last item has been
+        yielded, when any stage raises an exception, or when the
+        returned generator is closed or garbage collected before it's
+        exhausted.
+
+        '''
+        logger = logging.getLogger(__name__)
+
+        queues = [
+            Queue.Queue(maxsize=self.queue_size)
+            for _ in range(len(self._stages) + 1)
+            ]
+        aborted = threading.Event()
+        errors = []
+
+        def put(queue, item):
+            '''Put an item on a queue, giving up if the pipeline stops.'''
+            while True:
+                if aborted.is_set():
+                    raise PipelineAborted()
+                try:
+                    queue.put(item, timeout=POLL_INTERVAL)
+                    return
+                except Queue.Full:
+                    pass
+
+        def get(queue):
+            '''Get an item from a queue, giving up if the pipeline stops.'''
+            while True:
+                if aborted.is_set():
+                    raise PipelineAborted()
+                try:
+                    return queue.get(timeout=POLL_INTERVAL)
+                except Queue.Empty:
+                    pass
+
+        def fail(name):
+            '''Record the current exception and stop the pipeline.'''
+            logger.debug('pipeline stage %s failed', name, exc_info=True)
+            errors.append(sys.exc_info())
+            aborted.set()
+
+        def feed():
+            '''Put the input items on the first stage's queue.'''
+            try:
+                for item in items:
+                    put(queues[0], item)
+                put(queues[0], _DONE)
+            except PipelineAborted:
+                pass
+            except Exception:  # pylint: disable=broad-except
+                fail('input')
+
+        threads = [threading.Thread(target=feed, name='pipeline-input')]
+
+        for (index, (name, function, workers)) in enumerate(self._stages):
+
+            # The last of a stage's workers to finish tells the next
+            # stage there's nothing more coming.
+            remaining = [workers]
+            remaining_lock = threading.Lock()
+
+            def work(
+                    name=name, function=function,
+                    inbox=queues[index], outbox=queues[index + 1],
+                    remaining=remaining, remaining_lock=remaining_lock
+                    ):  # pylint: disable=bad-continuation
+                '''Pass a stage's items through its function.'''
+                try:
+                    while True:
+                        item = get(inbox)
+                        if item is _DONE:
+                            # Let this stage's other workers see it too.
+                            put(inbox, _DONE)
+                            break
+                        for result in function(item):
+                            put(outbox, result)
+
+                    with remaining_lock:
+                        remaining[0] -= 1
+                        last = remaining[0] == 0
+                    if last:
+                        put(outbox, _DONE)
+
+                except PipelineAborted:
+                    pass
+                except Exception:  # pylint: disable=broad-except
+                    fail(name)
+
+            threads.extend(
+                threading.Thread(
+                    target=work, name='pipeline-%s-%s' % (name, worker)
+                    )
+                for worker in range(workers)
+                )
+
+        for thread in threads:
+            thread.daemon = True
+            thread.start()
+
+        try:
+            while True:
+                try:
+                    item = get(queues[-1])
+                except PipelineAborted:
+                    break
+                if item is _DONE:
+                    break
+                yield item
+
+        finally:
+            aborted.set()
+            for thread in threads:
+                thread.join()
+
+        if errors:
+            (error_type, error, error_traceback) = errors[0]
+            raise error_type, error, error_traceback
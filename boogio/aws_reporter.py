@@ -158,6 +158,7 @@ for nested.
 import copy
 import json
 import os
+import tempfile
 
 import logging
 # Set default logging handler to avoid "No handler found" warnings.
@@ -169,6 +170,8 @@ except ImportError:
         def emit(self, record):
             pass
 
+from boogio import aws_informer
+from boogio import aws_pipeline
 from boogio.utensils import flatten
 from boogio.utensils import prune
 from boogio.utensils import tabulizer
@@ -176,6 +179,47 @@ from boogio.utensils import tabulizer
 logging.getLogger(__name__).addHandler(NullHandler())
 
 
+# - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - -
+def _path_field(path):
+    '''Return the top level resource key a prune spec path starts with.'''
+    # Tags and promoted keys appear as, e.g., Tags:Name.
+    return path.split('.')[0].split(':')[0]
+
+
+# - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - -
+def _expansion_fields(entity_type, path):
+    '''Return the fields of other entity types a path reads.
+
+    Arguments:
+
+        entity_type (string): The entity type the path starts at.
+
+        path (string): A prune spec path.
+
+    Returns:
+
+        (list of tuple) An ``(entity type, top level resource key)``
+        pair for each expansion the path leads into, in order.
+
+    '''
+    fields = []
+    segments = path.split('.')
+    while len(segments) > 1:
+        target_type = aws_informer.informer_expansion_types(
+            entity_type
+            ).get(segments[0].split(':')[0])
+        if target_type is None:
+            break
+        segments = segments[1:]
+        while segments and segments[0] == '[]':
+            segments = segments[1:]
+        if not segments:
+            break
+        entity_type = target_type
+        fields.append((entity_type, _path_field(segments[0])))
+    return fields
+
+
 # - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - -
 class ReportDefinition(object):
     '''Manage AWSReporter report definitions.
@@ -204,7 +248,15 @@ class ReportDefinition(object):
             value for any prune spec entry that doesn't explicitly
             define it will be set to this value.
 
+        elisions (list of str, optional):
+            Top level resource keys of the report's entity type that
+            the report doesn't need. A surveyor can elide these from
+            the informers it creates; see ``AWSReporter.elisions()``.
+
+    Raises:
 
+        ValueError: If any of the ``prune_specs`` paths needs a field
+        in ``elisions``.
 
     '''
 
@@ -215,7 +267,8 @@ class ReportDefinition(object):
             entity_type,
             prune_specs=None,
             default_column_order=None,
-            default_path_to_none=True
+            default_path_to_none=True,
+            elisions=None
             ):  # pylint: disable=bad-continuation
         '''Initialize a ReportDefinition instance.'''
 
@@ -232,6 +285,19 @@ class ReportDefinition(object):
             if 'path_to_none' not in pspec:
                 pspec['path_to_none'] = self.default_path_to_none
 
+        self.elisions = [] if elisions is None else list(elisions)
+
+        conflicts = [
+            pspec['path'] for pspec in self._prune_specs
+            if _path_field(pspec['path']) in self.elisions
+            ]
+        if conflicts:
+            raise ValueError(
+                'report %s elides fields needed by paths %s' % (
+                    self.name, ', '.join(conflicts)
+                    )
+                )
+
     # - - - - - - - - - - - - - - - - - - - - - - - - - - - -
     @property
     def prune_specs(self):
@@ -258,7 +324,12 @@ class ReportDefinition(object):
             name=self.name,
             entity_type=self.entity_type,
             prune_specs=list(self.prune_specs),
-            default_column_order=list(self.default_column_order)
+            default_column_order=(
+                None if self.default_column_order is None
+                else list(self.default_column_order)
+                ),
+            default_path_to_none=self.default_path_to_none,
+            elisions=list(self.elisions)
             )
 
         return copied
@@ -281,6 +352,12 @@ class ReportDefinition(object):
                 ``utensils.prune`` and ``utensils.flatten``
                 for more information.
 
+        Raises:
+
+            aws_informer.AWSInformerElidedFieldError: If any of the
+            ``prune_specs`` paths needs a field that was elided from
+            an informer.
+
         '''
         pruner = prune.Pruner(*self.prune_specs)
         extractable_informers = [
@@ -288,15 +365,38 @@ class ReportDefinition(object):
             if i.entity_type == self.entity_type
             ]
 
+        paths = [pspec['path'] for pspec in self.prune_specs]
+        for informer in extractable_informers:
+            elided_path = getattr(informer, 'elided_path', None)
+            if elided_path is None:
+                continue
+            for path in paths:
+                elided = elided_path(path)
+                if elided is not None:
+                    raise aws_informer.AWSInformerElidedFieldError(
+                        'report %s path %s for %s %s needs elided'
+                        ' field %s' % (
+                            self.name, path, informer.entity_type,
+                            informer.identifier, elided
+                            )
+                        )
+
+        def informer_dict(informer):
+            '''Return the informer content the report reads.'''
+            # Only the expansions the report reads are needed.
+            if isinstance(informer, aws_informer.AWSInformer):
+                return informer.to_dict(paths=paths)
+            return informer.to_dict()
+
         if flat:
             records = flatten.flatten([
-                pruner.prune_branches(informer.to_dict(), balanced=True)
+                pruner.prune_branches(informer_dict(informer), balanced=True)
                 for informer in extractable_informers
                 ])
 
         else:
             records = [
-                pruner.prune_tree(informer.to_dict())
+                pruner.prune_tree(informer_dict(informer))
                 for informer in extractable_informers
                 ]
 
@@ -455,6 +555,53 @@ class AWSReporter(object):
 
         return combined_definitions
 
+    # - - - - - - - - - - - - - - - - - - - - - - - - - - - -
+    def elisions(self, report_names=None, report_definitions=None):
+        '''Return the fields the selected reports can all do without.
+
+        Arguments:
+
+            report_names (list of str, optional):
+                The names of assigned report definitions to include.
+                If neither this nor ``report_definitions`` is
+                specified, all assigned report definitions are
+                included.
+
+            report_definitions (list of ReportDefinition, optional):
+                Additional report definitions to include.
+
+        Returns:
+
+            (dict) A dict whose keys are entity types and whose
+            values are the lists of fields in the ``elisions`` of
+            every included report definition for that entity type,
+            suitable for passing to ``AWSSurveyor.add_elisions()``.
+            Fields that any included report reads through an
+            expansion from another entity type are left out.
+
+        '''
+        by_type = {}
+        needed = {}
+        for definition in self._combined_report_definitions(
+                report_names, report_definitions
+                ):  # pylint: disable=bad-continuation
+            fields = set(definition.elisions)
+            if definition.entity_type in by_type:
+                fields &= by_type[definition.entity_type]
+            by_type[definition.entity_type] = fields
+
+            for pspec in definition.prune_specs:
+                for (entity_type, field) in _expansion_fields(
+                        definition.entity_type, pspec['path']
+                        ):  # pylint: disable=bad-continuation
+                    needed.setdefault(entity_type, set()).add(field)
+
+        return {
+            entity_type: sorted(fields - needed.get(entity_type, set()))
+            for (entity_type, fields) in by_type.items()
+            if fields - needed.get(entity_type, set())
+            }
+
     # - - - - - - - - - - - - - - - - - - - - - - - - - - - -
     def report_names(
             self,
@@ -599,21 +746,124 @@ class AWSReporter(object):
         # with which we'll report.
         # - - - - - - - - - - - - - - - - - - - - - - - -
 
-        this_report_informers = informers
-
-        for surveyor in surveyors:
-            this_report_informers.extend(surveyor.informers())
-
         # Either report_definition is the report to use, or report_name
         # holds the name of an assigned report to use.
         if report_definition is None:
             report_definition = self.report_definitions(report_name)[0]
 
+        # Only informers of the report's entity type are extracted,
+        # so that's all we need from the surveyors.
+        entity_types = ()
+        if report_definition.entity_type in aws_informer.entity_types():
+            entity_types = (report_definition.entity_type,)
+
+        this_report_informers = informers
+
+        for surveyor in surveyors:
+            this_report_informers.extend(surveyor.informers(*entity_types))
+
         return report_definition.extract_from(
             this_report_informers,
             flat=flat
             )
 
+    # - - - - - - - - - - - - - - - - - - - - - - - - - - - -
+    def diff_report(
+            self,
+            diff,
+            report_name=None,
+            report_definition=None,
+            statuses=None,
+            relevant_only=True,
+            flat=True
+            ):  # pylint: disable=bad-continuation
+        '''Generate a report over the differences between two surveys.
+
+        Arguments:
+
+            diff (aws_differ.AWSSurveyDiff):
+                The differences on which to report.
+
+            report_name (str, optional):
+                The name of an ``aws_reporter.ReportDefinition``
+                instance assigned to this reporter to be generated.
+
+            report_definition (ReportDefinition, optional):
+                An ``aws_reporter.ReportDefinition`` instance to be
+                generated.
+
+            statuses (list of str, optional):
+                If provided, only report differences with these
+                statuses (``'added'``, ``'removed'``, ``'changed'``).
+
+            relevant_only (bool, default=True):
+                If ``True``, omit changed entities none of whose
+                changed paths overlap the report definition's prune
+                paths.
+
+            flat (bool, default=True):
+                A flag to pass through to the report definition
+                ``extract_from()`` method.
+
+        Raises:
+
+            IndexError: If ``report_name`` isn't the ``name``
+                attribute of a member of ``self.report_definitions()``.
+
+            TypeError: If not exactly one of ``report_name`` and
+                ``report_definition`` is defined.
+
+        Returns:
+
+            list: The result of extracting the report from the diff
+            records. A ``diff.status`` field holding the difference
+            status is added to each record ahead of the report
+            definition's own fields.
+
+        '''
+        if report_definition is None and report_name is None:
+            raise TypeError(
+                'no report definition assigned or named'
+                )
+
+        if report_definition is not None and report_name is not None:
+            raise TypeError(
+                'multiple report definitions (both assigned and named)'
+                )
+
+        if report_name is not None:
+            if report_name not in self.report_names():
+                raise IndexError(
+                    'no assigned report definition with name'
+                    ' %s' % report_name
+                    )
+            report_definition = self.report_definitions(report_name)[0]
+
+        report_paths = [s['path'] for s in report_definition.prune_specs]
+
+        records = [
+            r for r in diff.informers(report_definition.entity_type)
+            if (statuses is None or r.status in statuses) and
+            (not relevant_only or r.touches(report_paths))
+            ]
+
+        status_spec = {'path': 'diff.status', 'path_to_none': True}
+        diff_definition = ReportDefinition(
+            name=report_definition.name,
+            entity_type=report_definition.entity_type,
+            prune_specs=[status_spec] + report_definition.prune_specs,
+            default_column_order=(
+                None if report_definition.default_column_order is None
+                else (
+                    [status_spec['path']] +
+                    report_definition.default_column_order
+                    )
+                ),
+            default_path_to_none=report_definition.default_path_to_none
+            )
+
+        return diff_definition.extract_from(records, flat=flat)
+
     # - - - - - - - - - - - - - - - - - - - - - - - - - - - -
     def reports(
             self,
@@ -1209,3 +1459,164 @@ class AWSReporter(object):
 
         with open(output_path, 'w') as fptr:
             fptr.write(report_json)
+
+    # - - - - - - - - - - - - - - - - - - - - - - - - - - - -
+    def write_stream(
+            self,
+            output_path,
+            informers,
+            output_format='csv',
+            report_name=None,
+            report_definition=None,
+            flat=True,
+            overwrite=False,
+            workers=1,
+            queue_size=aws_pipeline.DEFAULT_QUEUE_SIZE
+            ):  # pylint: disable=bad-continuation
+        '''Write a report as informers arrive.
+
+        Arguments:
+
+            output_path (string):
+                The path to the resulting file.
+
+            informers (iterable of AWSInformer):
+                The informers on which to report, e.g. from
+                ``AWSSurveyor.stream_informers()``.
+
+            output_format (str, default='csv'):
+                One of ``csv``, ``tsv`` or ``json``.
+
+            flat (bool, default=True):
+                As for ``report()``. Only ``json`` reports can be
+                nested.
+
+            overwrite (bool, default=False):
+                If ``True``, overwrite any existing file already
+                present.
+
+            workers (int, default=1):
+                The number of threads extracting report records.
+                With more than one, records are written in the order
+                they're extracted.
+
+            queue_size (int, optional):
+                The number of informers and extracted records that
+                can wait for the next step, as for
+                ``aws_pipeline.Pipeline``.
+
+        See the documentation for ``report()`` for details on other
+        arguments and exceptions.
+
+        Raises:
+
+            ValueError: If ``overwrite`` is ``False`` and a file
+                already exists at the location specified by
+                ``output_path``, or if ``output_format`` isn't
+                supported.
+
+        Returns: ``None``.
+
+        Records are extracted from each informer as it arrives, in
+        ``aws_pipeline.Pipeline`` worker threads, and written out
+        while later informers are still arriving. The output matches
+        that of ``write_csv()``, ``write_tsv()`` or ``write_json()``
+        except for the order of rows.
+
+        Tabular reports need their columns before the first row is
+        written. A report definition without a
+        ``default_column_order`` takes its columns from the keys of
+        all its records, so its records are spooled to a temporary
+        file until the last has been extracted, and columns are
+        sorted.
+
+        '''
+        separators = {'csv': ',', 'tsv': '\t', 'json': None}
+
+        if output_format not in separators:
+            raise ValueError('unsupported output format %s' % output_format)
+
+        if not flat and output_format != 'json':
+            raise ValueError('%s reports must be flat' % output_format)
+
+        if overwrite is False and os.path.exists(output_path):
+            raise ValueError('%s already exists' % output_path)
+
+        if report_definition is None and report_name is None:
+            raise TypeError(
+                'no report definition assigned or named'
+                )
+
+        if report_definition is not None and report_name is not None:
+            raise TypeError(
+                'multiple report definitions (both assigned and named)'
+                )
+
+        if report_name is not None:
+            if report_name not in self.report_names():
+                raise IndexError(
+                    'no assigned report definition with name'
+                    ' %s' % report_name
+                    )
+            report_definition = self.report_definitions(report_name)[0]
+
+        separator = separators[output_format]
+        columns = report_definition.default_column_order
+
+        def extract(informer):
+            '''Return an informer's report records, as one item.'''
+            return [report_definition.extract_from([informer], flat=flat)]
+
+        pipeline = aws_pipeline.Pipeline(queue_size=queue_size)
+        pipeline.add_stage(extract, workers=workers)
+        record_lists = pipeline.run(informers)
+
+        spool = None
+        if flat and columns is None:
+            # Spool the records until all their keys are known.
+            spool = tempfile.TemporaryFile()
+            keys = set()
+            for records in record_lists:
+                for record in records:
+                    keys.update(record.keys())
+                    spool.write(json.dumps(record))
+                    spool.write('\n')
+            columns = sorted(keys)
+            spool.seek(0)
+            record_lists = ([json.loads(line)] for line in spool)
+
+        try:
+            with open(output_path, 'w') as fptr:
+
+                if output_format == 'json':
+                    fptr.write('[')
+                    delimiter = ''
+                    for records in record_lists:
+                        for record in records:
+                            if flat:
+                                record = {c: record.get(c) for c in columns}
+                            fptr.write(delimiter)
+                            fptr.write(json.dumps(record))
+                            delimiter = ', '
+                        fptr.flush()
+                    fptr.write(']')
+                    return
+
+                if columns:
+                    fptr.write(separator.join(columns))
+                    fptr.write('\n')
+
+                for records in record_lists:
+                    for line in tabulizer.Tabulizer(
+                            data=records, columns=columns
+                            ).sv(
+                                include_headers=False,
+                                separator=separator
+                                ):  # pylint: disable=bad-continuation
+                        fptr.write(line)
+                        fptr.write('\n')
+                    fptr.flush()
+
+        finally:
+            if spool is not None:
+                spool.close()
@@ -145,6 +145,11 @@ add to, rather than overwriting, configuration file presets set the
             ...     set_all_regions=True
             ...     )
 
+    A surveyor created with ``skip_empty_regions=True`` skips regions
+    where a quick probe finds none of the entity types being
+    surveyed; see ``occupied_mediators()``. Pass ``full_sweep=True``
+    to ``survey()`` to survey every region anyway.
+
 
 .. _aws_surveyor_config_files_label:
 
@@ -288,10 +293,15 @@ the survey as a list of ``AWSInformer`` instances.
 
 '''
 
+import array
 from datetime import datetime
+import heapq
 import itertools
 import json
+from multiprocessing.pool import ThreadPool
 import os
+import threading
+import time
 
 import logging
 # Set default logging handler to avoid "No handler found" warnings.
@@ -304,7 +314,11 @@ except ImportError:
             '''Pylint-compliant docstring.'''
             pass
 
+from boogio import aws_async
+from boogio import aws_checkpoint
+from boogio import aws_graph
 from boogio import aws_informer
+from boogio import aws_pipeline
 
 from utensils import flatten
 from utensils import prune
@@ -314,6 +328,12 @@ logging.getLogger(__name__).addHandler(NullHandler())
 # We will cache the result of looking this up in AWS.
 _ALL_REGIONS = None
 
+# The outcomes recorded in AWSSurveyor.survey_status for each mediator
+# and entity type.
+COMPLETE = 'complete'
+INCOMPLETE = 'incomplete'
+FAILED = 'error'
+
 
 # - - - - - - - - - - - - - - - - - - - - - - - - - - - -
 #
@@ -355,7 +375,6 @@ def all_regions(profile_name=None, region_name=None, *filters):
         ['ap-southeast-2', 'us-west-2']
 
     '''
-    import boto3
     logger = logging.getLogger(__name__)
 
     # This is what was returned for a particular profile and environment at
@@ -393,7 +412,7 @@ def all_regions(profile_name=None, region_name=None, *filters):
         else:
             boto_kwargs.setdefault('region_name', 'us-east-1')
 
-        sess = boto3.session.Session(**boto_kwargs)
+        sess = aws_informer.shared_session(**boto_kwargs)
 
         kwargs_msg = (
             str(boto_kwargs) if len(boto_kwargs)
@@ -433,6 +452,36 @@ def all_regions(profile_name=None, region_name=None, *filters):
     return regions
 
 
+# - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - -
+def _expand_in_dependency_order(informer, max_depth, **kwargs):
+    '''Expand the informers in informer's expansions, then informer.
+
+    Each informer's own expansions are fetched once, by calling its
+    ``expand()`` method with ``max_depth=1``, and those expansions are
+    expanded before the informer is expanded to ``max_depth``, by
+    which time the informers beneath it are all already expanded.
+
+    Any other keyword arguments are passed to that first call of
+    informer's ``expand()`` method, and not to its expansions'.
+
+    '''
+    if max_depth is not None and max_depth < 1:
+        return
+
+    if informer.is_expanded:
+        informer.expand(max_depth)
+        return
+
+    informer.expand(1, **kwargs)
+
+    # Lazy expansions are left until they're used.
+    child_depth = None if max_depth is None else max_depth - 1
+    for child in informer.expansion_informers(resolve=False):
+        _expand_in_dependency_order(child, child_depth)
+
+    informer.expand(max_depth)
+
+
 # - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - -
 class AWSSurveyor(object):
     '''Manage AWS queries and ``AWSInformer`` instances with the results.
@@ -466,6 +515,11 @@ class AWSSurveyor(object):
             all currently available regions. This requires a call to
             ``aws_surveyor.all_regions()``, which connects to AWS.
 
+        skip_empty_regions (bool, default=False):
+            If `True`, ``survey()`` skips regional entity types in
+            regions where ``occupied_mediators()`` finds none of the
+            entity types being surveyed.
+
     Attributes:
 
         mediators (list of AWSMediator):
@@ -481,6 +535,18 @@ class AWSSurveyor(object):
 
     _presets_attributes = ['profiles', 'regions', 'entity_types']
 
+    _region_occupancy_filename = 'aws_surveyor_region_types.json'
+
+    # Region occupancy probe results are reused for this many seconds.
+    region_occupancy_ttl = 24 * 60 * 60
+
+    REGION_PROBE_THREAD_COUNT = 16
+
+    PREFETCH_THREAD_COUNT = 16
+
+    STREAM_FETCH_THREAD_COUNT = 8
+    STREAM_EXPAND_THREAD_COUNT = 4
+
     # Set this to True to prevent attempts to create AWS sessions at
     # initialization. This will prevent population of the _mediators
     # attribute.
@@ -554,6 +620,16 @@ class AWSSurveyor(object):
             cls.default_config_filename()
             )
 
+    # - - - - - - - - - - - - - - - - - - - - - - - - - - - -
+    @classmethod
+    def region_occupancy_path(cls):
+        '''Return the path to the region occupancy cache file.'''
+
+        return os.path.join(
+            cls.default_config_dir(),
+            cls._region_occupancy_filename
+            )
+
     # - - - - - - - - - - - - - - - - - - - - - - - - - - - -
     @classmethod
     def _surveyable_types(cls, *types):
@@ -585,12 +661,17 @@ class AWSSurveyor(object):
             entity_types=None,
             config_path=None,
             add_to_config=False,
-            set_all_regions=False
+            set_all_regions=False,
+            skip_empty_regions=False
             ):  # pylint: disable=bad-continuation
         '''Initialize an AWSSurveyor instance.'''
         logger = logging.getLogger(__name__)
 
         self._survey_timestamp = None
+        self._survey_status = {}
+
+        # This gets set by set_checkpoint().
+        self.checkpoint = None
 
         # This gets re-done, but lets e.g. pylint recognize the attributes.
         self._profiles = []
@@ -631,6 +712,8 @@ class AWSSurveyor(object):
                 all_regions_kwargs.setdefault('region_name', regions[0])
             self._regions = all_regions(**all_regions_kwargs)
 
+        self.skip_empty_regions = skip_empty_regions
+
         self._mediators = []
         self._accounts = []
 
@@ -638,8 +721,13 @@ class AWSSurveyor(object):
             # This will initialize both mediators and accounts.
             self._initialize_mediators()
 
-        # This gets populated by survey().
-        self._informers = []
+        # These get populated by survey(). The buckets hold the
+        # informers of each class, and of each mediator, with their
+        # positions in _informers. See _bucket_informers().
+        self._clear_informers()
+
+        # This gets built on demand by relationship_graph().
+        self._relationship_graph = None
 
     # - - - - - - - - - - - - - - - - - - - - - - - - - - - -
     def _initialize_presets_from_file(self, config_path):
@@ -705,14 +793,9 @@ class AWSSurveyor(object):
         '''Perform mediator initialization and accounts record update.'''
 
         self._mediators = self._get_initialized_mediators()
-        self._accounts = [
-            {
-                'account_id': m.account_id,
-                'account_name': m.account_name,
-                'account_desc': m.account_desc,
-                'region_name': m.region_name
-                } for m in self._mediators
-            ]
+        # Built on demand by the accounts property, so mediators'
+        # accounts aren't resolved until they're needed.
+        self._accounts = None
 
     # - - - - - - - - - - - - - - - - - - - - - - - - - - - -
     @property
@@ -720,6 +803,38 @@ class AWSSurveyor(object):
         '''Get the _survey_timestamp attribute.'''
         return self._survey_timestamp
 
+    # - - - - - - - - - - - - - - - - - - - - - - - - - - - -
+    @property
+    def survey_status(self):
+        '''The outcome of the last survey for each mediator and entity type.
+
+        This is a dict keyed by ``(mediator, entity_type)`` tuples.
+        Each value is a dict with these keys:
+
+            ``status``: ``COMPLETE`` if all the entity type's records
+            were retrieved, ``INCOMPLETE`` if retrieval hadn't
+            finished by the survey's deadline, or ``FAILED`` if
+            retrieval raised an exception.
+
+            ``error``: The exception's message, or ``None``.
+
+            ``seconds``: How long retrieval took, or ``None``.
+
+        Only informers whose retrieval is ``COMPLETE`` are included
+        in ``informers()``.
+
+        '''
+        return dict(self._survey_status)
+
+    # - - - - - - - - - - - - - - - - - - - - - - - - - - - -
+    @property
+    def survey_complete(self):
+        '''Whether every retrieval in the last survey was complete.'''
+        return all(
+            outcome['status'] == COMPLETE
+            for outcome in self._survey_status.itervalues()
+            )
+
     # - - - - - - - - - - - - - - - - - - - - - - - - - - - -
     @property
     def profiles(self):
@@ -834,6 +949,15 @@ class AWSSurveyor(object):
             }
 
         '''
+        if self._accounts is None:
+            self._accounts = [
+                {
+                    'account_id': m.account_id,
+                    'account_name': m.account_name,
+                    'account_desc': m.account_desc,
+                    'region_name': m.region_name
+                    } for m in self._mediators
+                ]
         return self._accounts
 
     # - - - - - - - - - - - - - - - - - - - - - - - - - - - -
@@ -944,68 +1068,235 @@ class AWSSurveyor(object):
             mediator.remove_all_filters(*remove_types)
 
     # - - - - - - - - - - - - - - - - - - - - - - - - - - - -
-    def survey(self, *entity_types, **kwargs):
-        '''Conduct a survey of preset or specified AWS targets.
+    def set_resource_compression(self, enabled=True):
+        '''Set whether the surveyor's mediators compress resource records.
+
+        Compressed resources are decoded on demand and cached
+        briefly, trading CPU for a much smaller memory footprint in
+        large surveys. This only affects entity types the mediators
+        haven't already retrieved. See ``AWSInformer.resource``.
+
+        '''
+        for mediator in self.mediators():
+            mediator.compress_resources = enabled
+
+    # - - - - - - - - - - - - - - - - - - - - - - - - - - - -
+    def set_checkpoint(self, path, max_age=aws_checkpoint.DEFAULT_MAX_AGE):
+        '''Keep completed survey parts in a working directory.
 
         Arguments:
 
-            *entity_types (str):
-                A tuple of the entity types to retrieve for this
-                survey, instead of any instance presets.
+            path (str): The working directory, or ``None`` to stop
+                checkpointing.
 
-            profiles (list of str, optional):
-                A subset of instance profiles to use for this survey.
+            max_age (number, optional): How long, in seconds, parts
+                saved by earlier runs are reused.
 
-            regions (list of str, optional):
-                A subset of instance regions to use for this survey.
+        Records the surveyor's mediators fetch, whether by
+        ``survey()`` or by ``expand_informers()``, are saved for each
+        profile, region and entity type as they're fetched, as are
+        the expanded contents of each batch of informers whose
+        expansions make their own AWS calls. A later run with the
+        same working directory, profiles, regions and filters reuses
+        whatever was saved less than ``max_age`` seconds ago, and
+        only retrieves what's missing or expired. See
+        ``aws_checkpoint.SurveyCheckpoint``.
 
-            refresh (optional):
-                If ``True`` (the default), delete all existing
-                informer records and load anew. If ``False``, preserve
-                existing records for any entity type that has already
-                been loaded.
+        Returns:
 
-        Raises:
+            (aws_checkpoint.SurveyCheckpoint) The checkpoint, or
+            ``None``.
 
-            ValueError: If any item in ``profiles`` or ``regions``
-                isn't already present in the corresponding presets.
+        '''
+        self.checkpoint = None if path is None else (
+            aws_checkpoint.SurveyCheckpoint(path, max_age=max_age)
+            )
+        for mediator in self.mediators():
+            mediator.checkpoint = self.checkpoint
+        return self.checkpoint
 
-            ValueError: If any of the entity types in ``entity_types``
-                isn't a valid ``AWSInformer`` entity type.
+    # - - - - - - - - - - - - - - - - - - - - - - - - - - - -
+    def add_elisions(self, entity_type, fields):
+        '''
+        Add resource fields to elide from the surveyor's informers.
 
-        The ``survey()`` method populates the internal list of
-        ``AWSInformer`` instances maintained by this ``AWSSurveyor``
-        instance, which can then be accessed via the ``instances()``
-        method.
+        Arguments:
 
-        By default, the ``profiles``, ``regions`` and ``entity_types``
-        used will be the presets values. Any values passed in as
-        arguments will override the corresponding presets values.
-        *This can be used to limit the profiles and regions surveyed
-        to a subset of those already configured as presets, but no new
-        profiles or regions can be added.* There is no such
-        restriction for ``entity_types``, and any new types will be
-        added to the instance's ``entity_types`` preset.
+            entity_type (string):
+                An informer entity type whose informers will have
+                the indicated fields removed from their resource.
 
-        If no profile was specified (so that default, environment
-        variable specified or instance profile associated credentials
-        will be used), any profiles passed to ``survey()`` will be
-        ignored.
+            fields (list of string):
+                Top level keys of the entity type's resource.
+
+        See the documentation for ``AWSMediator.add_elisions()`` for
+        further details.
 
         '''
+        for mediator in self.mediators():
+            mediator.add_elisions(entity_type, fields)
+
+    # - - - - - - - - - - - - - - - - - - - - - - - - - - - -
+    def remove_all_elisions(self, *remove_types):
+        '''Remove assigned elisions from the surveyor's mediators.'''
+        for mediator in self.mediators():
+            mediator.remove_all_elisions(*remove_types)
+
+    # - - - - - - - - - - - - - - - - - - - - - - - - - - - -
+    def occupied_mediators(
+            self, mediators=None, refresh=False, entity_types=None
+            ):  # pylint: disable=bad-continuation
+        '''Return the mediators whose regions hold any resources.
+
+        Arguments:
 
+            mediators (list of AWSMediator, optional):
+                The mediators to check. Defaults to all of this
+                surveyor's mediators.
+
+            refresh (bool, default=False):
+                If ``True``, probe every region, even where a recent
+                result is cached.
+
+            entity_types (list of str, optional):
+                The entity types to look for. Defaults to all
+                regional entity types.
+
+        Returns:
+
+            (list of AWSMediator): The mediators, in their original
+            order, for which ``AWSMediator.probe_occupancy()``
+            found any of the entity types.
+
+        Probe results are kept per account, region and entity type in
+        the file given by ``region_occupancy_path()``, and reused for
+        ``region_occupancy_ttl`` seconds, so an entity type found
+        empty in a region is only probed again once its result
+        expires. Regions without a current result for the entity
+        types are probed concurrently.
+
+        '''
         logger = logging.getLogger(__name__)
 
-        default_kwargs = {
-            'profiles': None,
-            'regions': None,
-            'refresh': True
-            }
-        kwargs = dict(default_kwargs, **kwargs)
+        if mediators is None:
+            mediators = self._mediators
+        if entity_types is None:
+            entity_types = aws_informer.regional_types()
+
+        cache_path = self.region_occupancy_path()
+        occupancy = {}
+        if os.path.exists(cache_path):
+            try:
+                with open(cache_path, 'r') as fptr:
+                    occupancy = json.load(fptr)
+            except (IOError, ValueError) as err:
+                logger.warning(
+                    'ignoring unreadable region occupancy cache %s: %s',
+                    cache_path, err
+                    )
 
-        profiles = kwargs['profiles']
-        regions = kwargs['regions']
-        refresh = kwargs['refresh']
+        now = time.time()
+
+        def cached(mediator):
+            '''Return the current cached results, by entity type.'''
+            entries = occupancy.get(mediator.account_id, {}).get(
+                mediator.region_name, {}
+                )
+            return {
+                entity_type: entries[entity_type]['occupied']
+                for entity_type in entity_types
+                if not refresh and entity_type in entries and
+                now - entries[entity_type]['checked'] <=
+                self.region_occupancy_ttl
+                }
+
+        def probe(args):
+            '''Probe a region; errors count as occupied, uncached.'''
+            (mediator, unknown_types) = args
+            try:
+                return mediator.probe_occupancy(*unknown_types)
+            except Exception as err:  # pylint: disable=broad-except
+                logger.warning(
+                    'region %s probe for profile %s failed: %s',
+                    mediator.region_name, mediator.profile_name, err
+                    )
+                return None
+
+        results = []
+        unknown = []
+        for (i, mediator) in enumerate(mediators):
+            known = cached(mediator)
+            if any(known.values()):
+                results.append(True)
+            elif len(known) == len(entity_types):
+                results.append(False)
+            else:
+                results.append(None)
+                unknown.append(
+                    (i, [t for t in entity_types if t not in known])
+                    )
+
+        if unknown:
+            logger.debug('probing %s regions for resources', len(unknown))
+
+            pool = ThreadPool(
+                min(len(unknown), self.REGION_PROBE_THREAD_COUNT)
+                )
+            try:
+                probed = pool.map(
+                    probe, [(mediators[i], types) for (i, types) in unknown]
+                    )
+            finally:
+                pool.close()
+                pool.join()
+
+            for ((i, _), found) in zip(unknown, probed):
+                if found is None:
+                    results[i] = True
+                    continue
+                results[i] = any(found.values())
+                entries = occupancy.setdefault(
+                    mediators[i].account_id, {}
+                    ).setdefault(mediators[i].region_name, {})
+                for (entity_type, occupied) in found.items():
+                    entries[entity_type] = {
+                        'occupied': occupied, 'checked': now
+                        }
+
+            try:
+                with open(cache_path, 'w') as fptr:
+                    json.dump(occupancy, fptr, indent=4, sort_keys=True)
+            except IOError as err:
+                logger.warning(
+                    'not updating region occupancy cache %s: %s',
+                    cache_path, err
+                    )
+
+        return [m for (m, occupied) in zip(mediators, results) if occupied]
+
+    # - - - - - - - - - - - - - - - - - - - - - - - - - - - -
+    def _survey_mediators(self, entity_types, profiles, regions, full_sweep):
+        '''Check survey arguments and select the mediators to poll.
+
+        Arguments:
+
+            entity_types, profiles, regions, full_sweep: As for
+                ``survey()``; ``profiles`` and ``regions`` may be
+                ``None``.
+
+        Returns:
+
+            (tuple) The entity types to survey, and a dict of the
+            mediators to poll for entity types of each regionality
+            (``aws_informer.REGIONAL``, ``REGIONLESS`` and
+            ``UNITARY``).
+
+        Raises:
+
+            ValueError: As for ``survey()``.
+
+        '''
+        logger = logging.getLogger(__name__)
 
         if profiles and not self.profiles:
             err_msg = (
@@ -1076,6 +1367,24 @@ class AWSSurveyor(object):
             if m.region_name == regions[0]
             ]
 
+        # Regional types are only surveyed where there's something to
+        # find, unless a full sweep was requested.
+        regional_mediators = mediators
+        surveyed_regional_types = [
+            t for t in entity_types if t in aws_informer.regional_types()
+            ]
+        if (
+                self.skip_empty_regions and not full_sweep and
+                surveyed_regional_types
+                ):  # pylint: disable=bad-continuation
+            regional_mediators = self.occupied_mediators(
+                mediators, entity_types=surveyed_regional_types
+                )
+            logger.info(
+                'skipping %s of %s regions with no resources',
+                len(mediators) - len(regional_mediators), len(mediators)
+                )
+
         # Check for empty polling.
         if not(entity_types):
             err_msg = 'survey() requires non-empty entity types list'
@@ -1091,80 +1400,448 @@ class AWSSurveyor(object):
                 )
             logger.warn(err_msg, entity_types)
 
+        return (entity_types, {
+            aws_informer.REGIONAL: regional_mediators,
+            aws_informer.REGIONLESS: nonregionized_mediators,
+            aws_informer.UNITARY: mediators[:1],
+            })
+
+    # - - - - - - - - - - - - - - - - - - - - - - - - - - - -
+    def survey(self, *entity_types, **kwargs):
+        '''Conduct a survey of preset or specified AWS targets.
+
+        Arguments:
+
+            *entity_types (str):
+                A tuple of the entity types to retrieve for this
+                survey, instead of any instance presets.
+
+            profiles (list of str, optional):
+                A subset of instance profiles to use for this survey.
+
+            regions (list of str, optional):
+                A subset of instance regions to use for this survey.
+
+            refresh (optional):
+                If ``True`` (the default), delete all existing
+                informer records and load anew. If ``False``, preserve
+                existing records for any entity type that has already
+                been loaded.
+
+            full_sweep (optional):
+                If ``True``, survey regional entity types in every
+                region, even if ``skip_empty_regions`` is set. The
+                default is ``False``.
+
+            deadline (number or datetime, optional):
+                The time to stop waiting for records, as a number of
+                seconds from now or a UTC ``datetime``.
+
+            priorities (dict or list, optional):
+                The order to retrieve entity types in. A dict maps
+                entity types to numbers, highest first, with unlisted
+                types at 0; a list names entity types, first first,
+                ahead of unlisted types.
+
+        Raises:
+
+            ValueError: If any item in ``profiles`` or ``regions``
+                isn't already present in the corresponding presets.
+
+            ValueError: If any of the entity types in ``entity_types``
+                isn't a valid ``AWSInformer`` entity type.
+
+        The ``survey()`` method populates the internal list of
+        ``AWSInformer`` instances maintained by this ``AWSSurveyor``
+        instance, which can then be accessed via the ``instances()``
+        method.
+
+        By default, the ``profiles``, ``regions`` and ``entity_types``
+        used will be the presets values. Any values passed in as
+        arguments will override the corresponding presets values.
+        *This can be used to limit the profiles and regions surveyed
+        to a subset of those already configured as presets, but no new
+        profiles or regions can be added.* There is no such
+        restriction for ``entity_types``, and any new types will be
+        added to the instance's ``entity_types`` preset.
+
+        If no profile was specified (so that default, environment
+        variable specified or instance profile associated credentials
+        will be used), any profiles passed to ``survey()`` will be
+        ignored.
+
+        **Scheduled Surveys**
+
+        With a ``deadline`` or ``priorities``, records for each
+        mediator and entity type are retrieved concurrently, started
+        in priority order. At the deadline, retrievals still in
+        progress are cancelled before their next page, and the
+        survey returns with the informers retrieved so far. An
+        exception retrieving one entity type in one region doesn't
+        stop the others. Either way, the outcome for each mediator
+        and entity type is recorded in ``survey_status``, and
+        ``survey_complete`` tells whether anything is missing.
+
+        Without either, each entity type is retrieved in turn and any
+        exception is raised.
+
+        '''
+
+        logger = logging.getLogger(__name__)
+
+        default_kwargs = {
+            'profiles': None,
+            'regions': None,
+            'refresh': True,
+            'full_sweep': False,
+            'deadline': None,
+            'priorities': None,
+            }
+        kwargs = dict(default_kwargs, **kwargs)
+
+        profiles = kwargs['profiles']
+        regions = kwargs['regions']
+        refresh = kwargs['refresh']
+        full_sweep = kwargs['full_sweep']
+        deadline = kwargs['deadline']
+        priorities = kwargs['priorities']
+
+        scheduled = deadline is not None or priorities is not None
+        if isinstance(deadline, datetime):
+            deadline = (deadline - datetime.utcnow()).total_seconds()
+        if deadline is not None:
+            deadline = time.time() + deadline
+
+        (entity_types, survey_mediators) = self._survey_mediators(
+            entity_types, profiles, regions, full_sweep
+            )
+
         # - - - - - - - - - - - - - - - - - - - -
         # Polling begins.
         # - - - - - - - - - - - - - - - - - - - -
-        # If we're not refreshing, we have to preserve the existing
-        # entities.
-        informers_index_by_entity_type = {
-            x: self.informers(x) for x in self._surveyable_types()
-            }
-        existing_surveyed_types = [
-            x for x, i in informers_index_by_entity_type.iteritems()
-            if i != []
-            ]
+        # If we're not refreshing, we keep anything already surveyed,
+        # and only poll for entity types we don't have yet.
+        self._bucket_informers()
+        existing_surveyed_types = set(
+            aws_informer.informer_entity_type(informer_class)
+            for (informer_class, (informers, _)) in (
+                self._informers_by_class.iteritems()
+                )
+            if informers
+            )
 
         informer_list = []
-        # If we're not refreshing, we keep anything already surveyed.
-        if not refresh:
-            for entity_type, informers in (
-                    informers_index_by_entity_type.iteritems()
-                    ):  # pylint: disable=bad-continuation
-                informer_list.extend(informers)
 
         self._survey_timestamp = datetime.utcnow().strftime(
             self.timestamp_format
             )
 
-        logger.debug('starting polling...')
-        for entity_type in entity_types:
+        polled_types = [
+            t for t in entity_types
+            if refresh or t not in existing_surveyed_types
+            ]
 
-            if entity_type in existing_surveyed_types and not refresh:
-                continue
+        # Keep the outcomes for the informers we're keeping.
+        survey_status = {} if refresh else {
+            key: outcome for (key, outcome) in self._survey_status.items()
+            if key[1] not in polled_types
+            }
+
+        unitary_informers = {}
+        if scheduled:
+            (fetch_status, unitary_informers) = self._scheduled_fetch(
+                [
+                    (mediator, entity_type)
+                    for entity_type in polled_types
+                    for mediator in survey_mediators[
+                        aws_informer.entity_type_spec(
+                            entity_type
+                            ).regionality
+                        ]
+                    ],
+                deadline, priorities
+                )
+            survey_status.update(fetch_status)
+
+        logger.debug('starting polling...')
+        for entity_type in polled_types:
 
             logger.debug('polling entity type %s...', entity_type)
-            # - - - - - - - - - - - -
-            # These have a separate set by region.
-            # - - - - - - - - - - - -
-            if entity_type in aws_informer.regional_types():
 
+            regionality = aws_informer.entity_type_spec(
+                entity_type
+                ).regionality
+
+            informer_class = aws_informer.informer_class(entity_type)
+
+            for mediator in survey_mediators[regionality]:
+                key = (mediator, entity_type)
+                if scheduled and survey_status[key]['status'] != COMPLETE:
+                    continue
+
+                # Unitary types, e.g. IAM, don't have "multiple
+                # entities", and have one informer in all.
+                if key in unitary_informers:
+                    informer_list.append(unitary_informers[key])
+                elif regionality == aws_informer.UNITARY:
+                    informer_list.append(
+                        informer_class(None, mediator=mediator)
+                        )
+                else:
+                    informer_list.extend(informer_class.from_records(
+                        mediator.entities(entity_type), mediator
+                        ))
+
+                if not scheduled:
+                    survey_status[key] = {
+                        'status': COMPLETE, 'error': None, 'seconds': None
+                        }
+
+        if refresh:
+            self._clear_informers()
+        self._add_informers(informer_list)
+
+        # Start resolving load balancer DNS names now, so they're
+        # ready, or nearly, by the time the informers are expanded.
+        aws_informer.ELBInformer.prefetch_dns_addresses(
+            self.informers('elb')
+            )
+
+        self._survey_status = survey_status
+        self._relationship_graph = None
+
+    # - - - - - - - - - - - - - - - - - - - - - - - - - - - -
+    def _scheduled_fetch(self, fetches, deadline, priorities):
+        '''Fetch records in priority order until a deadline.
+
+        Arguments:
+
+            fetches (list of tuple): The ``(mediator, entity_type)``
+                pairs to fetch records for.
+
+            deadline (float): The ``time.time()`` value at which to
+                stop waiting, or ``None``.
+
+            priorities (dict or list): As for ``survey()``.
+
+        Returns:
+
+            (tuple) The ``survey_status`` value for each pair, and
+            a dict of the informer for each pair of unitary type
+            whose informer was constructed.
+
+        Unitary entity types have no list of records, so their
+        informers, which make their own AWS calls, are constructed
+        in place of fetching records.
+
+        '''
+        logger = logging.getLogger(__name__)
+
+        if isinstance(priorities, (list, tuple)):
+            priorities = {
+                entity_type: len(priorities) - index
+                for (index, entity_type) in enumerate(priorities)
+                }
+        priorities = priorities or {}
+
+        unitary_types = set(aws_informer.unitary_types())
+        unitary_informers = {}
+        status = {}
+        for mediator_and_type in fetches:
+            status[mediator_and_type] = {
+                'status': INCOMPLETE, 'error': None, 'seconds': None
+                }
+
+        # Records already cached count however late it is.
+        for (mediator, entity_type) in fetches:
+            if (
+                    entity_type not in unitary_types and
+                    mediator.is_cached(entity_type)
+                    ):  # pylint: disable=bad-continuation
+                status[(mediator, entity_type)] = {
+                    'status': COMPLETE, 'error': None, 'seconds': 0.0
+                    }
+        fetches = [f for f in fetches if status[f]['status'] != COMPLETE]
+
+        # The sort is stable, so mediators stay interleaved.
+        fetches = sorted(fetches, key=lambda f: -priorities.get(f[1], 0))
+        if not fetches:
+            return (status, unitary_informers)
+
+        # The workers have a cancel event of their own, rather than
+        # one set on the mediators, so fetches left running past the
+        # deadline don't cancel later requests through the same
+        # mediators. A mediator's own cancel event, e.g. asurvey()'s,
+        # still applies.
+        cancel_event = threading.Event()
+
+        lock = threading.Lock()
+        finished = threading.Event()
+        state = {'pending': len(fetches), 'closed': False}
+
+        def fetch(mediator_and_type):
+            '''Fetch one entity type's records, recording the outcome.'''
+            (mediator, entity_type) = mediator_and_type
+            started = time.time()
+            outcome = {'status': COMPLETE, 'error': None}
+            informer = None
+            aws_async.set_thread_cancel_event(cancel_event)
+            try:
+                if entity_type in unitary_types:
+                    informer = aws_informer.informer_class(entity_type)(
+                        None, mediator=mediator
+                        )
+                else:
+                    mediator.entities(entity_type)
+            except Exception as err:  # pylint: disable=broad-except
+                outcome = {'status': FAILED, 'error': str(err)}
+            finally:
+                aws_async.set_thread_cancel_event(None)
+            outcome['seconds'] = time.time() - started
+
+            with lock:
+                # Outcomes after the deadline don't count.
+                if not state['closed']:
+                    status[mediator_and_type] = outcome
+                    if informer is not None:
+                        unitary_informers[mediator_and_type] = informer
+                state['pending'] -= 1
+                if state['pending'] == 0:
+                    finished.set()
+
+        pool = ThreadPool(min(len(fetches), self.PREFETCH_THREAD_COUNT))
+        for mediator_and_type in fetches:
+            pool.apply_async(fetch, (mediator_and_type,))
+        pool.close()
+
+        while not finished.is_set():
+            wait = 1.0
+            if deadline is not None:
+                wait = min(wait, deadline - time.time())
+                if wait <= 0:
+                    break
+            finished.wait(wait)
+
+        with lock:
+            state['closed'] = True
+            if not finished.is_set():
+                cancel_event.set()
+
+        # Don't wait for fetches stuck in a call.
+        if finished.is_set():
+            pool.join()
+
+        for (key, outcome) in sorted(
+                status.items(), key=lambda item: item[0][1]
+                ):  # pylint: disable=bad-continuation
+            if outcome['status'] != COMPLETE:
+                logger.warning(
+                    '%s %s %s: %s%s', key[0].profile_name,
+                    key[0].region_name, key[1], outcome['status'],
+                    ' (%s)' % outcome['error'] if outcome['error'] else ''
+                    )
+
+        return (status, unitary_informers)
+
+    # - - - - - - - - - - - - - - - - - - - - - - - - - - - -
+    def asurvey(self, *entity_types, **kwargs):
+        '''Conduct a survey in the background.
+
+        Arguments:
+
+            entity_types, profiles, regions, refresh, full_sweep,
+                deadline, priorities: As for ``survey()``.
+
+            expand (bool, default=False): If ``True``, expand the
+                surveyed informers, as ``expand_informers()`` would.
+
+            max_workers (int, optional): As for
+                ``expand_informers()``.
+
+            timeout (number, optional): If given, cancel the survey
+                after this many seconds.
+
+        Returns:
+
+            (aws_async.AWSFuture) A future whose result is the
+            surveyed informers, as ``informers()`` returns them.
+
+        Raises:
+
+            ValueError: As for ``survey()``, at once.
+
+            RuntimeError: If a background survey using the same
+                mediators is still running.
+
+        The records of each surveyed entity type are fetched
+        concurrently for all mediators, and then ``survey()`` and
+        ``expand_informers()`` run in the background, using and
+        filling the same mediator caches as they would when called
+        directly. Cancelling the future, or running out of time,
+        stops all the surveyor's mediators from requesting further
+        pages of records, and the future's result raises
+        ``aws_async.AWSCancelledError`` or ``AWSTimeoutError``. The
+        surveyor's informers are only replaced if the survey
+        finishes.
+
+        '''
+        survey_kwargs = dict(kwargs)
+        expand = survey_kwargs.pop('expand', False)
+        max_workers = survey_kwargs.pop('max_workers', None)
+        timeout = survey_kwargs.pop('timeout', None)
+
+        (survey_types, survey_mediators) = self._survey_mediators(
+            entity_types,
+            survey_kwargs.get('profiles'),
+            survey_kwargs.get('regions'),
+            survey_kwargs.get('full_sweep', False)
+            )
+
+        fetches = []
+        for entity_type in survey_types:
+            regionality = aws_informer.entity_type_spec(
+                entity_type
+                ).regionality
+            if regionality != aws_informer.UNITARY:
+                fetches.extend(
+                    (mediator, entity_type)
+                    for mediator in survey_mediators[regionality]
+                    )
+
+        mediators = list(self._mediators)
+        if any(m.cancel_event is not None for m in mediators):
+            raise RuntimeError('a background survey is already running')
+
+        cancel_event = threading.Event()
+        for mediator in mediators:
+            mediator.cancel_event = cancel_event
+
+        def run(future):
+            '''Survey, then expand, checking for cancellation.'''
+            try:
+                # A scheduled survey fetches concurrently itself.
+                if (
+                        survey_kwargs.get('deadline') is None and
+                        survey_kwargs.get('priorities') is None
+                        ):  # pylint: disable=bad-continuation
+                    self._fetch_entities(fetches)
+                    future.raise_if_cancelled()
+                self.survey(*entity_types, **survey_kwargs)
+                if expand:
+                    future.raise_if_cancelled()
+                    self.expand_informers(max_workers=max_workers)
+                return self.informers()
+            finally:
                 for mediator in mediators:
-                    informer_list.extend([
-                        aws_informer.informer_class(entity_type)(
-                            entity, mediator=mediator
-                            )
-                        for entity in mediator.entities(entity_type)
-                        ])
-
-            # - - - - - - - - - - - -
-            # These aren't separated out by region.
-            # The canonical example is SQS.
-            # - - - - - - - - - - - -
-            elif entity_type in aws_informer.regionless_types():
-
-                for mediator in nonregionized_mediators:
-                    informer_list.extend([
-                        aws_informer.informer_class(entity_type)(
-                            entity, mediator=mediator
-                            )
-                        for entity in mediator.entities(entity_type)
-                        ])
-
-            # - - - - - - - - - - - -
-            # These don't have "multiple entities".
-            # The canonical example is IAM.
-            # - - - - - - - - - - - -
-            elif entity_type in aws_informer.unitary_types():
-                informer_list.extend([
-                    aws_informer.informer_class(
-                        entity_type
-                        )(None, mediator=mediators[0])
-                    ])
-
-        self._informers = informer_list
+                    mediator.cancel_event = None
+
+        return aws_async.AWSFuture(
+            run, timeout=timeout, cancel_event=cancel_event,
+            name='aws-survey'
+            )
 
     # - - - - - - - - - - - - - - - - - - - - - - - - - - - -
-    def informers(self, *entity_types):
+    def informers(self, *entity_types, **kwargs):
         '''Return the current list of surveyed ``AWSInformer`` instances.
 
         Arguments:
@@ -1172,27 +1849,185 @@ class AWSSurveyor(object):
             entity_types (list of str): A list of informer entity
                 types.
 
+            mediator (AWSMediator, optional): If given, only the
+                informers surveyed through this mediator are
+                returned.
+
         Returns:
 
             list: A list of the informers of the specified entity
                 types retrieved in the last call to ``survey()``.
+
+        Informers are kept bucketed by class and by mediator, so
+        this doesn't search all the surveyed informers.
         '''
 
+        mediator = kwargs.get('mediator')
+
+        self._bucket_informers()
+
+        if mediator is not None:
+            (informers, _) = self._informers_by_mediator.get(
+                mediator, ([], None)
+                )
+            if len(entity_types) == 0:
+                return list(informers)
+            informer_classes = tuple(set([
+                aws_informer.informer_class(entity_type)
+                for entity_type in entity_types
+                ]))
+            return [i for i in informers if isinstance(i, informer_classes)]
+
         if len(entity_types) == 0:
             return self._informers
 
-        informer_classes = set([
+        informer_classes = tuple(set([
             aws_informer.informer_class(entity_type)
             for entity_type in entity_types
-            ])
+            ]))
+
+        # Subclasses of the requested classes count too, as for
+        # isinstance().
+        buckets = [
+            bucket
+            for (bucket_class, bucket) in self._informers_by_class.iteritems()
+            if issubclass(bucket_class, informer_classes)
+            ]
+
+        if len(buckets) == 1:
+            return list(buckets[0][0])
 
+        # Merge the buckets in survey order.
         return [
-            i for i in self._informers
-            if isinstance(i, tuple(informer_classes))
+            informer for (_, informer) in heapq.merge(*[
+                itertools.izip(positions, informers)
+                for (informers, positions) in buckets
+                ])
             ]
 
     # - - - - - - - - - - - - - - - - - - - - - - - - - - - -
-    def expand_informers(self, *entity_types):
+    def _clear_informers(self):
+        '''Forget the surveyed informers.'''
+        self._informers = []
+        self._informers_by_class = {}
+        self._informers_by_mediator = {}
+        self._bucketed_informers = self._informers
+        self._bucketed_count = 0
+
+    # - - - - - - - - - - - - - - - - - - - - - - - - - - - -
+    def _add_informers(self, informers):
+        '''Add informers to the surveyed informers and their buckets.'''
+        self._informers.extend(informers)
+        self._bucket_informers()
+
+    # - - - - - - - - - - - - - - - - - - - - - - - - - - - -
+    def _bucket_informers(self):
+        '''Bring the informer buckets up to date with ``_informers``.
+
+        Each bucket is a list of informers and an array of their
+        positions in ``_informers``, so the informers of several
+        buckets can be merged back into survey order. Informers
+        appended to ``_informers`` since it was last bucketed are
+        added to the buckets; if it's been replaced or shortened,
+        the buckets are rebuilt.
+
+        '''
+        if (
+                self._informers is not self._bucketed_informers or
+                len(self._informers) < self._bucketed_count
+                ):  # pylint: disable=bad-continuation
+            informers = self._informers
+            self._clear_informers()
+            self._informers = self._bucketed_informers = informers
+
+        for position in xrange(self._bucketed_count, len(self._informers)):
+            informer = self._informers[position]
+            for (buckets, key) in [
+                    (self._informers_by_class, type(informer)),
+                    (self._informers_by_mediator, informer.mediator),
+                    ]:  # pylint: disable=bad-continuation
+                if key not in buckets:
+                    buckets[key] = ([], array.array('l'))
+                buckets[key][0].append(informer)
+                buckets[key][1].append(position)
+
+        self._bucketed_count = len(self._informers)
+
+    # - - - - - - - - - - - - - - - - - - - - - - - - - - - -
+    def prefetch_expansions(self, *entity_types, **kwargs):
+        '''Fetch the records that expanding surveyed informers will use.
+
+        Arguments:
+
+            entity_types (list of str): A list of informer entity
+                types. By default, all surveyed informers are
+                considered.
+
+            max_depth (int, optional): How many levels of expansions
+                will be expanded, as for ``expand_informers()``.
+
+        Each informer class declares the entity types its
+        ``expand()`` method looks up, in its
+        ``expansion_entity_types`` attribute. For each mediator with
+        surveyed informers, all the types those informers' expansions
+        depend on, directly or through further expansions, are
+        fetched concurrently, so expanding the informers afterward
+        needs no more requests. Mediators with ``lazy_expansions``
+        set are skipped, since their expansions may never be used.
+
+        '''
+        logger = logging.getLogger(__name__)
+
+        max_depth = kwargs.get('max_depth')
+
+        surveyed_types = {}
+        for informer in self.informers(*entity_types):
+            if not informer.mediator.lazy_expansions:
+                surveyed_types.setdefault(
+                    informer.mediator, set()
+                    ).add(informer.entity_type)
+
+        fetches = []
+        for (mediator, mediator_types) in surveyed_types.iteritems():
+            dependencies = set()
+            for entity_type in mediator_types:
+                dependencies.update(aws_informer.expansion_dependencies(
+                    entity_type, max_depth
+                    ))
+            fetches.extend(
+                (mediator, entity_type) for entity_type in dependencies
+                )
+
+        if not fetches:
+            return
+
+        logger.debug(
+            'prefetching %s entity types for expansion', len(fetches)
+            )
+
+        self._fetch_entities(fetches)
+
+    # - - - - - - - - - - - - - - - - - - - - - - - - - - - -
+    def _fetch_entities(self, fetches):
+        '''Fetch and cache records for (mediator, entity type) pairs.'''
+
+        if not fetches:
+            return
+
+        def fetch(mediator_and_type):
+            '''Fetch and cache one entity type's records.'''
+            (mediator, entity_type) = mediator_and_type
+            mediator.entities(entity_type)
+
+        pool = ThreadPool(min(len(fetches), self.PREFETCH_THREAD_COUNT))
+        try:
+            pool.map(fetch, fetches, chunksize=1)
+        finally:
+            pool.close()
+            pool.join()
+
+    # - - - - - - - - - - - - - - - - - - - - - - - - - - - -
+    def expand_informers(self, *entity_types, **kwargs):
         '''Expand the current list of surveyed ``AWSInformer`` instances.
 
         Arguments:
@@ -1200,24 +2035,370 @@ class AWSSurveyor(object):
             entity_types (list of str): A list of informer entity
                 types.
 
+            max_depth (int, optional): How many levels of expansions
+                to expand, as for ``AWSInformer.expand()``. By
+                default, expansions are expanded all the way down.
+
+            max_workers (int, optional): The number of threads to
+                expand informers in. By default, informers are
+                expanded one at a time.
+
         Calling the ``AWSSurveyor.expand_informers()`` method will
         call the ``expand()`` method on each instance in the current
         list of surveyed informers, or on each instance of one of the
         entity types indicated.
 
-        '''
+        Each unique informer, whether surveyed or reached through
+        another's expansions, is expanded once, after the informers
+        in its own expansions. The records expansions refer to are
+        fetched first, by ``prefetch_expansions()``.
 
-        informer_classes_to_expand = set([
-            aws_informer.informer_class(entity_type)
-            for entity_type in entity_types
-            ])
+        With ``max_workers``, informers from different mediators, i.e.
+        different accounts and regions, are interleaved so they're
+        expanded in parallel, and an informer shared by several
+        threads' informers is still expanded once.
 
-        [
-            i.expand() for i in self._informers
-            if isinstance(i, tuple(informer_classes_to_expand)) or
-            len(informer_classes_to_expand) == 0
+        With a checkpoint set by ``set_checkpoint()``, expansions
+        saved by an earlier run are restored rather than expanded
+        again.
+
+        '''
+        max_depth = kwargs.get('max_depth')
+        max_workers = kwargs.get('max_workers')
+
+        self.prefetch_expansions(*entity_types, max_depth=max_depth)
+
+        expanding = set()
+        to_expand = []
+        for informer in self.informers(*entity_types):
+            if id(informer) not in expanding:
+                expanding.add(id(informer))
+                to_expand.append(informer)
+
+        expanded = None
+        if self.checkpoint is not None:
+            (to_expand, expanded) = self._resume_expansions(
+                to_expand, max_depth
+                )
+
+        # Describe EMR clusters concurrently, rather than one by one
+        # as each is expanded.
+        emr_descriptions = {}
+        if max_depth is None or max_depth >= 1:
+            emr_descriptions = aws_informer.EMRInformer.describe_clusters([
+                i for i in to_expand
+                if isinstance(i, aws_informer.EMRInformer) and
+                not i.is_expanded
+                ])
+
+        def expand(informer):
+            '''Expand an informer, checkpointing completed batches.'''
+            kwargs = {}
+            if isinstance(informer, aws_informer.EMRInformer):
+                kwargs['description'] = emr_descriptions.get(
+                    informer.description_key(informer)
+                    )
+            _expand_in_dependency_order(informer, max_depth, **kwargs)
+            if expanded is not None:
+                expanded(informer)
+
+        if not max_workers or max_workers < 2 or len(to_expand) < 2:
+            for informer in to_expand:
+                expand(informer)
+            return
+
+        # Take informers from each mediator in turn, so the workers
+        # are spread over accounts and regions rather than all
+        # queuing on one mediator's fetches.
+        by_mediator = {}
+        for informer in to_expand:
+            by_mediator.setdefault(id(informer.mediator), []).append(informer)
+        to_expand = [
+            informer
+            for informers in itertools.izip_longest(*by_mediator.values())
+            for informer in informers
+            if informer is not None
             ]
 
+        pool = ThreadPool(min(max_workers, len(to_expand)))
+        try:
+            pool.map(expand, to_expand, chunksize=1)
+        finally:
+            pool.close()
+            pool.join()
+
+    # - - - - - - - - - - - - - - - - - - - - - - - - - - - -
+    def _resume_expansions(self, informers, max_depth):
+        '''Restore checkpointed expansions, and checkpoint new ones.
+
+        Arguments:
+
+            informers (list of AWSInformer): The informers to expand.
+
+            max_depth (int): As for ``expand_informers()``.
+
+        Returns:
+
+            (tuple) The informers still to expand, and a function to
+            call with each of them once it's expanded.
+
+        Informers are checkpointed in batches, one for each mediator
+        and entity type, and only for entity types whose expansions
+        don't look up other entity types' records; the records
+        other expansions look up are checkpointed themselves. A
+        batch is restored only if every informer in it was saved.
+
+        '''
+        if max_depth is not None and max_depth < 1:
+            return (informers, None)
+
+        batches = {}
+        for informer in informers:
+            spec = aws_informer.entity_type_spec(informer.entity_type)
+            if (
+                    spec is not None and
+                    not spec.expansion_entity_types and
+                    not informer.is_expanded
+                    ):  # pylint: disable=bad-continuation
+                batches.setdefault(
+                    (informer.mediator, informer.entity_type), []
+                    ).append(informer)
+
+        def plan(mediator, entity_type):
+            '''Describe how a batch's content is retrieved.'''
+            return sorted(mediator.elided_fields(entity_type))
+
+        restored = set()
+        for ((mediator, entity_type), batch) in batches.items():
+            states = self.checkpoint.load(
+                aws_checkpoint.EXPANSIONS, mediator, entity_type,
+                plan(mediator, entity_type)
+                )
+            if states is None or not all(
+                    i.identifier in states for i in batch
+                    ):  # pylint: disable=bad-continuation
+                continue
+
+            for informer in batch:
+                (resource, supplementals) = states[informer.identifier]
+                if resource is not None:
+                    informer.resource = resource
+                informer.supplementals.update(supplementals)
+                informer.invalidate_fingerprint('resource', 'supplementals')
+                aws_informer.AWSInformer.expand(informer, max_depth)
+                restored.add(id(informer))
+            del batches[(mediator, entity_type)]
+
+        remaining = {key: len(batch) for (key, batch) in batches.items()}
+        members = set(id(i) for batch in batches.values() for i in batch)
+        lock = threading.Lock()
+
+        def expanded(informer):
+            '''Checkpoint the informer's batch if it's complete.'''
+            if id(informer) not in members:
+                return
+            key = (informer.mediator, informer.entity_type)
+            with lock:
+                remaining[key] -= 1
+                if remaining[key] > 0:
+                    return
+                del remaining[key]
+
+            self.checkpoint.save(
+                aws_checkpoint.EXPANSIONS, key[0], key[1],
+                {
+                    i.identifier: (
+                        i.resource,
+                        {
+                            k: v for (k, v) in i.supplementals.items()
+                            if k != 'meta'
+                            }
+                        )
+                    for i in batches[key]
+                    },
+                plan(*key)
+                )
+
+        return (
+            [i for i in informers if id(i) not in restored], expanded
+            )
+
+    # - - - - - - - - - - - - - - - - - - - - - - - - - - - -
+    def stream_informers(self, *entity_types, **kwargs):
+        '''Survey and expand informers as a stream, without keeping them.
+
+        Arguments:
+
+            entity_types, profiles, regions, full_sweep: As for
+                ``survey()``.
+
+            expand (bool, default=True): If ``True``, expand each
+                informer before it's yielded.
+
+            max_depth (int, optional): How many levels of expansions
+                to expand, as for ``expand_informers()``.
+
+            fetch_workers (int, optional): The number of threads
+                fetching pages of records. Defaults to
+                ``STREAM_FETCH_THREAD_COUNT``.
+
+            expand_workers (int, optional): The number of threads
+                expanding informers. Defaults to
+                ``STREAM_EXPAND_THREAD_COUNT``.
+
+            queue_size (int, optional): The number of items each
+                stage can get ahead of the next, as for
+                ``aws_pipeline.Pipeline``.
+
+            release (bool, default=True): If ``True``, release each
+                informer from its mediator's informer cache once the
+                next informer has been requested, unless its entity
+                type is one that expansions refer to.
+
+        Returns:
+
+            (generator) The informers surveyed, as each is ready.
+
+        Raises:
+
+            ValueError: As for ``survey()``.
+
+        This is a pipelined alternative to calling ``survey()`` and
+        then ``expand_informers()``. Pages of records are fetched,
+        informers are constructed from each page and informers are
+        expanded, each stage in its own threads, with
+        ``aws_pipeline.Pipeline`` queues between them. The first
+        informers are yielded as soon as the first page of records
+        has been fetched and expanded, and when the caller falls
+        behind, fetching waits. Informers are yielded in no
+        particular order.
+
+        The surveyed entity types' records aren't cached by the
+        mediators, and the informers aren't added to the surveyor's
+        ``informers()``, so memory use depends on the queue sizes
+        rather than on the number of entities. The records of the
+        entity types expansions refer to, listed by
+        ``aws_informer.expansion_dependencies()``, are still fetched
+        and cached whole, first, as expansions look them up.
+
+        '''
+        default_kwargs = {
+            'profiles': None,
+            'regions': None,
+            'full_sweep': False,
+            'expand': True,
+            'max_depth': None,
+            'fetch_workers': self.STREAM_FETCH_THREAD_COUNT,
+            'expand_workers': self.STREAM_EXPAND_THREAD_COUNT,
+            'queue_size': aws_pipeline.DEFAULT_QUEUE_SIZE,
+            'release': True,
+            }
+        kwargs = dict(default_kwargs, **kwargs)
+
+        max_depth = kwargs['max_depth']
+
+        (entity_types, survey_mediators) = self._survey_mediators(
+            entity_types, kwargs['profiles'], kwargs['regions'],
+            kwargs['full_sweep']
+            )
+
+        self._survey_timestamp = datetime.utcnow().strftime(
+            self.timestamp_format
+            )
+
+        streamed_types = {}
+        for entity_type in entity_types:
+            regionality = aws_informer.entity_type_spec(
+                entity_type
+                ).regionality
+            for mediator in survey_mediators[regionality]:
+                streamed_types.setdefault(mediator, []).append(entity_type)
+
+        # The records expansions look up are fetched whole and cached,
+        # each mediator's ahead of its own streamed types.
+        dependencies = {}
+        fetches = []
+        for mediator in self._mediators:
+            if mediator not in streamed_types:
+                continue
+
+            dependencies[mediator] = set()
+            if kwargs['expand'] and not mediator.lazy_expansions:
+                for entity_type in streamed_types[mediator]:
+                    dependencies[mediator].update(
+                        aws_informer.expansion_dependencies(
+                            entity_type, max_depth
+                            )
+                        )
+
+            fetches.extend(
+                (mediator, entity_type, False)
+                for entity_type in sorted(dependencies[mediator])
+                )
+            fetches.extend(
+                (mediator, entity_type, True)
+                for entity_type in streamed_types[mediator]
+                )
+
+        unitary_types = set(aws_informer.unitary_types())
+
+        def fetch(mediator_type_streamed):
+            '''Fetch one entity type's records, yielding pages to stream.'''
+            (mediator, entity_type, streamed) = mediator_type_streamed
+
+            if not streamed:
+                mediator.entities(entity_type)
+
+            elif entity_type in unitary_types:
+                yield (mediator, entity_type, None)
+
+            # These are being cached for expansions anyway.
+            elif entity_type in dependencies[mediator]:
+                yield (mediator, entity_type, mediator.entities(entity_type))
+
+            else:
+                for page in mediator.entity_pages(entity_type):
+                    yield (mediator, entity_type, page)
+
+        def construct(mediator_type_page):
+            '''Return the informers for a page of records.'''
+            (mediator, entity_type, page) = mediator_type_page
+            informer_class = aws_informer.informer_class(entity_type)
+
+            if page is None:
+                return [informer_class(None, mediator=mediator)]
+
+            informers = informer_class.from_records(page, mediator)
+            if informer_class is aws_informer.ELBInformer:
+                aws_informer.ELBInformer.prefetch_dns_addresses(informers)
+            return informers
+
+        def expand(informer):
+            '''Expand an informer.'''
+            _expand_in_dependency_order(informer, max_depth)
+            return [informer]
+
+        pipeline = aws_pipeline.Pipeline(queue_size=kwargs['queue_size'])
+        pipeline.add_stage(fetch, workers=kwargs['fetch_workers'])
+        pipeline.add_stage(construct)
+        if kwargs['expand']:
+            pipeline.add_stage(expand, workers=kwargs['expand_workers'])
+
+        def stream():
+            '''Yield the pipeline's informers, releasing each in turn.'''
+            for informer in pipeline.run(fetches):
+                yield informer
+                if (
+                        kwargs['release'] and
+                        informer.entity_type not in
+                        dependencies.get(informer.mediator, ())
+                        ):  # pylint: disable=bad-continuation
+                    informer.mediator.release(informer)
+
+        # Arguments are checked now, rather than when the first
+        # informer is requested.
+        return stream()
+
     # - - - - - - - - - - - - - - - - - - - - - - - - - - - -
     def all_paths(self, *entity_types):
         '''Find prunable paths available in informers of given types.
@@ -1255,6 +2436,28 @@ class AWSSurveyor(object):
                 )
             ))
 
+    # - - - - - - - - - - - - - - - - - - - - - - - - - - - -
+    def relationship_graph(self):
+        '''Return the relationship graph of the surveyed informers.
+
+        Returns:
+
+            aws_graph.AWSRelationshipGraph: A graph of the references
+            between the informers in this instance's ``informers()``
+            list.
+
+        The graph is built on the first call after each
+        ``survey()`` and reused until the next ``survey()``. See the
+        documentation for ``aws_graph`` for details.
+
+        '''
+        if self._relationship_graph is None:
+            self._relationship_graph = aws_graph.AWSRelationshipGraph(
+                self._informers
+                )
+
+        return self._relationship_graph
+
     # - - - - - - - - - - - - - - - - - - - - - - - - - - - -
     def set_ec2_elb_supplementals(self):
         '''Record LoadBalancer names in EC2 Instance supplementals.
@@ -1272,12 +2475,13 @@ class AWSSurveyor(object):
         for x in self.informers('ec2'):
             x.supplementals.setdefault('load_balancer_names', [])
             x.supplementals.setdefault('load_balancer_genuses', [])
+            x.invalidate_fingerprint('supplementals')
 
         # Populate the ELB informers, don't lose what's already there.
         self.survey('elb', refresh=False)
 
         # Add elb informer names and base names to each instance supplemental.
-        informer_cache = aws_informer.AWSMediator.informer_cache
+        graph = self.relationship_graph()
         for elb_informer in self.informers('elb'):
 
             load_balancer_name = elb_informer.resource['LoadBalancerName']
@@ -1291,21 +2495,18 @@ class AWSSurveyor(object):
                     load_balancer_site_specific.get('genus')
                     )
 
-            ec2_instance_ids = [
-                x['InstanceId'] for x in elb_informer.resource['Instances']
-                ]
-            for ec2_instance_id in ec2_instance_ids:
-
-                ec2_informer = informer_cache.get(ec2_instance_id)
+            # ELBs can reference EC2 instances that no longer exist;
+            # the graph leaves these unresolved, so they're skipped.
+            for ec2_informer in graph.neighbors(
+                    elb_informer, 'ec2', direction=aws_graph.OUTGOING
+                    ):  # pylint: disable=bad-continuation
 
-                # Ignore misses for now? ELBs can reference EC2
-                # instances that no longer exist.
-                if ec2_informer:
-                    supplementals = ec2_informer.supplementals
-                    supplementals['load_balancer_names'].append(
-                        load_balancer_name
+                supplementals = ec2_informer.supplementals
+                supplementals['load_balancer_names'].append(
+                    load_balancer_name
+                    )
+                if load_balancer_genus is not None:
+                    supplementals['load_balancer_genuses'].append(
+                        load_balancer_genus
                         )
-                    if load_balancer_genus is not None:
-                        supplementals['load_balancer_genuses'].append(
-                            load_balancer_genus
-                            )
+                ec2_informer.invalidate_fingerprint('supplementals')
@@ -161,6 +161,8 @@ def informer_site_init(informer):
     if class_name in informer_class_site_init_dispatch:
         informer_class_site_init_dispatch[class_name](informer)
 
+    informer.invalidate_fingerprint('supplementals')
+
 
 # - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - -
 def _informer_common_site_init(informer):
@@ -469,3 +471,4 @@ def set_elb_informer_instances_keyname_environments(informer):
     informer.supplementals['instance_environments'] = list(
         informer_instance_environments
         )
+    informer.invalidate_fingerprint('supplementals')
@@ -19,7 +19,7 @@
 '''
 import json
 
-import boto3
+from boogio import aws_informer
 
 
 # - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - -
@@ -117,7 +117,7 @@ class SQSSifter(object):
         # We recreate session and client only if they don't exist already,
         # unless reconnect is true.
         if reconnect or (self.session is None):
-            self.session = boto3.session.Session(
+            self.session = aws_informer.shared_session(
                 profile_name=pname,
                 region_name=rname
                 )
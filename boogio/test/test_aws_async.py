@@ -0,0 +1,180 @@
+# ----------------------------------------------------------------------------
+# Copyright (C) 2017 Verizon.  All Rights Reserved.
+#
+#   Licensed under the Apache License, Version 2.0 (the "License");
+#   you may not use this file except in compliance with the License.
+#   You may obtain a copy of the License at
+#
+#       http://www.apache.org/licenses/LICENSE-2.0
+#
+#   Unless required by applicable law or agreed to in writing, software
+#   distributed under the License is distributed on an "AS IS" BASIS,
+#   WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#   See the License for the specific language governing permissions and
+#   limitations under the License.
+#
+# ----------------------------------------------------------------------------
+
+'''Test cases for the aws_async.py module.'''
+
+import threading
+import time
+import unittest
+
+import boogio.aws_async as aws_async
+
+
+# - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - -
+class _StubPages(object):
+    '''A stand-in for paged AWS calls, counting the pages requested.'''
+
+    # pylint: disable=too-few-public-methods
+
+    def __init__(self, pages, delay=0.0):
+        self.pages = pages
+        self.delay = delay
+        self.requested = 0
+
+    def records(self):
+        '''Yield records, requesting each page as it's needed.'''
+        for page in range(self.pages):
+            time.sleep(self.delay)
+            self.requested += 1
+            for record in range(10):
+                yield {'page': page, 'record': record}
+
+
+# - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - -
+class TestAWSFuture(unittest.TestCase):
+    '''
+    Test cases for aws_async.AWSFuture.
+    '''
+
+    # pylint: disable=invalid-name
+
+    # - - - - - - - - - - - - - - - - - - - - - - - - - - - -
+    def test_aws_future_result(self):
+        '''Test results, exceptions and callbacks.'''
+
+        release = threading.Event()
+        called = []
+
+        def work(future):  # pylint: disable=unused-argument
+            '''Wait to be released.'''
+            release.wait(5)
+            return 42
+
+        future = aws_async.AWSFuture(work)
+        future.add_done_callback(called.append)
+        self.assertFalse(future.done())
+
+        with self.assertRaises(aws_async.AWSTimeoutError):
+            future.result(timeout=0.05)
+
+        release.set()
+        self.assertEqual(future.result(timeout=5), 42)
+        self.assertIsNone(future.exception())
+        self.assertFalse(future.cancelled())
+        self.assertFalse(future.cancel())
+        self.assertEqual(called, [future])
+
+        # Callbacks added later are called at once.
+        future.add_done_callback(called.append)
+        self.assertEqual(called, [future, future])
+
+        def fail(future):  # pylint: disable=unused-argument
+            '''Fail.'''
+            raise KeyError('oops')
+
+        future = aws_async.AWSFuture(fail)
+        with self.assertRaises(KeyError):
+            future.result(timeout=5)
+        self.assertIsInstance(future.exception(), KeyError)
+        self.assertFalse(future.cancelled())
+
+    # - - - - - - - - - - - - - - - - - - - - - - - - - - - -
+    def test_aws_future_cancel(self):
+        '''Test cooperative cancellation and deadlines.'''
+
+        stub = _StubPages(1000, delay=0.01)
+
+        def work(future):
+            '''Consume records, checking for cancellation.'''
+            for _ in stub.records():
+                future.raise_if_cancelled()
+
+        future = aws_async.AWSFuture(work)
+        time.sleep(0.05)
+        self.assertTrue(future.cancel())
+        with self.assertRaises(aws_async.AWSCancelledError):
+            future.result(timeout=5)
+        self.assertTrue(future.cancelled())
+        self.assertLess(stub.requested, 1000)
+
+        stub = _StubPages(1000, delay=0.01)
+        future = aws_async.AWSFuture(work, timeout=0.05)
+        with self.assertRaises(aws_async.AWSTimeoutError):
+            future.result(timeout=5)
+        self.assertTrue(future.cancelled())
+        self.assertLess(stub.requested, 1000)
+
+
+# - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - -
+class TestBackgroundIterator(unittest.TestCase):
+    '''
+    Test cases for aws_async.BackgroundIterator.
+    '''
+
+    # pylint: disable=invalid-name
+
+    # - - - - - - - - - - - - - - - - - - - - - - - - - - - -
+    def test_background_iterator(self):
+        '''Test iteration, read ahead and errors.'''
+
+        stub = _StubPages(5)
+        self.assertEqual(
+            list(aws_async.BackgroundIterator(stub.records())),
+            list(_StubPages(5).records())
+            )
+
+        # Pages are only requested as there's room for their records.
+        stub = _StubPages(100)
+        iterator = aws_async.BackgroundIterator(
+            stub.records(), queue_size=5
+            )
+        self.assertEqual(iterator.next(), {'page': 0, 'record': 0})
+        time.sleep(0.2)
+        self.assertEqual(stub.requested, 1)
+        iterator.cancel()
+
+        def fail():
+            '''Fail after one record.'''
+            yield 1
+            raise IOError('no more')
+
+        iterator = aws_async.BackgroundIterator(fail())
+        self.assertEqual(iterator.next(), 1)
+        with self.assertRaises(IOError):
+            iterator.next()
+
+    # - - - - - - - - - - - - - - - - - - - - - - - - - - - -
+    def test_background_iterator_cancel(self):
+        '''Test cancelling iteration.'''
+
+        stub = _StubPages(1000, delay=0.01)
+        iterator = aws_async.BackgroundIterator(stub.records())
+        iterator.next()
+        iterator.cancel()
+        with self.assertRaises(aws_async.AWSCancelledError):
+            list(iterator)
+        self.assertLess(stub.requested, 1000)
+
+        stub = _StubPages(1000, delay=0.01)
+        iterator = aws_async.BackgroundIterator(stub.records(), timeout=0.05)
+        with self.assertRaises(aws_async.AWSTimeoutError):
+            list(iterator)
+        self.assertLess(stub.requested, 1000)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,150 @@
+# ----------------------------------------------------------------------------
+# Copyright (C) 2017 Verizon.  All Rights Reserved.
+#
+#   Licensed under the Apache License, Version 2.0 (the "License");
+#   you may not use this file except in compliance with the License.
+#   You may obtain a copy of the License at
+#
+#       http://www.apache.org/licenses/LICENSE-2.0
+#
+#   Unless required by applicable law or agreed to in writing, software
+#   distributed under the License is distributed on an "AS IS" BASIS,
+#   WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#   See the License for the specific language governing permissions and
+#   limitations under the License.
+#
+# ----------------------------------------------------------------------------
+
+'''Test cases for the aws_checkpoint.py module.'''
+
+from datetime import datetime
+import os
+import shutil
+import tempfile
+import unittest
+
+import boogio.aws_checkpoint as aws_checkpoint
+
+
+# - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - -
+class _StubMediator(object):
+    '''A stand-in for an AWSMediator, with a profile and region.'''
+
+    # pylint: disable=too-few-public-methods
+
+    def __init__(self, profile_name, region_name):
+        self.profile_name = profile_name
+        self.region_name = region_name
+
+
+# - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - -
+class TestSurveyCheckpoint(unittest.TestCase):
+    '''
+    Test cases for aws_checkpoint.SurveyCheckpoint.
+    '''
+
+    # pylint: disable=invalid-name
+
+    # - - - - - - - - - - - - - - - - - - - - - - - - - - - -
+    def setUp(self):
+        '''Create a working directory.'''
+        self.path = tempfile.mkdtemp()
+
+    # - - - - - - - - - - - - - - - - - - - - - - - - - - - -
+    def tearDown(self):
+        '''Remove the working directory.'''
+        shutil.rmtree(self.path)
+
+    # - - - - - - - - - - - - - - - - - - - - - - - - - - - -
+    def test_survey_checkpoint_save_load(self):
+        '''Test saving and loading parts.'''
+
+        checkpoint = aws_checkpoint.SurveyCheckpoint(
+            os.path.join(self.path, 'work')
+            )
+        mediator = _StubMediator('prod/admin', 'us-east-1')
+        records = [{'VpcId': 'vpc-1', 'Created': datetime(2017, 1, 1)}]
+
+        self.assertIsNone(
+            checkpoint.load(aws_checkpoint.RECORDS, mediator, 'vpc')
+            )
+
+        checkpoint.save(
+            aws_checkpoint.RECORDS, mediator, 'vpc', records,
+            plan={'Filters': []}
+            )
+        self.assertEqual(
+            checkpoint.load(
+                aws_checkpoint.RECORDS, mediator, 'vpc', {'Filters': []}
+                ),
+            records
+            )
+
+        # Parts are kept apart by kind, profile, region and type.
+        for (kind, other, entity_type) in [
+                (aws_checkpoint.EXPANSIONS, mediator, 'vpc'),
+                (aws_checkpoint.RECORDS, _StubMediator(None, None), 'vpc'),
+                (
+                    aws_checkpoint.RECORDS,
+                    _StubMediator('prod/admin', 'us-west-2'), 'vpc'
+                    ),
+                (aws_checkpoint.RECORDS, mediator, 'subnet'),
+                ]:  # pylint: disable=bad-continuation
+            self.assertIsNone(
+                checkpoint.load(kind, other, entity_type, {'Filters': []})
+                )
+
+        # Parts saved with another plan aren't used.
+        self.assertIsNone(
+            checkpoint.load(
+                aws_checkpoint.RECORDS, mediator, 'vpc',
+                {'Filters': [{'Name': 'state', 'Values': ['available']}]}
+                )
+            )
+
+        # Nor are expired parts.
+        checkpoint.max_age = 0
+        self.assertIsNone(
+            checkpoint.load(
+                aws_checkpoint.RECORDS, mediator, 'vpc', {'Filters': []}
+                )
+            )
+
+    # - - - - - - - - - - - - - - - - - - - - - - - - - - - -
+    def test_survey_checkpoint_damage(self):
+        '''Test unreadable parts, unsavable content and clearing.'''
+
+        checkpoint = aws_checkpoint.SurveyCheckpoint(self.path)
+        mediator = _StubMediator('default', 'us-east-1')
+
+        checkpoint.save(aws_checkpoint.RECORDS, mediator, 'vpc', [1, 2])
+        part_path = checkpoint.part_path(
+            aws_checkpoint.RECORDS, mediator, 'vpc'
+            )
+        with open(part_path, 'wb') as fptr:
+            fptr.write('truncated')
+        self.assertIsNone(
+            checkpoint.load(aws_checkpoint.RECORDS, mediator, 'vpc')
+            )
+
+        # Failing to save leaves the previous part in place.
+        checkpoint.save(aws_checkpoint.RECORDS, mediator, 'vpc', [1, 2])
+        checkpoint.save(
+            aws_checkpoint.RECORDS, mediator, 'vpc', [lambda: None]
+            )
+        self.assertEqual(
+            checkpoint.load(aws_checkpoint.RECORDS, mediator, 'vpc'), [1, 2]
+            )
+        self.assertEqual(
+            os.listdir(os.path.join(self.path, aws_checkpoint.RECORDS)),
+            [os.path.basename(part_path)]
+            )
+
+        checkpoint.clear()
+        self.assertIsNone(
+            checkpoint.load(aws_checkpoint.RECORDS, mediator, 'vpc')
+            )
+
+
+if __name__ == '__main__':
+    unittest.main()
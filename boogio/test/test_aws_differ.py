@@ -0,0 +1,281 @@
+# ----------------------------------------------------------------------------
+# Copyright (C) 2017 Verizon.  All Rights Reserved.
+#
+#   Licensed under the Apache License, Version 2.0 (the "License");
+#   you may not use this file except in compliance with the License.
+#   You may obtain a copy of the License at
+#
+#       http://www.apache.org/licenses/LICENSE-2.0
+#
+#   Unless required by applicable law or agreed to in writing, software
+#   distributed under the License is distributed on an "AS IS" BASIS,
+#   WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#   See the License for the specific language governing permissions and
+#   limitations under the License.
+#
+# ----------------------------------------------------------------------------
+
+'''Test cases for the aws_differ.py module.'''
+
+import os
+import shutil
+import tempfile
+
+import unittest
+
+import boogio.aws_differ as aws_differ
+import boogio.aws_reporter as aws_reporter
+
+
+ACCOUNT = '123456789012'
+REGION = 'us-east-1'
+
+
+# - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - -
+def _ec2_record(instance_id, state='running', subnet_ips=10, **extra):
+    '''Construct a sample EC2 instance record.'''
+
+    record = {
+        'InstanceId': instance_id,
+        'State': {'Name': state, 'Code': 16},
+        'SubnetId': {
+            'SubnetId': 'subnet-1', 'AvailableIpAddressCount': subnet_ips
+            },
+        'SecurityGroups': [{'GroupId': 'sg-1'}, {'GroupId': 'sg-2'}],
+        'meta': {'account_id': ACCOUNT, 'region_name': REGION},
+        }
+    record.update(extra)
+    return record
+
+
+# - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - -
+def _snapshot(*records):
+    '''Construct a snapshot of EC2 instance records.'''
+
+    snapshot = aws_differ.AWSSnapshot()
+    for record in records:
+        snapshot.add_record(
+            'ec2', ACCOUNT, REGION, record['InstanceId'], record
+            )
+    return snapshot
+
+
+# - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - -
+class TestAWSDifferPaths(unittest.TestCase):
+    '''
+    Test cases for aws_differ path functions.
+    '''
+
+    # pylint: disable=invalid-name
+
+    # - - - - - - - - - - - - - - - - - - - - - - - - - - - -
+    def test_content_hash_is_stable(self):
+        '''Test that content hashes ignore dict ordering.'''
+
+        self.assertEqual(
+            aws_differ.content_hash({'a': 1, 'b': [1, 2]}),
+            aws_differ.content_hash({'b': [1, 2], 'a': 1})
+            )
+        self.assertNotEqual(
+            aws_differ.content_hash({'a': 1}),
+            aws_differ.content_hash({'a': 2})
+            )
+
+    # - - - - - - - - - - - - - - - - - - - - - - - - - - - -
+    def test_changed_paths(self):
+        '''Test identification of changed leaf paths.'''
+
+        old = _ec2_record('i-1')
+        new = _ec2_record('i-1', state='stopped', subnet_ips=9)
+
+        self.assertEqual(
+            aws_differ.changed_paths(old, new),
+            ['State.Name', 'SubnetId.AvailableIpAddressCount']
+            )
+
+        # List order isn't significant.
+        reordered = _ec2_record('i-1')
+        reordered['SecurityGroups'].reverse()
+        self.assertEqual(aws_differ.changed_paths(old, reordered), [])
+
+        # List content is.
+        reordered['SecurityGroups'].append({'GroupId': 'sg-3'})
+        self.assertEqual(
+            aws_differ.changed_paths(old, reordered),
+            ['SecurityGroups.[].GroupId']
+            )
+
+    # - - - - - - - - - - - - - - - - - - - - - - - - - - - -
+    def test_path_overlaps(self):
+        '''Test prune path prefix comparison.'''
+
+        self.assertTrue(aws_differ.path_overlaps('State.Name', 'State'))
+        self.assertTrue(aws_differ.path_overlaps('State', 'State.Name'))
+        self.assertTrue(
+            aws_differ.path_overlaps(
+                'SecurityGroups.[].GroupId', 'SecurityGroups.GroupId'
+                )
+            )
+        self.assertFalse(aws_differ.path_overlaps('State.Name', 'StateX'))
+        self.assertFalse(
+            aws_differ.path_overlaps('State.Name', 'State.Code')
+            )
+
+
+# - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - -
+class TestAWSSurveyDiff(unittest.TestCase):
+    '''
+    Test cases for aws_differ.AWSSurveyDiff.
+    '''
+
+    # pylint: disable=invalid-name
+
+    # - - - - - - - - - - - - - - - - - - - - - - - - - - - -
+    def setUp(self):
+        self.old = _snapshot(
+            _ec2_record('i-1'), _ec2_record('i-2'), _ec2_record('i-3')
+            )
+        self.new = _snapshot(
+            _ec2_record('i-1'),
+            _ec2_record('i-2', state='stopped'),
+            _ec2_record('i-3', subnet_ips=5),
+            _ec2_record('i-4'),
+            )
+        self.tmpdir = tempfile.mkdtemp()
+
+    # - - - - - - - - - - - - - - - - - - - - - - - - - - - -
+    def tearDown(self):
+        shutil.rmtree(self.tmpdir)
+
+    # - - - - - - - - - - - - - - - - - - - - - - - - - - - -
+    def test_diff(self):
+        '''Test added, removed and changed records.'''
+
+        diff = aws_differ.AWSSurveyDiff(self.new, self.old)
+
+        self.assertEqual(
+            diff.summary(),
+            {'added': 0, 'removed': 1, 'changed': 2, 'unchanged': 1}
+            )
+        self.assertEqual(diff.removed[0].identifier, 'i-4')
+
+        diff = aws_differ.AWSSurveyDiff(self.old, self.new)
+
+        self.assertEqual([r.identifier for r in diff.added], ['i-4'])
+        self.assertEqual(diff.removed, [])
+        self.assertEqual(
+            [(r.identifier, r.changed_paths) for r in diff.changed],
+            [
+                ('i-2', ['State.Name']),
+                ('i-3', ['SubnetId.AvailableIpAddressCount']),
+                ]
+            )
+        self.assertEqual(len(diff.informers('ec2')), 3)
+        self.assertEqual(diff.informers('vpc'), [])
+        self.assertEqual(
+            diff.records('changed')[0].to_dict()['diff']['status'],
+            'changed'
+            )
+
+    # - - - - - - - - - - - - - - - - - - - - - - - - - - - -
+    def test_volatile_changes(self):
+        '''Test that changes to only volatile fields are unchanged.'''
+
+        def subnet_snapshot(**record):
+            '''Construct a snapshot of one subnet record.'''
+            snapshot = aws_differ.AWSSnapshot()
+            entry = snapshot.add_record(
+                'subnet', ACCOUNT, REGION, 'subnet-1',
+                dict(record, SubnetId='subnet-1')
+                )
+            self.assertEqual(
+                entry['content_hash'],
+                aws_differ.content_hash(entry['record'])
+                )
+            return snapshot
+
+        old = subnet_snapshot(AvailableIpAddressCount=10, CidrBlock='a')
+
+        diff = aws_differ.AWSSurveyDiff(
+            old, subnet_snapshot(AvailableIpAddressCount=9, CidrBlock='a')
+            )
+        self.assertEqual(diff.changed, [])
+        self.assertEqual(diff.unchanged_count, 1)
+
+        diff = aws_differ.AWSSurveyDiff(
+            old, subnet_snapshot(AvailableIpAddressCount=9, CidrBlock='b')
+            )
+        self.assertEqual(diff.changed[0].changed_paths, ['CidrBlock'])
+
+    # - - - - - - - - - - - - - - - - - - - - - - - - - - - -
+    def test_alignment_includes_region(self):
+        '''Test that the same identifier in two regions isn't aligned.'''
+
+        other = _snapshot(_ec2_record('i-1'))
+        other.add_record(
+            'ec2', ACCOUNT, 'us-west-2', 'i-1', _ec2_record('i-1')
+            )
+
+        diff = aws_differ.AWSSurveyDiff(_snapshot(_ec2_record('i-1')), other)
+        self.assertEqual(
+            [r.key for r in diff.added],
+            [('ec2', ACCOUNT, 'us-west-2', 'i-1')]
+            )
+        self.assertEqual(diff.unchanged_count, 1)
+
+    # - - - - - - - - - - - - - - - - - - - - - - - - - - - -
+    def test_snapshot_write_and_read(self):
+        '''Test that snapshots survive a round trip through a file.'''
+
+        path = os.path.join(self.tmpdir, 'snapshot.json')
+        self.old.write(path)
+        restored = aws_differ.AWSSnapshot.read(path)
+
+        self.assertEqual(len(restored), 3)
+        self.assertEqual(restored.created, self.old.created)
+
+        diff = aws_differ.AWSSurveyDiff(restored, self.old)
+        self.assertEqual(diff.records(), [])
+        self.assertEqual(diff.unchanged_count, 3)
+
+    # - - - - - - - - - - - - - - - - - - - - - - - - - - - -
+    def test_diff_report(self):
+        '''Test running a report definition over a diff.'''
+
+        definition = aws_reporter.ReportDefinition(
+            name='EC2State',
+            entity_type='ec2',
+            prune_specs=[
+                {'path': 'InstanceId'},
+                {'path': 'State.Name'},
+                ],
+            default_column_order=['InstanceId', 'State.Name']
+            )
+        reporter = aws_reporter.AWSReporter()
+        diff = aws_differ.AWSSurveyDiff(self.old, self.new)
+
+        # The subnet change to i-3 isn't relevant to this report.
+        records = reporter.diff_report(diff, report_definition=definition)
+        self.assertEqual(
+            sorted(
+                (r['InstanceId'], r['diff.status'], r['State.Name'])
+                for r in records
+                ),
+            [('i-2', 'changed', 'stopped'), ('i-4', 'added', 'running')]
+            )
+
+        records = reporter.diff_report(
+            diff, report_definition=definition, relevant_only=False
+            )
+        self.assertEqual(len(records), 3)
+
+        records = reporter.diff_report(
+            diff, report_definition=definition, statuses=['added']
+            )
+        self.assertEqual([r['InstanceId'] for r in records], ['i-4'])
+
+        # A diff can stand in for a surveyor in the other methods.
+        records = reporter.report(
+            surveyors=[diff], report_definition=definition
+            )
+        self.assertEqual(len(records), 3)
@@ -0,0 +1,224 @@
+# ----------------------------------------------------------------------------
+# Copyright (C) 2017 Verizon.  All Rights Reserved.
+#
+#   Licensed under the Apache License, Version 2.0 (the "License");
+#   you may not use this file except in compliance with the License.
+#   You may obtain a copy of the License at
+#
+#       http://www.apache.org/licenses/LICENSE-2.0
+#
+#   Unless required by applicable law or agreed to in writing, software
+#   distributed under the License is distributed on an "AS IS" BASIS,
+#   WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#   See the License for the specific language governing permissions and
+#   limitations under the License.
+#
+# ----------------------------------------------------------------------------
+
+'''Test cases for the aws_graph.py module.'''
+
+import unittest
+
+import boogio.aws_graph as aws_graph
+
+
+# - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - -
+class _Mediator(object):
+    '''A stand-in with the mediator attributes the graph uses.'''
+
+    # pylint: disable=too-few-public-methods
+
+    def __init__(self, account_id, region_name, profile_name=None):
+        self.account_id = account_id
+        self.region_name = region_name
+        self.profile_name = profile_name
+
+
+# - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - -
+class _Entity(object):
+    '''A stand-in with the informer attributes the graph uses.'''
+
+    # pylint: disable=too-few-public-methods
+
+    def __init__(self, entity_type, identifier, resource, mediator=None):
+        self.entity_type = entity_type
+        self.identifier = identifier
+        self.resource = resource
+        self.mediator = mediator
+
+
+# - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - -
+class TestAWSRelationshipGraph(unittest.TestCase):
+    '''
+    Test cases for aws_graph.AWSRelationshipGraph.
+    '''
+
+    # pylint: disable=invalid-name
+
+    # - - - - - - - - - - - - - - - - - - - - - - - - - - - -
+    def setUp(self):
+        self.vpc = _Entity('vpc', 'vpc-1', {'VpcId': 'vpc-1'})
+        self.subnet = _Entity(
+            'subnet', 'subnet-1', {'SubnetId': 'subnet-1', 'VpcId': 'vpc-1'}
+            )
+        self.sg = _Entity(
+            'security_group', 'sg-1', {'GroupId': 'sg-1', 'VpcId': 'vpc-1'}
+            )
+        self.instances = [
+            _Entity('ec2', 'i-%d' % n, {
+                'InstanceId': 'i-%d' % n,
+                'SubnetId': 'subnet-1',
+                'VpcId': 'vpc-1',
+                'SecurityGroups': [{'GroupId': 'sg-1'}],
+                'NetworkInterfaces': [{'NetworkInterfaceId': 'eni-%d' % n}],
+                })
+            for n in range(3)
+            ]
+        self.eni = _Entity('network_interface', 'eni-0', {
+            'NetworkInterfaceId': 'eni-0',
+            'Groups': [{'GroupId': 'sg-1'}],
+            'Attachment': {'InstanceId': 'i-0'},
+            })
+        self.elb = _Entity('elb', 'lb-1', {
+            'LoadBalancerName': 'lb-1',
+            'Instances': [{'InstanceId': 'i-0'}, {'InstanceId': 'i-gone'}],
+            'SecurityGroups': ['sg-1'],
+            })
+
+        self.graph = aws_graph.AWSRelationshipGraph(
+            [self.vpc, self.subnet, self.sg, self.eni, self.elb] +
+            self.instances
+            )
+
+    # - - - - - - - - - - - - - - - - - - - - - - - - - - - -
+    def test_path_values(self):
+        '''Test extraction of values at reference paths.'''
+
+        self.assertEqual(
+            aws_graph.path_values(
+                self.instances[0].resource, 'SecurityGroups.[].GroupId'
+                ),
+            ['sg-1']
+            )
+        self.assertEqual(
+            aws_graph.path_values({'a': None, 'b': ''}, 'a'), []
+            )
+        self.assertEqual(aws_graph.path_values({}, 'a.[].b'), [])
+
+    # - - - - - - - - - - - - - - - - - - - - - - - - - - - -
+    def test_neighbors(self):
+        '''Test neighbor queries in each direction.'''
+
+        graph = self.graph
+
+        self.assertEqual(len(graph), 8)
+        self.assertIn(('ec2', 'i-0'), graph)
+        self.assertNotIn(('ec2', 'i-gone'), graph)
+
+        self.assertEqual(
+            graph.neighbors(self.subnet, 'ec2', aws_graph.INCOMING),
+            self.instances
+            )
+        self.assertEqual(
+            graph.neighbors(self.subnet, 'ec2', aws_graph.OUTGOING), []
+            )
+        self.assertEqual(
+            graph.neighbors(self.sg, 'network_interface'), [self.eni]
+            )
+        self.assertEqual(
+            graph.neighbors(self.instances[0], 'network_interface'),
+            [self.eni]
+            )
+
+        # Unresolved references are nodes but not informers.
+        self.assertEqual(graph.neighbors(self.elb, 'ec2'), [self.instances[0]])
+        self.assertEqual(
+            graph.neighbor_nodes(self.elb, 'ec2'),
+            [('ec2', 'i-0', None), ('ec2', 'i-gone', None)]
+            )
+
+        # Adding the missing entity resolves the existing edge.
+        gone = _Entity('ec2', 'i-gone', {'InstanceId': 'i-gone'})
+        graph.add_informer(gone)
+        self.assertEqual(
+            graph.neighbors(self.elb, 'ec2'), [self.instances[0], gone]
+            )
+
+    # - - - - - - - - - - - - - - - - - - - - - - - - - - - -
+    def test_closure(self):
+        '''Test closure queries.'''
+
+        graph = self.graph
+
+        self.assertItemsEqual(
+            graph.closure(self.elb),
+            [self.instances[0], self.sg, self.subnet, self.vpc, self.eni]
+            )
+        self.assertEqual(
+            graph.closure(self.elb, max_depth=1),
+            [self.instances[0], self.sg]
+            )
+        self.assertItemsEqual(
+            graph.closure(self.vpc, ['subnet', 'ec2'], aws_graph.INCOMING),
+            [self.subnet] + self.instances
+            )
+
+    # - - - - - - - - - - - - - - - - - - - - - - - - - - - -
+    def test_edges(self):
+        '''Test edge listing.'''
+
+        self.assertEqual(
+            self.graph.edges('elb'),
+            [
+                (('elb', 'lb-1', None), ('ec2', 'i-0', None)),
+                (('elb', 'lb-1', None), ('ec2', 'i-gone', None)),
+                (
+                    ('elb', 'lb-1', None),
+                    ('security_group', 'sg-1', None)
+                    ),
+                ]
+            )
+        self.assertEqual(
+            len(self.graph.edges(target_type='vpc')), 5
+            )
+
+    # - - - - - - - - - - - - - - - - - - - - - - - - - - - -
+    def test_scopes(self):
+        '''Test that entities in other accounts and regions are apart.'''
+
+        mediators = [
+            _Mediator('111111111111', 'us-east-1'),
+            _Mediator('111111111111', 'us-west-2'),
+            _Mediator(None, 'us-west-2', profile_name='other'),
+            ]
+
+        # The same load balancer and instance names in each scope.
+        elbs = [
+            _Entity('elb', 'lb-1', {
+                'LoadBalancerName': 'lb-1',
+                'Instances': [{'InstanceId': 'i-%d' % n}],
+                }, mediator)
+            for (n, mediator) in enumerate(mediators)
+            ]
+        instances = [
+            _Entity('ec2', 'i-%d' % n, {'InstanceId': 'i-%d' % n}, mediator)
+            for n in range(len(mediators))
+            for mediator in mediators
+            ]
+
+        graph = aws_graph.AWSRelationshipGraph(elbs + instances)
+        self.assertEqual(len(graph), len(elbs) + len(instances))
+
+        for (n, (elb, mediator)) in enumerate(zip(elbs, mediators)):
+            self.assertIs(graph.informer(graph.node(elb)), elb)
+            self.assertEqual(
+                graph.neighbors(elb, 'ec2'),
+                [
+                    i for i in instances
+                    if i.mediator is mediator and i.identifier == 'i-%d' % n
+                    ]
+                )
+
+        self.assertEqual(
+            graph.node(elbs[2]), ('elb', 'lb-1', ('other', 'us-west-2'))
+            )
@@ -17,10 +17,14 @@
 
 '''Test cases for the aws_informer module.'''
 
+import copy
+import datetime
 import json
 import os
 import random
+import socket
 import tempfile
+import time
 
 import unittest
 
@@ -235,6 +239,39 @@ class TestAWSInformerModule(unittest.TestCase):
             set([])
             )
 
+    # - - - - - - - - - - - - - - - - - - - - - - - - - - - - - -
+    def test_aws_informer_entity_type_spec(self):
+        '''Test cases for aws_informer.entity_type_spec().'''
+
+        for entity_type in aws_informer.entity_types():
+            spec = aws_informer.entity_type_spec(entity_type)
+            self.assertEqual(spec.entity_type, entity_type)
+            self.assertIs(
+                spec.informer_class, aws_informer.informer_class(entity_type)
+                )
+            self.assertEqual(
+                aws_informer.informer_entity_type(spec.informer_class),
+                entity_type
+                )
+            self.assertIn(
+                spec.regionality,
+                [
+                    aws_informer.REGIONAL, aws_informer.REGIONLESS,
+                    aws_informer.UNITARY
+                    ]
+                )
+            if spec.regionality != aws_informer.UNITARY:
+                self.assertIsNotNone(spec.identifier_key)
+                self.assertIsNotNone(spec.operation)
+
+        # Types can be fetched without having informers.
+        spec = aws_informer.entity_type_spec('s3')
+        self.assertIsNone(spec.informer_class)
+        self.assertEqual(spec.operation, 'list_buckets')
+        self.assertNotIn('s3', aws_informer.entity_types())
+
+        self.assertIsNone(aws_informer.entity_type_spec('no_such_type'))
+
     # - - - - - - - - - - - - - - - - - - - - - - - - - - - - - -
     def test_aws_informer_rekey(self):
         '''Test cases for aws_informer.rekey().'''
@@ -274,6 +311,507 @@ class TestAWSInformerModule(unittest.TestCase):
             aws_informer.rekey(working_map, new_key_map_clobber)
 
 
+    # - - - - - - - - - - - - - - - - - - - - - - - - - - - - - -
+    def test_aws_informer_volatile_fields(self):
+        '''Test cases for aws_informer.informer_volatile_fields().'''
+
+        # pylint: disable=protected-access
+
+        for entity_type in aws_informer.entity_types():
+            self.assertEqual(
+                aws_informer.informer_volatile_fields(entity_type),
+                aws_informer.informer_class(entity_type).volatile_fields
+                )
+
+        self.assertIn(
+            'AvailableIpAddressCount',
+            aws_informer.informer_volatile_fields('subnet')
+            )
+
+        original_config = aws_informer._BOOGIO_CONFIG
+        aws_informer._BOOGIO_CONFIG = {
+            'aws_informer': {'volatile_fields': {'subnet': []}}
+            }
+        try:
+            self.assertEqual(
+                aws_informer.informer_volatile_fields('subnet'), []
+                )
+        finally:
+            aws_informer._BOOGIO_CONFIG = original_config
+
+    # - - - - - - - - - - - - - - - - - - - - - - - - - - - - - -
+    def test_aws_informer_expansion_dependencies(self):
+        '''Test cases for aws_informer.expansion_dependencies().'''
+
+        for entity_type in aws_informer.entity_types():
+            for dependency in aws_informer.expansion_dependencies(
+                    entity_type
+                    ):  # pylint: disable=bad-continuation
+                self.assertIn(dependency, aws_informer.entity_types())
+
+        self.assertEqual(aws_informer.expansion_dependencies('vpc'), set())
+        self.assertEqual(
+            aws_informer.expansion_dependencies('security_group'),
+            set(['vpc'])
+            )
+        self.assertEqual(
+            aws_informer.expansion_dependencies('eip', max_depth=1),
+            set(['ec2', 'network_interface'])
+            )
+        self.assertEqual(
+            aws_informer.expansion_dependencies('eip'),
+            set([
+                'ec2', 'network_interface', 'security_group', 'vpc',
+                'subnet'
+                ])
+            )
+        self.assertEqual(
+            aws_informer.expansion_dependencies('eip', max_depth=0), set()
+            )
+
+    # - - - - - - - - - - - - - - - - - - - - - - - - - - - - - -
+    def test_aws_informer_without_paths(self):
+        '''Test cases for aws_informer._without_paths().'''
+
+        # pylint: disable=protected-access
+
+        tree = {
+            'a': 1,
+            'b': {'c': 2, 'd': 3},
+            'e': [{'f': 4, 'g': 5}, {'f': 6}],
+            }
+
+        self.assertEqual(
+            aws_informer._without_paths(
+                tree, [['a'], ['b', 'c'], ['e', '[]', 'f'], ['x', 'y']]
+                ),
+            {'b': {'d': 3}, 'e': [{'g': 5}, {}]}
+            )
+
+        # The original is untouched.
+        self.assertEqual(tree['a'], 1)
+        self.assertEqual(tree['b'], {'c': 2, 'd': 3})
+        self.assertEqual(tree['e'], [{'f': 4, 'g': 5}, {'f': 6}])
+
+    # - - - - - - - - - - - - - - - - - - - - - - - - - - - - - -
+    def test_aws_informer_intern_paths(self):
+        '''Test cases for aws_informer._intern_paths().'''
+
+        # pylint: disable=protected-access
+
+        def tree():
+            '''Return a tree with freshly built strings.'''
+            return {
+                'a': ''.join(['vpc-', '1']),
+                'b': {'c': u''.join([u'run', u'ning']), 'd': 3},
+                'e': [{'f': ''.join(['sg-', '1'])}, {'f': None}],
+                }
+
+        paths = [['a'], ['b', 'c'], ['b', 'd'], ['e', '[]', 'f'], ['x']]
+        first = tree()
+        second = tree()
+        aws_informer._intern_paths(first, paths)
+        aws_informer._intern_paths(second, paths)
+
+        self.assertEqual(first, tree())
+        self.assertIs(first['a'], second['a'])
+        self.assertIs(first['b']['c'], second['b']['c'])
+        self.assertIs(first['e'][0]['f'], second['e'][0]['f'])
+        self.assertIsInstance(first['b']['c'], unicode)
+        self.assertIsNone(first['e'][1]['f'])
+
+    # - - - - - - - - - - - - - - - - - - - - - - - - - - - - - -
+    def test_aws_informer_resource_stub(self):
+        '''Test cases for compressed resource records.'''
+
+        # pylint: disable=protected-access
+
+        record = {'GroupId': 'sg-1', 'IpPermissions': [{'FromPort': 22}]}
+        stub = aws_informer._ResourceStub(record, 'GroupId')
+
+        self.assertEqual(dict(stub), {'GroupId': 'sg-1'})
+        self.assertEqual(stub.decode(), record)
+        self.assertEqual(copy.deepcopy(stub), record)
+
+        cache = aws_informer._DecodedResourceCache(1)
+        decoded = cache.get(stub)
+        self.assertEqual(decoded, record)
+        self.assertIs(cache.get(stub), decoded)
+
+        other = aws_informer._ResourceStub({'GroupId': 'sg-2'}, 'GroupId')
+        cache.get(other)
+        self.assertIsNot(cache.get(stub), decoded)
+
+        self.assertIs(aws_informer._decoded_resource(record), record)
+
+    # - - - - - - - - - - - - - - - - - - - - - - - - - - - - - -
+    def test_aws_informer_frozen_dict(self):
+        '''Test cases for the shared meta supplementals dict type.'''
+
+        # pylint: disable=protected-access
+
+        frozen = aws_informer._FrozenDict({'region_name': 'us-east-1'})
+
+        with self.assertRaises(TypeError):
+            frozen['region_name'] = 'us-west-2'
+        with self.assertRaises(TypeError):
+            frozen.update({'account_id': '123'})
+
+        copied = copy.deepcopy(frozen)
+        self.assertEqual(copied, frozen)
+        copied['region_name'] = 'us-west-2'
+        self.assertEqual(frozen['region_name'], 'us-east-1')
+
+    # - - - - - - - - - - - - - - - - - - - - - - - - - - - - - -
+    def test_aws_informer_shared_session(self):
+        '''Test cases for sessions shared between mediators.'''
+
+        # pylint: disable=protected-access
+
+        session = aws_informer.shared_session(
+            profile_name=site_boogio.test_profile_name,
+            region_name='us-east-1'
+            )
+        other_region_session = aws_informer.shared_session(
+            profile_name=site_boogio.test_profile_name,
+            region_name='us-west-2'
+            )
+
+        self.assertIs(
+            aws_informer.shared_session(
+                profile_name=site_boogio.test_profile_name,
+                region_name='us-east-1'
+                ),
+            session
+            )
+        self.assertIsNot(other_region_session, session)
+        self.assertEqual(other_region_session.region_name, 'us-west-2')
+
+        # Credentials are resolved once per profile and models are
+        # loaded once.
+        self.assertIs(
+            other_region_session.get_credentials(),
+            session.get_credentials()
+            )
+        self.assertIs(
+            other_region_session._session.get_component('data_loader'),
+            session._session.get_component('data_loader')
+            )
+
+        self.assertIs(
+            aws_informer.AWSSession(
+                profile_name=site_boogio.test_profile_name,
+                region_name='us-west-2'
+                ).session,
+            other_region_session
+            )
+
+        aws_informer.clear_shared_sessions(site_boogio.test_profile_name)
+        self.assertIsNot(
+            aws_informer.shared_session(
+                profile_name=site_boogio.test_profile_name,
+                region_name='us-east-1'
+                ),
+            session
+            )
+
+        # Refreshing a session discards the profile's shared session
+        # and credentials.
+        mediator = aws_informer.AWSMediator(
+            profile_name=site_boogio.test_profile_name,
+            region_name='us-east-1'
+            )
+        shared = mediator.session
+        aws_informer._SHARED_CREDENTIALS[site_boogio.test_profile_name] = (
+            'stale'
+            )
+        mediator.refresh_session()
+        self.assertIsNot(mediator.session, shared)
+        self.assertIs(
+            aws_informer.shared_session(
+                profile_name=site_boogio.test_profile_name,
+                region_name='us-east-1'
+                ),
+            mediator.session
+            )
+        self.assertNotEqual(mediator.session.get_credentials(), 'stale')
+
+    # - - - - - - - - - - - - - - - - - - - - - - - - - - - - - -
+    def test_aws_informer_shared_credentials_expiry(self):
+        '''Test cases for re-resolving expiring shared credentials.'''
+
+        # pylint: disable=protected-access
+
+        class _Credentials(object):
+            '''Stand-in credentials with an expiry time.'''
+            # pylint: disable=too-few-public-methods
+            def __init__(self, expires_in):
+                self._expiry_time = (
+                    datetime.datetime.utcnow() +
+                    datetime.timedelta(seconds=expires_in)
+                    )
+
+        class _Resolver(object):
+            '''Return the next of a list of credentials.'''
+            # pylint: disable=too-few-public-methods
+            def __init__(self, credentials):
+                self.credentials = credentials
+
+            def load_credentials(self):
+                '''Return the next credentials.'''
+                return self.credentials.pop(0)
+
+        expiring = _Credentials(aws_informer.CREDENTIAL_EXPIRY_MARGIN / 2)
+        current = _Credentials(3600)
+        resolver = aws_informer._SharedCredentialResolver(
+            'no-such-profile', _Resolver([expiring, current, None])
+            )
+        try:
+            self.assertIs(resolver.load_credentials(), expiring)
+            self.assertIs(resolver.load_credentials(), current)
+            self.assertIs(resolver.load_credentials(), current)
+        finally:
+            aws_informer.clear_shared_sessions('no-such-profile')
+
+    # - - - - - - - - - - - - - - - - - - - - - - - - - - - - - -
+    def test_aws_informer_profile_account_id(self):
+        '''Test cases for account IDs resolved once per profile.'''
+
+        # pylint: disable=protected-access
+
+        account_id = aws_informer.profile_account_id(
+            profile_name=site_boogio.test_profile_name
+            )
+        self.assertEqual(
+            aws_informer._ACCOUNT_IDS[site_boogio.test_profile_name],
+            account_id
+            )
+        self.assertEqual(
+            aws_informer.AWSMediator(
+                profile_name=site_boogio.test_profile_name,
+                region_name='us-west-2'
+                ).account_id,
+            account_id
+            )
+
+        # Mediators resolve their account when it's first needed.
+        aws_informer.clear_account_ids(site_boogio.test_profile_name)
+        mediator = aws_informer.AWSMediator(
+            profile_name=site_boogio.test_profile_name,
+            region_name='us-west-2'
+            )
+        self.assertNotIn(
+            site_boogio.test_profile_name, aws_informer._ACCOUNT_IDS
+            )
+        self.assertIsNone(mediator._service_records)
+        self.assertEqual(mediator.account_id, account_id)
+        self.assertEqual(
+            aws_informer._ACCOUNT_IDS[site_boogio.test_profile_name],
+            account_id
+            )
+        self.assertIsNotNone(mediator.account_name)
+
+        # Account IDs persist in the configured cache file.
+        config = aws_informer._BOOGIO_CONFIG.setdefault('aws_informer', {})
+        (handle, filepath) = tempfile.mkstemp()
+        os.close(handle)
+        config['account_id_cache_file'] = filepath
+        try:
+            with open(filepath, 'w') as fptr:
+                json.dump({'no-such-profile': '000000000000'}, fptr)
+
+            self.assertEqual(
+                aws_informer.profile_account_id('no-such-profile'),
+                '000000000000'
+                )
+
+            aws_informer.clear_account_ids('no-such-profile')
+            self.assertNotIn('no-such-profile', aws_informer._ACCOUNT_IDS)
+            with open(filepath, 'r') as fptr:
+                self.assertEqual(json.load(fptr), {})
+
+            aws_informer.clear_account_ids(site_boogio.test_profile_name)
+            aws_informer.profile_account_id(
+                profile_name=site_boogio.test_profile_name
+                )
+            with open(filepath, 'r') as fptr:
+                self.assertEqual(
+                    json.load(fptr),
+                    {site_boogio.test_profile_name: account_id}
+                    )
+
+        finally:
+            del config['account_id_cache_file']
+            os.remove(filepath)
+
+    # - - - - - - - - - - - - - - - - - - - - - - - - - - - - - -
+    def test_aws_informer_rate_limit_account(self):
+        '''Test cases for the account keying rate limit buckets.'''
+
+        # pylint: disable=protected-access
+
+        aws_informer._ACCOUNT_IDS['no-such-profile'] = '000000000000'
+        try:
+            self.assertEqual(
+                aws_informer._rate_limit_account('no-such-profile'),
+                '000000000000'
+                )
+        finally:
+            aws_informer.clear_account_ids('no-such-profile')
+
+        # Unresolvable profiles are keyed by name, and aren't tried
+        # again until they're cleared.
+        self.assertEqual(
+            aws_informer._rate_limit_account('no-such-profile'),
+            'no-such-profile'
+            )
+        self.assertIn(
+            'no-such-profile', aws_informer._UNRESOLVED_ACCOUNT_PROFILES
+            )
+        aws_informer.clear_account_ids('no-such-profile')
+        self.assertNotIn(
+            'no-such-profile', aws_informer._UNRESOLVED_ACCOUNT_PROFILES
+            )
+
+        # Calls made while resolving identity don't wait for it.
+        aws_informer._ACCOUNT_ID_STATE.resolving = True
+        try:
+            self.assertEqual(
+                aws_informer._rate_limit_account('no-such-profile'),
+                'no-such-profile'
+                )
+        finally:
+            aws_informer._ACCOUNT_ID_STATE.resolving = False
+        self.assertNotIn(
+            'no-such-profile', aws_informer._UNRESOLVED_ACCOUNT_PROFILES
+            )
+
+    # - - - - - - - - - - - - - - - - - - - - - - - - - - - -
+    def test_aws_informer_dns_resolver(self):
+        '''Test concurrent, cached, retried DNS lookups.'''
+
+        lookups = []
+
+        def getaddrinfo(host, port, family):
+            '''Answer lookups for test names.'''
+            # pylint: disable=unused-argument
+            lookups.append(host)
+            if host == 'slow.example.com' and lookups.count(host) == 1:
+                time.sleep(1)
+            if host == 'flaky.example.com' and lookups.count(host) == 1:
+                raise socket.gaierror(socket.EAI_AGAIN, 'try again')
+            if host == 'missing.example.com':
+                raise socket.gaierror(socket.EAI_NONAME, 'not found')
+            if host == 'broken.example.com':
+                raise ValueError('unexpected')
+            return [
+                (family, 1, 6, '', ('10.0.0.2', 0)),
+                (family, 2, 17, '', ('10.0.0.1', 0)),
+                (family, 1, 6, '', ('10.0.0.1', 0)),
+                ]
+
+        filepath = os.path.join(self.tmpdir, 'dns_cache.json')
+        resolver = aws_informer._DNSAddressResolver(
+            ttl=60, timeout=0.2, attempts=3, thread_count=4,
+            cache_path=filepath
+            )
+
+        original_getaddrinfo = socket.getaddrinfo
+        socket.getaddrinfo = getaddrinfo
+        try:
+            resolver.prefetch([
+                'slow.example.com', 'flaky.example.com',
+                'missing.example.com', None
+                ])
+            self.assertEqual(
+                resolver.resolve('flaky.example.com'),
+                ['10.0.0.1', '10.0.0.2']
+                )
+            self.assertEqual(
+                resolver.resolve('slow.example.com'),
+                ['10.0.0.1', '10.0.0.2']
+                )
+            self.assertEqual(resolver.resolve('missing.example.com'), [])
+            self.assertEqual(lookups.count('slow.example.com'), 2)
+            self.assertEqual(lookups.count('flaky.example.com'), 2)
+            self.assertEqual(lookups.count('missing.example.com'), 1)
+
+            # Unexpected errors end the lookup, without caching it or
+            # leaving resolve() waiting for it.
+            started = time.time()
+            self.assertEqual(resolver.resolve('broken.example.com'), [])
+            self.assertLess(time.time() - started, 1)
+            self.assertEqual(lookups.count('broken.example.com'), 1)
+            self.assertNotIn('broken.example.com', resolver._cache)
+
+            # Cached results are reused, and kept between runs.
+            del lookups[:]
+            resolver.resolve('slow.example.com')
+            resolver.resolve('missing.example.com')
+            self.assertEqual(lookups, [])
+
+            resolver = aws_informer._DNSAddressResolver(
+                ttl=60, timeout=0.2, attempts=3, thread_count=4,
+                cache_path=filepath
+                )
+            self.assertEqual(
+                resolver.resolve('flaky.example.com'),
+                ['10.0.0.1', '10.0.0.2']
+                )
+            self.assertEqual(lookups, [])
+
+            # Expired results aren't reused.
+            resolver.ttl = 0
+            resolver.clear()
+            resolver.resolve('missing.example.com')
+            resolver.resolve('missing.example.com')
+            self.assertEqual(lookups, ['missing.example.com'] * 2)
+
+        finally:
+            socket.getaddrinfo = original_getaddrinfo
+            os.remove(filepath)
+
+    # - - - - - - - - - - - - - - - - - - - - - - - - - - - -
+    def test_aws_informer_emr_cluster_states(self):
+        '''Test EMR cluster state pushdown.'''
+
+        # pylint: disable=protected-access
+
+        config = aws_informer._BOOGIO_CONFIG.setdefault('aws_informer', {})
+        mediator = aws_informer.AWSMediator(
+            region_name=site_boogio.test_region_name,
+            profile_name=site_boogio.test_profile_name
+            )
+
+        self.assertEqual(
+            mediator._cluster_states_kwarg(),
+            {'ClusterStates': sorted(
+                aws_informer.EMRInformer.default_cluster_states
+                )}
+            )
+        self.assertEqual(mediator._cluster_states_kwarg(False), {})
+
+        config['emr_cluster_states'] = ['WAITING']
+        try:
+            self.assertEqual(
+                mediator._cluster_states_kwarg(),
+                {'ClusterStates': ['WAITING']}
+                )
+
+            mediator.add_filters('emr', {'ClusterStates': ['TERMINATED']})
+            self.assertEqual(
+                mediator._cluster_states_kwarg(),
+                {'ClusterStates': ['TERMINATED']}
+                )
+
+            mediator.remove_all_filters()
+            config['emr_cluster_states'] = []
+            self.assertEqual(mediator._cluster_states_kwarg(), {})
+
+        finally:
+            del config['emr_cluster_states']
+
+
 # - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - -
 class TestAWSInformerInit(unittest.TestCase):
     '''Basic test cases for AWSInformer initialization.'''
@@ -475,6 +1013,85 @@ class TestAWSInformerExpand(unittest.TestCase):
             )
 
 
+# - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - -
+class TestAWSInformerFingerprint(unittest.TestCase):
+    '''Basic test cases for AWSInformer.fingerprint.'''
+
+    # - - - - - - - - - - - - - - - - - - - - - - - - - - - - - -
+    def test_aws_informer_fingerprint(self):
+        '''Test fingerprint stability and invalidation.'''
+
+        informer = aws_informer.SubnetInformer(
+            GLOBAL_MEDIATOR.entities('subnet')[0],
+            mediator=GLOBAL_MEDIATOR
+            )
+
+        fingerprint = informer.fingerprint
+        self.assertEqual(informer.fingerprint, fingerprint)
+
+        # Volatile fields don't contribute.
+        informer.resource['AvailableIpAddressCount'] += 1
+        informer.invalidate_fingerprint('resource')
+        self.assertEqual(informer.fingerprint, fingerprint)
+
+        # Other fields do.
+        informer.supplementals['test-only'] = 'changed'
+        self.assertEqual(informer.fingerprint, fingerprint)
+        informer.invalidate_fingerprint()
+        self.assertNotEqual(informer.fingerprint, fingerprint)
+        del informer.supplementals['test-only']
+        informer.invalidate_fingerprint('supplementals')
+        self.assertEqual(informer.fingerprint, fingerprint)
+
+        # Expanding adds the expansion identifiers.
+        informer.expand()
+        self.assertNotEqual(informer.fingerprint, fingerprint)
+
+
+# - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - -
+class TestAWSInformerElisions(unittest.TestCase):
+    '''Basic test cases for AWSInformer resource elisions.'''
+
+    # - - - - - - - - - - - - - - - - - - - - - - - - - - - - - -
+    def setUp(self):
+        '''Test case common fixture setup.'''
+        GLOBAL_MEDIATOR.flush('subnet')
+
+    # - - - - - - - - - - - - - - - - - - - - - - - - - - - - - -
+    def tearDown(self):
+        '''Remove the test elisions.'''
+        GLOBAL_MEDIATOR.remove_all_elisions()
+        GLOBAL_MEDIATOR.flush('subnet')
+
+    # - - - - - - - - - - - - - - - - - - - - - - - - - - - - - -
+    def test_aws_informer_elisions(self):
+        '''Test that elided fields are dropped and recorded.'''
+
+        with self.assertRaises(ValueError):
+            GLOBAL_MEDIATOR.add_elisions('subnet', ['SubnetId'])
+
+        GLOBAL_MEDIATOR.add_elisions('subnet', ['CidrBlock', 'Tags'])
+        self.assertEqual(
+            GLOBAL_MEDIATOR.elided_fields('subnet'),
+            frozenset(['CidrBlock', 'Tags'])
+            )
+
+        informer = aws_informer.SubnetInformer(
+            GLOBAL_MEDIATOR.entities('subnet')[0],
+            mediator=GLOBAL_MEDIATOR
+            )
+
+        self.assertEqual(
+            informer.elided_fields, frozenset(['CidrBlock', 'Tags'])
+            )
+        self.assertNotIn('CidrBlock', informer.resource)
+        self.assertNotIn('CidrBlock', informer.to_dict())
+
+        self.assertEqual(informer.elided_path('CidrBlock'), 'CidrBlock')
+        self.assertEqual(informer.elided_path('Tags:Name'), 'Tags')
+        self.assertIsNone(informer.elided_path('SubnetId'))
+
+
 # - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - -
 class TestAWSInformerToDict(unittest.TestCase):
     '''Basic test cases for AWSInformer and subclasses to_dict() output.'''
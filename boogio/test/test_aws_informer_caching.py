@@ -292,6 +292,196 @@ class TestInformerCaching(unittest.TestCase):
             sg_informers_cached_count
             )
 
+    # - - - - - - - - - - - - - - - - - - - - - - - - - - - - - -
+    def test_expansion_memoization(self):
+        '''Test that informers are only expanded once.'''
+
+        ec2_informers = aws_informer.EC2InstanceInformer.from_records(
+            self.ec2_resources, GLOBAL_MEDIATOR
+            )
+        self.assertTrue(len(ec2_informers) > 0)
+
+        for informer in ec2_informers:
+            informer.expand(max_depth=1)
+
+        self.assertTrue(all(i.is_expanded for i in ec2_informers))
+        children = [
+            child
+            for informer in ec2_informers
+            for child in informer.expansions.get('SecurityGroups', [])
+            ]
+        self.assertTrue(len(children) > 0)
+        self.assertFalse(any(child.is_expanded for child in children))
+
+        # Expanding again doesn't refetch the expansions, but does
+        # expand them further.
+        expansions = [dict(i.expansions) for i in ec2_informers]
+        for informer in ec2_informers:
+            informer.expand()
+
+        for informer, informer_expansions in zip(
+                ec2_informers, expansions
+                ):  # pylint: disable=bad-continuation
+            for key, value in informer_expansions.iteritems():
+                self.assertIs(informer.expansions[key], value)
+        self.assertTrue(all(child.is_expanded for child in children))
+
+        # Informers shared by several others are the same informer.
+        self.assertEqual(
+            len(set(id(child) for child in children)),
+            len(set(child.identifier for child in children))
+            )
+
+    # - - - - - - - - - - - - - - - - - - - - - - - - - - - - - -
+    def test_lazy_expansions(self):
+        '''Test that lazy expansions are only resolved when used.'''
+
+        # pylint: disable=protected-access
+
+        eager_informers = aws_informer.EC2InstanceInformer.from_records(
+            self.ec2_resources, GLOBAL_MEDIATOR
+            )
+        for informer in eager_informers:
+            informer.expand()
+        eager_dicts = [i.to_dict() for i in eager_informers]
+
+        GLOBAL_MEDIATOR.flush()
+        GLOBAL_MEDIATOR.lazy_expansions = True
+        try:
+            ec2_informers = aws_informer.EC2InstanceInformer.from_records(
+                GLOBAL_MEDIATOR.entities('ec2'), GLOBAL_MEDIATOR
+                )
+            for informer in ec2_informers:
+                informer.expand()
+
+            # Nothing has been resolved...
+            self.assertEqual(cached_type('security_group'), [])
+            self.assertEqual(cached_type('vpc'), [])
+            self.assertIsNone(GLOBAL_MEDIATOR._other_entities['vpc'])
+
+            # ...until it's used.
+            informer = ec2_informers[0]
+            groups = informer.expansions['SecurityGroups']
+            self.assertTrue(len(groups) > 0)
+            self.assertTrue(all(g.is_expanded for g in groups))
+            self.assertIsNone(GLOBAL_MEDIATOR._other_entities['vpc'])
+
+            # Prune paths only resolve the expansions they lead into.
+            to_dict = informer.to_dict(paths=['SecurityGroups.[].GroupId'])
+            self.assertEqual(
+                [g['GroupId'] for g in to_dict['SecurityGroups']],
+                [g.identifier for g in groups]
+                )
+            self.assertEqual(cached_type('vpc'), [])
+
+            # Resolved lazy expansions look just like eager ones.
+            self.assertEqual([i.to_dict() for i in ec2_informers], eager_dicts)
+
+            # Single expansions with no match are never listed.
+            expansions = ec2_informers[-1].expansions
+            dict.__setitem__(
+                expansions, 'VpcId', aws_informer._ExpansionReference(
+                    ec2_informers[-1], 'vpc', 'VpcId', ['vpc-none'], True
+                    )
+                )
+            keys = expansions.keys()
+            self.assertNotIn('VpcId', keys)
+            self.assertEqual(len(expansions), len(keys))
+            self.assertItemsEqual(
+                [key for key in expansions if expansions[key] is not None],
+                keys
+                )
+            self.assertEqual(expansions, expansions.copy())
+
+        finally:
+            GLOBAL_MEDIATOR.lazy_expansions = False
+
+    # - - - - - - - - - - - - - - - - - - - - - - - - - - - - - -
+    def test_from_records_caching(self):
+        '''Test that bulk construction shares the informer cache.'''
+
+        self.assertEqual(GLOBAL_MEDIATOR.informer_cache, {})
+
+        sg_informers = aws_informer.SecurityGroupInformer.from_records(
+            self.sg_resources, GLOBAL_MEDIATOR
+            )
+
+        self.assertEqual(len(sg_informers), len(self.sg_resources))
+        self.assertEqual(
+            len(cached_type('security_group')), len(self.sg_resources)
+            )
+        self.assertEqual(
+            [i.identifier for i in sg_informers],
+            [r['GroupId'] for r in self.sg_resources]
+            )
+
+        # Individual construction finds the informers built in bulk...
+        for sg_informer, sg_resource in zip(sg_informers, self.sg_resources):
+            self.assertIs(
+                aws_informer.SecurityGroupInformer(
+                    sg_resource, mediator=GLOBAL_MEDIATOR
+                    ),
+                sg_informer
+                )
+
+        # ...and bulk construction finds them again.
+        self.assertEqual(
+            aws_informer.SecurityGroupInformer.from_records(
+                self.sg_resources, GLOBAL_MEDIATOR
+                ),
+            sg_informers
+            )
+
+        with self.assertRaises(ValueError):
+            aws_informer.SecurityGroupInformer.from_records(
+                [{'NotAGroupId': 'x'}], GLOBAL_MEDIATOR
+                )
+
+    # - - - - - - - - - - - - - - - - - - - - - - - - - - - - - -
+    def test_construction_race(self):
+        '''Test informers cached by another thread during construction.'''
+
+        self.assertEqual(GLOBAL_MEDIATOR.informer_cache, {})
+
+        sg_resource = self.sg_resources[0]
+        original_site_init = site_boogio.informer_site_init
+        others = []
+
+        def racing_site_init(informer):
+            '''Cache another informer for the entity, once.'''
+            original_site_init(informer)
+            if not others:
+                others.append(None)
+                others[0] = aws_informer.SecurityGroupInformer(
+                    sg_resource, mediator=GLOBAL_MEDIATOR
+                    )
+
+        site_boogio.informer_site_init = racing_site_init
+        try:
+            # Bulk construction uses the informer cached first...
+            self.assertIs(
+                aws_informer.SecurityGroupInformer.from_records(
+                    [sg_resource], GLOBAL_MEDIATOR
+                    )[0],
+                others[0]
+                )
+
+            GLOBAL_MEDIATOR.flush()
+            del others[:]
+
+            # ...and individual construction leaves it cached.
+            informer = aws_informer.SecurityGroupInformer(
+                sg_resource, mediator=GLOBAL_MEDIATOR
+                )
+        finally:
+            site_boogio.informer_site_init = original_site_init
+
+        self.assertIsNot(informer, others[0])
+        self.assertEqual(informer.identifier, others[0].identifier)
+        self.assertIs(
+            GLOBAL_MEDIATOR.informer_cache[sg_resource['GroupId']], others[0]
+            )
+
 
 if __name__ == '__main__':
     unittest.main()
@@ -413,6 +413,33 @@ class TestEMRInformer(unittest.TestCase):
         for key in emr_resource_keys:
             self.assertIn(key, informer.resource)
 
+    # - - - - - - - - - - - - - - - - - - - - - - - - - - - - - -
+    @unittest.skipUnless(emr_entities, 'No EMR resources found')
+    def test_emr_informer_describe_clusters(self):
+        '''Test passing prefetched descriptions to emr informers.'''
+
+        GLOBAL_MEDIATOR.flush()
+        informer = aws_informer.EMRInformer(
+            self.emr_resource,
+            mediator=GLOBAL_MEDIATOR
+            )
+
+        descriptions = aws_informer.EMRInformer.describe_clusters(
+            [informer]
+            )
+        key = informer.description_key(informer)
+        self.assertEqual(descriptions.keys(), [key])
+        self.assertEqual(key, (id(GLOBAL_MEDIATOR), informer.identifier))
+        self.assertEqual(
+            aws_informer.EMRInformer.describe_clusters([]), {}
+            )
+
+        # A description passed to expand() is used as is.
+        description = dict(descriptions[key], PrefetchedField='x')
+        informer.expand(description=description)
+        self.assertTrue(informer.is_expanded)
+        self.assertEqual(informer.resource['PrefetchedField'], 'x')
+
     # - - - - - - - - - - - - - - - - - - - - - - - - - - - - - -
     @unittest.skipUnless(emr_entities, 'No EMR resources found')
     def test_emr_informer_supplementals(self):
@@ -1355,6 +1382,43 @@ class TestSQSInformer(unittest.TestCase):
             informer_cache_length
             )
 
+    # - - - - - - - - - - - - - - - - - - - - - - - - - - - - - -
+    def test_sqs_informer_lazy_attributes(self):
+        '''Test deferred, concurrent loading of queue attributes.'''
+
+        # pylint: disable=protected-access
+
+        config = aws_informer._BOOGIO_CONFIG.setdefault('aws_informer', {})
+        config['lazy_sqs_attributes'] = True
+        config['sqs_attribute_names'] = ['QueueArn']
+
+        try:
+            GLOBAL_MEDIATOR.flush()
+            informers = aws_informer.SQSInformer.from_records(
+                GLOBAL_MEDIATOR.entities('sqs'), GLOBAL_MEDIATOR
+                )
+            self.assertFalse(
+                any(i._attributes_loaded for i in informers)
+                )
+
+            # Attributes are loaded on first use of the resource...
+            self.assertIn('QueueArn', informers[0].resource)
+            self.assertTrue(informers[0]._attributes_loaded)
+
+            # ...or for many informers at once.
+            aws_informer.SQSInformer.load_attributes(informers)
+            for informer in informers:
+                self.assertTrue(informer._attributes_loaded)
+                self.assertEqual(
+                    set(informer.resource.keys()),
+                    set(['QueueURL', 'QueueArn'])
+                    )
+
+        finally:
+            del config['lazy_sqs_attributes']
+            del config['sqs_attribute_names']
+            GLOBAL_MEDIATOR.flush()
+
     # - - - - - - - - - - - - - - - - - - - - - - - - - - - - - -
     def test_sqs_informer_expand(self):
         '''Test expansion of sqsinformers.'''
@@ -0,0 +1,246 @@
+# ----------------------------------------------------------------------------
+# Copyright (C) 2017 Verizon.  All Rights Reserved.
+#
+#   Licensed under the Apache License, Version 2.0 (the "License");
+#   you may not use this file except in compliance with the License.
+#   You may obtain a copy of the License at
+#
+#       http://www.apache.org/licenses/LICENSE-2.0
+#
+#   Unless required by applicable law or agreed to in writing, software
+#   distributed under the License is distributed on an "AS IS" BASIS,
+#   WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#   See the License for the specific language governing permissions and
+#   limitations under the License.
+#
+# ----------------------------------------------------------------------------
+
+'''Test cases for the aws_limiter.py module.'''
+
+import re
+import time
+import unittest
+
+import boto3
+import botocore.exceptions
+import botocore.session
+from botocore.awsrequest import AWSResponse
+
+import boogio.aws_limiter as aws_limiter
+
+
+THROTTLE_BODY = (
+    '<Response><Errors><Error><Code>RequestLimitExceeded</Code>'
+    '<Message>Request limit exceeded.</Message></Error></Errors>'
+    '<RequestID>1</RequestID></Response>'
+    )
+
+PAGE_BODY = (
+    '<DescribeInstancesResponse><reservationSet><item>'
+    '<reservationId>r-%s</reservationId></item></reservationSet>'
+    '%s</DescribeInstancesResponse>'
+    )
+
+
+# - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - -
+class _Raw(object):
+    '''A stand-in for a raw HTTP response stream.'''
+
+    # pylint: disable=too-few-public-methods
+
+    def __init__(self, body):
+        self.body = body
+
+    def stream(self, **kwargs):  # pylint: disable=unused-argument
+        '''Yield the response body.'''
+        yield self.body
+
+
+# - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - -
+def _response(url, status_code, body):
+    '''Return an HTTP response for botocore to parse.'''
+    response = AWSResponse(url, status_code, {}, _Raw(body))
+    # pylint: disable=protected-access
+    response._content = body
+    return response
+
+
+# - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - -
+class TestTokenBucket(unittest.TestCase):
+    '''
+    Test cases for aws_limiter.TokenBucket.
+    '''
+
+    # pylint: disable=invalid-name
+
+    # - - - - - - - - - - - - - - - - - - - - - - - - - - - -
+    def test_token_bucket_rate(self):
+        '''Test that tokens are issued at the bucket's rate.'''
+
+        bucket = aws_limiter.TokenBucket(
+            rate=50, burst=5, min_rate=1, max_rate=50,
+            increase=1, decrease=0.5
+            )
+
+        start = time.time()
+        for _ in range(5):
+            bucket.acquire()
+        self.assertLess(time.time() - start, 0.05)
+
+        start = time.time()
+        for _ in range(10):
+            bucket.acquire()
+        self.assertGreaterEqual(time.time() - start, 0.15)
+
+    # - - - - - - - - - - - - - - - - - - - - - - - - - - - -
+    def test_token_bucket_aimd(self):
+        '''Test additive increase and multiplicative decrease.'''
+
+        bucket = aws_limiter.TokenBucket(
+            rate=8, burst=5, min_rate=1, max_rate=10,
+            increase=1, decrease=0.5
+            )
+
+        bucket.throttled()
+        self.assertEqual(bucket.rate, 4)
+        for _ in range(3):
+            bucket.throttled()
+        self.assertEqual(bucket.rate, 1)
+
+        bucket.succeeded()
+        self.assertEqual(bucket.rate, 2)
+        for _ in range(20):
+            bucket.succeeded()
+        self.assertEqual(bucket.rate, 10)
+
+    # - - - - - - - - - - - - - - - - - - - - - - - - - - - -
+    def test_retry_delay(self):
+        '''Test jittered retry delays.'''
+
+        delays = [
+            aws_limiter.retry_delay(3, base=1, cap=5) for _ in range(50)
+            ]
+        self.assertTrue(all(0 <= d <= 5 for d in delays))
+        self.assertGreater(len(set(delays)), 1)
+
+        self.assertLessEqual(aws_limiter.retry_delay(1, base=0.1), 0.2)
+
+
+# - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - -
+class TestAWSRateLimiter(unittest.TestCase):
+    '''
+    Test cases for aws_limiter.AWSRateLimiter.
+    '''
+
+    # pylint: disable=invalid-name
+
+    # - - - - - - - - - - - - - - - - - - - - - - - - - - - -
+    def setUp(self):
+        self.limiter = aws_limiter.AWSRateLimiter(
+            limits={'default': {'rate': 100, 'burst': 100, 'max_rate': 1000}}
+            )
+
+        self.sent_tokens = []
+        self.throttle_count = 0
+
+        core_session = botocore.session.Session()
+        core_session.set_credentials('AKIDEXAMPLE', 'EXAMPLE')
+        self.limiter.register(core_session, lambda: '123456789012')
+        core_session.register('before-send', self.send)
+
+        self.client = boto3.session.Session(
+            botocore_session=core_session, region_name='us-east-1'
+            ).client('ec2')
+
+    # - - - - - - - - - - - - - - - - - - - - - - - - - - - -
+    def send(self, request, **kwargs):  # pylint: disable=unused-argument
+        '''Answer describe_instances with three pages.
+
+        The first throttle_count requests for the second page are
+        throttled.
+
+        '''
+        match = re.search(r'NextToken=(\w+)', request.body or '')
+        token = match.group(1) if match else None
+        self.sent_tokens.append(token)
+
+        if token == 'p2' and self.throttle_count > 0:
+            self.throttle_count -= 1
+            return _response(request.url, 503, THROTTLE_BODY)
+
+        next_token = {None: 'p2', 'p2': 'p3', 'p3': None}[token]
+        return _response(request.url, 200, PAGE_BODY % (
+            token,
+            '<nextToken>%s</nextToken>' % next_token if next_token else ''
+            ))
+
+    # - - - - - - - - - - - - - - - - - - - - - - - - - - - -
+    def test_aws_rate_limiter_buckets(self):
+        '''Test bucket sharing and per-service limits.'''
+
+        limiter = aws_limiter.AWSRateLimiter(
+            limits={'default': {'rate': 7}, 'emr': {'burst': 3}}
+            )
+
+        bucket = limiter.bucket('123456789012', 'us-east-1', 'ec2')
+        self.assertIs(
+            limiter.bucket('123456789012', 'us-east-1', 'ec2'), bucket
+            )
+        self.assertIsNot(
+            limiter.bucket('123456789012', 'us-west-2', 'ec2'), bucket
+            )
+        self.assertEqual(bucket.rate, 7)
+        self.assertEqual(bucket.burst, aws_limiter.DEFAULT_LIMITS['burst'])
+
+        # Built in service limits take precedence over the default.
+        emr_bucket = limiter.bucket('123456789012', 'us-east-1', 'emr')
+        self.assertEqual(
+            emr_bucket.rate, aws_limiter.DEFAULT_SERVICE_LIMITS['emr']['rate']
+            )
+        self.assertEqual(emr_bucket.burst, 3)
+
+        limiter.clear()
+        self.assertIsNot(
+            limiter.bucket('123456789012', 'us-east-1', 'ec2'), bucket
+            )
+
+    # - - - - - - - - - - - - - - - - - - - - - - - - - - - -
+    def test_aws_rate_limiter_throttled_pagination(self):
+        '''Test that throttled pages are retried in place.'''
+
+        self.throttle_count = 2
+
+        reservations = [
+            r['ReservationId']
+            for page in self.client.get_paginator(
+                'describe_instances'
+                ).paginate()
+            for r in page['Reservations']
+            ]
+
+        self.assertEqual(reservations, ['r-None', 'r-p2', 'r-p3'])
+        self.assertEqual(self.sent_tokens, [None, 'p2', 'p2', 'p2', 'p3'])
+
+        # A success, two throttles and two more successes.
+        bucket = self.limiter.bucket('123456789012', 'us-east-1', 'ec2')
+        self.assertEqual(bucket.rate, (100 + 0.5) * 0.5 * 0.5 + 2 * 0.5)
+
+    # - - - - - - - - - - - - - - - - - - - - - - - - - - - -
+    def test_aws_rate_limiter_max_attempts(self):
+        '''Test that throttled requests are eventually abandoned.'''
+
+        self.limiter.max_attempts = 2
+        # Leave botocore's own retries out of it.
+        self.client.meta.events.unregister(
+            'needs-retry.ec2', unique_id='retry-config-ec2'
+            )
+        self.throttle_count = 100
+
+        with self.assertRaises(botocore.exceptions.ClientError):
+            self.client.describe_instances(NextToken='p2')
+
+        self.assertEqual(self.sent_tokens, ['p2', 'p2'])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -19,6 +19,7 @@
 
 import unittest
 
+from boogio import aws_async
 from boogio import aws_informer
 from boogio import site_boogio
 
@@ -278,6 +279,33 @@ class TestAWSMediatorEntities(unittest.TestCase):
         self.mediator.flush('sqs')
         self.assertIsNone(self.mediator._services['sqs'])
 
+    # - - - - - - - - - - - - - - - - - - - - - - - - - - - - - -
+    def test_aws_mediator_aiter_entities(self):
+        '''Test background entity retrieval.'''
+
+        self.assertIsNone(self.mediator._services['ec2'])
+
+        records = list(self.mediator.aiter_entities('ec2', queue_size=1))
+        self.assertNotEqual(len(records), 0)
+
+        # The records were cached for entities().
+        self.assertEqual(self.mediator._services['ec2'], records)
+        self.assertEqual(
+            list(self.mediator.aiter_entities('ec2')),
+            self.mediator.entities('ec2')
+            )
+
+        with self.assertRaises(aws_informer.AWSMediatorError):
+            self.mediator.aiter_entities('nonsense')
+
+        # A cancelled iteration caches nothing.
+        self.mediator.flush('ec2')
+        iterator = self.mediator.aiter_entities('ec2', queue_size=1)
+        iterator.cancel()
+        with self.assertRaises(aws_async.AWSCancelledError):
+            list(iterator)
+        self.assertIsNone(self.mediator._services['ec2'])
+
 
 if __name__ == '__main__':
     unittest.main()
@@ -0,0 +1,125 @@
+# ----------------------------------------------------------------------------
+# Copyright (C) 2017 Verizon.  All Rights Reserved.
+#
+#   Licensed under the Apache License, Version 2.0 (the "License");
+#   you may not use this file except in compliance with the License.
+#   You may obtain a copy of the License at
+#
+#       http://www.apache.org/licenses/LICENSE-2.0
+#
+#   Unless required by applicable law or agreed to in writing, software
+#   distributed under the License is distributed on an "AS IS" BASIS,
+#   WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#   See the License for the specific language governing permissions and
+#   limitations under the License.
+#
+# ----------------------------------------------------------------------------
+
+'''Test cases for the aws_pipeline.py module.'''
+
+import threading
+import time
+import unittest
+
+import boogio.aws_pipeline as aws_pipeline
+
+
+# - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - -
+def _pipeline_threads():
+    '''Return the running pipeline threads.'''
+    return [
+        t for t in threading.enumerate() if t.name.startswith('pipeline-')
+        ]
+
+
+# - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - -
+class TestPipeline(unittest.TestCase):
+    '''
+    Test cases for aws_pipeline.Pipeline.
+    '''
+
+    # pylint: disable=invalid-name
+
+    # - - - - - - - - - - - - - - - - - - - - - - - - - - - -
+    def test_pipeline_stages(self):
+        '''Test that items pass through every stage.'''
+
+        pipeline = aws_pipeline.Pipeline(queue_size=2)
+        pipeline.add_stage(range, workers=3)
+        pipeline.add_stage(lambda n: [n * n], workers=4, name='square')
+
+        self.assertEqual(
+            [name for (name, _, _) in pipeline.stages], ['range', 'square']
+            )
+        self.assertItemsEqual(
+            list(pipeline.run(xrange(10))),
+            [n * n for m in range(10) for n in range(m)]
+            )
+
+        # A pipeline can be run again, and without stages it passes
+        # items through.
+        self.assertItemsEqual(list(pipeline.run([3])), [0, 1, 4])
+        self.assertEqual(
+            list(aws_pipeline.Pipeline().run(iter([1, 2]))), [1, 2]
+            )
+
+        with self.assertRaises(ValueError):
+            pipeline.add_stage(range, workers=0)
+
+        self.assertEqual(_pipeline_threads(), [])
+
+    # - - - - - - - - - - - - - - - - - - - - - - - - - - - -
+    def test_pipeline_backpressure(self):
+        '''Test that a slow consumer holds back earlier stages.'''
+
+        fed = []
+
+        def feed():
+            '''Record each input item as it's taken.'''
+            for item in xrange(1000):
+                fed.append(item)
+                yield item
+
+        pipeline = aws_pipeline.Pipeline(queue_size=2)
+        pipeline.add_stage(lambda n: [n])
+        pipeline.add_stage(lambda n: [n])
+
+        results = pipeline.run(feed())
+        self.assertEqual(results.next(), 0)
+        time.sleep(0.2)
+
+        # Each queue holds up to two items, and each thread one more.
+        self.assertLessEqual(len(fed), 12)
+
+        results.close()
+        self.assertEqual(_pipeline_threads(), [])
+
+    # - - - - - - - - - - - - - - - - - - - - - - - - - - - -
+    def test_pipeline_errors(self):
+        '''Test that a stage's exception stops the pipeline.'''
+
+        def fail(n):
+            '''Fail on one item.'''
+            if n == 5:
+                raise KeyError(n)
+            return [n]
+
+        pipeline = aws_pipeline.Pipeline(queue_size=2)
+        pipeline.add_stage(fail, workers=2)
+
+        with self.assertRaises(KeyError):
+            list(pipeline.run(xrange(1000)))
+        self.assertEqual(_pipeline_threads(), [])
+
+        def bad_input():
+            '''Fail after one item.'''
+            yield 1
+            raise IOError('no more')
+
+        with self.assertRaises(IOError):
+            list(aws_pipeline.Pipeline().run(bad_input()))
+        self.assertEqual(_pipeline_threads(), [])
+
+
+if __name__ == '__main__':
+    unittest.main()
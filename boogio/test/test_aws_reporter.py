@@ -326,6 +326,20 @@ class TestReportDefinition(unittest.TestCase):
             definition2.default_column_order,
             definition.default_column_order
             )
+        self.assertIsNot(
+            definition3.default_column_order,
+            definition2.default_column_order
+            )
+
+        # An unset column order stays unset.
+        definition4 = aws_reporter.ReportDefinition(
+            name=self.sample_name,
+            entity_type=self.sample_entity_type,
+            prune_specs=self.sample_prune_specs,
+            default_path_to_none=False
+            ).copy()
+        self.assertIsNone(definition4.default_column_order)
+        self.assertFalse(definition4.default_path_to_none)
 
     # - - - - - - - - - - - - - - - - - - - - - - - - - - - -
     def test_report_definition_extract_from_flat(self):
@@ -403,6 +417,63 @@ class TestReportDefinition(unittest.TestCase):
             )
 
 
+    # - - - - - - - - - - - - - - - - - - - - - - - - - - - -
+    def test_report_definition_elisions(self):
+        '''
+        Tests of ReportDefinition elisions.
+        '''
+
+        definition = aws_reporter.ReportDefinition(
+            name=self.sample_name,
+            entity_type='ec2',
+            prune_specs=[{'path': 'InstanceId'}, {'path': 'Tags:Name'}],
+            elisions=['BlockDeviceMappings']
+            )
+        self.assertEqual(definition.elisions, ['BlockDeviceMappings'])
+        self.assertEqual(definition.copy().elisions, ['BlockDeviceMappings'])
+
+        with self.assertRaises(ValueError):
+            aws_reporter.ReportDefinition(
+                name=self.sample_name,
+                entity_type='ec2',
+                prune_specs=[{'path': 'Tags:Name'}],
+                elisions=['Tags']
+                )
+
+        class _Informer(object):
+            '''A stand-in for an informer with an elided field.'''
+
+            # pylint: disable=too-few-public-methods,no-self-use
+
+            entity_type = 'ec2'
+            identifier = 'i-1'
+
+            def to_dict(self):
+                '''Return the informer content.'''
+                return {'InstanceId': 'i-1'}
+
+            def elided_path(self, path):
+                '''Report Tags as elided.'''
+                return 'Tags' if path.startswith('Tags') else None
+
+        definition = aws_reporter.ReportDefinition(
+            name=self.sample_name,
+            entity_type='ec2',
+            prune_specs=[{'path': 'InstanceId'}]
+            )
+        self.assertEqual(
+            definition.extract_from([_Informer()]), [{'InstanceId': 'i-1'}]
+            )
+
+        definition.prune_specs = [
+            {'path': 'InstanceId'}, {'path': 'Tags:Name'}
+            ]
+        with self.assertRaises(
+                aws_reporter.aws_informer.AWSInformerElidedFieldError
+                ):  # pylint: disable=bad-continuation
+            definition.extract_from([_Informer()])
+
+
 # - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - -
 class TestAWSReporterInit(unittest.TestCase):
     '''
@@ -808,6 +879,79 @@ class TestAWSReporterGeneralMethods(unittest.TestCase):
             )
 
 
+    # - - - - - - - - - - - - - - - - - - - - - - - - - - - -
+    def test_aws_reporter_elisions(self):
+        '''
+        Test AWSReporter.elisions().
+        '''
+        reporter = aws_reporter.AWSReporter(
+            report_definitions=[
+                aws_reporter.ReportDefinition(
+                    name='EC2 A', entity_type='ec2',
+                    elisions=['BlockDeviceMappings', 'ProductCodes']
+                    ),
+                aws_reporter.ReportDefinition(
+                    name='EC2 B', entity_type='ec2',
+                    elisions=['ProductCodes', 'Tags']
+                    ),
+                aws_reporter.ReportDefinition(
+                    name='VPC', entity_type='vpc',
+                    elisions=['CidrBlockAssociationSet']
+                    ),
+                aws_reporter.ReportDefinition(
+                    name='Subnet', entity_type='subnet'
+                    ),
+                ]
+            )
+
+        self.assertEqual(
+            reporter.elisions(),
+            {
+                'ec2': ['ProductCodes'],
+                'vpc': ['CidrBlockAssociationSet'],
+                }
+            )
+        self.assertEqual(
+            reporter.elisions(report_names=['EC2 A']),
+            {'ec2': ['BlockDeviceMappings', 'ProductCodes']}
+            )
+        self.assertEqual(reporter.elisions(report_names=['Subnet']), {})
+
+        # Fields read through expansions into another entity type
+        # aren't elided from that type.
+        reporter.add_report_definitions([
+            aws_reporter.ReportDefinition(
+                name='Security Group', entity_type='security_group',
+                elisions=['IpPermissions', 'IpPermissionsEgress']
+                ),
+            aws_reporter.ReportDefinition(
+                name='EC2 SG Rules', entity_type='ec2',
+                prune_specs=[
+                    {'path': 'InstanceId'},
+                    {'path': 'SecurityGroups.[].IpPermissions.[].FromPort'},
+                    {
+                        'path': (
+                            'SecurityGroups.[].VpcId'
+                            '.CidrBlockAssociationSet.[].CidrBlock'
+                            )},
+                    ]
+                ),
+            ])
+        self.assertEqual(
+            reporter.elisions(report_names=['Security Group', 'VPC']),
+            {
+                'security_group': ['IpPermissions', 'IpPermissionsEgress'],
+                'vpc': ['CidrBlockAssociationSet'],
+                }
+            )
+        self.assertEqual(
+            reporter.elisions(
+                report_names=['Security Group', 'VPC', 'EC2 SG Rules']
+                ),
+            {'security_group': ['IpPermissionsEgress']}
+            )
+
+
 # - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - -
 class TestAWSReporterAssignReports(unittest.TestCase):
     '''
@@ -2857,5 +3001,68 @@ class TestAWSReporterReportWriteToFile(unittest.TestCase):
         #     1 + len(self.single_definition_report_flat[report_name])
         #     )
 
+    # - - - - - - - - - - - - - - - - - - - - - - - - - - - -
+    def test_aws_reporter_write_stream(self):
+        '''Tests for the aws_reporter write_stream() method. '''
+
+        report_name = self.single_definition_report_name
+        report_data = self.single_definition_report_flat[
+            self.single_definition_report_name
+            ]
+
+        csv_path = os.path.join(self.tmpdir, 'test_write_stream.csv')
+        json_path = os.path.join(self.tmpdir, 'test_write_stream.json')
+
+        self.single_definition_reporter.write_stream(
+            output_path=csv_path,
+            informers=iter(self.informers),
+            report_name=report_name,
+            workers=2
+            )
+
+        with open(csv_path, 'r') as fptr:
+            lines = fptr.read().splitlines()
+
+        # The report has no column order, so columns are sorted.
+        columns = lines[0].split(',')
+        self.assertEqual(
+            columns,
+            sorted(p['path'] for p in self.sample_prune_specs_profile_name)
+            )
+        self.assertItemsEqual(
+            [dict(zip(columns, line.split(','))) for line in lines[1:]],
+            [
+                {k: str(v) for (k, v) in record.items()}
+                for record in report_data
+                ]
+            )
+
+        with self.assertRaises(ValueError):
+            self.single_definition_reporter.write_stream(
+                output_path=csv_path,
+                informers=iter(self.informers),
+                report_name=report_name
+                )
+
+        with self.assertRaises(ValueError):
+            self.single_definition_reporter.write_stream(
+                output_path=csv_path,
+                informers=iter(self.informers),
+                report_name=report_name,
+                flat=False,
+                overwrite=True
+                )
+
+        self.single_definition_reporter.write_stream(
+            output_path=json_path,
+            informers=iter(self.informers),
+            report_name=report_name,
+            output_format='json'
+            )
+
+        with open(json_path, 'r') as fptr:
+            self.assertItemsEqual(json.load(fptr), report_data)
+
+
 if __name__ == '__main__':
     unittest.main()
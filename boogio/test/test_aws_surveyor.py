@@ -1294,6 +1294,109 @@ class TestAWSSurveyorMediators(unittest.TestCase):
             len(surveyor.profiles) * len(surveyor.regions)
             )
 
+    # - - - - - - - - - - - - - - - - - - - - - - - - - - - -
+    def test_aws_surveyor_occupied_mediators(self):
+        '''Test AWSSurveyor region occupancy probing and caching.'''
+
+        config_dir = tempfile.mkdtemp()
+        aws_surveyor.AWSSurveyor.default_config_dir(config_dir)
+        cache_path = aws_surveyor.AWSSurveyor.region_occupancy_path()
+
+        try:
+            surveyor = aws_surveyor.AWSSurveyor(
+                config_path='',
+                profiles=[TEST_PROFILE_NAME],
+                regions=['us-east-1', 'us-west-1']
+                )
+            self.assertFalse(surveyor.skip_empty_regions)
+
+            occupied = surveyor.occupied_mediators(
+                entity_types=['elb', 'subnet']
+                )
+            self.assertTrue(
+                set(occupied).issubset(set(surveyor.mediators()))
+                )
+
+            with open(cache_path, 'r') as fptr:
+                occupancy = json.load(fptr)
+            account_id = surveyor.mediators()[0].account_id
+            self.assertItemsEqual(
+                occupancy[account_id].keys(), ['us-east-1', 'us-west-1']
+                )
+
+            # Current results are used without probing again.
+            occupancy[account_id]['us-west-1'] = {
+                'elb': {'occupied': False, 'checked': time.time()},
+                'subnet': {'occupied': False, 'checked': time.time()},
+                }
+            occupancy[account_id]['us-east-1'] = {
+                'elb': {'occupied': True, 'checked': time.time()},
+                }
+            with open(cache_path, 'w') as fptr:
+                json.dump(occupancy, fptr)
+
+            def no_probe(*entity_types):
+                '''Fail if a probe is attempted.'''
+                self.fail('unexpected region probe: %s' % (entity_types,))
+
+            for mediator in surveyor.mediators():
+                mediator.probe_occupancy = no_probe
+
+            self.assertEqual(
+                [
+                    m.region_name for m in surveyor.occupied_mediators(
+                        entity_types=['elb', 'subnet']
+                        )
+                    ],
+                ['us-east-1']
+                )
+
+            # Entity types without a current result are probed, and
+            # only those.
+            probed = []
+
+            def empty_probe(mediator):
+                '''Return a probe that records its calls.'''
+                def probe(*entity_types):
+                    '''Find every entity type empty.'''
+                    probed.append((mediator.region_name, entity_types))
+                    return {t: False for t in entity_types}
+                return probe
+
+            for mediator in surveyor.mediators():
+                mediator.probe_occupancy = empty_probe(mediator)
+            self.assertEqual(
+                [
+                    m.region_name for m in surveyor.occupied_mediators(
+                        entity_types=['subnet', 'vpc']
+                        )
+                    ],
+                []
+                )
+            self.assertItemsEqual(
+                probed,
+                [('us-east-1', ('subnet', 'vpc')), ('us-west-1', ('vpc',))]
+                )
+
+            # Expired results are probed again.
+            probed[:] = []
+            surveyor.region_occupancy_ttl = -1
+            self.assertEqual(
+                surveyor.occupied_mediators(entity_types=['subnet']), []
+                )
+            self.assertItemsEqual(
+                probed,
+                [('us-east-1', ('subnet',)), ('us-west-1', ('subnet',))]
+                )
+
+        finally:
+            aws_surveyor.AWSSurveyor.default_config_dir(
+                ORIGINAL_DEFAULT_CONFIG_DIR
+                )
+            if os.path.exists(cache_path):
+                os.remove(cache_path)
+            os.rmdir(config_dir)
+
     # - - - - - - - - - - - - - - - - - - - - - - - - - - - -
     def test_aws_surveyor_mediator_filters(self):
         '''Test AWSSurveyor mediator filter assignment and removal.'''
@@ -1372,8 +1475,21 @@ class TestAWSSurveyorSupplementalSetters(unittest.TestCase):
         surveyor.survey('ec2', 'elb')
         self.assertNotEqual(informer_cache, {})
 
+        fingerprints = {
+            i.identifier: i.fingerprint for i in surveyor.informers('ec2')
+            }
+
         surveyor.set_ec2_elb_supplementals()
 
+        # The added supplementals change every EC2 fingerprint.
+        self.assertEqual(
+            [
+                i for i in surveyor.informers('ec2')
+                if i.fingerprint == fingerprints[i.identifier]
+                ],
+            []
+            )
+
         # - - - - - - - - - - - - - - - -
         # Chack that all EC2Informer instances now have load balancer
         # information fields in their supplementals.
@@ -23,8 +23,12 @@ records.
 '''
 
 from datetime import datetime
+import os
+import shutil
+import tempfile
 import unittest
 
+import boogio.aws_async as aws_async
 import boogio.aws_surveyor as aws_surveyor
 import boogio.aws_informer as aws_informer
 
@@ -350,6 +354,321 @@ class TestAWSSurveyorSurvey(unittest.TestCase):
 
         self.assertItemsEqual(some_ips, selected_ips)
 
+    # - - - - - - - - - - - - - - - - - - - - - - - - - - - -
+    def test_aws_surveyor_prefetch_expansions(self):
+        '''Test AWSSurveyor.prefetch_expansions().'''
+
+        # pylint: disable=protected-access
+
+        surveyor = aws_surveyor.AWSSurveyor(
+            profiles=['default'],
+            regions=['us-east-1'],
+            config_path=''
+            )
+        surveyor.survey('security_group')
+        mediators = set(i.mediator for i in surveyor.informers())
+        self.assertNotEqual(mediators, set())
+
+        for mediator in mediators:
+            mediator.flush('vpc', 'subnet')
+
+        # Security groups' expansions only refer to VPCs.
+        surveyor.prefetch_expansions()
+
+        for mediator in mediators:
+            self.assertIsNotNone(mediator._other_entities['vpc'])
+            self.assertIsNone(mediator._other_entities['subnet'])
+
+    # - - - - - - - - - - - - - - - - - - - - - - - - - - - -
+    def test_aws_surveyor_expand_informers_parallel(self):
+        '''Test AWSSurveyor.expand_informers() with max_workers.'''
+
+        entity_types = ['ec2', 'security_group', 'subnet', 'vpc']
+
+        serial_surveyor = aws_surveyor.AWSSurveyor(
+            profiles=['default'],
+            regions=['us-east-1', 'us-west-1'],
+            config_path=''
+            )
+        serial_surveyor.survey(*entity_types)
+        serial_surveyor.expand_informers()
+        serial_dicts = [i.to_dict() for i in serial_surveyor.informers()]
+
+        # Informers are cached across mediators; start afresh.
+        for mediator in serial_surveyor.mediators():
+            mediator.flush()
+
+        surveyor = aws_surveyor.AWSSurveyor(
+            profiles=['default'],
+            regions=['us-east-1', 'us-west-1'],
+            config_path=''
+            )
+        surveyor.survey(*entity_types)
+        self.assertTrue(len(surveyor.informers()) > 1)
+        surveyor.expand_informers(max_workers=8)
+
+        self.assertEqual(
+            set([i.is_expanded for i in surveyor.informers()]),
+            set([True])
+            )
+
+        # Expansions still share informers with the survey.
+        for informer in surveyor.informers('ec2'):
+            for group in informer.expansions.get('SecurityGroups', []):
+                self.assertIs(
+                    group, informer.mediator.informer_cache[group.identifier]
+                    )
+                self.assertTrue(group.is_expanded)
+
+        self.assertItemsEqual(
+            [i.to_dict() for i in surveyor.informers()], serial_dicts
+            )
+
+        for mediator in surveyor.mediators():
+            mediator.flush()
+
+    # - - - - - - - - - - - - - - - - - - - - - - - - - - - -
+    def test_aws_surveyor_stream_informers(self):
+        '''Test AWSSurveyor.stream_informers().'''
+
+        surveyor = aws_surveyor.AWSSurveyor(
+            profiles=['default'],
+            regions=['us-east-1'],
+            config_path=''
+            )
+        surveyor.survey('ec2')
+        surveyor.expand_informers()
+        surveyed_dicts = [i.to_dict() for i in surveyor.informers()]
+
+        for mediator in surveyor.mediators():
+            mediator.flush()
+
+        with self.assertRaises(ValueError):
+            surveyor.stream_informers('ec2', regions=['us-nowhere-1'])
+
+        streamed_dicts = []
+        for informer in surveyor.stream_informers('ec2', queue_size=2):
+            self.assertTrue(informer.is_expanded)
+            streamed_dicts.append(informer.to_dict())
+
+        self.assertItemsEqual(streamed_dicts, surveyed_dicts)
+
+        # The streamed informers were released, and their records
+        # weren't cached; expansion records were.
+        for mediator in surveyor.mediators():
+            self.assertEqual(
+                [
+                    i for i in mediator.informer_cache.values()
+                    if i.entity_type == 'ec2'
+                    ],
+                []
+                )
+            # pylint: disable=protected-access
+            self.assertIsNone(mediator._services['ec2'])
+            self.assertIsNotNone(mediator._other_entities['vpc'])
+
+        for mediator in surveyor.mediators():
+            mediator.flush()
+
+    # - - - - - - - - - - - - - - - - - - - - - - - - - - - -
+    def test_aws_surveyor_survey_scheduled(self):
+        '''Test AWSSurveyor.survey() with priorities and a deadline.'''
+
+        entity_types = ['ec2', 'security_group', 'vpc']
+
+        surveyor = aws_surveyor.AWSSurveyor(
+            profiles=['default'],
+            regions=['us-east-1', 'us-west-1'],
+            config_path=''
+            )
+        for mediator in surveyor.mediators():
+            mediator.flush()
+
+        surveyor.survey(*entity_types)
+        self.assertTrue(surveyor.survey_complete)
+        surveyed = surveyor.informers()
+
+        for mediator in surveyor.mediators():
+            mediator.flush()
+
+        surveyor.survey(*entity_types, priorities={'vpc': 2, 'ec2': 1})
+        self.assertTrue(surveyor.survey_complete)
+        self.assertItemsEqual(
+            [i.to_dict() for i in surveyor.informers()],
+            [i.to_dict() for i in surveyed]
+            )
+        self.assertEqual(
+            set(surveyor.survey_status.keys()),
+            set(
+                (mediator, entity_type)
+                for mediator in surveyor.mediators()
+                for entity_type in entity_types
+                )
+            )
+        for outcome in surveyor.survey_status.values():
+            self.assertEqual(outcome['status'], aws_surveyor.COMPLETE)
+            self.assertIsNone(outcome['error'])
+
+        for mediator in surveyor.mediators():
+            mediator.flush()
+
+        # With a past deadline, only what's already retrieved counts.
+        surveyor.mediators()[0].entities('vpc')
+        surveyor.survey(
+            *entity_types,
+            deadline=datetime.utcnow().replace(year=2000)
+            )
+        status = surveyor.survey_status
+        self.assertEqual(
+            status[(surveyor.mediators()[0], 'vpc')]['status'],
+            aws_surveyor.COMPLETE
+            )
+        self.assertFalse(surveyor.survey_complete)
+        for informer in surveyor.informers():
+            self.assertEqual(
+                status[(informer.mediator, informer.entity_type)]['status'],
+                aws_surveyor.COMPLETE
+                )
+
+        # Fetches cut off by the deadline don't cancel a survey
+        # started right after it.
+        for mediator in surveyor.mediators():
+            self.assertIsNone(mediator.cancel_event)
+        surveyor.survey(*entity_types)
+        self.assertTrue(surveyor.survey_complete)
+        self.assertItemsEqual(
+            [i.to_dict() for i in surveyor.informers()],
+            [i.to_dict() for i in surveyed]
+            )
+
+        for mediator in surveyor.mediators():
+            mediator.flush()
+
+    # - - - - - - - - - - - - - - - - - - - - - - - - - - - -
+    def test_aws_surveyor_informers_buckets(self):
+        '''Test retrieving informers by entity type and mediator.'''
+
+        surveyor = aws_surveyor.AWSSurveyor(
+            profiles=['default'],
+            regions=['us-east-1', 'us-west-1'],
+            config_path=''
+            )
+        surveyor.survey('vpc', 'subnet', 'security_group')
+        surveyed = list(surveyor.informers())
+
+        def scan(*entity_types):
+            '''Return the surveyed informers of some types, in order.'''
+            return [i for i in surveyed if i.entity_type in entity_types]
+
+        for entity_types in [('vpc',), ('subnet', 'vpc'), ('elb',)]:
+            self.assertEqual(
+                surveyor.informers(*entity_types), scan(*entity_types)
+                )
+
+        mediator = surveyor.mediators()[-1]
+        self.assertEqual(
+            surveyor.informers(mediator=mediator),
+            [i for i in surveyed if i.mediator is mediator]
+            )
+        self.assertEqual(
+            surveyor.informers('vpc', mediator=mediator),
+            [i for i in scan('vpc') if i.mediator is mediator]
+            )
+
+        # Informers surveyed without refreshing are added at the end.
+        surveyor.survey('vpc', 'network_acl', refresh=False)
+        self.assertEqual(surveyor.informers()[:len(surveyed)], surveyed)
+        surveyed = list(surveyor.informers())
+        self.assertEqual(
+            surveyor.informers('network_acl', 'vpc'),
+            scan('network_acl', 'vpc')
+            )
+
+        surveyor.survey('vpc')
+        self.assertEqual(surveyor.informers('subnet'), [])
+        self.assertEqual(
+            surveyor.informers(), surveyor.informers('vpc')
+            )
+
+    # - - - - - - - - - - - - - - - - - - - - - - - - - - - -
+    def test_aws_surveyor_checkpoint(self):
+        '''Test resuming a survey from a checkpoint.'''
+
+        path = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, path)
+
+        def survey():
+            '''Survey and expand informers, checkpointing in path.'''
+            surveyor = aws_surveyor.AWSSurveyor(
+                profiles=['default'],
+                regions=['us-east-1'],
+                config_path=''
+                )
+            surveyor.set_checkpoint(path)
+            surveyor.survey('vpc', 'subnet', 'emr')
+            surveyor.expand_informers()
+            informers = surveyor.informers()
+            for mediator in surveyor.mediators():
+                mediator.flush()
+            return informers
+
+        surveyed = survey()
+        saved = os.listdir(os.path.join(path, 'records'))
+        self.assertIn('default.us-east-1.vpc', saved)
+        self.assertIn('default.us-east-1.subnet', saved)
+
+        self.assertItemsEqual(
+            [i.to_dict() for i in survey()],
+            [i.to_dict() for i in surveyed]
+            )
+
+    # - - - - - - - - - - - - - - - - - - - - - - - - - - - -
+    def test_aws_surveyor_asurvey(self):
+        '''Test AWSSurveyor.asurvey().'''
+
+        surveyor = aws_surveyor.AWSSurveyor(
+            profiles=['default'],
+            regions=['us-east-1'],
+            config_path=''
+            )
+        for mediator in surveyor.mediators():
+            mediator.flush()
+
+        with self.assertRaises(ValueError):
+            surveyor.asurvey('ec2', regions=['us-nowhere-1'])
+
+        future = surveyor.asurvey('ec2', 'vpc', expand=True, timeout=60)
+        with self.assertRaises(RuntimeError):
+            surveyor.asurvey('ec2')
+
+        informers = future.result(timeout=60)
+        self.assertTrue(future.done())
+        self.assertFalse(future.cancelled())
+        self.assertItemsEqual(informers, surveyor.informers())
+        self.assertEqual(
+            set(i.entity_type for i in informers), set(['ec2', 'vpc'])
+            )
+        self.assertEqual(set(i.is_expanded for i in informers), set([True]))
+
+        # The sync API shares the records fetched in the background.
+        for mediator in surveyor.mediators():
+            # pylint: disable=protected-access
+            self.assertIsNotNone(mediator._services['ec2'])
+            self.assertIsNone(mediator.cancel_event)
+
+        # A cancelled survey leaves the last survey's informers.
+        for mediator in surveyor.mediators():
+            mediator.flush()
+        future = surveyor.asurvey('subnet')
+        future.cancel()
+        with self.assertRaises(aws_async.AWSCancelledError):
+            future.result()
+        self.assertTrue(future.cancelled())
+        self.assertItemsEqual(informers, surveyor.informers())
+
+        for mediator in surveyor.mediators():
+            mediator.flush()
+
 
 # - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - -
 class TestAWSSurveyorAllPaths(unittest.TestCase):
@@ -19,9 +19,10 @@
 import json
 import logging
 
-import boto3
 import botocore.exceptions
 
+from boogio import aws_informer
+
 # Set default logging handler to avoid "No handler found" warnings.
 try:  # Python 2.7+
     from logging import NullHandler
@@ -81,7 +82,7 @@ class TrustedAdvisorCheckManager(object):
         if profile_name:
             session_kwargs.update({'profile_name': profile_name})
         self._logger.info('initializing AWS session...')
-        self._session = boto3.session.Session(**session_kwargs)
+        self._session = aws_informer.shared_session(**session_kwargs)
         self._client = self._session.client('support')
 
         # - - - - - - - - - - - - - - - - - - - - - - - -